@@ -6,6 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 
 # Import your models and Base
+from app.core.config import settings
 from app.db.database import Base
 from app.models import *  # Import all models
 
@@ -18,6 +19,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# 앱과 같은 DATABASE_URL 사용 (alembic.ini 값은 기본값)
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 target_metadata = Base.metadata
@@ -0,0 +1,155 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 00:00:00
+
+기존에 앱 시작 시 Base.metadata.create_all로 만들던 초기 테이블
+create_all로 이미 만든 DB는 `alembic stamp 0001` 후 이어서 upgrade (scripts/migrate.py가 자동으로 처리)
+- create_all은 없는 테이블만 만들고 기존 테이블은 바꾸지 않았으므로 enum 값/컬럼 변경(0002)은 빠져 있음
+- 그 사이 create_all이 새로 만든 테이블은 0003~0005가 건너뜀 (0002는 반복 실행해도 되는 DDL)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('hashed_password', sa.String(length=255), nullable=True),
+        sa.Column('wallet_address', sa.String(length=42), nullable=True),
+        sa.Column('smart_wallet_address', sa.String(length=42), nullable=True),
+        sa.Column('role', sa.Enum('ADMIN', 'ORGANIZER', 'BUYER', name='userrole'), nullable=False),
+        sa.Column('kyc_verified', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_wallet_address', 'users', ['wallet_address'], unique=False)
+
+    op.create_table(
+        'events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('event_id_onchain', sa.BigInteger(), nullable=True),
+        sa.Column('organizer_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('ipfs_hash', sa.String(length=255), nullable=True),
+        sa.Column('price_wei', sa.BigInteger(), nullable=False),
+        sa.Column('max_tickets', sa.Integer(), nullable=False),
+        sa.Column('sold_tickets', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('event_date', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'ACTIVE', 'CANCELLED', 'ENDED', name='eventstatus'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organizer_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id_onchain'),
+    )
+
+    op.create_table(
+        'tickets',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('token_id', sa.BigInteger(), nullable=False),
+        sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('owner_address', sa.String(length=42), nullable=False),
+        sa.Column('ipfs_hash', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum('ACTIVE', 'REFUNDED', 'TRANSFERRED', 'CANCELLED', name='ticketstatus'), nullable=False),
+        sa.Column('purchase_price_wei', sa.BigInteger(), nullable=True),
+        sa.Column('purchase_tx_hash', sa.String(length=66), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tickets_token_id', 'tickets', ['token_id'], unique=True)
+    op.create_index('ix_tickets_owner_address', 'tickets', ['owner_address'], unique=False)
+
+    op.create_table(
+        'resales',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('ticket_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('token_id', sa.BigInteger(), nullable=False),
+        sa.Column('seller_address', sa.String(length=42), nullable=False),
+        sa.Column('price_wei', sa.BigInteger(), nullable=False),
+        sa.Column('status', sa.Enum('LISTED', 'SOLD', 'CANCELLED', name='resalestatus'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sold_at', sa.DateTime(), nullable=True),
+        sa.Column('sale_tx_hash', sa.String(length=66), nullable=True),
+        sa.ForeignKeyConstraint(['ticket_id'], ['tickets.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_resales_token_id', 'resales', ['token_id'], unique=False)
+    op.create_index('ix_resales_seller_address', 'resales', ['seller_address'], unique=False)
+
+    op.create_table(
+        'transactions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tx_hash', sa.String(length=66), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('ticket_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('transaction_type', sa.Enum('PURCHASE', 'RESALE', 'REFUND', name='transactiontype'), nullable=False),
+        sa.Column('amount_wei', sa.BigInteger(), nullable=True),
+        sa.Column('gas_fee_wei', sa.BigInteger(), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'FAILED', name='transactionstatus'), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.ForeignKeyConstraint(['ticket_id'], ['tickets.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_transactions_tx_hash', 'transactions', ['tx_hash'], unique=True)
+
+    op.create_table(
+        'refund_requests',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('ticket_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('reason', sa.String(), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', 'PROCESSED', name='refundstatus'), nullable=False),
+        sa.Column('refund_amount_wei', sa.BigInteger(), nullable=True),
+        sa.Column('refund_tx_hash', sa.String(length=66), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['ticket_id'], ['tickets.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('refund_requests')
+    op.drop_index('ix_transactions_tx_hash', table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index('ix_resales_seller_address', table_name='resales')
+    op.drop_index('ix_resales_token_id', table_name='resales')
+    op.drop_table('resales')
+    op.drop_index('ix_tickets_owner_address', table_name='tickets')
+    op.drop_index('ix_tickets_token_id', table_name='tickets')
+    op.drop_table('tickets')
+    op.drop_table('events')
+    op.drop_index('ix_users_wallet_address', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    for enum_name in ('refundstatus', 'transactionstatus', 'transactiontype', 'resalestatus',
+                      'ticketstatus', 'eventstatus', 'userrole'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""transaction type CHARGE, nullable tickets.token_id
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+- transactiontype에 CHARGE 추가 (Smart Wallet 충전)
+- tickets.token_id NULL 허용 (submit-and-track: 확인 전에는 tokenId를 모름)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ALTER TYPE ... ADD VALUE는 트랜잭션 밖에서 실행
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE transactiontype ADD VALUE IF NOT EXISTS 'CHARGE'")
+    op.alter_column('tickets', 'token_id', existing_type=sa.BigInteger(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # enum 값은 제거할 수 없으므로 token_id만 되돌림 (NULL 행이 있으면 실패)
+    op.alter_column('tickets', 'token_id', existing_type=sa.BigInteger(), nullable=False)
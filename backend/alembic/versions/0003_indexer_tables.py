@@ -0,0 +1,52 @@
+"""chain indexer tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+scripts/run_indexer.py 체크포인트와 반영한 로그
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import schema_exists
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not schema_exists('indexer_checkpoints'):
+        op.create_table(
+            'indexer_checkpoints',
+            sa.Column('name', sa.String(length=64), nullable=False),
+            sa.Column('last_block', sa.BigInteger(), nullable=False),
+            sa.Column('last_block_hash', sa.String(length=66), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('name'),
+        )
+    if not schema_exists('indexed_logs'):
+        op.create_table(
+            'indexed_logs',
+            sa.Column('tx_hash', sa.String(length=66), nullable=False),
+            sa.Column('log_index', sa.Integer(), nullable=False),
+            sa.Column('block_number', sa.BigInteger(), nullable=False),
+            sa.Column('event_name', sa.String(length=64), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('tx_hash', 'log_index'),
+        )
+        op.create_index('ix_indexed_logs_block_number', 'indexed_logs', ['block_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_indexed_logs_block_number', table_name='indexed_logs')
+    op.drop_table('indexed_logs')
+    op.drop_table('indexer_checkpoints')
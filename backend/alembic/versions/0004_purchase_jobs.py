@@ -0,0 +1,61 @@
+"""purchase job queue
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:03
+
+PURCHASE_MODE=queue 구매 작업 (user_id + Idempotency-Key 유일)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db.migration_utils import schema_exists
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not schema_exists('purchase_jobs'):
+        op.create_table(
+            'purchase_jobs',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('ticket_id', postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column('idempotency_key', sa.String(length=128), nullable=True),
+            sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='purchasejobstatus'), nullable=False),
+            sa.Column('token_uri', sa.String(length=512), nullable=True),
+            sa.Column('ipfs_hash', sa.String(length=255), nullable=True),
+            sa.Column('op_hash', sa.String(length=66), nullable=True),
+            sa.Column('tx_hash', sa.String(length=66), nullable=True),
+            sa.Column('token_id', sa.BigInteger(), nullable=True),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('run_after', sa.DateTime(), nullable=False),
+            sa.Column('locked_by', sa.String(length=64), nullable=True),
+            sa.Column('locked_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+            sa.ForeignKeyConstraint(['ticket_id'], ['tickets.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'idempotency_key', name='uq_purchase_jobs_user_idempotency_key'),
+        )
+        op.create_index('ix_purchase_jobs_user_id', 'purchase_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_purchase_jobs_user_id', table_name='purchase_jobs')
+    op.drop_table('purchase_jobs')
+    sa.Enum(name='purchasejobstatus').drop(op.get_bind(), checkfirst=True)
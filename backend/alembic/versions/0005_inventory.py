@@ -0,0 +1,69 @@
+"""inventory shards and holds
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:04
+
+재고 샤드 카운터 / 구매 진행 중 예약, purchase_jobs.hold_id
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db.migration_utils import schema_exists
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not schema_exists('inventory_shards'):
+        op.create_table(
+            'inventory_shards',
+            sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('shard', sa.Integer(), nullable=False),
+            sa.Column('capacity', sa.Integer(), nullable=False),
+            sa.Column('held', sa.Integer(), nullable=False),
+            sa.Column('sold', sa.Integer(), nullable=False),
+            sa.CheckConstraint('held >= 0 AND sold >= 0', name='ck_inventory_shards_non_negative'),
+            sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+            sa.PrimaryKeyConstraint('event_id', 'shard'),
+        )
+    if not schema_exists('inventory_holds'):
+        op.create_table(
+            'inventory_holds',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('shard', sa.Integer(), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+            sa.Column('status', sa.Enum('HELD', 'CONFIRMED', 'RELEASED', name='inventoryholdstatus'), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_inventory_holds_expires_at', 'inventory_holds', ['expires_at'], unique=False)
+
+    if not schema_exists('purchase_jobs', 'hold_id'):
+        op.add_column('purchase_jobs', sa.Column('hold_id', postgresql.UUID(as_uuid=True), nullable=True))
+        op.create_foreign_key(
+            'purchase_jobs_hold_id_fkey', 'purchase_jobs', 'inventory_holds', ['hold_id'], ['id']
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('purchase_jobs_hold_id_fkey', 'purchase_jobs', type_='foreignkey')
+    op.drop_column('purchase_jobs', 'hold_id')
+    op.drop_index('ix_inventory_holds_expires_at', table_name='inventory_holds')
+    op.drop_table('inventory_holds')
+    op.drop_table('inventory_shards')
+    sa.Enum(name='inventoryholdstatus').drop(op.get_bind(), checkfirst=True)
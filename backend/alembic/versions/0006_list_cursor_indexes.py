@@ -0,0 +1,42 @@
+"""composite indexes for list cursor pagination
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:05
+
+목록 API의 (created_at, id) 커서 범위 조건 + 필터 컬럼용 복합 인덱스
+운영 중 테이블 잠금을 피하려고 CONCURRENTLY로 생성
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_tickets_owner_created_id', 'tickets', ['owner_address', 'created_at', 'id']),
+    ('ix_events_created_id', 'events', ['created_at', 'id']),
+    ('ix_events_status_created_id', 'events', ['status', 'created_at', 'id']),
+    ('ix_resales_status_created_id', 'resales', ['status', 'created_at', 'id']),
+    ('ix_refund_requests_created_id', 'refund_requests', ['created_at', 'id']),
+    ('ix_refund_requests_user_created_id', 'refund_requests', ['user_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,57 @@
+"""composite and partial indexes for hot query shapes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:06
+
+- tickets: 중복 구매 확인 (event_id, owner_address) WHERE status = 'ACTIVE'
+- resales: 목록/중복 등록 확인은 LISTED만 보므로 부분 인덱스로 교체
+- refund_requests: 티켓별 환불 요청 확인 (ticket_id, status)
+- events: 판매 중 필터 (status, start_time, end_time)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_tickets_event_owner_active', 'tickets', ['event_id', 'owner_address'], "status = 'ACTIVE'"),
+    ('ix_resales_listed_created_id', 'resales', ['created_at', 'id'], "status = 'LISTED'"),
+    ('ix_resales_ticket_listed', 'resales', ['ticket_id'], "status = 'LISTED'"),
+    ('ix_refund_requests_ticket_status', 'refund_requests', ['ticket_id', 'status'], None),
+    ('ix_events_status_window', 'events', ['status', 'start_time', 'end_time'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+        # LISTED 부분 인덱스로 대체
+        op.drop_index(
+            'ix_resales_status_created_id', table_name='resales',
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_resales_status_created_id', 'resales', ['status', 'created_at', 'id'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
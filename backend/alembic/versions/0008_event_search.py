@@ -0,0 +1,59 @@
+"""event full-text search
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:07
+
+- events.metadata_text: IPFS 메타데이터의 검색 대상 텍스트
+- events.search_vector: 이름/설명/메타데이터 tsvector (STORED 생성 컬럼) + GIN 인덱스
+- events.name trigram GIN 인덱스 (오타 검색, pg_trgm 확장 필요)
+
+생성 컬럼 추가는 테이블을 다시 쓰므로 (ACCESS EXCLUSIVE 잠금) 이벤트가 많으면 점검 시간에 실행
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(metadata_text, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('events', sa.Column('metadata_text', sa.Text(), nullable=True))
+    op.add_column(
+        'events',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True)
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_search_vector', 'events', ['search_vector'], unique=False,
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_events_name_trgm', 'events', ['name'], unique=False,
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_name_trgm', table_name='events', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_events_search_vector', table_name='events', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('events', 'search_vector')
+    op.drop_column('events', 'metadata_text')
@@ -0,0 +1,47 @@
+"""ipfs pin queue
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:08
+
+로컬에서 CID를 계산한 메타데이터의 Pinata 고정 대기열
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'ipfs_pins',
+        sa.Column('cid', sa.String(length=100), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('keyvalues', sa.JSON(), nullable=True),
+        sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'PINNED', 'FAILED', name='ipfspinstatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=64), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('pinned_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('cid'),
+    )
+    op.create_index('ix_ipfs_pins_status_run_after', 'ipfs_pins', ['status', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ipfs_pins_status_run_after', table_name='ipfs_pins')
+    op.drop_table('ipfs_pins')
+    sa.Enum(name='ipfspinstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,37 @@
+"""ticket metadata directory
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 00:00:09
+
+- events.metadata_dir_cid: 승인 시 미리 고정한 티켓 메타데이터 디렉터리 CID
+- inventory_shards.issued / inventory_holds.serial: 예약 시 배정하는 티켓 일련번호
+  (기존 샤드는 이미 판매/예약된 수량부터 이어서 배정)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('metadata_dir_cid', sa.String(length=100), nullable=True))
+    op.add_column('inventory_shards', sa.Column('issued', sa.Integer(), server_default='0', nullable=False))
+    op.execute('UPDATE inventory_shards SET issued = held + sold')
+    op.alter_column('inventory_shards', 'issued', server_default=None)
+    op.add_column('inventory_holds', sa.Column('serial', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('inventory_holds', 'serial')
+    op.drop_column('inventory_shards', 'issued')
+    op.drop_column('events', 'metadata_dir_cid')
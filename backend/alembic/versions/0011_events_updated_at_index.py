@@ -0,0 +1,33 @@
+"""events updated_at index
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 00:00:10
+
+- events: 판매 스케줄러가 updated_at 워터마크 이후 바뀐 이벤트만 다시 읽음
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_updated_at', 'events', ['updated_at'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_updated_at', table_name='events', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,44 @@
+"""inventory_shards updated_at
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:11
+
+- inventory_shards.updated_at: 판매 수량 동기화가 바뀐 샤드의 이벤트만 다시 합산
+  (기존 행은 현재 시각 - 첫 동기화는 어차피 전체 합산)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, Sequence[str], None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'inventory_shards',
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False)
+    )
+    op.alter_column('inventory_shards', 'updated_at', server_default=None)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_inventory_shards_updated_at', 'inventory_shards', ['updated_at'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_inventory_shards_updated_at', table_name='inventory_shards',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('inventory_shards', 'updated_at')
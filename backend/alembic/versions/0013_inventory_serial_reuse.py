@@ -0,0 +1,47 @@
+"""reuse serials of released inventory holds
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 00:00:12
+
+- inventory_holds.serial_free: 반환된 예약의 일련번호를 다음 예약이 재사용
+  (기존에 반환된 예약의 번호도 재사용 대상으로 표시)
+- 샤드별 재사용 가능 번호 부분 인덱스
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'inventory_holds',
+        sa.Column('serial_free', sa.Boolean(), server_default=sa.false(), nullable=False)
+    )
+    op.alter_column('inventory_holds', 'serial_free', server_default=None)
+    op.execute("UPDATE inventory_holds SET serial_free = true WHERE status = 'RELEASED' AND serial IS NOT NULL")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_inventory_holds_free_serial', 'inventory_holds', ['event_id', 'shard'], unique=False,
+            postgresql_where=sa.text('serial_free'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_inventory_holds_free_serial', table_name='inventory_holds',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('inventory_holds', 'serial_free')
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, events, tickets, resales, refunds, admin, ipfs, user_operations, payments
+from app.api.v1 import auth, events, tickets, resales, refunds, admin, ipfs, user_operations, payments, transactions
 
 api_router = APIRouter()
 
@@ -12,4 +12,4 @@ api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 api_router.include_router(ipfs.router, prefix="/ipfs", tags=["ipfs"])
 api_router.include_router(user_operations.router, prefix="/user-operations", tags=["user-operations"])
 api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
-
+api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
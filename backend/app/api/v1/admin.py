@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.database import get_async_db, pool_stats, read_router
 from app.schemas.event import EventResponse
 from app.schemas.refund import RefundRequestResponse
 from app.models.event import Event, EventStatus
 from app.models.ticket import Ticket, TicketStatus
 from app.models.user import User, UserRole
 from app.models.refund import RefundRequest, RefundStatus
-from app.core.dependencies import get_current_admin
+from app.core.dependencies import get_current_admin, get_read_db
 from app.core.config import settings
+from app.core.pagination import paginate
+from app.services.web3_service import web3_service
+from app.services.inventory_service import inventory_service
+from app.services.tx_tracker import tx_tracker
+from app.services.catalog_cache import catalog_cache
+from app.services.sale_scheduler import sale_scheduler
+from app.services.async_ipfs_service import async_ipfs_service
+from app.services.ipfs_cache import ipfs_cache
+from app.services.pin_queue import pin_queue
+from app.services.ticket_metadata import ticket_metadata
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,41 +32,68 @@ router = APIRouter()
 
 @router.get("/events/pending", response_model=List[EventResponse])
 async def get_pending_events(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """승인 대기 이벤트 목록"""
-    events = (
-        db.query(Event)
-        .filter(Event.status == EventStatus.PENDING)
-        .order_by(Event.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    query = select(Event).where(Event.status == EventStatus.PENDING)
+    events = await paginate(db, query, (Event.created_at, Event.id), cursor, limit, response, skip=skip)
     return events
 
 
 @router.get("/stats")
 async def get_stats(
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """시스템 통계"""
-    total_events = db.query(Event).count()
-    total_tickets = db.query(Ticket).count()
-    total_users = db.query(User).count()
-    pending_events = db.query(Event).filter(Event.status == EventStatus.PENDING).count()
-    pending_refunds = db.query(RefundRequest).filter(RefundRequest.status == "pending").count()
+    # 카운트 5개를 스칼라 서브쿼리로 한 번에 조회
+    def count(model, *conditions):
+        return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+    
+    stats = (await db.execute(
+        select(
+            count(Event).label("total_events"),
+            count(Ticket).label("total_tickets"),
+            count(User).label("total_users"),
+            count(Event, Event.status == EventStatus.PENDING).label("pending_events"),
+            count(RefundRequest, RefundRequest.status == RefundStatus.PENDING).label("pending_refunds"),
+        )
+    )).one()
     
     return {
-        "total_events": total_events,
-        "total_tickets": total_tickets,
-        "total_users": total_users,
-        "pending_events": pending_events,
-        "pending_refunds": pending_refunds
+        "total_events": stats.total_events,
+        "total_tickets": stats.total_tickets,
+        "total_users": stats.total_users,
+        "pending_events": stats.pending_events,
+        "pending_refunds": stats.pending_refunds
+    }
+
+
+@router.get("/metrics")
+async def get_metrics(
+    current_user: User = Depends(get_current_admin)
+):
+    """내부 캐시/리소스 지표"""
+    return {
+        "contracts": web3_service.contracts.stats(),
+        "nonces": web3_service.nonces.stats() if web3_service.nonces else None,
+        "tx_tracker": tx_tracker.stats(),
+        "inventory": inventory_service.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "sale_scheduler": sale_scheduler.stats(),
+        "db_pools": pool_stats(),
+        "read_router": read_router.stats(),
+        "ipfs_gateways": async_ipfs_service.stats(),
+        "ipfs_cache": ipfs_cache.stats(),
+        "pin_queue": pin_queue.stats(),
+        "ticket_metadata": ticket_metadata.stats(),
+        "password_hasher": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
     }
 
 
@@ -62,10 +102,10 @@ async def update_user_role(
     user_id: str,
     new_role: UserRole,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사용자 역할 변경"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,8 +113,9 @@ async def update_user_role(
         )
     
     user.role = new_role
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await principal_cache.invalidate(user.id)
     
     return {"message": "User role updated", "user_id": str(user.id), "new_role": user.role}
 
@@ -83,7 +124,7 @@ async def update_user_role(
 async def emergency_refund(
     ticket_id: str,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """긴급 환불 (관리자만, 이벤트 취소 시)"""
     import uuid
@@ -100,7 +141,7 @@ async def emergency_refund(
             detail="Invalid ticket ID format"
         )
     
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_uuid).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_uuid))
     if not ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -115,7 +156,7 @@ async def emergency_refund(
         )
     
     # 이벤트 확인
-    event = db.query(Event).filter(Event.id == ticket.event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == ticket.event_id))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -133,13 +174,13 @@ async def emergency_refund(
     refund_tx_hash = None
     if ticket.token_id is not None:
         try:
-            from app.services.web3_service import web3_service
+            from app.services.async_web3_service import async_web3_service
             from app.core.config import settings
             
             # RefundManager의 emergencyRefund 함수 호출
-            refund_manager = web3_service._get_contract(settings.REFUND_MANAGER_ADDRESS, "RefundManager")
+            refund_manager = async_web3_service._get_contract(settings.REFUND_MANAGER_ADDRESS, "RefundManager")
             function = refund_manager.functions.emergencyRefund(ticket.token_id)
-            refund_tx_hash = web3_service._send_transaction(function)
+            refund_tx_hash = await async_web3_service._send_transaction(function)
             logger.info(f"Emergency refund processed onchain: tx={refund_tx_hash}")
         except Exception as e:
             logger.error(f"Failed to process emergency refund onchain: {e}")
@@ -149,10 +190,10 @@ async def emergency_refund(
             )
     
     # 환불 요청 생성 또는 업데이트
-    existing_refund = (
-        db.query(RefundRequest)
-        .filter(RefundRequest.ticket_id == ticket_uuid)
-        .first()
+    existing_refund = await db.scalar(
+        select(RefundRequest)
+        .where(RefundRequest.ticket_id == ticket_uuid)
+        .limit(1)
     )
     
     if existing_refund:
@@ -176,7 +217,7 @@ async def emergency_refund(
     # 티켓 상태 업데이트
     ticket.status = TicketStatus.REFUNDED
     
-    db.commit()
+    await db.commit()
     
     return {
         "message": "Emergency refund processed successfully",
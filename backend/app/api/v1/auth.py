@@ -1,20 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, WalletConnect
 from app.models.user import User
 from app.services.auth_service import create_user, authenticate_user, create_access_token_for_user
 from app.core.dependencies import get_current_user
 from app.core.security import get_password_hash
+from app.services.principal_cache import principal_cache
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_create: UserCreate, db: Session = Depends(get_db)):
+async def register(user_create: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """회원가입"""
     try:
-        user = create_user(db, user_create)
+        user = await create_user(db, user_create)
         # UUID를 문자열로 변환하여 반환
         return UserResponse(
             id=str(user.id),
@@ -36,9 +37,9 @@ async def register(user_create: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login(user_login: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """로그인 (이메일/비밀번호)"""
-    user = authenticate_user(db, user_login.email, user_login.password)
+    user = await authenticate_user(db, user_login.email, user_login.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -87,31 +88,34 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 async def connect_wallet(
     wallet_info: WalletConnect,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """지갑 연결 (Account Abstraction)"""
+    # rollback 후에는 만료된 속성을 읽을 수 없으므로(비동기 세션 지연 로딩) 기존 주소를 미리 보관
+    previous_wallet_address = current_user.wallet_address
     # 지갑 주소 업데이트
     try:
         current_user.wallet_address = wallet_info.wallet_address
         # TODO: Account Abstraction 지갑 생성 로직
         # current_user.smart_wallet_address = generate_smart_wallet(...)
         
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await db.refresh(current_user)
+        await principal_cache.invalidate(current_user.id)
         
         return {
             "message": "Wallet connected successfully",
             "wallet_address": current_user.wallet_address
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # UNIQUE 제약 에러인 경우 무시 (이미 다른 사용자가 사용 중일 수 있음)
         if "UNIQUE constraint" in str(e) or "unique" in str(e).lower():
             # 기존 지갑 주소를 그대로 사용
-            if current_user.wallet_address:
+            if previous_wallet_address:
                 return {
                     "message": "Wallet already connected",
-                    "wallet_address": current_user.wallet_address
+                    "wallet_address": previous_wallet_address
                 }
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -122,7 +126,7 @@ async def connect_wallet(
 @router.post("/wallet/create")
 async def create_smart_wallet(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Smart Wallet 생성 (Account Abstraction)"""
     # 이미 Smart Wallet이 있으면 반환
@@ -134,27 +138,28 @@ async def create_smart_wallet(
     
     try:
         # Account Abstraction 서비스 사용
-        from app.services.aa_service import aa_service
+        from app.services.async_aa_service import async_aa_service
         
         # Deterministic 주소 생성 및 배포
         # owner_address는 사용자의 MetaMask 주소 사용 (사용자가 서명할 수 있도록)
         # 현재는 사용자 주소가 없으면 서비스 계정 사용 (나중에 사용자가 연결하면 업데이트)
         owner_address = current_user.wallet_address if current_user.wallet_address else None
-        smart_wallet_address = aa_service.generate_smart_wallet_address(
+        smart_wallet_address = await async_aa_service.generate_smart_wallet_address(
             user_id=str(current_user.id),
             owner_address=owner_address  # 사용자 주소 또는 None (서비스 계정 사용)
         )
         
         current_user.smart_wallet_address = smart_wallet_address
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await db.refresh(current_user)
+        await principal_cache.invalidate(current_user.id)
         
         return {
             "message": "Smart wallet created successfully",
             "smart_wallet_address": smart_wallet_address
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create smart wallet: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.database import get_db
-from app.schemas.event import EventCreate, EventUpdate, EventResponse
+from app.db.database import get_async_db
+from app.schemas.event import EventCreate, EventUpdate, EventResponse, EventSearchResult, EventSearchFacets, OrganizerFacet
 from app.models.event import Event, EventStatus
+from app.models.inventory import InventoryHold, InventoryHoldStatus, InventoryShard
+from app.models.purchase_job import PurchaseJob
 from app.models.user import User
-from app.core.dependencies import get_current_user, get_current_organizer, get_current_admin
+from app.core.dependencies import get_current_user, get_current_organizer, get_current_admin, get_read_db
 from app.core.config import settings
-from app.services.web3_service import web3_service
-from app.services.ipfs_service import ipfs_service
+from app.core.pagination import CREATED_AT_ID, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, paginate
+from app.services.async_web3_service import async_web3_service
+from app.services.pin_queue import pin_queue
+from app.services.ticket_metadata import DIRECTORY_FIELDS, ticket_metadata
+from app.services.inventory_service import inventory_service
+from app.services.purchase_queue import ACTIVE_STATUSES
+from app.services.catalog_cache import LIST_SCOPE, catalog_cache, event_scope
+from app.services.sale_scheduler import SALE_STATUSES, sale_scheduler, sale_status
+from app.services import event_search
 from datetime import datetime
 import logging
 import uuid
@@ -17,52 +29,76 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_EVENT_LIST = TypeAdapter(List[EventResponse])
+
+# 검색 trigram 결과 커서 접두사 (base64url에 없는 문자)
+TRIGRAM_CURSOR_PREFIX = "t."
+
+
+def _event_response(event: Event) -> EventResponse:
+    # UUID를 문자열로 변환
+    return EventResponse(
+        id=str(event.id),
+        event_id_onchain=event.event_id_onchain,
+        organizer_id=str(event.organizer_id),
+        name=event.name,
+        description=event.description,
+        ipfs_hash=event.ipfs_hash,
+        price_wei=event.price_wei,
+        max_tickets=event.max_tickets,
+        sold_tickets=event.sold_tickets,
+        start_time=event.start_time,
+        end_time=event.end_time,
+        event_date=event.event_date,
+        status=event.status,
+        created_at=event.created_at,
+        updated_at=event.updated_at,
+    )
+
 
 @router.get("", response_model=List[EventResponse])
 async def get_events(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
     status_filter: Optional[EventStatus] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """이벤트 목록 조회"""
+    """이벤트 목록 조회 (직렬화된 페이지 캐시, ETag/Last-Modified 조건부 요청 지원)"""
+    cache_key = f"events:{status_filter.value if status_filter else ''}:{cursor or ''}:{skip}:{limit}"
+    entry, generations = await catalog_cache.get(cache_key, [LIST_SCOPE])
+    if entry is not None:
+        return catalog_cache.respond(request, entry)
+
     try:
-        query = db.query(Event)
-        
-        if status_filter:
+        if status_filter == EventStatus.ACTIVE and sale_scheduler.ready:
+            # 판매 중 목록은 스케줄러의 메모리 인덱스에서 (DB 조회 없음)
+            after = tuple(decode_cursor(cursor, CREATED_AT_ID)) if cursor else None
+            items = sale_scheduler.on_sale_page(after, skip, limit + 1)
+            if len(items) > limit:
+                items = items[:limit]
+                response.headers[NEXT_CURSOR_HEADER] = encode_cursor([items[-1].created_at, items[-1].id])
+        else:
+            query = select(Event)
+            
             if status_filter == EventStatus.ACTIVE:
                 # "판매 중" 필터: 승인되었고, 현재 시간이 판매 기간 내에 있는 이벤트
+                # (스케줄러가 돌지 않는 경우 - 아직 ACTIVE로 전환되지 않은 APPROVED 포함)
                 now = datetime.utcnow()
-                query = query.filter(
-                    Event.status == EventStatus.APPROVED,
+                query = query.where(
+                    Event.status.in_([EventStatus.APPROVED, EventStatus.ACTIVE]),
                     Event.start_time <= now,
                     Event.end_time >= now
                 )
-            else:
-                query = query.filter(Event.status == status_filter)
-        
-        events = query.order_by(Event.created_at.desc()).offset(skip).limit(limit).all()
-        
-        # UUID를 문자열로 변환하여 반환
-        return [
-            EventResponse(
-                id=str(event.id),
-                event_id_onchain=event.event_id_onchain,
-                organizer_id=str(event.organizer_id),
-                name=event.name,
-                description=event.description,
-                ipfs_hash=event.ipfs_hash,
-                price_wei=event.price_wei,
-                max_tickets=event.max_tickets,
-                sold_tickets=event.sold_tickets,
-                start_time=event.start_time,
-                end_time=event.end_time,
-                event_date=event.event_date,
-                status=event.status,
-                created_at=event.created_at,
-                updated_at=event.updated_at,
-            ) for event in events
-        ]
+            elif status_filter:
+                query = query.where(Event.status == status_filter)
+            
+            events = await paginate(db, query, (Event.created_at, Event.id), cursor, limit, response, skip=skip)
+            items = [_event_response(event) for event in events]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get events: {e}", exc_info=True)
         raise HTTPException(
@@ -70,10 +106,128 @@ async def get_events(
             detail=f"Failed to get events: {str(e)}"
         )
 
+    headers = {}
+    if NEXT_CURSOR_HEADER in response.headers:
+        headers[NEXT_CURSOR_HEADER] = response.headers[NEXT_CURSOR_HEADER]
+    entry = await catalog_cache.put(
+        cache_key,
+        generations,
+        _EVENT_LIST.dump_json(items),
+        headers=headers,
+        modified_at=max((item.updated_at for item in items), default=None),
+        time_dependent=status_filter == EventStatus.ACTIVE,
+    )
+    return catalog_cache.respond(request, entry)
+
+
+def _search_filters(
+    q: str = Query(..., min_length=1, max_length=200, description="검색어 (따옴표 구문, OR, -제외 지원)"),
+    status_filter: Optional[EventStatus] = None,
+    price_min: Optional[int] = Query(None, ge=0, description="최소 가격 (wei)"),
+    price_max: Optional[int] = Query(None, ge=0, description="최대 가격 (wei)"),
+    date_from: Optional[datetime] = Query(None, description="이벤트 일시 시작"),
+    date_to: Optional[datetime] = Query(None, description="이벤트 일시 끝"),
+    min_available: Optional[int] = Query(None, ge=1, description="최소 잔여 수량 (max_tickets - sold_tickets)"),
+    organizer_id: Optional[str] = None,
+):
+    """검색어 + facet 조건"""
+    organizer_uuid = None
+    if organizer_id:
+        try:
+            organizer_uuid = uuid.UUID(organizer_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid organizer ID format"
+            )
+    conditions = event_search.search_conditions(
+        status_filter=status_filter,
+        price_min=price_min,
+        price_max=price_max,
+        date_from=date_from,
+        date_to=date_to,
+        min_available=min_available,
+        organizer_id=organizer_uuid,
+    )
+    return q, conditions
+
+
+@router.get("/search", response_model=List[EventSearchResult])
+async def search_events(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
+    filters: tuple = Depends(_search_filters),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    이벤트 검색 (관련도순, 커서 페이지네이션)
+
+    이름/설명/메타데이터 전문 검색 결과가 없으면 이름 trigram 유사도로 다시 검색 (오타 대비)
+    trigram 결과의 다음 페이지 커서는 "t." 접두사로 구분
+    """
+    q, conditions = filters
+    trigram = bool(cursor) and cursor.startswith(TRIGRAM_CURSOR_PREFIX)
+
+    if not trigram:
+        stmt, rank = event_search.fulltext_statement(q, conditions)
+        rows = await paginate(
+            db, stmt, (rank, Event.id), cursor, limit, response, skip=skip, parsers=event_search.SCORE_ID
+        )
+        # 첫 페이지에 결과가 없을 때만 trigram으로
+        trigram = not rows and not cursor and not skip
+
+    if trigram:
+        stmt, rank = event_search.trigram_statement(q, conditions)
+        rows = await paginate(
+            db, stmt, (rank, Event.id), cursor[len(TRIGRAM_CURSOR_PREFIX):] if cursor else None,
+            limit, response, skip=skip, parsers=event_search.SCORE_ID
+        )
+        if NEXT_CURSOR_HEADER in response.headers:
+            response.headers[NEXT_CURSOR_HEADER] = TRIGRAM_CURSOR_PREFIX + response.headers[NEXT_CURSOR_HEADER]
+
+    return [
+        EventSearchResult(**_event_response(row).model_dump(), rank=row.rank)
+        for row in rows
+    ]
+
+
+@router.get("/search/facets", response_model=EventSearchFacets)
+async def search_event_facets(
+    filters: tuple = Depends(_search_filters),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """검색 결과 facet 집계 (전체/잔여 수량 있는 수, 가격/일시 범위, 주최자별 상위 10)"""
+    q, conditions = filters
+    for match_name, match in (
+        ("fulltext", event_search.fulltext_match(q)),
+        ("trigram", event_search.trigram_match(q)),
+    ):
+        summary_stmt, organizer_stmt = event_search.facet_statements(match, conditions)
+        summary = (await db.execute(summary_stmt)).one()
+        if summary.total:
+            break
+
+    organizers = (await db.execute(organizer_stmt)).all() if summary.total else []
+    return EventSearchFacets(
+        match=match_name,
+        total=summary.total,
+        available=summary.available,
+        price_min=summary.price_min,
+        price_max=summary.price_max,
+        date_min=summary.date_min,
+        date_max=summary.date_max,
+        organizers=[
+            OrganizerFacet(organizer_id=str(organizer_id), count=count)
+            for organizer_id, count in organizers
+        ],
+    )
+
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: str, db: Session = Depends(get_db)):
-    """이벤트 상세 조회"""
+async def get_event(event_id: str, request: Request, db: AsyncSession = Depends(get_read_db)):
+    """이벤트 상세 조회 (캐시, 조건부 요청 지원)"""
     try:
         event_uuid = uuid.UUID(event_id)
     except ValueError:
@@ -82,47 +236,41 @@ async def get_event(event_id: str, db: Session = Depends(get_db)):
             detail="Invalid event ID format"
         )
     
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    cache_key = f"event:{event_uuid}"
+    entry, generations = await catalog_cache.get(cache_key, [event_scope(event_uuid)])
+    if entry is not None:
+        return catalog_cache.respond(request, entry)
+
+    event = await db.scalar(select(Event).where(Event.id == event_uuid))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
     
-    # UUID를 문자열로 변환하여 반환
-    return EventResponse(
-        id=str(event.id),
-        event_id_onchain=event.event_id_onchain,
-        organizer_id=str(event.organizer_id),
-        name=event.name,
-        description=event.description,
-        ipfs_hash=event.ipfs_hash,
-        price_wei=event.price_wei,
-        max_tickets=event.max_tickets,
-        sold_tickets=event.sold_tickets,
-        start_time=event.start_time,
-        end_time=event.end_time,
-        event_date=event.event_date,
-        status=event.status,
-        created_at=event.created_at,
-        updated_at=event.updated_at,
+    entry = await catalog_cache.put(
+        cache_key,
+        generations,
+        _event_response(event).model_dump_json().encode(),
+        modified_at=event.updated_at,
     )
+    return catalog_cache.respond(request, entry)
 
 
 @router.post("", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
     event_create: EventCreate,
     current_user: User = Depends(get_current_organizer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """이벤트 생성"""
-    # IPFS에 메타데이터 업로드
+    # 메타데이터 CID 계산 + 고정 예약 (이벤트 저장과 같은 트랜잭션, Pinata 업로드는 백그라운드)
     metadata = {
         "name": event_create.name,
         "description": event_create.description,
         "event_date": event_create.event_date.isoformat(),
     }
-    ipfs_hash = ipfs_service.upload_json(metadata)
+    ipfs_hash = await db.run_sync(lambda session: pin_queue.add_json(session, metadata, f"Event-{event_create.name}"))
     
     # DB에 이벤트 저장
     db_event = Event(
@@ -135,15 +283,17 @@ async def create_event(
         start_time=event_create.start_time,
         end_time=event_create.end_time,
         event_date=event_create.event_date,
-        status=EventStatus.PENDING
+        status=EventStatus.PENDING,
+        metadata_text=event_search.metadata_search_text(metadata)
     )
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await db.refresh(db_event)
+    await catalog_cache.invalidate_events([db_event.id])
     
     # 온체인에 이벤트 생성
     try:
-        event_id_onchain = web3_service.create_event_onchain(
+        event_id_onchain = await async_web3_service.create_event_onchain(
             event_manager_address=settings.EVENT_MANAGER_ADDRESS,
             ipfs_hash=ipfs_hash or "",
             price=event_create.price_wei,
@@ -154,8 +304,9 @@ async def create_event(
         )
         if event_id_onchain is not None:
             db_event.event_id_onchain = event_id_onchain
-            db.commit()
-            db.refresh(db_event)
+            await db.commit()
+            await db.refresh(db_event)
+            await catalog_cache.invalidate_events([db_event.id])
     except Exception as e:
         logger.error(f"Failed to create event onchain: {e}")
         # 온체인 생성 실패해도 DB에는 저장 (나중에 재시도 가능)
@@ -186,10 +337,10 @@ async def update_event(
     event_id: str,
     event_update: EventUpdate,
     current_user: User = Depends(get_current_organizer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """이벤트 수정"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -208,8 +359,25 @@ async def update_event(
     for field, value in update_data.items():
         setattr(event, field, value)
     
-    db.commit()
-    db.refresh(event)
+    # 판매 기간이 바뀌면 판매 상태도 다시 계산 (승인된 이벤트만)
+    if event.status in SALE_STATUSES:
+        event.status = sale_status(event.start_time, event.end_time)
+    
+    # 재고 샤드 용량 재분배 (이미 판매/예약된 수량은 유지)
+    if "max_tickets" in update_data:
+        await db.run_sync(inventory_service.resize, event)
+    
+    # 미리 만든 좌석 번호별 티켓 문서 내용이 바뀌면 다시 생성 (그동안은 이벤트 문서 사용)
+    rebuild_metadata = event.status in SALE_STATUSES and not DIRECTORY_FIELDS.isdisjoint(update_data)
+    if rebuild_metadata:
+        event.metadata_dir_cid = None
+    
+    await db.commit()
+    await db.refresh(event)
+    sale_scheduler.track(event)
+    await catalog_cache.invalidate_events([event.id])
+    if rebuild_metadata:
+        ticket_metadata.schedule_directory(event.id)
     return event
 
 
@@ -217,10 +385,10 @@ async def update_event(
 async def delete_event(
     event_id: str,
     current_user: User = Depends(get_current_organizer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """이벤트 삭제"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -234,8 +402,38 @@ async def delete_event(
             detail="Not authorized to delete this event"
         )
     
-    db.delete(event)
-    db.commit()
+    # 구매 진행 중(작업 대기/실행, 재고 예약)이면 삭제하지 않음
+    in_progress = await db.scalar(
+        select(PurchaseJob.id)
+        .where(PurchaseJob.event_id == event.id, PurchaseJob.status.in_(ACTIVE_STATUSES))
+        .limit(1)
+    ) or await db.scalar(
+        select(InventoryHold.id)
+        .where(InventoryHold.event_id == event.id, InventoryHold.status == InventoryHoldStatus.HELD)
+        .limit(1)
+    )
+    if in_progress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Event has purchases in progress"
+        )
+
+    # 끝난 구매 작업/반환된 예약/재고 샤드는 이벤트와 함께 삭제 (첫 예약 시 만들어지는 행)
+    await db.execute(delete(PurchaseJob).where(PurchaseJob.event_id == event.id))
+    await db.execute(delete(InventoryHold).where(InventoryHold.event_id == event.id))
+    await db.execute(delete(InventoryShard).where(InventoryShard.event_id == event.id))
+    await db.delete(event)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # 발급된 티켓/거래 기록이 있는 이벤트
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Event has tickets or transactions and cannot be deleted"
+        )
+    sale_scheduler.untrack(event.id)
+    await catalog_cache.invalidate_events([event.id])
     return None
 
 
@@ -243,7 +441,7 @@ async def delete_event(
 async def approve_event(
     event_id: str,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """이벤트 승인 (관리자)"""
     # UUID 변환
@@ -256,7 +454,7 @@ async def approve_event(
             detail="Invalid event ID format"
         )
     
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    event = await db.scalar(select(Event).where(Event.id == event_uuid))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -272,7 +470,7 @@ async def approve_event(
     # 온체인에서 승인
     if event.event_id_onchain is not None:
         try:
-            web3_service.approve_event_onchain(
+            await async_web3_service.approve_event_onchain(
                 event_manager_address=settings.EVENT_MANAGER_ADDRESS,
                 event_id=event.event_id_onchain
             )
@@ -283,9 +481,14 @@ async def approve_event(
                 detail=f"Failed to approve event onchain: {str(e)}"
             )
     
-    event.status = EventStatus.APPROVED
-    db.commit()
-    db.refresh(event)
+    # 판매 기간 중이면 바로 판매 중(ACTIVE), 이후 전환은 스케줄러가 담당
+    event.status = sale_status(event.start_time, event.end_time)
+    await db.commit()
+    await db.refresh(event)
+    sale_scheduler.track(event)
+    await catalog_cache.invalidate_events([event.id])
+    # 좌석 번호별 티켓 문서 디렉터리 생성/고정 (TICKET_METADATA_MODE=directory, 백그라운드)
+    ticket_metadata.schedule_directory(event.id)
     
     # UUID를 문자열로 변환하여 반환
     from app.schemas.event import EventResponse
@@ -312,10 +515,10 @@ async def approve_event(
 async def cancel_event(
     event_id: str,
     current_user: User = Depends(get_current_organizer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """이벤트 취소"""
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == event_id))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -330,7 +533,9 @@ async def cancel_event(
         )
     
     event.status = EventStatus.CANCELLED
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
+    sale_scheduler.untrack(event.id)
+    await catalog_cache.invalidate_events([event.id])
     
     return event
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.core.dependencies import get_current_admin
 from app.services.ipfs_service import ipfs_service
+from app.services.async_ipfs_service import async_ipfs_service
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, Any
 
 router = APIRouter()
@@ -9,7 +11,7 @@ router = APIRouter()
 @router.get("/test")
 async def test_ipfs_connection():
     """IPFS 연결 테스트 (Pinata)"""
-    is_connected = ipfs_service.test_connection()
+    is_connected = await run_in_threadpool(ipfs_service.test_connection)
     
     if not is_connected:
         return {
@@ -31,7 +33,7 @@ async def upload_test_data(
     current_user = Depends(get_current_admin)
 ):
     """테스트용 JSON 데이터 업로드"""
-    ipfs_hash = ipfs_service.upload_json(data)
+    ipfs_hash = await run_in_threadpool(ipfs_service.upload_json, data)
     
     if not ipfs_hash:
         raise HTTPException(
@@ -49,7 +51,7 @@ async def upload_test_data(
 @router.get("/retrieve/{ipfs_hash}")
 async def retrieve_ipfs_data(ipfs_hash: str):
     """IPFS에서 데이터 조회"""
-    data = ipfs_service.get_json(ipfs_hash)
+    data = await async_ipfs_service.get_json(ipfs_hash)
     
     if not data:
         raise HTTPException(
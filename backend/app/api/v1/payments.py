@@ -3,13 +3,15 @@
 카드 결제 처리 및 Smart Wallet 충전
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.user import User
 from app.core.dependencies import get_current_user
-from app.services.web3_service import web3_service
-from web3 import Web3
+from app.core.config import settings
+from app.models.transaction import TransactionType
+from app.services.async_web3_service import async_web3_service
+from app.services.tx_tracker import tx_tracker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,7 +31,7 @@ class CardPaymentRequest(BaseModel):
 async def process_card_payment(
     payment: CardPaymentRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     카드 결제 처리 및 Smart Wallet 충전
@@ -63,24 +65,38 @@ async def process_card_payment(
         
         if payment_success:
             # Smart Wallet에 자금 충전 (서비스 계정에서)
-            smart_wallet_address = Web3.to_checksum_address(current_user.smart_wallet_address)
+            # 서비스 계정 nonce 관리자를 공유하므로 다른 트랜잭션과 동시에 전송 가능
+            if settings.TX_CONFIRMATION_MODE == "track":
+                # 해시만 받고 반환 - 확인은 tx_tracker가 처리 (GET /transactions/{tx_hash})
+                transfer_tx = await async_web3_service.transfer(
+                    current_user.smart_wallet_address, amount_wei, wait=False
+                )
+                await db.run_sync(
+                    lambda session: tx_tracker.record(
+                        session,
+                        transfer_tx,
+                        TransactionType.CHARGE,
+                        user_id=current_user.id,
+                        amount_wei=amount_wei
+                    )
+                )
+                await db.commit()
+                logger.info(f"Smart Wallet charge submitted: {transfer_tx}")
+                return {
+                    "success": True,
+                    "tx_hash": transfer_tx,
+                    "status": "pending",
+                    "message": "Payment processed, Smart Wallet charge pending confirmation"
+                }
             
-            # 서비스 계정에서 Smart Wallet로 이더 전송
-            transfer_tx = web3_service.w3.eth.send_transaction({
-                'from': web3_service.address,
-                'to': smart_wallet_address,
-                'value': amount_wei,
-                'gas': 21000,
-                'gasPrice': web3_service.w3.eth.gas_price
-            })
+            transfer_tx = await async_web3_service.transfer(current_user.smart_wallet_address, amount_wei)
             
-            receipt = web3_service.w3.eth.wait_for_transaction_receipt(transfer_tx, timeout=60)
-            
-            logger.info(f"Smart Wallet charged: {transfer_tx.hex()}")
+            logger.info(f"Smart Wallet charged: {transfer_tx}")
             
             return {
                 "success": True,
-                "tx_hash": transfer_tx.hex(),
+                "tx_hash": transfer_tx,
+                "status": "confirmed",
                 "message": "Payment processed and Smart Wallet charged"
             }
         else:
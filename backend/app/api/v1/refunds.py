@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime, timedelta
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.schemas.refund import RefundRequestCreate, RefundRequestResponse
 from app.models.refund import RefundRequest, RefundStatus
 from app.models.ticket import Ticket
@@ -10,7 +11,9 @@ from app.models.event import Event
 from app.models.user import User
 from app.core.dependencies import get_current_user, get_current_organizer, get_current_admin
 from app.core.config import settings
-from app.services.web3_service import web3_service
+from app.core.pagination import paginate
+from app.services.async_web3_service import async_web3_service
+from app.services.async_aa_service import async_aa_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,7 +27,7 @@ router = APIRouter()
 async def request_refund(
     refund_create: RefundRequestCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """구매한 티켓 환불 요청"""
     # 티켓 확인 (UUID 변환)
@@ -37,7 +40,7 @@ async def request_refund(
             detail="Invalid ticket ID format"
         )
     
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_uuid).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_uuid))
     if not ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,11 +63,11 @@ async def request_refund(
         )
     
     # 이미 환불 요청이 있는지 확인
-    existing_request = (
-        db.query(RefundRequest)
-        .filter(RefundRequest.ticket_id == ticket_uuid)
-        .filter(RefundRequest.status != RefundStatus.REJECTED)
-        .first()
+    existing_request = await db.scalar(
+        select(RefundRequest)
+        .where(RefundRequest.ticket_id == ticket_uuid)
+        .where(RefundRequest.status != RefundStatus.REJECTED)
+        .limit(1)
     )
     if existing_request:
         raise HTTPException(
@@ -73,7 +76,7 @@ async def request_refund(
         )
     
     # 이벤트 확인 및 환불 가능 기간 확인
-    event = db.query(Event).filter(Event.id == ticket.event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == ticket.event_id))
     if event:
         # 환불 기한을 이벤트 날짜 1일 전까지로 변경 (테스트를 위해)
         refund_deadline = event.event_date - timedelta(days=1)
@@ -92,30 +95,28 @@ async def request_refund(
         refund_amount_wei=event.price_wei if event else None
     )
     db.add(db_refund)
-    db.commit()
-    db.refresh(db_refund)
+    await db.commit()
+    await db.refresh(db_refund)
     
     # 온체인에 환불 요청
     # Smart Wallet을 사용하는 경우 UserOperation으로 처리
     if ticket.token_id is not None and event.event_id_onchain is not None:
         try:
-            from app.services.aa_service import aa_service
-            from app.services.web3_service import web3_service
             from web3 import Web3
             
             # Smart Wallet 사용 시 UserOperation으로 환불 요청
             if current_user.smart_wallet_address:
                 # RefundManager의 requestRefund 함수 호출 데이터 인코딩
-                refund_manager = web3_service._get_contract(settings.REFUND_MANAGER_ADDRESS, "RefundManager")
+                refund_manager = async_web3_service._get_contract(settings.REFUND_MANAGER_ADDRESS, "RefundManager")
                 function = refund_manager.functions.requestRefund(ticket.token_id)
                 
                 # 함수 호출 데이터 인코딩
                 try:
-                    gas_price = web3_service.w3.eth.gas_price
-                    tx_dict = function.build_transaction({
+                    gas_price = await async_web3_service.w3.eth.gas_price
+                    tx_dict = await function.build_transaction({
                         'from': current_user.smart_wallet_address,
                         'gas': 200000,
-                        'gasPrice': gas_price if gas_price else web3_service.w3.to_wei(20, 'gwei')
+                        'gasPrice': gas_price if gas_price else async_web3_service.w3.to_wei(20, 'gwei')
                     })
                     call_data = tx_dict['data']
                 except Exception as e:
@@ -135,7 +136,7 @@ async def request_refund(
                 else:
                     call_data_bytes = call_data
                 
-                user_operation = aa_service.create_user_operation(
+                user_operation = await async_aa_service.create_user_operation(
                     sender=current_user.smart_wallet_address,
                     target=settings.REFUND_MANAGER_ADDRESS,
                     data=call_data_bytes,
@@ -143,7 +144,7 @@ async def request_refund(
                 )
                 
                 # Paymaster 데이터 가져오기 (환불 요청은 스폰서)
-                paymaster_data = aa_service.get_paymaster_sponsor_data(
+                paymaster_data = await async_aa_service.get_paymaster_sponsor_data(
                     user_operation,
                     target=settings.REFUND_MANAGER_ADDRESS
                 )
@@ -153,8 +154,8 @@ async def request_refund(
                 import os
                 private_key = os.getenv("PRIVATE_KEY", settings.PRIVATE_KEY)
                 if private_key:
-                    signed_user_op = aa_service.sign_user_operation(user_operation, private_key)
-                    op_hash = aa_service.send_user_operation(signed_user_op)
+                    signed_user_op = await async_aa_service.sign_user_operation(user_operation, private_key)
+                    op_hash = await async_aa_service.send_user_operation(signed_user_op)
                     logger.info(f"Refund request UserOperation sent: {op_hash}")
             else:
                 # 일반 지갑 사용 시 직접 호출 (실제로는 프론트엔드에서 처리해야 함)
@@ -179,18 +180,20 @@ async def request_refund(
 
 @router.get("", response_model=List[RefundRequestResponse])
 async def get_refunds(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """환불 요청 목록 조회"""
     # 관리자나 주최자는 모든 요청 조회, 일반 사용자는 자신의 요청만
-    query = db.query(RefundRequest)
+    query = select(RefundRequest)
     if current_user.role == "buyer":
-        query = query.filter(RefundRequest.user_id == current_user.id)
+        query = query.where(RefundRequest.user_id == current_user.id)
     
-    refunds = query.order_by(RefundRequest.created_at.desc()).offset(skip).limit(limit).all()
+    refunds = await paginate(db, query, (RefundRequest.created_at, RefundRequest.id), cursor, limit, response, skip=skip)
     return refunds
 
 
@@ -198,7 +201,7 @@ async def get_refunds(
 async def get_refund(
     refund_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """환불 요청 상세 조회"""
     # UUID 변환
@@ -211,7 +214,7 @@ async def get_refund(
             detail="Invalid refund ID format"
         )
     
-    refund = db.query(RefundRequest).filter(RefundRequest.id == refund_uuid).first()
+    refund = await db.scalar(select(RefundRequest).where(RefundRequest.id == refund_uuid))
     if not refund:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -244,7 +247,7 @@ async def get_refund(
 async def approve_refund(
     refund_id: str,
     current_user: User = Depends(get_current_organizer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """환불 승인"""
     # UUID 변환
@@ -257,7 +260,7 @@ async def approve_refund(
             detail="Invalid refund ID format"
         )
     
-    refund = db.query(RefundRequest).filter(RefundRequest.id == refund_uuid).first()
+    refund = await db.scalar(select(RefundRequest).where(RefundRequest.id == refund_uuid))
     if not refund:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -271,9 +274,9 @@ async def approve_refund(
         )
     
     # 이벤트 확인 (주최자 권한)
-    ticket = db.query(Ticket).filter(Ticket.id == refund.ticket_id).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == refund.ticket_id))
     if ticket:
-        event = db.query(Event).filter(Event.id == ticket.event_id).first()
+        event = await db.scalar(select(Event).where(Event.id == ticket.event_id))
         if event and event.organizer_id != current_user.id and current_user.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -286,7 +289,7 @@ async def approve_refund(
         try:
             # 주최자 또는 관리자가 환불 처리
             # RefundManager의 processRefund 함수 호출
-            refund_tx_hash = web3_service.process_refund(
+            refund_tx_hash = await async_web3_service.process_refund(
                 refund_manager_address=settings.REFUND_MANAGER_ADDRESS,
                 ticket_nft_address=settings.TICKET_NFT_ADDRESS,
                 token_id=ticket.token_id
@@ -309,8 +312,8 @@ async def approve_refund(
     if ticket:
         ticket.status = TicketStatus.REFUNDED
     
-    db.commit()
-    db.refresh(refund)
+    await db.commit()
+    await db.refresh(refund)
     
     # UUID를 문자열로 변환하여 반환
     from app.schemas.refund import RefundRequestResponse
@@ -331,7 +334,7 @@ async def approve_refund(
 async def reject_refund(
     refund_id: str,
     current_user: User = Depends(get_current_organizer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """환불 거부"""
     # UUID 변환
@@ -344,7 +347,7 @@ async def reject_refund(
             detail="Invalid refund ID format"
         )
     
-    refund = db.query(RefundRequest).filter(RefundRequest.id == refund_uuid).first()
+    refund = await db.scalar(select(RefundRequest).where(RefundRequest.id == refund_uuid))
     if not refund:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -360,8 +363,8 @@ async def reject_refund(
     refund.status = RefundStatus.REJECTED
     refund.processed_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(refund)
+    await db.commit()
+    await db.refresh(refund)
     
     # UUID를 문자열로 변환하여 반환
     from app.schemas.refund import RefundRequestResponse
@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.database import get_async_db
 from app.schemas.resale import ResaleCreate, ResaleResponse
 from app.models.resale import Resale, ResaleStatus
 from app.models.ticket import Ticket
 from app.models.event import Event
 from app.models.user import User
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
 from app.core.config import settings
-from app.services.web3_service import web3_service
+from app.core.pagination import paginate
+from app.services.async_web3_service import async_web3_service
+from app.services.async_aa_service import async_aa_service
 from datetime import datetime
 import logging
 import uuid
@@ -21,20 +24,16 @@ router = APIRouter()
 
 @router.get("", response_model=List[ResaleResponse])
 async def get_resales(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """재판매 목록 조회"""
     try:
-        resales = (
-            db.query(Resale)
-            .filter(Resale.status == ResaleStatus.LISTED)
-            .order_by(Resale.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = select(Resale).where(Resale.status == ResaleStatus.LISTED)
+        resales = await paginate(db, query, (Resale.created_at, Resale.id), cursor, limit, response, skip=skip)
         # UUID를 문자열로 변환하여 반환
         return [
             ResaleResponse(
@@ -49,6 +48,8 @@ async def get_resales(
                 sale_tx_hash=resale.sale_tx_hash,
             ) for resale in resales
         ]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get resales: {e}", exc_info=True)
         raise HTTPException(
@@ -58,7 +59,7 @@ async def get_resales(
 
 
 @router.get("/{resale_id}", response_model=ResaleResponse)
-async def get_resale(resale_id: str, db: Session = Depends(get_db)):
+async def get_resale(resale_id: str, db: AsyncSession = Depends(get_read_db)):
     """재판매 상세 조회"""
     # UUID 변환
     import uuid
@@ -70,7 +71,7 @@ async def get_resale(resale_id: str, db: Session = Depends(get_db)):
             detail="Invalid resale ID format"
         )
     
-    resale = db.query(Resale).filter(Resale.id == resale_uuid).first()
+    resale = await db.scalar(select(Resale).where(Resale.id == resale_uuid))
     if not resale:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -96,7 +97,7 @@ async def get_resale(resale_id: str, db: Session = Depends(get_db)):
 async def create_resale(
     resale_create: ResaleCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """구매한 티켓을 재판매 마켓플레이스에 등록"""
     # 티켓 확인 (UUID 변환)
@@ -109,7 +110,7 @@ async def create_resale(
             detail="Invalid ticket ID format"
         )
     
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_uuid).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_uuid))
     if not ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,12 +132,19 @@ async def create_resale(
             detail="Cannot resale a refunded ticket"
         )
     
+    # 온체인 구매 확인 전(tokenId 미확정) 티켓은 재판매 불가
+    if ticket.token_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ticket purchase is not confirmed yet"
+        )
+    
     # 이미 등록된 재판매 확인
-    existing_resale = (
-        db.query(Resale)
-        .filter(Resale.ticket_id == ticket_uuid)
-        .filter(Resale.status == ResaleStatus.LISTED)
-        .first()
+    existing_resale = await db.scalar(
+        select(Resale)
+        .where(Resale.ticket_id == ticket_uuid)
+        .where(Resale.status == ResaleStatus.LISTED)
+        .limit(1)
     )
     if existing_resale:
         raise HTTPException(
@@ -145,7 +153,7 @@ async def create_resale(
         )
     
     # 가격 상한선 확인
-    event = db.query(Event).filter(Event.id == ticket.event_id).first()
+    event = await db.scalar(select(Event).where(Event.id == ticket.event_id))
     if event:
         max_price = (event.price_wei * 20000) // 10000  # 200%
         if resale_create.price_wei > max_price:
@@ -160,19 +168,18 @@ async def create_resale(
         try:
             # Smart Wallet 사용 시 UserOperation으로 재판매 등록
             if current_user.smart_wallet_address:
-                from app.services.aa_service import aa_service
                 from web3 import Web3
                 
                 # 1. TicketNFT에서 마켓플레이스에 approve (UserOperation)
-                ticket_nft = web3_service._get_contract(settings.TICKET_NFT_ADDRESS, "TicketNFT")
+                ticket_nft = async_web3_service._get_contract(settings.TICKET_NFT_ADDRESS, "TicketNFT")
                 approve_function = ticket_nft.functions.approve(settings.MARKETPLACE_ADDRESS, ticket.token_id)
                 
                 try:
-                    gas_price = web3_service.w3.eth.gas_price
-                    tx_dict = approve_function.build_transaction({
+                    gas_price = await async_web3_service.w3.eth.gas_price
+                    tx_dict = await approve_function.build_transaction({
                         'from': current_user.smart_wallet_address,
                         'gas': 100000,
-                        'gasPrice': gas_price if gas_price else web3_service.w3.to_wei(20, 'gwei')
+                        'gasPrice': gas_price if gas_price else async_web3_service.w3.to_wei(20, 'gwei')
                     })
                     approve_data = tx_dict['data']
                 except Exception as e:
@@ -189,7 +196,7 @@ async def create_resale(
                     approve_data_bytes = approve_data
                 
                 # Approve UserOperation 생성 및 전송
-                approve_op = aa_service.create_user_operation(
+                approve_op = await async_aa_service.create_user_operation(
                     sender=current_user.smart_wallet_address,
                     target=settings.TICKET_NFT_ADDRESS,
                     data=approve_data_bytes,
@@ -199,20 +206,20 @@ async def create_resale(
                 import os
                 private_key = os.getenv("PRIVATE_KEY", settings.PRIVATE_KEY)
                 if private_key:
-                    signed_approve_op = aa_service.sign_user_operation(approve_op, private_key)
-                    aa_service.send_user_operation(signed_approve_op)
+                    signed_approve_op = await async_aa_service.sign_user_operation(approve_op, private_key)
+                    await async_aa_service.send_user_operation(signed_approve_op)
                     logger.info("Ticket approved for marketplace via UserOperation")
                 
                 # 2. TicketMarketplace에 재판매 등록 (UserOperation)
-                marketplace = web3_service._get_contract(settings.MARKETPLACE_ADDRESS, "TicketMarketplace")
+                marketplace = async_web3_service._get_contract(settings.MARKETPLACE_ADDRESS, "TicketMarketplace")
                 list_function = marketplace.functions.listTicketForResale(ticket.token_id, resale_create.price_wei)
                 
                 try:
-                    gas_price = web3_service.w3.eth.gas_price
-                    tx_dict = list_function.build_transaction({
+                    gas_price = await async_web3_service.w3.eth.gas_price
+                    tx_dict = await list_function.build_transaction({
                         'from': current_user.smart_wallet_address,
                         'gas': 200000,
-                        'gasPrice': gas_price if gas_price else web3_service.w3.to_wei(20, 'gwei')
+                        'gasPrice': gas_price if gas_price else async_web3_service.w3.to_wei(20, 'gwei')
                     })
                     list_data = tx_dict['data']
                 except Exception as e:
@@ -229,7 +236,7 @@ async def create_resale(
                     list_data_bytes = list_data
                 
                 # List UserOperation 생성 및 전송
-                list_op = aa_service.create_user_operation(
+                list_op = await async_aa_service.create_user_operation(
                     sender=current_user.smart_wallet_address,
                     target=settings.MARKETPLACE_ADDRESS,
                     data=list_data_bytes,
@@ -240,12 +247,12 @@ async def create_resale(
                 list_op["paymasterAndData"] = b""
                 
                 if private_key:
-                    signed_list_op = aa_service.sign_user_operation(list_op, private_key)
-                    aa_service.send_user_operation(signed_list_op)
+                    signed_list_op = await async_aa_service.sign_user_operation(list_op, private_key)
+                    await async_aa_service.send_user_operation(signed_list_op)
                     logger.info("Ticket listed for resale via UserOperation")
             else:
                 # 일반 지갑 사용 시 직접 호출
-                web3_service.list_ticket_for_resale(
+                await async_web3_service.list_ticket_for_resale(
                     marketplace_address=settings.MARKETPLACE_ADDRESS,
                     ticket_nft_address=settings.TICKET_NFT_ADDRESS,
                     token_id=ticket.token_id,
@@ -268,8 +275,8 @@ async def create_resale(
         status=ResaleStatus.LISTED
     )
     db.add(db_resale)
-    db.commit()
-    db.refresh(db_resale)
+    await db.commit()
+    await db.refresh(db_resale)
     
     # UUID를 문자열로 변환하여 반환
     from app.schemas.resale import ResaleResponse
@@ -289,7 +296,7 @@ async def create_resale(
 async def buy_resale(
     resale_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """재판매 티켓 구매"""
     # UUID 변환
@@ -302,7 +309,7 @@ async def buy_resale(
             detail="Invalid resale ID format"
         )
     
-    resale = db.query(Resale).filter(Resale.id == resale_uuid).first()
+    resale = await db.scalar(select(Resale).where(Resale.id == resale_uuid))
     if not resale:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -325,7 +332,7 @@ async def buy_resale(
     # 온체인에서 구매
     if resale.token_id is not None:
         try:
-            web3_service.buy_resale_ticket(
+            await async_web3_service.buy_resale_ticket(
                 marketplace_address=settings.MARKETPLACE_ADDRESS,
                 token_id=resale.token_id,
                 value=resale.price_wei,
@@ -343,14 +350,14 @@ async def buy_resale(
     resale.sold_at = datetime.utcnow()
     
     # 티켓 소유자 변경
-    ticket = db.query(Ticket).filter(Ticket.id == resale.ticket_id).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == resale.ticket_id))
     if ticket:
         buyer_address = current_user.smart_wallet_address or current_user.wallet_address
         ticket.owner_address = buyer_address
         ticket.status = "active"  # 재판매 구매 후 활성 상태
     
-    db.commit()
-    db.refresh(resale)
+    await db.commit()
+    await db.refresh(resale)
     
     # UUID를 문자열로 변환하여 반환
     from app.schemas.resale import ResaleResponse
@@ -371,10 +378,10 @@ async def buy_resale(
 async def cancel_resale(
     resale_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """재판매 등록 취소"""
-    resale = db.query(Resale).filter(Resale.id == resale_id).first()
+    resale = await db.scalar(select(Resale).where(Resale.id == resale_id))
     if not resale:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -388,5 +395,5 @@ async def cancel_resale(
         )
     
     resale.status = ResaleStatus.CANCELLED
-    db.commit()
+    await db.commit()
     return None
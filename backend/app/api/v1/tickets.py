@@ -1,17 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime
-from app.db.database import get_db
-from app.schemas.ticket import TicketResponse, TicketPurchase
+from app.db.database import get_async_db
+from app.schemas.ticket import TicketResponse, TicketListItem, TicketPurchase, PurchaseJobResponse
 from app.models.ticket import Ticket, TicketStatus
 from app.models.event import Event, EventStatus
 from app.models.user import User
-from app.core.dependencies import get_current_user
+from app.models.purchase_job import PurchaseJob
+from app.core.dependencies import get_current_user, get_read_db
 from app.core.config import settings
-from app.services.web3_service import web3_service
+from app.core.pagination import paginate
 from app.services.ipfs_service import ipfs_service
+from app.services.async_ipfs_service import async_ipfs_service
+from app.services.purchase_service import (
+    InsufficientBalanceError,
+    confirm_purchase,
+    submit_purchase,
+)
+from app.services.ticket_metadata import ticket_metadata
+from app.services.purchase_queue import (
+    DuplicatePurchaseError,
+    IdempotencyKeyConflictError,
+    SoldOutError,
+    purchase_queue,
+)
+from app.services.inventory_service import inventory_service
+from app.services.tx_tracker import tx_tracker
+from app.models.transaction import TransactionType
+from starlette.concurrency import run_in_threadpool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,62 +39,74 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("", response_model=List[TicketResponse])
+@router.get("", response_model=List[TicketListItem])
 async def get_tickets(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값 (지정 시 skip 무시)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """내 티켓 목록 조회"""
+    """
+    내 티켓 목록 조회 (최신순, 커서 페이지네이션)
+    
+    티켓 컬럼과 이벤트 이름/일시/상태만 한 번의 조인 쿼리로 조회
+    """
     # Smart Wallet 주소로 필터링 (UserOperation 사용 시)
     owner_address = current_user.smart_wallet_address or current_user.wallet_address
     if not owner_address:
         return []
     
-    tickets = (
-        db.query(Ticket)
+    query = (
+        select(
+            Ticket.id,
+            Ticket.token_id,
+            Ticket.event_id,
+            Ticket.owner_address,
+            Ticket.ipfs_hash,
+            Ticket.status,
+            Ticket.purchase_price_wei,
+            Ticket.purchase_tx_hash,
+            Ticket.created_at,
+            Ticket.updated_at,
+            Event.name.label("event_name"),
+            Event.event_date.label("event_date"),
+            Event.status.label("event_status"),
+        )
         .join(Event, Ticket.event_id == Event.id)
-        .filter(Ticket.owner_address == owner_address)
-        .order_by(Ticket.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+        .where(Ticket.owner_address == owner_address)
     )
-    # UUID를 문자열로 변환하여 반환 (이벤트 정보 포함)
-    from app.schemas.ticket import TicketResponse
-    result = []
-    for ticket in tickets:
-        event = db.query(Event).filter(Event.id == ticket.event_id).first()
-        ticket_dict = {
-            "id": str(ticket.id),
-            "token_id": ticket.token_id,
-            "event_id": str(ticket.event_id),
-            "owner_address": ticket.owner_address,
-            "ipfs_hash": ticket.ipfs_hash,
-            "status": ticket.status,
-            "purchase_price_wei": ticket.purchase_price_wei,
-            "purchase_tx_hash": ticket.purchase_tx_hash,
-            "created_at": ticket.created_at,
-            "updated_at": ticket.updated_at,
-        }
-        # 이벤트 정보 추가
-        if event:
-            ticket_dict["event_name"] = event.name
-            ticket_dict["event_date"] = event.event_date
-            ticket_dict["event_status"] = event.status
-        result.append(ticket_dict)
-    return result
+    rows = await paginate(db, query, (Ticket.created_at, Ticket.id), cursor, limit, response, skip=skip)
+    
+    return [
+        TicketListItem(
+            id=str(row.id),
+            token_id=row.token_id,
+            event_id=str(row.event_id),
+            owner_address=row.owner_address,
+            ipfs_hash=row.ipfs_hash,
+            status=row.status,
+            purchase_price_wei=row.purchase_price_wei,
+            purchase_tx_hash=row.purchase_tx_hash,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            event_name=row.event_name,
+            event_date=row.event_date,
+            event_status=row.event_status,
+        )
+        for row in rows
+    ]
 
 
 @router.get("/{ticket_id}", response_model=TicketResponse)
 async def get_ticket(
     ticket_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """티켓 상세 조회"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
     if not ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,10 +140,16 @@ async def get_ticket(
 @router.post("/purchase", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 async def purchase_ticket(
     purchase: TicketPurchase,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=128),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """티켓 구매"""
+    """
+    티켓 구매
+    
+    PURCHASE_MODE=queue이면 재고 예약 후 구매 작업만 등록하고 202와 작업 정보를 반환
+    (같은 Idempotency-Key로 재요청하면 기존 작업을 그대로 반환)
+    """
     # 이벤트 확인 (UUID 변환)
     import uuid
     try:
@@ -122,7 +160,19 @@ async def purchase_ticket(
             detail="Invalid event ID format"
         )
     
-    event = db.query(Event).filter(Event.id == event_uuid).first()
+    use_queue = settings.PURCHASE_MODE == "queue"
+    if use_queue and idempotency_key:
+        # 재시도 요청은 검증보다 먼저 기존 작업 확인 (이미 구매 완료된 경우에도 같은 응답)
+        existing_job = await db.run_sync(purchase_queue.find_job, current_user.id, idempotency_key)
+        if existing_job is not None:
+            if existing_job.event_id != event_uuid:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Idempotency-Key already used for a different request"
+                )
+            return _purchase_job_accepted(existing_job)
+    
+    event = await db.scalar(select(Event).where(Event.id == event_uuid))
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -130,10 +180,10 @@ async def purchase_ticket(
         )
     
     # 이벤트 상태 확인
-    if event.status != EventStatus.APPROVED:
+    if event.status not in (EventStatus.APPROVED, EventStatus.ACTIVE):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Event is not approved"
+            detail="Event is not on sale"
         )
     
     # 판매 기간 확인
@@ -144,7 +194,7 @@ async def purchase_ticket(
             detail="Not in sale period"
         )
     
-    # 티켓 수량 확인
+    # 티켓 수량 확인 (빠른 매진 응답용, 실제 재고는 예약 시 원자적으로 확인)
     if event.sold_tickets >= event.max_tickets:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -160,12 +210,12 @@ async def purchase_ticket(
     
     # 중복 구매 방지: 같은 이벤트에 대해 이미 구매한 티켓이 있는지 확인
     owner_address = current_user.smart_wallet_address or current_user.wallet_address
-    existing_ticket = (
-        db.query(Ticket)
-        .filter(Ticket.event_id == event_uuid)
-        .filter(Ticket.owner_address == owner_address)
-        .filter(Ticket.status == TicketStatus.ACTIVE)
-        .first()
+    existing_ticket = await db.scalar(
+        select(Ticket)
+        .where(Ticket.event_id == event_uuid)
+        .where(Ticket.owner_address == owner_address)
+        .where(Ticket.status == TicketStatus.ACTIVE)
+        .limit(1)
     )
     if existing_ticket:
         raise HTTPException(
@@ -173,282 +223,102 @@ async def purchase_ticket(
             detail="You have already purchased a ticket for this event"
         )
     
-    # 티켓 메타데이터 생성 및 IPFS 업로드
-    token_uri = purchase.token_uri
-    if not token_uri:
-        metadata = {
-            "name": f"Ticket for {event.name}",
-            "description": f"Ticket for event: {event.name}",
-            "image": event.ipfs_hash or "",  # 이벤트 이미지가 있다면
-            "attributes": [
-                {"trait_type": "Event", "value": event.name},
-                {"trait_type": "Event Date", "value": event.event_date.isoformat()},
-                {"trait_type": "Price", "value": str(event.price_wei)},
-            ],
-            "event_id": str(event.id),
-            "event_name": event.name,
-        }
-        
-        # Pinata 메타데이터 추가
-        pinata_metadata = {
-            "name": f"Ticket-{event.name}",
-            "keyvalues": {
-                "event_id": str(event.id),
-                "event_name": event.name,
-            }
-        }
-        
-        ipfs_hash = ipfs_service.upload_json(metadata, pinata_metadata)
-        if not ipfs_hash:
+    # 작업 큐 모드: 재고 예약 + 작업 등록만 하고 나머지는 워커가 처리
+    if use_queue:
+        # 이벤트 티켓 문서 URI (처음 보는 문서면 고정 대기열 커밋/캐시 쓰기가 있어 스레드에서)
+        # 좌석 번호별 디렉터리가 있으면 예약 번호로 정하므로 생략
+        default_token_uri = None
+        if not purchase.token_uri and not ticket_metadata.has_directory(event):
+            default_token_uri = await run_in_threadpool(ticket_metadata.token_uri, event)
+        try:
+            job, _ = await db.run_sync(
+                lambda session: purchase_queue.enqueue(
+                    session,
+                    current_user,
+                    event,
+                    token_uri=purchase.token_uri,
+                    idempotency_key=idempotency_key,
+                    default_token_uri=default_token_uri
+                )
+            )
+        except SoldOutError:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to upload ticket metadata to IPFS"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Tickets sold out"
             )
-        token_uri = f"ipfs://{ipfs_hash}"
-    else:
+        except DuplicatePurchaseError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A purchase for this event is already in progress"
+            )
+        except IdempotencyKeyConflictError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Idempotency-Key already used for a different request"
+            )
+        return _purchase_job_accepted(job)
+    
+    # 재고 예약 (조건부 UPDATE, 바로 커밋해서 온체인 처리 동안 샤드 행 잠금을 쥐지 않음)
+    hold = await db.run_sync(lambda session: inventory_service.reserve(session, event, user_id=current_user.id))
+    if hold is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tickets sold out"
+        )
+    hold_id = hold.id
+    hold_serial = hold.serial
+    await db.commit()
+    
+    try:
+        # 티켓 문서 URI (미리 고정한 좌석 번호별 문서, 없으면 이벤트 문서 - CID 로컬 계산, Pinata 업로드는 백그라운드)
+        token_uri = purchase.token_uri or await run_in_threadpool(ticket_metadata.token_uri, event, hold_serial)
         ipfs_hash = token_uri.replace("ipfs://", "")
     
-    # 온체인에서 티켓 구매 (UserOperation 사용)
-    tx_hash = None
-    token_id = None
-    if event.event_id_onchain is not None:
-        try:
-            # Smart Wallet 주소 확인
-            if not current_user.smart_wallet_address:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Smart wallet not created. Please create smart wallet first."
-                )
-            
-            # UserOperation을 사용한 티켓 구매
-            from app.services.aa_service import aa_service
-            from web3 import Web3
-            
-            # EventManager 컨트랙트에서 purchaseTicket 함수 호출 데이터 인코딩
-            contract = web3_service._get_contract(settings.EVENT_MANAGER_ADDRESS, "EventManager")
-            
-            # purchaseTicket(eventId, tokenURI) 함수 호출 데이터 인코딩
-            function = contract.functions.purchaseTicket(event.event_id_onchain, token_uri)
-            
-            # 함수 호출 데이터 인코딩 (web3.py v6)
+        # 온체인에서 티켓 구매 (UserOperation 사용)
+        tx_hash = None
+        token_id = None
+        track_confirmation = settings.TX_CONFIRMATION_MODE == "track"
+        if event.event_id_onchain is not None:
             try:
-                # web3.py v6: build_transaction을 사용하여 데이터 추출
-                gas_price = web3_service.w3.eth.gas_price
-                tx_dict = function.build_transaction({
-                    'from': current_user.smart_wallet_address,
-                    'value': event.price_wei,
-                    'gas': 500000,
-                    'gasPrice': gas_price if gas_price else web3_service.w3.to_wei(20, 'gwei')
-                })
-                call_data = tx_dict['data']
-                logger.info(f"Function call data encoded: {call_data[:20]}...")
-            except Exception as e:
-                logger.error(f"Failed to encode function call with build_transaction: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                # 대체 방법: 직접 ABI 인코딩
-                from eth_abi import encode as abi_encode
-                from eth_utils import keccak, to_hex
-                # 함수 시그니처 해시 (purchaseTicket(uint256,string))
-                fn_signature = keccak(b"purchaseTicket(uint256,string)")[:4]
-                # 인자 인코딩
-                encoded_args = abi_encode(['uint256', 'string'], [event.event_id_onchain, token_uri])
-                call_data_hex = to_hex(fn_signature + encoded_args)
-                call_data = call_data_hex
-                logger.info(f"Function call data encoded (fallback): {call_data[:20]}...")
-            
-            # Smart Wallet 잔액 확인 (실제 서비스: 사용자가 충전해야 함)
-            smart_wallet_balance = web3_service.w3.eth.get_balance(
-                Web3.to_checksum_address(current_user.smart_wallet_address)
-            )
-            logger.info(f"Smart Wallet balance: {smart_wallet_balance} wei ({web3_service.w3.from_wei(smart_wallet_balance, 'ether')} ETH)")
+                # UserOperation 전송 (track 모드에서는 영수증을 기다리지 않음)
+                op_hash = await submit_purchase(
+                    event,
+                    current_user.smart_wallet_address,
+                    token_uri,
+                    wait=not track_confirmation
+                )
             
-            # 잔액 부족 시 에러 반환 (카드 결제 필요)
-            if smart_wallet_balance < event.price_wei:
+                # op_hash는 Bundler 경유면 UserOperation 해시, 직접 전송이면 트랜잭션 해시
+                if track_confirmation:
+                    # tokenId는 tx_tracker가 확인 시 로그에서 채움
+                    tx_hash = op_hash
+                    logger.info(f"Ticket purchase submitted, pending confirmation: tx={tx_hash}")
+                else:
+                    # 추측값을 쓰지 않고 tokenId를 못 찾으면 NULL로 저장 (tx_tracker/인덱서가 채움)
+                    tx_hash, token_id = await confirm_purchase(
+                        op_hash,
+                        event.event_id_onchain,
+                        current_user.smart_wallet_address
+                    )
+            except InsufficientBalanceError as e:
                 raise HTTPException(
                     status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                    detail={
-                        "error": "Insufficient balance",
-                        "required": str(event.price_wei),
-                        "current": str(smart_wallet_balance),
-                        "smart_wallet_address": current_user.smart_wallet_address,
-                        "message": "Smart Wallet에 충분한 자금이 없습니다. 카드 결제를 진행해주세요.",
-                        "payment_required": True
-                    }
+                    detail=e.to_detail()
                 )
-            
-            # UserOperation 생성
-            # call_data가 이미 bytes인지 확인
-            if isinstance(call_data, str):
-                call_data_bytes = bytes.fromhex(call_data.replace("0x", ""))
-            else:
-                call_data_bytes = call_data
-            
-            user_operation = aa_service.create_user_operation(
-                sender=current_user.smart_wallet_address,
-                target=settings.EVENT_MANAGER_ADDRESS,
-                data=call_data_bytes,
-                value=event.price_wei
-            )
-            
-            # Paymaster 데이터 가져오기 (티켓 구매는 스폰서)
-            paymaster_data = aa_service.get_paymaster_sponsor_data(
-                user_operation,
-                target=settings.EVENT_MANAGER_ADDRESS
-            )
-            user_operation["paymasterAndData"] = paymaster_data
-            
-            # UserOperation 서명 (서비스 계정의 private key 사용 - 테스트용)
-            import os
-            private_key = os.getenv("PRIVATE_KEY", settings.PRIVATE_KEY)
-            if not private_key:
+            except Exception as e:
+                logger.error(f"Failed to purchase ticket with UserOperation: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Private key not configured"
+                    detail=f"Failed to purchase ticket onchain: {str(e)}"
                 )
-            
-            signed_user_op = aa_service.sign_user_operation(user_operation, private_key)
-            
-            # UserOperation 전송
-            op_hash = aa_service.send_user_operation(signed_user_op)
-            logger.info(f"UserOperation sent, op_hash: {op_hash}, type: {type(op_hash)}")
-            
-            # 트랜잭션 영수증 대기 및 tokenId 추출
-            # EntryPoint에서 직접 전송한 경우 트랜잭션 해시를 사용
-            # op_hash가 문자열인지 확인하고, 트랜잭션 해시 형식인지 확인
-            op_hash_str = str(op_hash) if not isinstance(op_hash, str) else op_hash
-            if op_hash_str.startswith("0x") and len(op_hash_str) == 66:
-                # 트랜잭션 해시인 경우
-                try:
-                    receipt = web3_service.w3.eth.wait_for_transaction_receipt(op_hash_str, timeout=120)
-                    tx_hash = op_hash_str
-                    
-                    if receipt.status != 1:
-                        raise HTTPException(
-                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail=f"Transaction failed: {tx_hash}"
-                        )
-                    
-                    # TicketSold 이벤트에서 tokenId 추출
-                    # EventManager 컨트랙트 주소에서 발생한 이벤트만 확인
-                    event_manager_address_checksum = Web3.to_checksum_address(settings.EVENT_MANAGER_ADDRESS)
-                    ticket_sold = contract.events.TicketSold()
-                    
-                    logger.info(f"Checking {len(receipt.logs)} logs for TicketSold event from EventManager at {event_manager_address_checksum}...")
-                    for log in receipt.logs:
-                        try:
-                            # EventManager 컨트랙트에서 발생한 로그만 확인
-                            log_address = log.get('address') if isinstance(log, dict) else log.address
-                            if str(log_address).lower() == event_manager_address_checksum.lower():
-                                decoded = ticket_sold.process_log(log)
-                                if decoded.args.eventId == event.event_id_onchain:
-                                    token_id = decoded.args.tokenId
-                                    logger.info(f"Ticket purchased via UserOperation: tokenId={token_id}, tx={tx_hash}")
-                                    break
-                        except Exception as e:
-                            logger.debug(f"Failed to process log (address: {log.get('address', 'unknown') if isinstance(log, dict) else log.address}): {e}")
-                            continue
-                    
-                    # token_id를 찾지 못한 경우, TicketNFT에서 직접 조회 시도
-                    if token_id is None:
-                        logger.warning(f"Token ID not found in logs, trying to query from TicketNFT...")
-                        try:
-                            # TicketNFT 컨트랙트에서 최근 mint된 token 조회
-                            ticket_nft = web3_service._get_contract(settings.TICKET_NFT_ADDRESS, "TicketNFT")
-                            # 현재 사용자의 Smart Wallet 주소로 최근 mint된 token 찾기
-                            # (간단한 방법: totalSupply를 사용하여 최신 token ID 추정)
-                            total_supply = ticket_nft.functions.totalSupply().call()
-                            logger.info(f"TicketNFT totalSupply: {total_supply}")
-                            if total_supply > 0:
-                                # 최근 mint된 token들 확인 (최대 10개)
-                                for i in range(min(10, total_supply)):
-                                    check_token_id = total_supply - 1 - i
-                                    try:
-                                        owner = ticket_nft.functions.ownerOf(check_token_id).call()
-                                        token_to_event = ticket_nft.functions.tokenToEvent(check_token_id).call()
-                                        logger.info(f"Token {check_token_id}: owner={owner}, eventId={token_to_event}")
-                                        if (owner.lower() == current_user.smart_wallet_address.lower() and 
-                                            token_to_event == event.event_id_onchain):
-                                            token_id = check_token_id
-                                            logger.info(f"Found token ID from TicketNFT: {token_id}")
-                                            break
-                                    except Exception as e:
-                                        logger.debug(f"Failed to check token {check_token_id}: {e}")
-                                        continue
-                        except Exception as e:
-                            logger.error(f"Failed to query token ID from TicketNFT: {e}")
-                            import traceback
-                            logger.error(traceback.format_exc())
-                    
-                    if token_id is None:
-                        # token_id를 찾지 못했지만 트랜잭션은 성공한 경우
-                        # 임시로 unique하지 않은 값 사용 (나중에 수동 업데이트)
-                        logger.error(f"Failed to extract token ID from transaction: {tx_hash}")
-                        logger.error(f"Transaction receipt: status={receipt.status}, logs={len(receipt.logs)}")
-                        # DB에서 가장 큰 token_id를 찾아서 +1 사용 (임시 해결책)
-                        max_token = db.query(func.max(Ticket.token_id)).scalar()
-                        if max_token is not None:
-                            token_id = max_token + 1
-                            logger.warning(f"Using temporary token_id: {token_id} (will need manual update)")
-                        else:
-                            token_id = 1
-                            logger.warning(f"Using temporary token_id: {token_id} (will need manual update)")
-                except Exception as e:
-                    logger.error(f"Failed to get transaction receipt: {e}")
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Failed to get transaction receipt: {str(e)}"
-                    )
-            else:
-                # UserOperation 해시인 경우 (Bundler 사용) 또는 형식이 다른 경우
-                logger.warning(f"op_hash format unexpected: {op_hash_str}, trying TicketNFT query...")
-                tx_hash = op_hash_str
-                
-                # TicketNFT에서 직접 조회 시도
-                try:
-                    ticket_nft = web3_service._get_contract(settings.TICKET_NFT_ADDRESS, "TicketNFT")
-                    total_supply = ticket_nft.functions.totalSupply().call()
-                    logger.info(f"TicketNFT totalSupply: {total_supply}")
-                    if total_supply > 0:
-                        # 최근 mint된 token들 확인 (최대 10개)
-                        for i in range(min(10, total_supply)):
-                            check_token_id = total_supply - 1 - i
-                            try:
-                                owner = ticket_nft.functions.ownerOf(check_token_id).call()
-                                token_to_event = ticket_nft.functions.tokenToEvent(check_token_id).call()
-                                logger.info(f"Token {check_token_id}: owner={owner}, eventId={token_to_event}")
-                                if (owner.lower() == current_user.smart_wallet_address.lower() and 
-                                    token_to_event == event.event_id_onchain):
-                                    token_id = check_token_id
-                                    logger.info(f"Found token ID from TicketNFT: {token_id}")
-                                    break
-                            except Exception as e:
-                                logger.debug(f"Failed to check token {check_token_id}: {e}")
-                                continue
-                except Exception as e:
-                    logger.error(f"Failed to query token ID from TicketNFT: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                
-                # token_id를 찾지 못한 경우 fallback
-                if token_id is None:
-                    logger.error(f"Failed to extract token ID, using fallback...")
-                    max_token = db.query(func.max(Ticket.token_id)).scalar()
-                    if max_token is not None:
-                        token_id = max_token + 1
-                        logger.warning(f"Using temporary token_id: {token_id} (will need manual update)")
-                    else:
-                        token_id = 1
-                        logger.warning(f"Using temporary token_id: {token_id} (will need manual update)")
-                
-        except Exception as e:
-            logger.error(f"Failed to purchase ticket with UserOperation: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to purchase ticket onchain: {str(e)}"
-            )
+    except Exception:
+        # 구매 실패 시 예약 반환 (요청이 중간에 끊기면 만료 시간이 지난 뒤 sweeper가 반환)
+        await db.run_sync(inventory_service.release, hold_id)
+        await db.commit()
+        raise
     
     # DB에 티켓 저장 (Smart Wallet 주소 사용)
     if not current_user.smart_wallet_address:
@@ -458,7 +328,7 @@ async def purchase_ticket(
         )
     
     db_ticket = Ticket(
-        token_id=token_id or 0,  # 임시값
+        token_id=token_id,  # 확인 전이면 NULL (track 모드는 tx_tracker, 아니면 인덱서가 채움)
         event_id=event.id,
         owner_address=current_user.smart_wallet_address,  # Smart Wallet 주소 사용
         ipfs_hash=ipfs_hash,
@@ -467,11 +337,26 @@ async def purchase_ticket(
     )
     db.add(db_ticket)
     
-    # 이벤트 판매 수량 업데이트
-    event.sold_tickets += 1
+    # track 모드에서만 tx_tracker가 돌므로 기록 (wait 모드에서 tokenId를 못 찾으면 인덱서가 채움)
+    if track_confirmation and tx_hash and token_id is None:
+        await db.flush()  # ticket id 할당
+        await db.run_sync(
+            lambda session: tx_tracker.record(
+                session,
+                tx_hash,
+                TransactionType.PURCHASE,
+                user_id=current_user.id,
+                ticket_id=db_ticket.id,
+                event_id=event.id,
+                amount_wei=event.price_wei
+            )
+        )
+    
+    # 판매 확정 (events.sold_tickets는 inventory sweeper가 샤드 합계로 동기화)
+    await db.run_sync(inventory_service.confirm, hold_id)
     
-    db.commit()
-    db.refresh(db_ticket)
+    await db.commit()
+    await db.refresh(db_ticket)
     
     # UUID를 문자열로 변환하여 반환
     from app.schemas.ticket import TicketResponse
@@ -489,14 +374,62 @@ async def purchase_ticket(
     )
 
 
+def _purchase_job_response(job: PurchaseJob) -> PurchaseJobResponse:
+    return PurchaseJobResponse(
+        id=str(job.id),
+        event_id=str(job.event_id),
+        status=job.status,
+        ticket_id=str(job.ticket_id) if job.ticket_id else None,
+        token_id=job.token_id,
+        tx_hash=job.tx_hash,
+        attempts=job.attempts,
+        last_error=job.last_error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+def _purchase_job_accepted(job: PurchaseJob) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(_purchase_job_response(job)),
+        headers={"Location": f"/api/v1/tickets/purchase/jobs/{job.id}"}
+    )
+
+
+@router.get("/purchase/jobs/{job_id}", response_model=PurchaseJobResponse)
+async def get_purchase_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """구매 작업 상태 조회 (PURCHASE_MODE=queue)"""
+    import uuid
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid job ID format"
+        )
+    
+    job = await db.scalar(select(PurchaseJob).where(PurchaseJob.id == job_uuid))
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Purchase job not found"
+        )
+    return _purchase_job_response(job)
+
+
 @router.get("/{ticket_id}/metadata")
 async def get_ticket_metadata(
     ticket_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """티켓 메타데이터 조회 (IPFS에서 실제 데이터 가져오기)"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
     if not ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -514,7 +447,7 @@ async def get_ticket_metadata(
     # IPFS에서 메타데이터 조회
     metadata = None
     if ticket.ipfs_hash:
-        metadata = ipfs_service.get_json(ticket.ipfs_hash)
+        metadata = await async_ipfs_service.get_json(ticket.ipfs_hash)
     
     return {
         "ipfs_hash": ticket.ipfs_hash,
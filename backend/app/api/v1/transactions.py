@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.schemas.transaction import TransactionResponse
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.core.dependencies import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/{tx_hash}", response_model=TransactionResponse)
+async def get_transaction_status(
+    tx_hash: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """트랜잭션 확인 상태 조회 (tx_tracker가 기록)"""
+    transaction = await db.scalar(select(Transaction).where(Transaction.tx_hash == tx_hash))
+    if not transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    
+    # 본인 트랜잭션 또는 관리자만 조회 가능
+    if transaction.user_id and transaction.user_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this transaction"
+        )
+    
+    return TransactionResponse(
+        id=str(transaction.id),
+        tx_hash=transaction.tx_hash,
+        transaction_type=transaction.transaction_type,
+        status=transaction.status,
+        user_id=str(transaction.user_id) if transaction.user_id else None,
+        ticket_id=str(transaction.ticket_id) if transaction.ticket_id else None,
+        event_id=str(transaction.event_id) if transaction.event_id else None,
+        amount_wei=transaction.amount_wei,
+        gas_fee_wei=transaction.gas_fee_wei,
+        block_number=transaction.block_number,
+        created_at=transaction.created_at,
+    )
@@ -3,11 +3,11 @@ UserOperation API 엔드포인트
 Account Abstraction 트랜잭션 생성 및 전송
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.user import User
 from app.core.dependencies import get_current_user
-from app.services.aa_service import aa_service
+from app.services.async_aa_service import async_aa_service
 from typing import Optional
 import logging
 
@@ -22,7 +22,7 @@ async def create_user_operation(
     data: str,  # hex encoded bytes
     value: int = 0,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     UserOperation 생성
@@ -43,7 +43,7 @@ async def create_user_operation(
         call_data = bytes.fromhex(data.replace("0x", ""))
         
         # UserOperation 생성
-        user_operation = aa_service.create_user_operation(
+        user_operation = await async_aa_service.create_user_operation(
             sender=current_user.smart_wallet_address,
             target=target,
             data=call_data,
@@ -51,7 +51,7 @@ async def create_user_operation(
         )
         
         # Paymaster 데이터 가져오기 (가스비 스폰서)
-        paymaster_data = aa_service.get_paymaster_sponsor_data(
+        paymaster_data = await async_aa_service.get_paymaster_sponsor_data(
             user_operation,
             target=target
         )
@@ -91,7 +91,7 @@ async def send_user_operation(
     user_operation: dict,
     signature: Optional[str] = None,  # hex encoded signature (선택적, 백엔드에서 서명 가능)
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     서명된 UserOperation 전송
@@ -136,11 +136,11 @@ async def send_user_operation(
                 )
             
             # UserOperation 서명
-            signed_user_op = aa_service.sign_user_operation(user_op_bytes, private_key)
+            signed_user_op = await async_aa_service.sign_user_operation(user_op_bytes, private_key)
             user_op_bytes["signature"] = signed_user_op["signature"]
         
         # UserOperation 전송
-        op_hash = aa_service.send_user_operation(user_op_bytes)
+        op_hash = await async_aa_service.send_user_operation(user_op_bytes)
         
         return {
             "user_operation_hash": op_hash,
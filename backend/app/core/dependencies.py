@@ -1,17 +1,19 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
-from app.db.database import get_db
+from app.db.database import get_async_db, read_router
 from app.models.user import User
 from app.core.security import decode_access_token
+from app.services.principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """현재 로그인한 사용자 가져오기"""
     credentials_exception = HTTPException(
@@ -34,13 +36,35 @@ async def get_current_user(
     except ValueError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_uuid).first()
+    # 캐시/토큰 클레임에 있으면 users 조회 없이 세션에 붙인 User
+    user = await principal_cache.load(db, user_uuid, payload)
     if user is None:
         raise credentials_exception
+
+    # 이 요청에서 쓰기가 일어나면 이후 잠시 동안 이 사용자의 읽기는 primary로 (read-your-writes)
+    event.listen(db.sync_session, "after_flush", lambda session, context: read_router.mark_write(user_uuid))
     
     return user
 
 
+async def get_read_db(request: Request):
+    """
+    읽기 전용 API용 세션 (복제본 라우팅)
+
+    토큰이 있으면 DB 조회 없이 사용자 ID만 꺼내 방금 쓰기를 한 사용자인지 확인
+    (인증 자체는 get_current_user가 담당)
+    """
+    user_id = None
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_access_token(token)
+        if payload:
+            user_id = payload.get("sub")
+
+    async with read_router.session_factory(user_id)() as db:
+        yield db
+
+
 async def get_current_admin(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -0,0 +1,90 @@
+"""
+커서(keyset) 페이지네이션
+OFFSET 대신 마지막 행의 정렬 키 (예: created_at, id) 다음부터 인덱스 범위 조건으로 조회
+다음 페이지 커서는 응답 헤더 X-Next-Cursor로 전달 (본문은 기존처럼 목록, skip도 계속 지원)
+"""
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Callable, List, Optional, Sequence
+from datetime import datetime
+import base64
+import json
+import uuid
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (created_at, id) 커서 파서
+CREATED_AT_ID = (datetime.fromisoformat, uuid.UUID)
+
+
+def _serialize(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_serialize(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[str], Any]]) -> List[Any]:
+    """커서 디코딩 (형식이 맞지 않으면 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor length mismatch")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    columns: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    response: Response,
+    skip: int = 0,
+    parsers: Sequence[Callable[[str], Any]] = CREATED_AT_ID,
+    descending: bool = True
+) -> list:
+    """
+    keyset 페이지 조회
+
+    Args:
+        db: 비동기 세션
+        stmt: 필터까지 적용한 select (order_by는 여기서 적용)
+        columns: 정렬 키 컬럼 (마지막 컬럼은 유일해야 함, 행에서 같은 이름으로 읽을 수 있어야 함)
+        cursor: 이전 페이지의 X-Next-Cursor 값
+        limit: 페이지 크기
+        response: 다음 페이지 커서를 헤더에 넣을 응답
+        skip: 커서가 없을 때의 OFFSET (기존 호환용)
+        parsers: 커서 값 파서 (columns 순서)
+        descending: 내림차순 여부
+
+    Returns:
+        최대 limit개의 행 (select(Model)이면 모델 객체, 여러 컬럼 projection이면 Row)
+    """
+    if cursor:
+        values = decode_cursor(cursor, parsers)
+        key = tuple_(*columns)
+        stmt = stmt.where(key < tuple_(*values) if descending else key > tuple_(*values))
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in columns))
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.scalars().all() if len(result.keys()) == 1 else result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows
@@ -0,0 +1,166 @@
+"""
+앱 시작 warm-up / 준비 상태
+DB 풀, RPC, ABI 레지스트리, IPFS 클라이언트를 동시에 준비하고 결과를 GET /ready로 보고
+(GET /health는 프로세스 생존만 확인 - 외부 의존성과 무관)
+"""
+from sqlalchemy import text
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+import asyncio
+import time
+import logging
+
+from app.core.config import settings
+from app.db.database import async_engine, replica_engines
+from app.services.web3_service import Web3Service, web3_service
+from app.services.async_web3_service import async_web3_service
+from app.services.ipfs_service import ipfs_service
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_database() -> str:
+    """API 핸들러가 쓰는 async DB 풀(primary + 읽기 복제본)에 연결을 동시에 미리 열어 둠 (첫 요청이 연결 수립을 기다리지 않도록)"""
+    async def open_connection(pool_engine):
+        connection = await pool_engine.connect()
+        try:
+            await connection.execute(text("SELECT 1"))
+        except Exception:
+            await connection.close()
+            raise
+        return connection
+
+    results = await asyncio.gather(
+        *(
+            open_connection(pool_engine)
+            for pool_engine in [async_engine, *replica_engines]
+            for _ in range(max(settings.WARMUP_DB_CONNECTIONS, 1))
+        ),
+        return_exceptions=True
+    )
+    connections = [result for result in results if not isinstance(result, BaseException)]
+    for connection in connections:
+        await connection.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+    return f"{len(connections)} connections"
+
+
+async def _warm_rpc() -> str:
+    """RPC 연결 확인 + 체인 ID 조회 (동기/비동기 프로바이더 모두 연결 수립)"""
+    if not await asyncio.to_thread(web3_service.connect, True):
+        raise RuntimeError(f"RPC not reachable: {web3_service.rpc_url}")
+    chain_id = await asyncio.to_thread(lambda: web3_service.chain_id)
+    if not await async_web3_service.is_connected():
+        raise RuntimeError(f"Async RPC not reachable: {async_web3_service.rpc_url}")
+    return f"chain {chain_id}"
+
+
+def _warm_abis() -> str:
+    """컨트랙트 ABI 아티팩트 미리 로드"""
+    names = list(Web3Service.CONTRACT_NAMES.values())
+    missing = [name for name in names if not web3_service.contracts.get_abi(name)]
+    if missing:
+        raise RuntimeError(f"Missing ABIs: {', '.join(missing)}")
+    return f"{len(names)} ABIs"
+
+
+def _warm_ipfs() -> str:
+    """Pinata 인증 확인 (keep-alive 세션에 TLS 연결 수립)"""
+    if not ipfs_service.is_configured:
+        return "not configured (mock uploads)"
+    if not ipfs_service.test_connection():
+        raise RuntimeError("Pinata authentication failed")
+    return "authenticated"
+
+
+class Readiness:
+    """
+    구성요소별 warm-up 결과
+
+    warm-up은 백그라운드 태스크로 실행되므로 앱 시작을 막지 않음
+    required 구성요소가 모두 준비되어야 ready (실패한 구성요소는 /ready 호출 시 다시 확인)
+    """
+
+    def __init__(self, checks: Dict[str, Callable[[], Any]], required: Iterable[str], timeout: float = 15.0):
+        self.checks = checks
+        self.required = set(required)
+        self.timeout = timeout
+        self.components: Dict[str, dict] = {name: {"ready": False, "detail": "pending"} for name in checks}
+        self.started_at: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return all(self.components[name]["ready"] for name in self.required if name in self.components)
+
+    def start(self) -> None:
+        """warm-up 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.warm_up())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _check(self, name: str) -> None:
+        check = self.checks[name]
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(check):
+                awaitable: Awaitable = check()
+            else:
+                awaitable = asyncio.to_thread(check)
+            detail = await asyncio.wait_for(awaitable, self.timeout)
+            self.components[name] = {"ready": True, "detail": detail}
+        except asyncio.TimeoutError:
+            self.components[name] = {"ready": False, "detail": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            # 드라이버 예외는 여러 줄 - 첫 줄만 보고
+            self.components[name] = {"ready": False, "detail": (str(e).splitlines() or [type(e).__name__])[0]}
+        self.components[name]["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        if self.components[name]["ready"]:
+            logger.info(f"Warm-up {name}: {self.components[name]['detail']}")
+        else:
+            logger.warning(f"Warm-up {name} failed: {self.components[name]['detail']}")
+
+    async def warm_up(self) -> None:
+        """모든 구성요소 동시 준비"""
+        self.started_at = time.perf_counter()
+        await asyncio.gather(*(self._check(name) for name in self.checks))
+        self.warmup_seconds = round(time.perf_counter() - self.started_at, 3)
+        logger.info(f"Warm-up finished in {self.warmup_seconds}s (ready={self.ready})")
+
+    async def check(self) -> dict:
+        """준비 상태 (warm-up이 끝났는데 준비 안 된 필수 구성요소가 있으면 다시 확인)"""
+        if self._task is not None and self._task.done():
+            failed = [name for name in self.required if name in self.components and not self.components[name]["ready"]]
+            if failed:
+                await asyncio.gather(*(self._check(name) for name in failed))
+        return self.report()
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_seconds": self.warmup_seconds,
+            "components": self.components,
+        }
+
+
+readiness = Readiness(
+    checks={
+        "database": _warm_database,
+        "rpc": _warm_rpc,
+        "abi": _warm_abis,
+        "ipfs": _warm_ipfs,
+    },
+    required=settings.READINESS_REQUIRED,
+    timeout=settings.WARMUP_TIMEOUT_SECONDS,
+)
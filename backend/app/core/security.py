@@ -5,26 +5,39 @@ import bcrypt
 from app.core.config import settings
 
 
+def _password_bytes(password: str) -> bytes:
+    # bcrypt는 72바이트를 초과하는 비밀번호를 처리하지 못함
+    return password.encode('utf-8')[:72]
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """비밀번호 검증"""
+    """비밀번호 검증 (bcrypt - 블로킹, async 코드에서는 password_hasher 사용)"""
     return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
+        _password_bytes(plain_password),
         hashed_password.encode('utf-8')
     )
 
 
-def get_password_hash(password: str) -> str:
-    """비밀번호 해싱"""
-    # bcrypt는 72바이트를 초과하는 비밀번호를 처리하지 못함
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-    
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """비밀번호 해싱 (bcrypt - 블로킹, async 코드에서는 password_hasher 사용)"""
+    salt = bcrypt.gensalt(rounds or settings.BCRYPT_ROUNDS)
+    hashed = bcrypt.hashpw(_password_bytes(password), salt)
     return hashed.decode('utf-8')
 
 
+def password_hash_rounds(hashed_password: str) -> Optional[int]:
+    """bcrypt 해시의 cost ($2b$12$... → 12), 형식이 다르면 None"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def password_needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """설정한 cost와 다른 해시인지 (로그인 성공 시 다시 해싱)"""
+    return password_hash_rounds(hashed_password) != (rounds or settings.BCRYPT_ROUNDS)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """JWT 토큰 생성"""
     to_encode = data.copy()
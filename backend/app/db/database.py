@@ -1,17 +1,201 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Dict, List, Optional
+import itertools
+import threading
+import time
 from app.core.config import settings
 
-# SQLite는 check_same_thread=False 필요
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+class _CheckoutTimer:
+    """풀 체크아웃 대기 시간/타임아웃 집계 (QueuePool 계열 mixin)"""
+
+    def _do_get(self):
+        stats = self.__dict__.setdefault("checkout_stats", {"checkouts": 0, "timeouts": 0, "wait_total": 0.0, "wait_max": 0.0})
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            stats["timeouts"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            stats["checkouts"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+
+
+class TimedQueuePool(_CheckoutTimer, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    pass
+
+
+def async_database_url(url: str):
+    """
+    동기 DB URL → async 드라이버 URL과 connect_args
+
+    postgresql(+psycopg2) → postgresql+asyncpg (sslmode는 asyncpg의 ssl 인자로 변환)
+    sqlite → sqlite+aiosqlite
+    그 외 DB는 ASYNC_DATABASE_URL로 async 드라이버 URL을 직접 지정해야 함
+    """
+    parsed = make_url(url)
+    async_connect_args = {}
+    if parsed.get_backend_name() == "postgresql":
+        sslmode = parsed.query.get("sslmode")
+        parsed = parsed.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+        if sslmode:
+            async_connect_args["ssl"] = sslmode
+    elif parsed.get_backend_name() == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    else:
+        raise ValueError(
+            f"No async driver mapping for '{parsed.drivername}' - set ASYNC_DATABASE_URL explicitly"
+        )
+    return parsed, async_connect_args
+
+
+def engine_options(url, is_async: bool, connect_args: Optional[dict] = None) -> dict:
+    """풀 크기/재활용/statement_timeout 설정 (SQLite는 기본 풀 사용)"""
+    connect_args = dict(connect_args or {})
+    options = {"pool_pre_ping": True}
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite는 check_same_thread=False 필요
+        if not is_async:
+            connect_args["check_same_thread"] = False
+    else:
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+            if is_async:
+                connect_args.setdefault("server_settings", {})["statement_timeout"] = timeout
+            else:
+                connect_args["options"] = f"-c statement_timeout={timeout}"
+    options["connect_args"] = connect_args
+    return options
+
+
+def _async_engine(url: str):
+    async_url, connect_args = async_database_url(url)
+    return create_async_engine(async_url, **engine_options(async_url, True, connect_args))
+
+
+# 동기 엔진: 스크립트, 백그라운드 워커(스레드), Alembic
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, False))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# 비동기 엔진: FastAPI 핸들러 (쿼리 대기 중 이벤트 루프를 막지 않음)
+if settings.ASYNC_DATABASE_URL:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL, **engine_options(settings.ASYNC_DATABASE_URL, True)
+    )
+else:
+    async_engine = _async_engine(settings.DATABASE_URL)
+# 커밋 후에도 로드된 속성을 그대로 사용 (async에서는 만료된 속성 지연 로드 불가)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# 읽기 복제본 (무거운 읽기 API용, 없으면 primary 사용)
+replica_engines = [_async_engine(url) for url in settings.DB_READ_REPLICA_URLS]
+
+
+class ReadRouter:
+    """
+    읽기 전용 세션 라우팅
+
+    - 복제본이 있으면 라운드 로빈으로 분배, 없으면 primary
+    - 사용자가 쓰기(구매 등)를 한 뒤 sticky_seconds 동안은 그 사용자의 읽기를 primary로 보냄
+      (복제 지연 때문에 방금 구매한 티켓이 안 보이는 일이 없도록, 워커 프로세스 단위)
+    """
+
+    def __init__(self, primary: async_sessionmaker, replica_engines: List, sticky_seconds: float = 5.0):
+        self.primary = primary
+        self.replicas = [
+            async_sessionmaker(replica, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            for replica in replica_engines
+        ]
+        self.sticky_seconds = sticky_seconds
+        self._next = itertools.count()
+        self._sticky: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {"replica": 0, "primary": 0, "sticky": 0}
+
+    def mark_write(self, user_id) -> None:
+        """사용자의 쓰기 기록 (이후 sticky_seconds 동안 읽기를 primary로)"""
+        if not self.replicas or self.sticky_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._sticky[str(user_id)] = now + self.sticky_seconds
+            if len(self._sticky) > 10000:
+                self._sticky = {key: until for key, until in self._sticky.items() if until > now}
+
+    def is_sticky(self, user_id) -> bool:
+        until = self._sticky.get(str(user_id))
+        if until is None:
+            return False
+        if until < time.monotonic():
+            with self._lock:
+                self._sticky.pop(str(user_id), None)
+            return False
+        return True
+
+    def session_factory(self, user_id=None) -> async_sessionmaker:
+        if not self.replicas:
+            self._stats["primary"] += 1
+            return self.primary
+        if user_id is not None and self.is_sticky(user_id):
+            self._stats["sticky"] += 1
+            return self.primary
+        self._stats["replica"] += 1
+        return self.replicas[next(self._next) % len(self.replicas)]
+
+    def stats(self) -> dict:
+        return {**self._stats, "replicas": len(self.replicas), "sticky_users": len(self._sticky)}
+
+
+read_router = ReadRouter(AsyncSessionLocal, replica_engines, settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def pool_stats() -> dict:
+    """엔진별 풀 연결 수와 체크아웃 대기 시간"""
+    engines = {"sync": engine, "primary": async_engine.sync_engine}
+    engines.update({f"replica_{i}": replica.sync_engine for i, replica in enumerate(replica_engines)})
+
+    result = {}
+    for name, pool_engine in engines.items():
+        pool = pool_engine.pool
+        if not isinstance(pool, QueuePool):
+            result[name] = {"status": pool.status()}
+            continue
+        checkout = dict(getattr(pool, "checkout_stats", {"checkouts": 0, "timeouts": 0, "wait_total": 0.0, "wait_max": 0.0}))
+        checkouts = checkout.pop("checkouts")
+        wait_total = checkout.pop("wait_total")
+        result[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": checkouts,
+            "timeouts": checkout["timeouts"],
+            "wait_avg_ms": round(wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+            "wait_max_ms": round(checkout["wait_max"] * 1000, 3),
+        }
+    return result
+
 
 def get_db():
     db = SessionLocal()
@@ -20,3 +204,7 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,22 @@
+"""
+alembic 마이그레이션 공용 도우미
+"""
+from typing import Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def schema_exists(table: str, column: Optional[str] = None) -> bool:
+    """
+    테이블(column을 주면 컬럼)이 이미 있는지
+
+    예전에 앱 시작 시 Base.metadata.create_all로 새 테이블을 만들던 DB를 이어서 upgrade할 때 사용
+    (오프라인 --sql 모드에서는 DB를 볼 수 없으므로 항상 False)
+    """
+    if op.get_context().as_sql:
+        return False
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return False
+    return column is None or column in {c["name"] for c in inspector.get_columns(table)}
@@ -5,6 +5,10 @@ from app.models.ticket import Ticket
 from app.models.resale import Resale
 from app.models.transaction import Transaction
 from app.models.refund import RefundRequest
+from app.models.indexer import IndexerCheckpoint, IndexedLog
+from app.models.purchase_job import PurchaseJob
+from app.models.inventory import InventoryShard, InventoryHold
+from app.models.ipfs_pin import IPFSPin
 
 __all__ = [
     "Base",
@@ -14,5 +18,11 @@ __all__ = [
     "Resale",
     "Transaction",
     "RefundRequest",
+    "IndexerCheckpoint",
+    "IndexedLog",
+    "PurchaseJob",
+    "InventoryShard",
+    "InventoryHold",
+    "IPFSPin",
 ]
 
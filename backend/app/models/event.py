@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Boolean, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Boolean, ForeignKey, Enum, Index, Text, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 import uuid
 from datetime import datetime
 import enum
@@ -16,8 +16,30 @@ class EventStatus(str, enum.Enum):
     ENDED = "ended"
 
 
+# 검색 텍스트 설정 (한국어는 형태소 분석 사전이 없으므로 공백 단위 'simple')
+SEARCH_CONFIG = "simple"
+# 이름(A) > 설명(B) > IPFS 메타데이터(C) 가중치
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(metadata_text, '')), 'C')"
+)
+
+
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # 목록 커서 페이지네이션 (created_at, id) - 전체 / 상태별
+        Index("ix_events_created_id", "created_at", "id"),
+        Index("ix_events_status_created_id", "status", "created_at", "id"),
+        # 판매 중(ACTIVE) 필터: status = APPROVED AND start_time <= now AND end_time >= now
+        Index("ix_events_status_window", "status", "start_time", "end_time"),
+        # 판매 스케줄러 변경분 조회: updated_at >= 워터마크
+        Index("ix_events_updated_at", "updated_at"),
+        # 검색: 전문 검색 + 오타 대비 이름 trigram (pg_trgm)
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_events_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id_onchain = Column(BigInteger, unique=True, nullable=True)  # 스마트 컨트랙트의 eventId
@@ -35,6 +57,13 @@ class Event(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # 승인 시 미리 만들어 고정한 티켓 메타데이터 디렉터리 (<serial>.json, TICKET_METADATA_MODE=directory)
+    metadata_dir_cid = Column(String(100), nullable=True)
+
+    # 검색용 (목록/상세 조회에서는 읽지 않음)
+    metadata_text = deferred(Column(Text, nullable=True))  # IPFS 메타데이터의 검색 대상 텍스트
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
     # Relationships
     organizer = relationship("User", back_populates="events")
     tickets = relationship("Ticket", back_populates="event")
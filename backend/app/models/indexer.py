@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime
+from datetime import datetime
+
+from app.db.database import Base
+
+
+class IndexerCheckpoint(Base):
+    """체인 인덱서 진행 위치 (인덱서 이름별 마지막 처리 블록)"""
+    __tablename__ = "indexer_checkpoints"
+
+    name = Column(String(64), primary_key=True)
+    last_block = Column(BigInteger, nullable=False)
+    last_block_hash = Column(String(66), nullable=True)  # reorg 감지용
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class IndexedLog(Base):
+    """이미 반영한 로그 (재처리 시 중복 반영 방지, reorg 시 블록 번호 기준으로 삭제)"""
+    __tablename__ = "indexed_logs"
+
+    tx_hash = Column(String(66), primary_key=True)
+    log_index = Column(Integer, primary_key=True)
+    block_number = Column(BigInteger, nullable=False, index=True)
+    event_name = Column(String(64), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
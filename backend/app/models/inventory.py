@@ -0,0 +1,60 @@
+from sqlalchemy import Boolean, Column, Integer, DateTime, ForeignKey, Enum, CheckConstraint, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+import enum
+
+from app.db.database import Base
+
+
+class InventoryShard(Base):
+    """
+    이벤트 재고 카운터 샤드
+
+    한 이벤트의 판매 가능 수량(max_tickets)을 여러 행으로 나눠,
+    동시 구매가 한 행의 잠금에 몰리지 않게 함 (held + sold <= capacity)
+    """
+    __tablename__ = "inventory_shards"
+    __table_args__ = (
+        CheckConstraint("held >= 0 AND sold >= 0", name="ck_inventory_shards_non_negative"),
+        # 판매 수량 동기화: updated_at >= 워터마크인 샤드의 이벤트만 다시 합산
+        Index("ix_inventory_shards_updated_at", "updated_at"),
+    )
+
+    event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    capacity = Column(Integer, nullable=False)
+    held = Column(Integer, default=0, nullable=False)  # 구매 진행 중 (만료 시 반환)
+    sold = Column(Integer, default=0, nullable=False)  # 구매 확정
+    # 새 일련번호를 배정할 때마다 1씩 증가 - 티켓 일련번호 = shard + 1 + (issued - 1) * 샤드 수
+    # (반환된 예약의 번호를 먼저 재사용하므로 issued <= capacity)
+    issued = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class InventoryHoldStatus(str, enum.Enum):
+    HELD = "held"
+    CONFIRMED = "confirmed"
+    RELEASED = "released"
+
+
+class InventoryHold(Base):
+    """구매 진행 중인 재고 1장 (expires_at이 지나면 샤드로 반환)"""
+    __tablename__ = "inventory_holds"
+    __table_args__ = (
+        # 샤드별 재사용 가능한 일련번호
+        Index(
+            "ix_inventory_holds_free_serial", "event_id", "shard",
+            postgresql_where=text("serial_free"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"), nullable=False)
+    shard = Column(Integer, nullable=False)
+    serial = Column(Integer, nullable=True)  # 티켓 일련번호 (메타데이터 디렉터리의 <serial>.json)
+    serial_free = Column(Boolean, default=False, nullable=False)  # 반환되어 다른 예약이 번호를 재사용할 수 있음
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    status = Column(Enum(InventoryHoldStatus), default=InventoryHoldStatus.HELD, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
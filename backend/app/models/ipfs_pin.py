@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, DateTime, Enum, Text, LargeBinary, JSON, Index
+from datetime import datetime
+import enum
+
+from app.db.database import Base
+
+
+class IPFSPinStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    PINNED = "pinned"
+    FAILED = "failed"
+
+
+class IPFSPin(Base):
+    """
+    Pinata 고정 대기열 (CID별 1행)
+
+    메타데이터 CID는 로컬에서 계산해 바로 token URI로 쓰고, 내용은 이 테이블에 넣어 두면
+    백그라운드 워커가 SKIP LOCKED로 묶어 가져가 Pinata에 올림 (고정 후 content는 비움)
+    """
+    __tablename__ = "ipfs_pins"
+    __table_args__ = (
+        Index("ix_ipfs_pins_status_run_after", "status", "run_after"),
+    )
+
+    cid = Column(String(100), primary_key=True)
+    content = Column(LargeBinary, nullable=True)  # 올릴 원본 바이트 (고정 후 NULL)
+    name = Column(String(255), nullable=True)  # pinataMetadata.name
+    keyvalues = Column(JSON, nullable=True)  # pinataMetadata.keyvalues
+    status = Column(Enum(IPFSPinStatus), default=IPFSPinStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)  # 재시도 대기
+    locked_by = Column(String(64), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    pinned_at = Column(DateTime, nullable=True)
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Enum, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+import enum
+
+from app.db.database import Base
+
+
+class PurchaseJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class PurchaseJob(Base):
+    """
+    비동기 구매 작업 (purchase 파이프라인 모드)
+
+    요청 시점에 재고를 예약하고 작업을 넣으면, 워커가 SKIP LOCKED로 가져가
+    메타데이터 CID 계산 → UserOperation 전송 → 확인 → 티켓 저장 순으로 처리
+    """
+    __tablename__ = "purchase_jobs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_purchase_jobs_user_idempotency_key"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"), nullable=False)
+    ticket_id = Column(UUID(as_uuid=True), ForeignKey("tickets.id"), nullable=True)
+    hold_id = Column(UUID(as_uuid=True), ForeignKey("inventory_holds.id"), nullable=True)  # 예약한 재고
+    idempotency_key = Column(String(128), nullable=True)  # 클라이언트 Idempotency-Key 헤더
+    status = Column(Enum(PurchaseJobStatus), default=PurchaseJobStatus.QUEUED, nullable=False)
+
+    # 단계별 결과 (재시도 시 완료된 단계는 건너뜀)
+    token_uri = Column(String(512), nullable=True)
+    ipfs_hash = Column(String(255), nullable=True)
+    op_hash = Column(String(66), nullable=True)  # UserOperation 해시 또는 트랜잭션 해시
+    tx_hash = Column(String(66), nullable=True)
+    token_id = Column(BigInteger, nullable=True)
+
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)  # 재시도 대기
+    locked_by = Column(String(64), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
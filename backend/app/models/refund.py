@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -17,6 +17,13 @@ class RefundStatus(str, enum.Enum):
 
 class RefundRequest(Base):
     __tablename__ = "refund_requests"
+    __table_args__ = (
+        # 환불 요청 목록 커서 페이지네이션 - 전체 / 사용자별
+        Index("ix_refund_requests_created_id", "created_at", "id"),
+        Index("ix_refund_requests_user_created_id", "user_id", "created_at", "id"),
+        # 티켓별 진행 중 환불 요청 확인 (ticket_id + status)
+        Index("ix_refund_requests_ticket_status", "ticket_id", "status"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     ticket_id = Column(UUID(as_uuid=True), ForeignKey("tickets.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Boolean, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -16,6 +16,12 @@ class ResaleStatus(str, enum.Enum):
 
 class Resale(Base):
     __tablename__ = "resales"
+    __table_args__ = (
+        # 재판매 목록 (LISTED만 조회 + created_at, id 커서)
+        Index("ix_resales_listed_created_id", "created_at", "id", postgresql_where=text("status = 'LISTED'")),
+        # 티켓별 중복 등록 확인
+        Index("ix_resales_ticket_listed", "ticket_id", postgresql_where=text("status = 'LISTED'")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     ticket_id = Column(UUID(as_uuid=True), ForeignKey("tickets.id"), nullable=False)
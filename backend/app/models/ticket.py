@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -17,9 +17,18 @@ class TicketStatus(str, enum.Enum):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # 내 티켓 목록 (owner_address 필터 + created_at, id 커서)
+        Index("ix_tickets_owner_created_id", "owner_address", "created_at", "id"),
+        # 중복 구매 확인 (event_id + owner_address, ACTIVE 티켓만)
+        Index(
+            "ix_tickets_event_owner_active", "event_id", "owner_address",
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    token_id = Column(BigInteger, unique=True, nullable=False, index=True)
+    token_id = Column(BigInteger, unique=True, nullable=True, index=True)  # 온체인 확인 전에는 NULL
     event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"), nullable=False)
     owner_address = Column(String(42), nullable=False, index=True)
     ipfs_hash = Column(String(255), nullable=True)
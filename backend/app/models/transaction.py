@@ -12,6 +12,7 @@ class TransactionType(str, enum.Enum):
     PURCHASE = "purchase"
     RESALE = "resale"
     REFUND = "refund"
+    CHARGE = "charge"  # Smart Wallet 충전
 
 
 class TransactionStatus(str, enum.Enum):
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.models.event import EventStatus
 
@@ -41,3 +41,24 @@ class EventResponse(EventBase):
     class Config:
         from_attributes = True
 
+
+
+class EventSearchResult(EventResponse):
+    """검색 결과 (rank: 전문 검색 ts_rank_cd 또는 trigram 유사도)"""
+    rank: float
+
+
+class OrganizerFacet(BaseModel):
+    organizer_id: str
+    count: int
+
+
+class EventSearchFacets(BaseModel):
+    match: str  # "fulltext" / "trigram"
+    total: int
+    available: int  # 잔여 수량이 있는 이벤트 수
+    price_min: Optional[int] = None
+    price_max: Optional[int] = None
+    date_min: Optional[datetime] = None
+    date_max: Optional[datetime] = None
+    organizers: List[OrganizerFacet]
@@ -2,11 +2,13 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 from app.models.ticket import TicketStatus
+from app.models.purchase_job import PurchaseJobStatus
+from app.models.event import EventStatus
 
 
 class TicketResponse(BaseModel):
     id: str
-    token_id: int
+    token_id: Optional[int] = None
     event_id: str
     owner_address: str
     ipfs_hash: Optional[str] = None
@@ -20,7 +22,30 @@ class TicketResponse(BaseModel):
         from_attributes = True
 
 
+class TicketListItem(TicketResponse):
+    """내 티켓 목록 항목 (이벤트 정보 포함)"""
+    event_name: Optional[str] = None
+    event_date: Optional[datetime] = None
+    event_status: Optional[EventStatus] = None
+
+
 class TicketPurchase(BaseModel):
     event_id: str
     token_uri: Optional[str] = None
 
+
+
+class PurchaseJobResponse(BaseModel):
+    id: str
+    event_id: str
+    status: PurchaseJobStatus
+    ticket_id: Optional[str] = None
+    token_id: Optional[int] = None
+    tx_hash: Optional[str] = None
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
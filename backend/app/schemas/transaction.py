@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.models.transaction import TransactionType, TransactionStatus
+
+
+class TransactionResponse(BaseModel):
+    id: str
+    tx_hash: str
+    transaction_type: TransactionType
+    status: TransactionStatus
+    user_id: Optional[str] = None
+    ticket_id: Optional[str] = None
+    event_id: Optional[str] = None
+    amount_wei: Optional[int] = None
+    gas_fee_wei: Optional[int] = None
+    block_number: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -11,30 +11,239 @@ import json
 import os
 import logging
 from app.core.config import settings
+from app.services.multicall import format_fee_history
 
 logger = logging.getLogger(__name__)
 
+# UserOperation 튜플 구조 (EntryPoint v0.6)
+USER_OPERATION_COMPONENTS = [
+    {"name": "sender", "type": "address"},
+    {"name": "nonce", "type": "uint256"},
+    {"name": "initCode", "type": "bytes"},
+    {"name": "callData", "type": "bytes"},
+    {"name": "callGasLimit", "type": "uint256"},
+    {"name": "verificationGasLimit", "type": "uint256"},
+    {"name": "preVerificationGas", "type": "uint256"},
+    {"name": "maxFeePerGas", "type": "uint256"},
+    {"name": "maxPriorityFeePerGas", "type": "uint256"},
+    {"name": "paymasterAndData", "type": "bytes"},
+    {"name": "signature", "type": "bytes"}
+]
+
+# EntryPoint ABI (사용하는 함수/이벤트만 포함, 아티팩트 파일 없음)
+ENTRY_POINT_ABI = [
+    {
+        "inputs": [
+            {"name": "sender", "type": "address"},
+            {"name": "key", "type": "uint192"}
+        ],
+        "name": "getNonce",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"components": USER_OPERATION_COMPONENTS, "name": "userOp", "type": "tuple"}
+        ],
+        "name": "getUserOpHash",
+        "outputs": [{"name": "", "type": "bytes32"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [
+            {"components": USER_OPERATION_COMPONENTS, "name": "ops", "type": "tuple[]"},
+            {"name": "beneficiary", "type": "address"}
+        ],
+        "name": "handleOps",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "userOpHash", "type": "bytes32"},
+            {"indexed": True, "name": "sender", "type": "address"},
+            {"indexed": True, "name": "paymaster", "type": "address"},
+            {"indexed": False, "name": "nonce", "type": "uint256"},
+            {"indexed": False, "name": "success", "type": "bool"},
+            {"indexed": False, "name": "actualGasCost", "type": "uint256"},
+            {"indexed": False, "name": "actualGasUsed", "type": "uint256"}
+        ],
+        "name": "UserOperationEvent",
+        "type": "event"
+    }
+]
+
+
+def user_operation_tuple(user_operation: Dict[str, Any]) -> tuple:
+    """UserOperation 딕셔너리를 EntryPoint 호출용 튜플로 변환"""
+    return (
+        Web3.to_checksum_address(user_operation["sender"]),
+        user_operation["nonce"],
+        user_operation["initCode"],
+        user_operation["callData"],
+        user_operation["callGasLimit"],
+        user_operation["verificationGasLimit"],
+        user_operation["preVerificationGas"],
+        user_operation["maxFeePerGas"],
+        user_operation["maxPriorityFeePerGas"],
+        user_operation["paymasterAndData"],
+        user_operation.get("signature", b"")
+    )
+
+
+def manual_user_operation_hash(user_operation: Dict[str, Any]) -> bytes:
+    """EntryPoint 없이 UserOperation 해시 계산 (keccak256(abi.encode(...)))"""
+    encoded = abi_encode(
+        ['address', 'uint256', 'bytes', 'bytes', 'uint256', 'uint256', 'uint256', 'uint256', 'uint256', 'bytes', 'bytes'],
+        list(user_operation_tuple(user_operation))
+    )
+    return Web3.keccak(encoded)
+
+
+def _hex(value) -> str:
+    return value.hex() if isinstance(value, bytes) else value
+
+
+def user_operation_to_rpc(user_operation: Dict[str, Any]) -> Dict[str, Any]:
+    """UserOperation을 Bundler JSON-RPC 형식으로 변환"""
+    return {
+        "sender": user_operation["sender"],
+        "nonce": hex(user_operation["nonce"]),
+        "initCode": _hex(user_operation["initCode"]),
+        "callData": _hex(user_operation["callData"]),
+        "callGasLimit": hex(user_operation["callGasLimit"]),
+        "verificationGasLimit": hex(user_operation["verificationGasLimit"]),
+        "preVerificationGas": hex(user_operation["preVerificationGas"]),
+        "maxFeePerGas": hex(user_operation["maxFeePerGas"]),
+        "maxPriorityFeePerGas": hex(user_operation["maxPriorityFeePerGas"]),
+        "paymasterAndData": _hex(user_operation["paymasterAndData"]),
+        "signature": _hex(user_operation["signature"])
+    }
+
+
+def build_user_operation(
+    sender: str,
+    data: bytes,
+    nonce: int,
+    max_fee_per_gas: int,
+    max_priority_fee_per_gas: int,
+    call_gas_limit: Optional[int] = None,
+    verification_gas_limit: Optional[int] = None,
+    pre_verification_gas: Optional[int] = None,
+    paymaster_and_data: bytes = b""
+) -> Dict[str, Any]:
+    """UserOperation 딕셔너리 생성 (가스 한도 기본값 적용)"""
+    return {
+        "sender": sender,
+        "nonce": nonce,
+        "initCode": b"",  # Smart Wallet이 이미 배포된 경우 빈 바이트
+        "callData": data,
+        "callGasLimit": call_gas_limit if call_gas_limit is not None else 100000,
+        "verificationGasLimit": verification_gas_limit if verification_gas_limit is not None else 100000,
+        "preVerificationGas": pre_verification_gas if pre_verification_gas is not None else 50000,
+        "maxFeePerGas": max_fee_per_gas,
+        "maxPriorityFeePerGas": max_priority_fee_per_gas,
+        "paymasterAndData": paymaster_and_data,
+        "signature": b""  # 나중에 서명 추가
+    }
+
+
+def apply_user_operation_signature(
+    user_operation: Dict[str, Any],
+    user_op_hash: bytes,
+    private_key: str
+) -> Dict[str, Any]:
+    """UserOperation 해시에 EIP-191 서명 후 signature 필드 설정"""
+    message_hash = encode_defunct(primitive=user_op_hash)
+    
+    if not private_key.startswith("0x"):
+        private_key = "0x" + private_key
+    
+    account = Account.from_key(private_key)
+    signed_message = account.sign_message(message_hash)
+    user_operation["signature"] = signed_message.signature
+    
+    logger.info(f"UserOperation signed by {account.address}")
+    return user_operation
+
+
+def is_sponsored_target(target: Optional[str]) -> bool:
+    """
+    Paymaster 스폰서 대상인지 판단
+    
+    - 티켓 구매 (EventManager): 스폰서
+    - 환불 (RefundManager): 스폰서
+    - 재판매 (Marketplace) 등 나머지: 사용자 부담
+    """
+    if not target:
+        return False
+    target = target.lower()
+    if target == settings.EVENT_MANAGER_ADDRESS.lower():
+        logger.info("EventManager call detected - Paymaster sponsor enabled")
+        return True
+    if target == settings.REFUND_MANAGER_ADDRESS.lower():
+        logger.info("RefundManager call detected - Paymaster sponsor enabled")
+        return True
+    if target == settings.MARKETPLACE_ADDRESS.lower():
+        logger.info("Marketplace call detected - user pays gas")
+    return False
+
+
+def paymaster_request_payload(user_operation: Dict[str, Any], entry_point_address: str) -> Dict[str, Any]:
+    """Paymaster /sponsor 요청 본문"""
+    return {
+        "user_operation": {
+            "sender": user_operation["sender"],
+            "nonce": user_operation["nonce"],
+            "callData": _hex(user_operation["callData"]),
+            "callGasLimit": user_operation["callGasLimit"],
+            "verificationGasLimit": user_operation["verificationGasLimit"],
+            "preVerificationGas": user_operation["preVerificationGas"],
+            "maxFeePerGas": user_operation["maxFeePerGas"],
+            "maxPriorityFeePerGas": user_operation["maxPriorityFeePerGas"],
+        },
+        "entryPoint": entry_point_address
+    }
+
+
+def parse_paymaster_response(result: Dict[str, Any]) -> bytes:
+    """
+    Paymaster 응답을 paymasterAndData로 변환
+    
+    형식: paymaster_address (20 bytes) + paymaster_data (서명 등)
+    """
+    paymaster_address = result.get("paymaster_address", "")
+    paymaster_data = result.get("paymaster_data", "")
+    if not paymaster_address:
+        return b""
+    
+    paymaster_address_bytes = bytes.fromhex(paymaster_address.replace("0x", ""))
+    if isinstance(paymaster_data, str):
+        paymaster_data_bytes = bytes.fromhex(paymaster_data.replace("0x", "")) if paymaster_data else b""
+    else:
+        paymaster_data_bytes = paymaster_data or b""
+    
+    logger.info(f"Paymaster sponsor data retrieved: {paymaster_address}")
+    return paymaster_address_bytes + paymaster_data_bytes
+
 
 class AccountAbstractionService:
     """Account Abstraction 서비스"""
     
     def __init__(self):
-        # Web3Service 재사용 (이미 연결되어 있음)
+        # Web3Service 재사용 (연결은 첫 사용 시점에 확인)
         try:
             from app.services.web3_service import web3_service
+            # EntryPoint ABI를 레지스트리에 등록 (호출마다 컨트랙트 객체를 만들지 않도록)
+            web3_service.contracts.register_abi("EntryPoint", ENTRY_POINT_ABI)
             self.web3_service = web3_service
-            self.w3 = web3_service.w3
-            self.account = web3_service.account
-            self.address = web3_service.address
         except Exception as e:
             logger.warning(f"Failed to initialize Web3Service: {e}")
             self.web3_service = None
-            self.w3 = None
-            self.account = None
-            self.address = None
-        
-        if not self.w3 or not self.w3.is_connected():
-            logger.warning("Web3 not connected in AA Service")
         
         logger.info("AA Service initialized")
         
@@ -54,17 +263,29 @@ class AccountAbstractionService:
             getattr(settings, 'SMART_WALLET_FACTORY_ADDRESS', "")
         )
     
+    @property
+    def w3(self):
+        return self.web3_service.w3 if self.web3_service else None
+    
+    @property
+    def account(self):
+        return self.web3_service.account if self.web3_service else None
+    
+    @property
+    def address(self) -> Optional[str]:
+        return self.web3_service.address if self.web3_service else None
+    
     def _get_contract(self, contract_address: str, contract_name: str):
         """컨트랙트 인스턴스 가져오기"""
         if not self.web3_service:
             raise Exception("Web3Service not initialized")
         return self.web3_service._get_contract(contract_address, contract_name)
     
-    def _send_transaction(self, contract_function, value: int = 0) -> str:
+    def _send_transaction(self, contract_function, value: int = 0, wait: bool = True) -> str:
         """트랜잭션 전송 헬퍼"""
         if not self.web3_service:
             raise Exception("Web3Service not initialized")
-        return self.web3_service._send_transaction(contract_function, value)
+        return self.web3_service._send_transaction(contract_function, value, wait=wait)
     
     def generate_smart_wallet_address(
         self,
@@ -176,67 +397,56 @@ class AccountAbstractionService:
         if not self.w3:
             raise Exception("Web3 not connected")
         
-        # Nonce 조회 (EntryPoint에서)
+        # EntryPoint nonce와 가스비를 한 번의 배치로 조회
+        need_fees = max_fee_per_gas is None or max_priority_fee_per_gas is None
+        batch = self.web3_service.read_batch()
+        nonce_index = fee_index = None
         if nonce is None:
             try:
-                # EntryPoint ABI (getNonce 함수 포함)
-                entry_point_abi = [
-                    {
-                        "inputs": [
-                            {"name": "sender", "type": "address"},
-                            {"name": "key", "type": "uint192"}
-                        ],
-                        "name": "getNonce",
-                        "outputs": [{"name": "", "type": "uint256"}],
-                        "stateMutability": "view",
-                        "type": "function"
-                    }
-                ]
-                
-                entry_point = self.w3.eth.contract(
-                    address=Web3.to_checksum_address(self.entry_point_address),
-                    abi=entry_point_abi
-                )
+                entry_point = self._get_contract(self.entry_point_address, "EntryPoint")
                 
                 # EntryPoint에서 nonce 조회 (key는 0 사용)
-                nonce = entry_point.functions.getNonce(
+                nonce_index = batch.call(entry_point.functions.getNonce(
                     Web3.to_checksum_address(sender),
                     0
-                ).call()
-                logger.info(f"Nonce from EntryPoint: {nonce}")
+                ))
             except Exception as e:
                 logger.warning(f"Failed to get nonce from EntryPoint: {e}, using 0")
                 nonce = 0
+        if need_fees:
+            fee_index = batch.rpc("eth_feeHistory", [hex(1), "latest", []], format_fee_history)
+        
+        results = batch.execute()
         
-        # 가스비 조회
-        if max_fee_per_gas is None or max_priority_fee_per_gas is None:
-            fee_history = self.w3.eth.fee_history(1, "latest")
+        if nonce_index is not None:
+            nonce = results[nonce_index]
+            if nonce is None:
+                logger.warning("Failed to get nonce from EntryPoint, using 0")
+                nonce = 0
+            else:
+                logger.info(f"Nonce from EntryPoint: {nonce}")
+        
+        # 가스비 계산
+        if need_fees:
+            fee_history = results[fee_index]
+            if not fee_history:
+                raise Exception("Failed to fetch fee history")
             base_fee = fee_history["baseFeePerGas"][0]
             max_priority_fee_per_gas = self.w3.to_wei(2, "gwei")
             max_fee_per_gas = base_fee + max_priority_fee_per_gas
         
-        # 가스 한도 설정
-        if call_gas_limit is None:
-            call_gas_limit = 100000
-        if verification_gas_limit is None:
-            verification_gas_limit = 100000
-        if pre_verification_gas is None:
-            pre_verification_gas = 50000
-        
         # UserOperation 구조
-        user_operation = {
-            "sender": sender,
-            "nonce": nonce,
-            "initCode": b"",  # Smart Wallet이 이미 배포된 경우 빈 바이트
-            "callData": data,
-            "callGasLimit": call_gas_limit,
-            "verificationGasLimit": verification_gas_limit,
-            "preVerificationGas": pre_verification_gas,
-            "maxFeePerGas": max_fee_per_gas,
-            "maxPriorityFeePerGas": max_priority_fee_per_gas,
-            "paymasterAndData": paymaster_and_data,
-            "signature": b""  # 나중에 서명 추가
-        }
+        user_operation = build_user_operation(
+            sender,
+            data,
+            nonce,
+            max_fee_per_gas,
+            max_priority_fee_per_gas,
+            call_gas_limit=call_gas_limit,
+            verification_gas_limit=verification_gas_limit,
+            pre_verification_gas=pre_verification_gas,
+            paymaster_and_data=paymaster_and_data
+        )
         
         logger.info(f"Created UserOperation: sender={sender}, target={target}")
         return user_operation
@@ -259,57 +469,12 @@ class AccountAbstractionService:
         
         # EntryPoint 컨트랙트에서 getUserOpHash 호출 시도
         try:
-            # EntryPoint ABI (getUserOpHash 함수만 포함)
-            entry_point_abi = [
-                {
-                    "inputs": [
-                        {
-                            "components": [
-                                {"name": "sender", "type": "address"},
-                                {"name": "nonce", "type": "uint256"},
-                                {"name": "initCode", "type": "bytes"},
-                                {"name": "callData", "type": "bytes"},
-                                {"name": "callGasLimit", "type": "uint256"},
-                                {"name": "verificationGasLimit", "type": "uint256"},
-                                {"name": "preVerificationGas", "type": "uint256"},
-                                {"name": "maxFeePerGas", "type": "uint256"},
-                                {"name": "maxPriorityFeePerGas", "type": "uint256"},
-                                {"name": "paymasterAndData", "type": "bytes"},
-                                {"name": "signature", "type": "bytes"}
-                            ],
-                            "name": "userOp",
-                            "type": "tuple"
-                        }
-                    ],
-                    "name": "getUserOpHash",
-                    "outputs": [{"name": "", "type": "bytes32"}],
-                    "stateMutability": "view",
-                    "type": "function"
-                }
-            ]
-            
-            entry_point = self.w3.eth.contract(
-                address=Web3.to_checksum_address(self.entry_point_address),
-                abi=entry_point_abi
-            )
-            
-            # UserOperation을 튜플로 변환
-            user_op_tuple = (
-                Web3.to_checksum_address(user_operation["sender"]),
-                user_operation["nonce"],
-                user_operation["initCode"],
-                user_operation["callData"],
-                user_operation["callGasLimit"],
-                user_operation["verificationGasLimit"],
-                user_operation["preVerificationGas"],
-                user_operation["maxFeePerGas"],
-                user_operation["maxPriorityFeePerGas"],
-                user_operation["paymasterAndData"],
-                user_operation.get("signature", b"")
-            )
+            entry_point = self._get_contract(self.entry_point_address, "EntryPoint")
             
             # EntryPoint에서 해시 조회
-            user_op_hash = entry_point.functions.getUserOpHash(user_op_tuple).call()
+            user_op_hash = entry_point.functions.getUserOpHash(
+                user_operation_tuple(user_operation)
+            ).call()
             logger.info(f"UserOperation hash from EntryPoint: {user_op_hash.hex()}")
             return user_op_hash
             
@@ -318,26 +483,7 @@ class AccountAbstractionService:
             # EntryPoint가 없거나 호출 실패 시 수동 계산
             # ERC-4337 표준: keccak256(abi.encodePacked(...))
             
-            # UserOperation 필드를 순서대로 인코딩
-            encoded = abi_encode(
-                ['address', 'uint256', 'bytes', 'bytes', 'uint256', 'uint256', 'uint256', 'uint256', 'uint256', 'bytes', 'bytes'],
-                [
-                    Web3.to_checksum_address(user_operation["sender"]),
-                    user_operation["nonce"],
-                    user_operation["initCode"],
-                    user_operation["callData"],
-                    user_operation["callGasLimit"],
-                    user_operation["verificationGasLimit"],
-                    user_operation["preVerificationGas"],
-                    user_operation["maxFeePerGas"],
-                    user_operation["maxPriorityFeePerGas"],
-                    user_operation["paymasterAndData"],
-                    user_operation.get("signature", b"")
-                ]
-            )
-            
-            # keccak256 해시 계산
-            user_op_hash = Web3.keccak(encoded)
+            user_op_hash = manual_user_operation_hash(user_operation)
             logger.info(f"UserOperation hash (manual): {user_op_hash.hex()}")
             return user_op_hash
     
@@ -362,37 +508,20 @@ class AccountAbstractionService:
         # UserOperation 해시 계산
         user_op_hash = self._get_user_operation_hash(user_operation)
         
-        # Ethereum 서명 메시지 해시로 변환 (EIP-191)
-        # ERC-4337에서는 EntryPoint가 이미 메시지 해시를 계산하므로
-        # 여기서는 직접 해시를 사용하거나, toEthSignedMessageHash 사용
-        
-        # EntryPoint에서 받은 해시를 그대로 사용 (EntryPoint가 이미 처리)
-        # 또는 toEthSignedMessageHash 사용
-        message_hash = encode_defunct(primitive=user_op_hash)
-        
-        # 서명
-        if not private_key.startswith("0x"):
-            private_key = "0x" + private_key
-        
-        account = Account.from_key(private_key)
-        signed_message = account.sign_message(message_hash)
-        signature = signed_message.signature
-        
-        # UserOperation에 서명 추가
-        user_operation["signature"] = signature
-        
-        logger.info(f"UserOperation signed by {account.address}")
-        return user_operation
+        # Ethereum 서명 메시지 해시로 변환 (EIP-191) 후 서명
+        return apply_user_operation_signature(user_operation, user_op_hash, private_key)
     
     def send_user_operation(
         self,
-        user_operation: Dict[str, Any]
+        user_operation: Dict[str, Any],
+        wait: bool = True
     ) -> str:
         """
         UserOperation을 Bundler로 전송
         
         Args:
             user_operation: 서명된 UserOperation
+            wait: EntryPoint 직접 전송 시 영수증 대기 여부
         
         Returns:
             UserOperation 해시
@@ -400,25 +529,13 @@ class AccountAbstractionService:
         if not self.bundler_url:
             # Bundler URL이 없으면 직접 EntryPoint로 전송 (로컬 테스트용)
             logger.warning("Bundler URL not configured, sending directly to EntryPoint")
-            return self._send_user_operation_direct(user_operation)
+            return self._send_user_operation_direct(user_operation, wait=wait)
         
         # Bundler API 호출
         import requests
         
         # UserOperation을 JSON-RPC 형식으로 변환
-        user_op_rpc = {
-            "sender": user_operation["sender"],
-            "nonce": hex(user_operation["nonce"]),
-            "initCode": user_operation["initCode"].hex() if isinstance(user_operation["initCode"], bytes) else user_operation["initCode"],
-            "callData": user_operation["callData"].hex() if isinstance(user_operation["callData"], bytes) else user_operation["callData"],
-            "callGasLimit": hex(user_operation["callGasLimit"]),
-            "verificationGasLimit": hex(user_operation["verificationGasLimit"]),
-            "preVerificationGas": hex(user_operation["preVerificationGas"]),
-            "maxFeePerGas": hex(user_operation["maxFeePerGas"]),
-            "maxPriorityFeePerGas": hex(user_operation["maxPriorityFeePerGas"]),
-            "paymasterAndData": user_operation["paymasterAndData"].hex() if isinstance(user_operation["paymasterAndData"], bytes) else user_operation["paymasterAndData"],
-            "signature": user_operation["signature"].hex() if isinstance(user_operation["signature"], bytes) else user_operation["signature"]
-        }
+        user_op_rpc = user_operation_to_rpc(user_operation)
         
         payload = {
             "jsonrpc": "2.0",
@@ -448,17 +565,19 @@ class AccountAbstractionService:
             logger.error(f"Failed to send UserOperation to bundler: {e}")
             # 실패 시 직접 전송 시도
             logger.info("Falling back to direct EntryPoint call")
-            return self._send_user_operation_direct(user_operation)
+            return self._send_user_operation_direct(user_operation, wait=wait)
     
     def _send_user_operation_direct(
         self,
-        user_operation: Dict[str, Any]
+        user_operation: Dict[str, Any],
+        wait: bool = True
     ) -> str:
         """
         EntryPoint에 직접 UserOperation 전송 (로컬 테스트용)
         
         Args:
             user_operation: 서명된 UserOperation
+            wait: 영수증 대기 여부 (False면 해시만 반환)
         
         Returns:
             트랜잭션 해시
@@ -466,65 +585,17 @@ class AccountAbstractionService:
         if not self.w3:
             raise Exception("Web3 not connected")
         
-        # EntryPoint ABI (handleOps 함수 포함)
-        entry_point_abi = [
-            {
-                "inputs": [
-                    {
-                        "components": [
-                            {"name": "sender", "type": "address"},
-                            {"name": "nonce", "type": "uint256"},
-                            {"name": "initCode", "type": "bytes"},
-                            {"name": "callData", "type": "bytes"},
-                            {"name": "callGasLimit", "type": "uint256"},
-                            {"name": "verificationGasLimit", "type": "uint256"},
-                            {"name": "preVerificationGas", "type": "uint256"},
-                            {"name": "maxFeePerGas", "type": "uint256"},
-                            {"name": "maxPriorityFeePerGas", "type": "uint256"},
-                            {"name": "paymasterAndData", "type": "bytes"},
-                            {"name": "signature", "type": "bytes"}
-                        ],
-                        "name": "ops",
-                        "type": "tuple[]"
-                    },
-                    {"name": "beneficiary", "type": "address"}
-                ],
-                "name": "handleOps",
-                "outputs": [],
-                "stateMutability": "nonpayable",
-                "type": "function"
-            }
-        ]
-        
         try:
-            entry_point = self.w3.eth.contract(
-                address=Web3.to_checksum_address(self.entry_point_address),
-                abi=entry_point_abi
-            )
-            
-            # UserOperation을 튜플로 변환
-            user_op_tuple = (
-                Web3.to_checksum_address(user_operation["sender"]),
-                user_operation["nonce"],
-                user_operation["initCode"],
-                user_operation["callData"],
-                user_operation["callGasLimit"],
-                user_operation["verificationGasLimit"],
-                user_operation["preVerificationGas"],
-                user_operation["maxFeePerGas"],
-                user_operation["maxPriorityFeePerGas"],
-                user_operation["paymasterAndData"],
-                user_operation["signature"]
-            )
+            entry_point = self._get_contract(self.entry_point_address, "EntryPoint")
             
             # EntryPoint.handleOps 호출
             function = entry_point.functions.handleOps(
-                [user_op_tuple],
+                [user_operation_tuple(user_operation)],
                 self.address  # beneficiary (가스비 수령자)
             )
             
             # 트랜잭션 전송
-            tx_hash = self._send_transaction(function)
+            tx_hash = self._send_transaction(function, wait=wait)
             logger.info(f"UserOperation sent directly to EntryPoint: {tx_hash}")
             return tx_hash
             
@@ -559,30 +630,8 @@ class AccountAbstractionService:
             return b""
         
         # target 주소로 어떤 컨트랙트인지 판단
-        if target:
-            from app.core.config import settings
-            
-            # 티켓 구매 (EventManager) - 스폰서
-            if target.lower() == settings.EVENT_MANAGER_ADDRESS.lower():
-                # callData에서 함수 시그니처 확인
-                call_data = user_operation.get("callData", b"")
-                if isinstance(call_data, str):
-                    call_data = bytes.fromhex(call_data.replace("0x", ""))
-                
-                # purchaseTicket 함수 시그니처: 0x + keccak256("purchaseTicket(uint256,string)")[:4]
-                # 실제로는 함수 시그니처를 확인하거나, 간단히 EventManager 호출이면 스폰서
-                logger.info("EventManager call detected - Paymaster sponsor enabled")
-                return self._get_paymaster_data(user_operation)
-            
-            # 환불 (RefundManager) - 스폰서
-            if target.lower() == settings.REFUND_MANAGER_ADDRESS.lower():
-                logger.info("RefundManager call detected - Paymaster sponsor enabled")
-                return self._get_paymaster_data(user_operation)
-            
-            # 재판매 (Marketplace) - 사용자 부담
-            if target.lower() == settings.MARKETPLACE_ADDRESS.lower():
-                logger.info("Marketplace call detected - user pays gas")
-                return b""
+        if is_sponsored_target(target):
+            return self._get_paymaster_data(user_operation)
         
         # 기본적으로 스폰서하지 않음 (사용자 부담)
         logger.info("Paymaster sponsor not applicable")
@@ -605,20 +654,7 @@ class AccountAbstractionService:
             import requests
             
             # Paymaster API 호출
-            # 실제 Paymaster 서비스가 있다면 이렇게 호출
-            payload = {
-                "user_operation": {
-                    "sender": user_operation["sender"],
-                    "nonce": user_operation["nonce"],
-                    "callData": user_operation["callData"].hex() if isinstance(user_operation["callData"], bytes) else user_operation["callData"],
-                    "callGasLimit": user_operation["callGasLimit"],
-                    "verificationGasLimit": user_operation["verificationGasLimit"],
-                    "preVerificationGas": user_operation["preVerificationGas"],
-                    "maxFeePerGas": user_operation["maxFeePerGas"],
-                    "maxPriorityFeePerGas": user_operation["maxPriorityFeePerGas"],
-                },
-                "entryPoint": self.entry_point_address
-            }
+            payload = paymaster_request_payload(user_operation, self.entry_point_address)
             
             response = requests.post(
                 f"{self.paymaster_url}/sponsor",
@@ -628,33 +664,8 @@ class AccountAbstractionService:
             )
             
             if response.status_code == 200:
-                result = response.json()
-                # Paymaster 데이터 형식: paymaster_address (20 bytes) + paymaster_data (서명 등)
-                paymaster_address = result.get("paymaster_address", "")
-                paymaster_data = result.get("paymaster_data", "")
-                
-                if paymaster_address:
-                    # 주소를 bytes로 변환 (20 bytes)
-                    if paymaster_address.startswith("0x"):
-                        paymaster_address_bytes = bytes.fromhex(paymaster_address[2:])
-                    else:
-                        paymaster_address_bytes = bytes.fromhex(paymaster_address)
-                    
-                    # paymaster_data도 bytes로 변환
-                    if paymaster_data:
-                        if isinstance(paymaster_data, str):
-                            if paymaster_data.startswith("0x"):
-                                paymaster_data_bytes = bytes.fromhex(paymaster_data[2:])
-                            else:
-                                paymaster_data_bytes = bytes.fromhex(paymaster_data)
-                        else:
-                            paymaster_data_bytes = paymaster_data
-                    else:
-                        paymaster_data_bytes = b""
-                    
-                    # Paymaster 주소 + 데이터 결합
-                    paymaster_and_data = paymaster_address_bytes + paymaster_data_bytes
-                    logger.info(f"Paymaster sponsor data retrieved: {paymaster_address}")
+                paymaster_and_data = parse_paymaster_response(response.json())
+                if paymaster_and_data:
                     return paymaster_and_data
             
             logger.warning(f"Paymaster API returned error: {response.status_code}")
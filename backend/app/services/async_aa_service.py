@@ -0,0 +1,334 @@
+"""
+비동기 Account Abstraction 서비스
+AsyncWeb3Service 위에서 UserOperation 생성/서명/전송 (Bundler/Paymaster 호출은 aiohttp)
+"""
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from typing import Optional, Dict, Any, List, Tuple
+import aiohttp
+import asyncio
+import logging
+
+from app.services.aa_service import (
+    AccountAbstractionService,
+    ENTRY_POINT_ABI,
+    aa_service,
+    apply_user_operation_signature,
+    build_user_operation,
+    is_sponsored_target,
+    manual_user_operation_hash,
+    parse_paymaster_response,
+    paymaster_request_payload,
+    user_operation_to_rpc,
+    user_operation_tuple,
+)
+from app.services.async_web3_service import AsyncWeb3Service, async_web3_service
+from app.services.multicall import format_fee_history, format_logs, format_receipt
+from app.services.receipt_decoder import receipt_decoder
+
+logger = logging.getLogger(__name__)
+
+# UserOperationEvent 조회 시 전송 시점 블록보다 앞쪽 여유 (노드 간 블록 높이 차이 대비)
+USER_OPERATION_LOOKBACK_BLOCKS = 10
+
+
+class AsyncAccountAbstractionService:
+    """AccountAbstractionService의 비동기 버전 (설정은 동기 서비스와 공유)"""
+
+    def __init__(self, async_web3: AsyncWeb3Service, sync_service: AccountAbstractionService):
+        self.web3_service = async_web3
+        self.w3 = async_web3.w3
+        self.sync_service = sync_service
+        self.bundler_url = sync_service.bundler_url
+        self.paymaster_url = sync_service.paymaster_url
+        self.entry_point_address = sync_service.entry_point_address
+        self.factory_address = sync_service.factory_address
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        async_web3.contracts.register_abi("EntryPoint", ENTRY_POINT_ABI)
+
+    @property
+    def address(self) -> Optional[str]:
+        return self.web3_service.address
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Bundler/Paymaster 호출용 세션 (이벤트 루프 안에서 최초 1회 생성)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"Content-Type": "application/json"}
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_contract(self, contract_address: str, contract_name: str):
+        """비동기 컨트랙트 인스턴스 가져오기"""
+        return self.web3_service._get_contract(contract_address, contract_name)
+
+    async def generate_smart_wallet_address(
+        self,
+        user_id: str,
+        owner_address: Optional[str] = None,
+        salt: Optional[int] = None
+    ) -> str:
+        """Smart Wallet 주소 생성 및 배포 (배포 트랜잭션 대기 포함이라 스레드에서 실행)"""
+        return await asyncio.to_thread(
+            self.sync_service.generate_smart_wallet_address,
+            user_id,
+            owner_address,
+            salt
+        )
+
+    async def create_user_operation(
+        self,
+        sender: str,
+        target: str,
+        data: bytes,
+        value: int = 0,
+        nonce: Optional[int] = None,
+        call_gas_limit: Optional[int] = None,
+        verification_gas_limit: Optional[int] = None,
+        pre_verification_gas: Optional[int] = None,
+        max_fee_per_gas: Optional[int] = None,
+        max_priority_fee_per_gas: Optional[int] = None,
+        paymaster_and_data: bytes = b""
+    ) -> Dict[str, Any]:
+        """UserOperation 생성 (AccountAbstractionService.create_user_operation 참고)"""
+        # EntryPoint nonce와 가스비를 한 번의 배치로 조회
+        need_fees = max_fee_per_gas is None or max_priority_fee_per_gas is None
+        batch = self.web3_service.read_batch()
+        nonce_index = fee_index = None
+        if nonce is None:
+            try:
+                entry_point = self._get_contract(self.entry_point_address, "EntryPoint")
+                # EntryPoint에서 nonce 조회 (key는 0 사용)
+                nonce_index = batch.call(entry_point.functions.getNonce(
+                    Web3.to_checksum_address(sender),
+                    0
+                ))
+            except Exception as e:
+                logger.warning(f"Failed to get nonce from EntryPoint: {e}, using 0")
+                nonce = 0
+        if need_fees:
+            fee_index = batch.rpc("eth_feeHistory", [hex(1), "latest", []], format_fee_history)
+
+        results = await batch.execute()
+
+        if nonce_index is not None:
+            nonce = results[nonce_index]
+            if nonce is None:
+                logger.warning("Failed to get nonce from EntryPoint, using 0")
+                nonce = 0
+            else:
+                logger.info(f"Nonce from EntryPoint: {nonce}")
+
+        # 가스비 계산
+        if need_fees:
+            fee_history = results[fee_index]
+            if not fee_history:
+                raise Exception("Failed to fetch fee history")
+            base_fee = fee_history["baseFeePerGas"][0]
+            max_priority_fee_per_gas = self.w3.to_wei(2, "gwei")
+            max_fee_per_gas = base_fee + max_priority_fee_per_gas
+
+        user_operation = build_user_operation(
+            sender,
+            data,
+            nonce,
+            max_fee_per_gas,
+            max_priority_fee_per_gas,
+            call_gas_limit=call_gas_limit,
+            verification_gas_limit=verification_gas_limit,
+            pre_verification_gas=pre_verification_gas,
+            paymaster_and_data=paymaster_and_data
+        )
+
+        logger.info(f"Created UserOperation: sender={sender}, target={target}")
+        return user_operation
+
+    async def _get_user_operation_hash(self, user_operation: Dict[str, Any]) -> bytes:
+        """UserOperation 해시 (EntryPoint 조회 실패 시 수동 계산)"""
+        try:
+            entry_point = self._get_contract(self.entry_point_address, "EntryPoint")
+            user_op_hash = await entry_point.functions.getUserOpHash(
+                user_operation_tuple(user_operation)
+            ).call()
+            logger.info(f"UserOperation hash from EntryPoint: {user_op_hash.hex()}")
+            return user_op_hash
+        except Exception as e:
+            logger.warning(f"Failed to get hash from EntryPoint: {e}, using manual calculation")
+            user_op_hash = manual_user_operation_hash(user_operation)
+            logger.info(f"UserOperation hash (manual): {user_op_hash.hex()}")
+            return user_op_hash
+
+    async def sign_user_operation(
+        self,
+        user_operation: Dict[str, Any],
+        private_key: str
+    ) -> Dict[str, Any]:
+        """UserOperation 서명 (ERC-4337 표준)"""
+        user_op_hash = await self._get_user_operation_hash(user_operation)
+        return apply_user_operation_signature(user_operation, user_op_hash, private_key)
+
+    async def send_user_operation(
+        self,
+        user_operation: Dict[str, Any],
+        wait: bool = True
+    ) -> str:
+        """UserOperation을 Bundler로 전송 (Bundler 미설정/실패 시 EntryPoint 직접 전송)"""
+        if not self.bundler_url:
+            logger.warning("Bundler URL not configured, sending directly to EntryPoint")
+            return await self._send_user_operation_direct(user_operation, wait=wait)
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "eth_sendUserOperation",
+            "params": [user_operation_to_rpc(user_operation), self.entry_point_address]
+        }
+
+        try:
+            session = self._get_http_session()
+            async with session.post(
+                self.bundler_url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+
+            if "error" in result:
+                raise Exception(f"Bundler error: {result['error']}")
+
+            user_op_hash = result.get("result")
+            logger.info(f"UserOperation sent to bundler: {user_op_hash}")
+            return user_op_hash
+
+        except Exception as e:
+            logger.error(f"Failed to send UserOperation to bundler: {e}")
+            logger.info("Falling back to direct EntryPoint call")
+            return await self._send_user_operation_direct(user_operation, wait=wait)
+
+    async def wait_for_user_operation(
+        self,
+        op_or_tx_hash: str,
+        timeout: int = 120,
+        poll_interval: float = 1.0
+    ) -> Tuple[str, AttributeDict, List]:
+        """
+        UserOperation 처리 완료 대기
+
+        send_user_operation 결과는 Bundler 경유면 UserOperation 해시, 직접 전송이면 트랜잭션 해시이고
+        둘 다 66자라 형식으로 구분할 수 없으므로, 매 폴링마다 영수증 조회와
+        UserOperationEvent(userOpHash) 로그 조회를 한 번의 배치로 보냄
+
+        Returns:
+            (트랜잭션 해시, 영수증, 해당 UserOperation의 로그 목록)
+        """
+        op_or_tx_hash = Web3.to_hex(hexstr=op_or_tx_hash)
+        start_block = max(await self.w3.eth.block_number - USER_OPERATION_LOOKBACK_BLOCKS, 0)
+        event_topic = receipt_decoder.topic_for("EntryPoint", "UserOperationEvent")
+        deadline = asyncio.get_running_loop().time() + timeout
+
+        while True:
+            batch = self.web3_service.read_batch()
+            receipt_index = batch.rpc("eth_getTransactionReceipt", [op_or_tx_hash], format_receipt)
+            logs_index = None
+            if event_topic:
+                logs_index = batch.rpc("eth_getLogs", [{
+                    "fromBlock": hex(start_block),
+                    "toBlock": "latest",
+                    "address": self.entry_point_address,
+                    "topics": [event_topic, op_or_tx_hash],
+                }], format_logs, default=[])
+            results = await batch.execute()
+
+            receipt = results[receipt_index]
+            if receipt is not None:
+                if receipt.status != 1:
+                    raise Exception(f"Transaction failed: {op_or_tx_hash}")
+                # 직접 전송: 번들에 UserOperation이 하나뿐 - handleOps가 성공해도 UserOperation은 실패했을 수 있음
+                user_op_event, logs = receipt_decoder.user_operation_logs(receipt, None)
+                if user_op_event is None:
+                    # UserOperationEvent가 없는 일반 트랜잭션
+                    return op_or_tx_hash, receipt, list(receipt.logs)
+                if not user_op_event.args.success:
+                    raise Exception(f"UserOperation reverted: {op_or_tx_hash}")
+                return op_or_tx_hash, receipt, logs
+
+            events = results[logs_index] if logs_index is not None else None
+            if events:
+                tx_hash = events[0].transactionHash.hex()
+                receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
+                user_op_event, logs = receipt_decoder.user_operation_logs(receipt, op_or_tx_hash)
+                if user_op_event is not None and not user_op_event.args.success:
+                    raise Exception(f"UserOperation reverted: {op_or_tx_hash}")
+                return tx_hash, receipt, logs
+
+            if asyncio.get_running_loop().time() >= deadline:
+                raise TimeoutError(f"UserOperation not included within {timeout}s: {op_or_tx_hash}")
+            await asyncio.sleep(poll_interval)
+
+    async def _send_user_operation_direct(
+        self,
+        user_operation: Dict[str, Any],
+        wait: bool = True
+    ) -> str:
+        """EntryPoint.handleOps 직접 호출 (로컬 테스트용)"""
+        try:
+            entry_point = self._get_contract(self.entry_point_address, "EntryPoint")
+            function = entry_point.functions.handleOps(
+                [user_operation_tuple(user_operation)],
+                self.address  # beneficiary (가스비 수령자)
+            )
+
+            tx_hash = await self.web3_service._send_transaction(function, wait=wait)
+            logger.info(f"UserOperation sent directly to EntryPoint: {tx_hash}")
+            return tx_hash
+
+        except Exception as e:
+            logger.error(f"Failed to send UserOperation to EntryPoint: {e}")
+            raise
+
+    async def get_paymaster_sponsor_data(
+        self,
+        user_operation: Dict[str, Any],
+        target: Optional[str] = None
+    ) -> bytes:
+        """Paymaster 스폰서 데이터 (스폰서 대상이 아니면 빈 바이트)"""
+        if not self.paymaster_url:
+            logger.info("Paymaster URL not configured, skipping sponsor")
+            return b""
+
+        if is_sponsored_target(target):
+            return await self._get_paymaster_data(user_operation)
+
+        logger.info("Paymaster sponsor not applicable")
+        return b""
+
+    async def _get_paymaster_data(self, user_operation: Dict[str, Any]) -> bytes:
+        """Paymaster 서비스에서 스폰서 데이터 가져오기"""
+        try:
+            session = self._get_http_session()
+            async with session.post(
+                f"{self.paymaster_url}/sponsor",
+                json=paymaster_request_payload(user_operation, self.entry_point_address),
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status == 200:
+                    paymaster_and_data = parse_paymaster_response(await response.json())
+                    if paymaster_and_data:
+                        return paymaster_and_data
+
+                logger.warning(f"Paymaster API returned error: {response.status}")
+                return b""
+
+        except Exception as e:
+            logger.warning(f"Failed to get Paymaster sponsor data: {e}")
+            return b""
+
+
+async_aa_service = AsyncAccountAbstractionService(async_web3_service, aa_service)
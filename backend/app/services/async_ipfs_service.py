@@ -0,0 +1,230 @@
+"""
+비동기 IPFS 게이트웨이 클라이언트
+게이트웨이별 keep-alive 연결 풀, 지연 시간/오류 통계로 정한 순서대로 헤지(hedged) 요청, 서킷 브레이커
+
+- 가장 빠른 게이트웨이부터 요청하고, hedge_delay 안에 응답이 없거나 실패하면 다음 게이트웨이도 동시에 요청
+- 처음 도착한 유효한 JSON을 사용하고 나머지 요청은 취소
+- 연속 실패가 breaker_failures번이면 breaker_cooldown 동안 건너뜀 (이후 한 번 시험 요청)
+- 받은 내용은 CID 검증 후 ipfs_cache에 저장 (같은 CID는 다시 네트워크로 나가지 않음)
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
+import asyncio
+import json
+import time
+import logging
+
+from app.core.config import settings
+from app.services.ipfs_cache import ipfs_cache
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayError(Exception):
+    pass
+
+
+class Gateway:
+    """게이트웨이 하나의 연결 풀과 통계"""
+
+    # 지연 시간 EWMA 가중치
+    ALPHA = 0.2
+
+    def __init__(self, base_url: str, initial_latency: float = 1.0):
+        self.base_url = base_url.rstrip("/")
+        self.name = urlparse(self.base_url).netloc or self.base_url
+        self.latency = initial_latency  # 성공 응답 지연 시간 EWMA (초)
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0  # 서킷 브레이커가 열려 있는 시각 (monotonic)
+        self.probing = False  # 쿨다운 후 시험 요청 중
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def session(self, pool_size: int) -> aiohttp.ClientSession:
+        """게이트웨이 전용 keep-alive 세션 (이벤트 루프 안에서 최초 1회 생성)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=pool_size, keepalive_timeout=60),
+                headers={"Accept": "application/json"},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def error_rate(self) -> float:
+        finished = self.successes + self.failures
+        return self.failures / finished if finished else 0.0
+
+    def available(self, now: float) -> bool:
+        """브레이커가 닫혀 있거나, 쿨다운이 끝났고 아직 시험 요청 중이 아님"""
+        return now >= self.open_until and not self.probing
+
+    def score(self) -> float:
+        """낮을수록 먼저 시도 (지연 시간에 오류율 가중)"""
+        return self.latency * (1 + 4 * self.error_rate)
+
+    def record_success(self, elapsed: float) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.latency = (1 - self.ALPHA) * self.latency + self.ALPHA * elapsed
+
+    def record_failure(self, breaker_failures: int, cooldown: float) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.probing or self.consecutive_failures >= breaker_failures:
+            if self.open_until <= time.monotonic():
+                logger.warning(f"IPFS gateway {self.name} circuit open for {cooldown}s")
+            self.open_until = time.monotonic() + cooldown
+        self.probing = False
+
+    def stats(self) -> dict:
+        return {
+            "latency_ms": round(self.latency * 1000, 1),
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "error_rate": round(self.error_rate, 3),
+            "circuit_open": self.open_until > time.monotonic(),
+        }
+
+
+class AsyncIPFSService:
+    def __init__(
+        self,
+        gateways: List[str],
+        timeout: float = 10.0,
+        hedge_delay: float = 0.3,
+        pool_size: int = 20,
+        breaker_failures: int = 5,
+        breaker_cooldown: float = 30.0,
+    ):
+        self.gateways = [Gateway(url) for url in gateways]
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.pool_size = pool_size
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self._stats = {"requests": 0, "hedged": 0, "not_found": 0}
+
+    async def close(self) -> None:
+        for gateway in self.gateways:
+            await gateway.close()
+
+    def ordered_gateways(self) -> List[Gateway]:
+        """시도 순서: 사용 가능한 게이트웨이를 점수순으로, 브레이커가 열린 게이트웨이는 마지막에"""
+        now = time.monotonic()
+        available = sorted((g for g in self.gateways if g.available(now)), key=Gateway.score)
+        # 모두 열려 있으면 그래도 시도 (아무것도 안 하는 것보다 나음)
+        rest = sorted((g for g in self.gateways if g not in available), key=lambda g: g.open_until)
+        return available + rest
+
+    async def _fetch(self, gateway: Gateway, path: str) -> Tuple[bytes, Any]:
+        gateway.requests += 1
+        if gateway.open_until and gateway.open_until <= time.monotonic():
+            gateway.probing = True
+        started = time.perf_counter()
+        try:
+            async with gateway.session(self.pool_size).get(
+                f"{gateway.base_url}/{path}",
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                if response.status != 200:
+                    raise GatewayError(f"HTTP {response.status}")
+                raw = await response.read()
+                data = json.loads(raw)
+        except asyncio.CancelledError:
+            # 다른 게이트웨이가 먼저 응답 - 실패로 치지 않음
+            gateway.cancelled += 1
+            gateway.probing = False
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, GatewayError, ValueError) as e:
+            gateway.record_failure(self.breaker_failures, self.breaker_cooldown)
+            raise GatewayError(f"{gateway.name}: {e or type(e).__name__}") from e
+        gateway.record_success(time.perf_counter() - started)
+        return raw, data
+
+    async def get_json(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        IPFS에서 JSON 데이터 조회 (게이트웨이 헤지 요청)
+
+        Args:
+            ipfs_hash: IPFS 해시 (ipfs:// 접두사 허용)
+
+        Returns:
+            JSON 데이터 또는 None (모든 게이트웨이 실패)
+        """
+        hash_clean = ipfs_hash.replace("ipfs://", "").strip()
+        self._stats["requests"] += 1
+        cached = ipfs_cache.get_memory(hash_clean)
+        if cached is None:
+            cached = await run_in_threadpool(ipfs_cache.get, hash_clean)
+        if cached is not None:
+            return cached
+
+        pending_gateways = self.ordered_gateways()
+        running: Dict[asyncio.Task, Gateway] = {}
+        errors: List[str] = []
+        deadline = time.monotonic() + self.timeout
+
+        try:
+            while pending_gateways or running:
+                # 처음, 또는 hedge_delay가 지났거나 실패가 있었으면 다음 게이트웨이 시작
+                if pending_gateways:
+                    gateway = pending_gateways.pop(0)
+                    if running:
+                        self._stats["hedged"] += 1
+                    running[asyncio.create_task(self._fetch(gateway, hash_clean))] = gateway
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # 다음 게이트웨이를 띄우기 전까지 (마지막 게이트웨이면 끝까지) 대기
+                wait = min(self.hedge_delay, remaining) if pending_gateways else remaining
+                done, _ = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    gateway = running.pop(task)
+                    try:
+                        raw, data = task.result()
+                    except GatewayError as e:
+                        errors.append(str(e))
+                        continue
+                    logger.info(f"Retrieved JSON from IPFS via {gateway.name}: {hash_clean}")
+                    await run_in_threadpool(ipfs_cache.put, hash_clean, raw, data)
+                    return data
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        self._stats["not_found"] += 1
+        logger.error(f"Failed to retrieve JSON from IPFS: {hash_clean} ({'; '.join(errors) or 'timed out'})")
+        return None
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "gateways": {gateway.name: gateway.stats() for gateway in self.gateways},
+        }
+
+
+async_ipfs_service = AsyncIPFSService(
+    gateways=settings.IPFS_GATEWAYS,
+    timeout=settings.IPFS_GATEWAY_TIMEOUT_SECONDS,
+    hedge_delay=settings.IPFS_HEDGE_DELAY_SECONDS,
+    pool_size=settings.IPFS_GATEWAY_POOL_SIZE,
+    breaker_failures=settings.IPFS_BREAKER_FAILURES,
+    breaker_cooldown=settings.IPFS_BREAKER_COOLDOWN_SECONDS,
+)
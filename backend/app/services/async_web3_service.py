@@ -0,0 +1,375 @@
+"""
+비동기 Web3 서비스
+AsyncWeb3/AsyncHTTPProvider 기반 - FastAPI 핸들러에서 이벤트 루프를 막지 않고 await
+"""
+from web3 import AsyncWeb3, Web3
+from web3.exceptions import TimeExhausted
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import aiohttp
+import asyncio
+import logging
+
+from app.services.contract_registry import ContractRegistry
+from app.services.multicall import AsyncReadBatch, hex_to_int, rpc_batch_payload, rpc_batch_results
+from app.services.web3_service import Web3Service, event_tuple_to_dict, web3_service
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWeb3Service:
+    """
+    Web3Service의 비동기 버전
+
+    서비스 계정, nonce 관리자, ABI 캐시는 동기 Web3Service와 공유하므로
+    두 경로에서 동시에 트랜잭션을 보내도 nonce가 충돌하지 않음
+    """
+
+    NONCE_RETRIES = Web3Service.NONCE_RETRIES
+
+    def __init__(self, sync_service: Web3Service):
+        self.sync_service = sync_service
+        self.rpc_url = sync_service.rpc_url
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc_url))
+        self.contracts = ContractRegistry(self.w3, parent=sync_service.contracts)
+        self.multicall_address = sync_service.multicall_address
+        self._multicall_available = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def account(self):
+        return self.sync_service.account
+
+    @property
+    def address(self) -> Optional[str]:
+        return self.sync_service.address
+
+    @property
+    def nonces(self):
+        return self.sync_service.nonces
+
+    async def is_connected(self) -> bool:
+        try:
+            return await self.w3.is_connected()
+        except Exception:
+            return False
+
+    def _get_contract(self, contract_address: str, contract_name: str):
+        """비동기 컨트랙트 인스턴스 가져오기 (주소/이름별 캐시)"""
+        return self.contracts.get_contract(contract_address, contract_name)
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """JSON-RPC 배치용 keep-alive 세션 (이벤트 루프 안에서 최초 1회 생성)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def has_multicall(self) -> bool:
+        """Multicall3 배포 여부 (최초 1회만 확인, 동기 서비스가 이미 확인했으면 재사용)"""
+        if self._multicall_available is None:
+            if self.sync_service._multicall_available is not None:
+                self._multicall_available = self.sync_service._multicall_available
+                return self._multicall_available
+            available = False
+            if self.multicall_address:
+                try:
+                    code = await self.w3.eth.get_code(Web3.to_checksum_address(self.multicall_address))
+                    available = len(code) > 0
+                except Exception as e:
+                    logger.warning(f"Failed to check Multicall3 deployment: {e}")
+            self._multicall_available = available
+        return self._multicall_available
+
+    def read_batch(self) -> AsyncReadBatch:
+        """읽기 배치 생성 (Web3Service.read_batch 참고, execute()는 await)"""
+        return AsyncReadBatch(self)
+
+    async def rpc_batch(self, calls: List[Tuple[str, list]], timeout: int = 30) -> List[Optional[Any]]:
+        """JSON-RPC 배치 요청 (Web3Service.rpc_batch의 비동기 버전)"""
+        if not calls:
+            return []
+
+        session = self._get_http_session()
+        async with session.post(
+            self.rpc_url,
+            json=rpc_batch_payload(calls),
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            response.raise_for_status()
+            body = await response.json(content_type=None)
+        return rpc_batch_results(calls, body)
+
+    async def _sign_and_send(self, build_transaction: Callable[[int], Awaitable[dict]]) -> str:
+        """nonce 할당 → 서명 → 전송 (Web3Service._sign_and_send의 비동기 버전)"""
+        if not self.account:
+            raise Exception("Service account not configured")
+
+        for attempt in range(self.NONCE_RETRIES):
+            # 최초 할당 시 체인 조회가 있을 수 있으므로 스레드에서 실행
+            nonce = await asyncio.to_thread(self.nonces.allocate)
+            signed_txn = None
+            try:
+                transaction = await build_transaction(nonce)
+                signed_txn = self.account.sign_transaction(transaction)
+                tx_hash = await self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                return tx_hash.hex()
+            except Exception as e:
+                if signed_txn is not None and self.nonces.is_already_known(e):
+                    logger.info(f"Transaction with nonce {nonce} already known")
+                    return signed_txn.hash.hex()
+                if self.nonces.is_nonce_error(e) and attempt < self.NONCE_RETRIES - 1:
+                    logger.warning(f"Nonce conflict on {nonce}, resyncing: {e}")
+                    self.nonces.release(nonce)
+                    await asyncio.to_thread(self.nonces.resync)
+                    continue
+                self.nonces.release(nonce)
+                raise
+
+        raise Exception("Failed to send transaction: nonce retries exhausted")
+
+    async def wait_for_receipt(self, tx_hash: str, timeout: int = 120):
+        """트랜잭션 영수증 대기 (이벤트 루프를 막지 않음)"""
+        try:
+            receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        except TimeExhausted:
+            await asyncio.to_thread(self.nonces.fill_gaps)
+            raise
+
+        if receipt.status != 1:
+            raise Exception(f"Transaction failed: {tx_hash}")
+
+        logger.info(f"Transaction successful: {tx_hash}")
+        return receipt
+
+    async def _send_transaction(self, contract_function, value: int = 0, wait: bool = True) -> str:
+        """트랜잭션 전송 (wait=False면 해시만 반환)"""
+        gas_price = await self.w3.eth.gas_price
+
+        async def build(nonce: int) -> dict:
+            return await contract_function.build_transaction({
+                'from': self.address,
+                'nonce': nonce,
+                'gas': 500000,  # 가스 한도
+                'gasPrice': gas_price,
+                'value': value,
+            })
+
+        tx_hash = await self._sign_and_send(build)
+        if wait:
+            await self.wait_for_receipt(tx_hash)
+        return tx_hash
+
+    async def transfer(self, to_address: str, value: int, wait: bool = True) -> str:
+        """서비스 계정에서 이더 전송"""
+        # 가스 가격과 체인 ID를 한 번의 배치로 조회
+        batch = self.read_batch()
+        batch.rpc("eth_gasPrice", [], hex_to_int)
+        batch.rpc("eth_chainId", [], hex_to_int)
+        gas_price, chain_id = await batch.execute()
+        if gas_price is None or chain_id is None:
+            raise Exception("Failed to fetch gas price / chain id")
+
+        async def build(nonce: int) -> dict:
+            return {
+                'from': self.address,
+                'to': Web3.to_checksum_address(to_address),
+                'nonce': nonce,
+                'value': value,
+                'gas': 21000,
+                'gasPrice': gas_price,
+                'chainId': chain_id,
+            }
+
+        tx_hash = await self._sign_and_send(build)
+        if wait:
+            await self.wait_for_receipt(tx_hash, timeout=60)
+        return tx_hash
+
+    async def create_event_onchain(
+        self,
+        event_manager_address: str,
+        ipfs_hash: str,
+        price: int,
+        max_tickets: int,
+        start_time: int,
+        end_time: int,
+        event_date: int
+    ) -> Optional[int]:
+        """온체인에 이벤트 생성"""
+        try:
+            contract = self._get_contract(event_manager_address, "EventManager")
+            function = contract.functions.createEvent(
+                ipfs_hash,
+                price,
+                max_tickets,
+                start_time,
+                end_time,
+                event_date
+            )
+
+            tx_hash = await self._send_transaction(function, wait=False)
+            receipt = await self.wait_for_receipt(tx_hash)
+
+            # 트랜잭션 로그에서 eventId 추출
+            event_created = contract.events.EventCreated()
+            for log in receipt.logs:
+                try:
+                    decoded = event_created.process_log(log)
+                    event_id = decoded.args.eventId
+                    logger.info(f"Event created onchain: eventId={event_id}, tx={tx_hash}")
+                    return event_id
+                except Exception:
+                    continue
+
+            # 로그에서 추출 실패 시 컨트랙트에서 직접 조회
+            current_id = await contract.functions.getCurrentEventId().call()
+            return current_id - 1
+
+        except Exception as e:
+            logger.error(f"Failed to create event onchain: {e}")
+            raise
+
+    async def approve_event_onchain(self, event_manager_address: str, event_id: int) -> Optional[str]:
+        """온체인에서 이벤트 승인"""
+        try:
+            contract = self._get_contract(event_manager_address, "EventManager")
+            tx_hash = await self._send_transaction(contract.functions.approveEvent(event_id))
+
+            logger.info(f"Event approved onchain: eventId={event_id}, tx={tx_hash}")
+            return tx_hash
+
+        except Exception as e:
+            logger.error(f"Failed to approve event onchain: {e}")
+            raise
+
+    async def purchase_ticket_onchain(
+        self,
+        event_manager_address: str,
+        event_id: int,
+        token_uri: str,
+        value: int,
+        buyer_address: str
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """온체인에서 티켓 구매"""
+        try:
+            contract = self._get_contract(event_manager_address, "EventManager")
+            function = contract.functions.purchaseTicket(event_id, token_uri)
+
+            tx_hash = await self._send_transaction(function, value=value, wait=False)
+            receipt = await self.wait_for_receipt(tx_hash)
+
+            # 트랜잭션 로그에서 tokenId 추출
+            ticket_sold = contract.events.TicketSold()
+            for log in receipt.logs:
+                try:
+                    decoded = ticket_sold.process_log(log)
+                    token_id = decoded.args.tokenId
+                    logger.info(f"Ticket purchased onchain: tokenId={token_id}, tx={tx_hash}")
+                    return tx_hash, token_id
+                except Exception:
+                    continue
+
+            logger.warning(f"Could not extract tokenId from transaction: {tx_hash}")
+            return tx_hash, None
+
+        except Exception as e:
+            logger.error(f"Failed to purchase ticket onchain: {e}")
+            raise
+
+    async def list_ticket_for_resale(
+        self,
+        marketplace_address: str,
+        ticket_nft_address: str,
+        token_id: int,
+        price: int
+    ) -> Optional[str]:
+        """티켓을 재판매 마켓플레이스에 등록"""
+        try:
+            # 1. TicketNFT 컨트랙트에서 approve
+            ticket_nft = self._get_contract(ticket_nft_address, "TicketNFT")
+            approve_tx = await self._send_transaction(
+                ticket_nft.functions.approve(marketplace_address, token_id)
+            )
+            logger.info(f"Ticket approved for marketplace: tx={approve_tx}")
+
+            # 2. TicketMarketplace 컨트랙트에서 listTicketForResale
+            marketplace = self._get_contract(marketplace_address, "TicketMarketplace")
+            list_tx = await self._send_transaction(
+                marketplace.functions.listTicketForResale(token_id, price)
+            )
+
+            logger.info(f"Ticket listed for resale: tokenId={token_id}, price={price}, tx={list_tx}")
+            return list_tx
+
+        except Exception as e:
+            logger.error(f"Failed to list ticket for resale: {e}")
+            raise
+
+    async def buy_resale_ticket(
+        self,
+        marketplace_address: str,
+        token_id: int,
+        value: int,
+        buyer_address: str
+    ) -> Optional[str]:
+        """재판매 티켓 구매"""
+        try:
+            marketplace = self._get_contract(marketplace_address, "TicketMarketplace")
+            tx_hash = await self._send_transaction(
+                marketplace.functions.buyResaleTicket(token_id),
+                value=value
+            )
+
+            logger.info(f"Resale ticket purchased: tokenId={token_id}, tx={tx_hash}")
+            return tx_hash
+
+        except Exception as e:
+            logger.error(f"Failed to buy resale ticket: {e}")
+            raise
+
+    async def process_refund(
+        self,
+        refund_manager_address: str,
+        ticket_nft_address: str,
+        token_id: int
+    ) -> Optional[str]:
+        """환불 처리 (티켓 소각)"""
+        try:
+            refund_manager = self._get_contract(refund_manager_address, "RefundManager")
+            tx_hash = await self._send_transaction(refund_manager.functions.processRefund(token_id))
+
+            logger.info(f"Refund processed: tokenId={token_id}, tx={tx_hash}")
+            return tx_hash
+
+        except Exception as e:
+            logger.error(f"Failed to process refund: {e}")
+            raise
+
+    async def get_event_onchain(self, event_manager_address: str, event_id: int) -> Optional[dict]:
+        """온체인에서 이벤트 정보 조회"""
+        try:
+            contract = self._get_contract(event_manager_address, "EventManager")
+            event = await contract.functions.getEvent(event_id).call()
+
+            return event_tuple_to_dict(event)
+        except Exception as e:
+            logger.error(f"Failed to get event onchain: {e}")
+            return None
+
+    async def get_events_onchain(self, event_manager_address: str, event_ids: List[int]) -> List[Optional[dict]]:
+        """여러 이벤트 정보를 한 번의 배치로 조회 (조회 실패한 이벤트는 None)"""
+        contract = self._get_contract(event_manager_address, "EventManager")
+        batch = self.read_batch()
+        for event_id in event_ids:
+            batch.call(contract.functions.getEvent(event_id))
+        return [
+            event_tuple_to_dict(event) if event is not None else None
+            for event in await batch.execute()
+        ]
+
+
+async_web3_service = AsyncWeb3Service(web3_service)
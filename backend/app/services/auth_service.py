@@ -1,25 +1,40 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import Optional
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate
-from app.core.security import verify_password, get_password_hash, create_access_token
-from datetime import timedelta
+from app.core.security import create_access_token
+from app.services.password_hasher import PasswordHasherBusyError, password_hasher
+from app.services.principal_cache import PRINCIPAL_CLAIM, principal_values
+from datetime import datetime, timedelta
 from app.core.config import settings
 
 
-def create_user(db: Session, user_create: UserCreate) -> User:
+def _password_busy() -> HTTPException:
+    """해싱 풀 포화 → 429 (대기열에 쌓지 않고 바로 거절)"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+async def create_user(db: AsyncSession, user_create: UserCreate) -> User:
     """사용자 생성"""
     # 이메일 중복 확인
-    existing_user = db.query(User).filter(User.email == user_create.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_create.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # 비밀번호 해싱
-    hashed_password = get_password_hash(user_create.password)
+    # 비밀번호 해싱 (전용 스레드 풀)
+    try:
+        hashed_password = await password_hasher.hash(user_create.password)
+    except PasswordHasherBusyError:
+        raise _password_busy()
     
     # 사용자 생성
     db_user = User(
@@ -28,29 +43,42 @@ def create_user(db: Session, user_create: UserCreate) -> User:
         role=user_create.role,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """사용자 인증"""
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         return None
     if not user.hashed_password:
         return None
-    # 비밀번호 검증
-    if not verify_password(password, user.hashed_password):
+    # 비밀번호 검증 (전용 스레드 풀)
+    try:
+        ok, new_hash = await password_hasher.verify(password, user.hashed_password)
+    except PasswordHasherBusyError:
+        raise _password_busy()
+    if not ok:
         return None
+    # BCRYPT_ROUNDS가 바뀐 뒤 첫 로그인이면 새 cost의 해시로 교체
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 
 def create_access_token_for_user(user: User) -> str:
     """사용자용 액세스 토큰 생성"""
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    data = {"sub": str(user.id), "email": user.email, "role": user.role}
+    # 사용자 정보를 담아 get_current_user가 DB 조회 없이 사용 (principal_cache)
+    if settings.AUTH_TOKEN_PRINCIPAL_CLAIMS:
+        data[PRINCIPAL_CLAIM] = principal_values(user)
+        data["iat"] = datetime.utcnow()
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email, "role": user.role},
+        data=data,
         expires_delta=access_token_expires
     )
     return access_token
@@ -0,0 +1,292 @@
+"""
+이벤트 카탈로그 캐시
+GET /events, GET /events/{id} 응답 본문(JSON)을 TTL+LRU로 캐시하고 ETag/Last-Modified 조건부 요청(304) 처리
+
+무효화는 범위(scope)별 세대(generation) 값으로 처리
+- "list": 목록 페이지 전체 (이벤트 하나만 바뀌어도 어느 페이지에 있는지 알 수 없음)
+- "event:{id}": 이벤트 상세
+항목은 만들 때의 세대 값을 함께 저장하고, 조회 시 현재 세대와 다르면 miss
+(저장소가 공유 캐시면 다른 워커의 무효화도 바로 반영)
+"""
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response, status
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LIST_SCOPE = "list"
+
+
+def event_scope(event_id) -> str:
+    return f"event:{event_id}"
+
+
+class LocalCatalogStore:
+    """프로세스 내 TTL+LRU 저장소 (공유 캐시가 없을 때의 대체 구현, 워커마다 따로 보관)"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 1000, generation_ttl: float = 86400.0):
+        self.max_entries = max_entries
+        self.generation_ttl = generation_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, Tuple[float, float]] = {}  # scope -> (세대, 만료 시각)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, scopes: Sequence[str]) -> List[Optional[float]]:
+        now = time.monotonic()
+        with self._lock:
+            result = []
+            for scope in scopes:
+                item = self._generations.get(scope)
+                result.append(item[0] if item and item[1] >= now else None)
+            return result
+
+    def bump(self, scopes: Iterable[str], generation: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for scope in scopes:
+                self._generations[scope] = (generation, now + self.generation_ttl)
+            if len(self._generations) > self.max_entries * 4:
+                self._generations = {
+                    scope: item for scope, item in self._generations.items() if item[1] >= now
+                }
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCatalogStore:
+    """
+    Redis 공유 저장소 (CATALOG_CACHE_REDIS_URL 설정 시, redis 패키지 필요)
+
+    LRU 제거는 Redis maxmemory-policy(allkeys-lru)에 맡김
+    """
+
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "catalog:", generation_ttl: float = 86400.0):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self.prefix = prefix
+        self.generation_ttl = int(generation_ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, json.dumps(value, separators=(",", ":")), px=max(int(ttl * 1000), 1))
+
+    def generations(self, scopes: Sequence[str]) -> List[Optional[float]]:
+        values = self.client.mget([f"{self.prefix}gen:{scope}" for scope in scopes])
+        return [float(value) if value is not None else None for value in values]
+
+    def bump(self, scopes: Iterable[str], generation: float) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for scope in scopes:
+            pipe.set(f"{self.prefix}gen:{scope}", repr(generation), ex=self.generation_ttl)
+        pipe.execute()
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+@dataclass
+class CatalogEntry:
+    body: str
+    etag: str
+    last_modified: float  # epoch seconds
+    headers: Dict[str, str]
+    generations: List[Optional[float]]
+
+
+class CatalogCache:
+    """
+    직렬화된 카탈로그 응답 캐시
+
+    세대 값은 무효화 시각(epoch)이라 Last-Modified 계산에도 사용
+    저장소 장애 시에는 캐시 없이 DB에서 응답 (요청은 실패시키지 않음)
+    """
+
+    def __init__(self, store, ttl: float = 30.0, enabled: bool = True):
+        self.store = store
+        self.ttl = ttl
+        self.enabled = enabled
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "not_modified": 0, "invalidations": 0, "errors": 0}
+
+    async def _call(self, fn, *args):
+        # 공유 저장소는 네트워크 I/O라 스레드에서 실행 (로컬 저장소는 바로 호출)
+        if self.store.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def get(self, key: str, scopes: Sequence[str]) -> Tuple[Optional[CatalogEntry], List[Optional[float]]]:
+        """
+        캐시 조회
+
+        Returns:
+            (항목 또는 None, 현재 세대) - miss면 DB 조회 전에 받은 세대를 put()에 그대로 넘김
+            (조회 중에 무효화되면 저장한 항목이 다음 조회에서 바로 miss가 되도록)
+        """
+        if not self.enabled:
+            return None, []
+        try:
+            generations = await self._call(self.store.generations, scopes)
+            value = await self._call(self.store.get, key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Catalog cache lookup failed: {e}")
+            return None, []
+
+        if value is None:
+            self._stats["misses"] += 1
+            return None, generations
+        entry = CatalogEntry(**value) if isinstance(value, dict) else value
+        if entry.generations != generations:
+            self._stats["stale"] += 1
+            return None, generations
+        self._stats["hits"] += 1
+        return entry, generations
+
+    async def put(
+        self,
+        key: str,
+        generations: List[Optional[float]],
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        modified_at: Optional[datetime] = None,
+        time_dependent: bool = False,
+    ) -> CatalogEntry:
+        """
+        응답 본문 저장 후 항목 반환
+
+        Args:
+            modified_at: 본문 내용 중 가장 최근 수정 시각 (Last-Modified 계산용, UTC naive)
+            time_dependent: 현재 시각에 따라 결과가 바뀌는 조회 (판매 중 필터 등) - 만든 시각을 Last-Modified로
+        """
+        text = body.decode()
+        candidates = [generation for generation in generations if generation is not None]
+        if modified_at is not None:
+            candidates.append(modified_at.replace(tzinfo=timezone.utc).timestamp())
+        if time_dependent or not candidates:
+            candidates.append(time.time())
+        entry = CatalogEntry(
+            body=text,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            last_modified=max(candidates),
+            headers=dict(headers or {}),
+            generations=list(generations),
+        )
+        if self.enabled:
+            try:
+                value = asdict(entry) if self.store.blocking else entry
+                await self._call(self.store.set, key, value, self.ttl)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Catalog cache store failed: {e}")
+        return entry
+
+    def respond(self, request: Request, entry: CatalogEntry) -> Response:
+        """조건부 요청이면 304, 아니면 캐시된 본문으로 200"""
+        headers = {
+            **entry.headers,
+            "ETag": entry.etag,
+            "Last-Modified": format_datetime(datetime.fromtimestamp(int(entry.last_modified), timezone.utc), usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        if self._not_modified(request, entry):
+            self._stats["not_modified"] += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _not_modified(request: Request, entry: CatalogEntry) -> bool:
+        # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag.removeprefix("W/") == entry.etag for tag in tags)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return int(entry.last_modified) <= since.timestamp()
+        return False
+
+    def _scopes(self, event_ids: Iterable) -> List[str]:
+        return [LIST_SCOPE, *(event_scope(event_id) for event_id in event_ids)]
+
+    async def invalidate_events(self, event_ids: Iterable) -> None:
+        """이벤트 변경 커밋 후 호출 (목록 전체 + 해당 이벤트 상세 무효화)"""
+        try:
+            await self._call(self.store.bump, self._scopes(event_ids), time.time())
+            self._stats["invalidations"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Catalog cache invalidation failed: {e}")
+
+    def invalidate_events_sync(self, event_ids: Iterable) -> None:
+        """백그라운드 스레드(재고 sweeper 등)용"""
+        try:
+            self.store.bump(self._scopes(event_ids), time.time())
+            self._stats["invalidations"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Catalog cache invalidation failed: {e}")
+
+    def stats(self) -> dict:
+        return {**self._stats, "entries": self.store.size(), "ttl_seconds": self.ttl, "enabled": self.enabled}
+
+
+def _create_store():
+    generation_ttl = max(settings.CATALOG_CACHE_TTL_SECONDS * 10, 86400.0)
+    if settings.CATALOG_CACHE_REDIS_URL:
+        try:
+            return RedisCatalogStore(settings.CATALOG_CACHE_REDIS_URL, generation_ttl=generation_ttl)
+        except ImportError:
+            logger.warning("redis package not installed, using in-process catalog cache")
+    return LocalCatalogStore(settings.CATALOG_CACHE_MAX_ENTRIES, generation_ttl=generation_ttl)
+
+
+catalog_cache = CatalogCache(
+    store=_create_store(),
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    enabled=settings.CATALOG_CACHE_ENABLED,
+)
@@ -0,0 +1,528 @@
+"""
+체인 이벤트 인덱서
+EventManager / TicketNFT / TicketMarketplace / RefundManager 로그를 eth_getLogs로 블록 범위씩 따라가며
+Event, Ticket, Resale, RefundRequest, Transaction 테이블에 반영
+"""
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+import threading
+import uuid
+import logging
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.event import Event, EventStatus
+from app.models.indexer import IndexerCheckpoint, IndexedLog
+from app.models.refund import RefundRequest, RefundStatus
+from app.models.resale import Resale, ResaleStatus
+from app.models.ticket import Ticket, TicketStatus
+from app.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.models.user import User
+from app.services.receipt_decoder import DecodedLog, ReceiptDecoder, ZERO_ADDRESS
+from app.services.web3_service import Web3Service, web3_service
+
+logger = logging.getLogger(__name__)
+
+# 주소 속성 → (ABI 이름, 인덱싱할 이벤트)
+INDEXED_EVENTS = {
+    "event_manager_address": ("EventManager", ["EventCreated", "EventApproved", "EventCancelled", "TicketSold"]),
+    "ticket_nft_address": ("TicketNFT", ["TicketMinted", "TicketBurned", "Transfer"]),
+    "marketplace_address": ("TicketMarketplace", ["TicketListed", "TicketSold", "ListingCancelled"]),
+    "refund_manager_address": ("RefundManager", ["RefundRequested", "RefundProcessed"]),
+}
+
+
+class _Batch:
+    """한 블록 범위를 반영하는 동안 쓰는 미리 로드된 행 캐시"""
+
+    def __init__(self):
+        self.events_by_onchain: Dict[int, Event] = {}
+        self.tickets_by_token: Dict[int, Ticket] = {}
+        self.unresolved_tickets: List[Ticket] = []  # token_id가 아직 NULL인 티켓
+        self.listed_resales: Dict[int, Resale] = {}
+        self.open_refunds: Dict[uuid.UUID, RefundRequest] = {}
+        self.users_by_address: Dict[str, User] = {}
+        self.transactions: Dict[str, dict] = {}
+
+
+class ChainIndexer:
+    """
+    확정된 블록(head - confirmations)까지만 반영하고, 체크포인트 블록 해시가 바뀌면
+    confirmations 만큼 되감아 다시 처리 (이미 반영한 로그는 IndexedLog로 건너뜀)
+    """
+
+    def __init__(
+        self,
+        web3_service: Web3Service,
+        session_factory: Callable[[], Session] = SessionLocal,
+        name: str = "main",
+        start_block: int = 0,
+        batch_blocks: int = 2000,
+        confirmations: int = 12,
+        poll_interval: float = 3.0,
+    ):
+        self.web3_service = web3_service
+        self.session_factory = session_factory
+        self.name = name
+        self.start_block = start_block
+        self.batch_blocks = batch_blocks
+        self.confirmations = confirmations
+        self.poll_interval = poll_interval
+        self._decoder: Optional[ReceiptDecoder] = None
+        self._handlers = {
+            ("EventManager", "EventCreated"): self._on_event_created,
+            ("EventManager", "EventApproved"): self._on_event_approved,
+            ("EventManager", "EventCancelled"): self._on_event_cancelled,
+            ("EventManager", "TicketSold"): self._on_ticket_sold,
+            ("TicketNFT", "TicketMinted"): self._on_ticket_minted,
+            ("TicketNFT", "TicketBurned"): self._on_ticket_burned,
+            ("TicketNFT", "Transfer"): self._on_transfer,
+            ("TicketMarketplace", "TicketListed"): self._on_ticket_listed,
+            ("TicketMarketplace", "TicketSold"): self._on_resale_sold,
+            ("TicketMarketplace", "ListingCancelled"): self._on_listing_cancelled,
+            ("RefundManager", "RefundRequested"): self._on_refund_requested,
+            ("RefundManager", "RefundProcessed"): self._on_refund_processed,
+        }
+
+    def _get_decoder(self) -> ReceiptDecoder:
+        """인덱싱 대상 이벤트만 등록한 디코더 (최초 1회)"""
+        if self._decoder is None:
+            decoder = ReceiptDecoder(self.web3_service.contracts, self.web3_service.w3.codec)
+            for attr, (contract_name, event_names) in INDEXED_EVENTS.items():
+                if not decoder.register(getattr(self.web3_service, attr, None), contract_name, event_names):
+                    logger.warning(f"{attr} not configured, skipping {contract_name} logs")
+            self._decoder = decoder
+        return self._decoder
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        """따라잡은 뒤에는 poll_interval마다 새 블록 확인"""
+        stop = stop or threading.Event()
+        logger.info(f"Chain indexer '{self.name}' started")
+        while not stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error(f"Chain indexer iteration failed: {e}")
+                processed = 0
+            # 따라잡는 중이면 쉬지 않고 다음 범위 처리
+            if processed == 0:
+                stop.wait(self.poll_interval)
+
+    def run_once(self) -> int:
+        """
+        다음 블록 범위 하나를 처리
+
+        Returns:
+            처리한 블록 수 (따라잡았으면 0)
+        """
+        w3 = self.web3_service.w3
+        if not w3:
+            raise Exception("Web3 not connected")
+        decoder = self._get_decoder()
+        if not decoder.addresses:
+            return 0
+
+        db = self.session_factory()
+        try:
+            checkpoint = db.get(IndexerCheckpoint, self.name)
+            if checkpoint is None:
+                checkpoint = IndexerCheckpoint(name=self.name, last_block=self.start_block - 1)
+                db.add(checkpoint)
+
+            head = w3.eth.block_number
+            last_block = self._check_reorg(db, checkpoint)
+            safe_head = head - self.confirmations
+            from_block = last_block + 1
+            if from_block > safe_head:
+                db.commit()
+                return 0
+            to_block = min(from_block + self.batch_blocks - 1, safe_head)
+
+            raw_logs = w3.eth.get_logs({
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "address": decoder.addresses,
+                "topics": [decoder.topics],
+            })
+            decoded = decoder.decode(raw_logs)
+            decoded.sort(key=lambda log: (log.block_number, log.log_index))
+
+            applied = self._apply(db, decoded, from_block, to_block)
+
+            checkpoint.last_block = to_block
+            checkpoint.last_block_hash = w3.eth.get_block(to_block)["hash"].hex()
+            db.commit()
+
+            logger.info(f"Indexed blocks {from_block}-{to_block}: {applied}/{len(decoded)} logs applied (head {head})")
+            return to_block - from_block + 1
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _check_reorg(self, db: Session, checkpoint: IndexerCheckpoint) -> int:
+        """체크포인트 블록 해시가 체인과 다르면 confirmations 만큼 되감기"""
+        if checkpoint.last_block_hash is None or checkpoint.last_block < self.start_block:
+            return checkpoint.last_block
+
+        block = self.web3_service.w3.eth.get_block(checkpoint.last_block)
+        if block["hash"].hex() == checkpoint.last_block_hash:
+            return checkpoint.last_block
+
+        rewind_to = max(checkpoint.last_block - self.confirmations, self.start_block - 1)
+        removed = (
+            db.query(IndexedLog)
+            .filter(IndexedLog.block_number > rewind_to)
+            .delete(synchronize_session=False)
+        )
+        logger.warning(
+            f"Reorg detected at block {checkpoint.last_block}, rewinding to {rewind_to} "
+            f"({removed} indexed logs dropped)"
+        )
+        checkpoint.last_block = rewind_to
+        checkpoint.last_block_hash = None
+        return rewind_to
+
+    def _apply(self, db: Session, logs: List[DecodedLog], from_block: int, to_block: int) -> int:
+        """로그를 순서대로 반영 (필요한 행은 범위마다 한 번에 미리 로드)"""
+        seen = {
+            (tx_hash, log_index)
+            for tx_hash, log_index in (
+                db.query(IndexedLog.tx_hash, IndexedLog.log_index)
+                .filter(IndexedLog.block_number.between(from_block, to_block))
+            )
+        }
+        logs = [log for log in logs if (log.tx_hash, log.log_index) not in seen]
+        if not logs:
+            return 0
+
+        batch = self._preload(db, logs)
+        for log in logs:
+            handler = self._handlers.get((log.contract, log.event))
+            if handler:
+                handler(db, batch, log)
+
+        db.flush()  # 새 티켓 id 할당
+        if batch.transactions:
+            self._upsert_transactions(db, list(batch.transactions.values()))
+
+        db.execute(
+            pg_insert(IndexedLog)
+            .values([
+                {
+                    "tx_hash": log.tx_hash,
+                    "log_index": log.log_index,
+                    "block_number": log.block_number,
+                    "event_name": f"{log.contract}.{log.event}",
+                    "created_at": datetime.utcnow(),
+                }
+                for log in logs
+            ])
+            .on_conflict_do_nothing(index_elements=["tx_hash", "log_index"])
+        )
+        return len(logs)
+
+    def _preload(self, db: Session, logs: List[DecodedLog]) -> _Batch:
+        batch = _Batch()
+        token_ids = {log.args.tokenId for log in logs if "tokenId" in log.args}
+        event_ids = {log.args.eventId for log in logs if "eventId" in log.args}
+        requesters = {
+            log.args.requester.lower() for log in logs
+            if log.contract == "RefundManager" and log.event == "RefundRequested"
+        }
+
+        if event_ids:
+            for event in db.query(Event).filter(Event.event_id_onchain.in_(event_ids)):
+                batch.events_by_onchain[event.event_id_onchain] = event
+        if token_ids:
+            tickets = db.query(Ticket).filter(Ticket.token_id.in_(token_ids)).all()
+            batch.tickets_by_token = {ticket.token_id: ticket for ticket in tickets}
+            for resale in (
+                db.query(Resale)
+                .filter(Resale.token_id.in_(token_ids))
+                .filter(Resale.status == ResaleStatus.LISTED)
+            ):
+                batch.listed_resales[resale.token_id] = resale
+            ticket_ids = [ticket.id for ticket in tickets]
+            if ticket_ids:
+                for refund in (
+                    db.query(RefundRequest)
+                    .filter(RefundRequest.ticket_id.in_(ticket_ids))
+                    .filter(RefundRequest.status.in_([RefundStatus.PENDING, RefundStatus.APPROVED]))
+                ):
+                    batch.open_refunds[refund.ticket_id] = refund
+        if batch.events_by_onchain:
+            batch.unresolved_tickets = (
+                db.query(Ticket)
+                .filter(Ticket.token_id.is_(None))
+                .filter(Ticket.event_id.in_([event.id for event in batch.events_by_onchain.values()]))
+                .all()
+            )
+        if requesters:
+            for user in db.query(User).filter(
+                func.lower(User.smart_wallet_address).in_(requesters)
+                | func.lower(User.wallet_address).in_(requesters)
+            ):
+                for address in (user.smart_wallet_address, user.wallet_address):
+                    if address:
+                        batch.users_by_address[address.lower()] = user
+        return batch
+
+    def _upsert_transactions(self, db: Session, rows: List[dict]) -> None:
+        """tx_hash 기준 일괄 upsert (tx_tracker가 먼저 넣은 PENDING 행은 확인 상태로 갱신)"""
+        stmt = pg_insert(Transaction).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tx_hash"],
+            set_={
+                "status": stmt.excluded.status,
+                "block_number": stmt.excluded.block_number,
+                "ticket_id": func.coalesce(Transaction.ticket_id, stmt.excluded.ticket_id),
+                "event_id": func.coalesce(Transaction.event_id, stmt.excluded.event_id),
+                "amount_wei": func.coalesce(Transaction.amount_wei, stmt.excluded.amount_wei),
+            },
+        )
+        db.execute(stmt)
+
+    def _record_transaction(
+        self,
+        batch: _Batch,
+        log: DecodedLog,
+        transaction_type: TransactionType,
+        ticket: Optional[Ticket] = None,
+        amount_wei: Optional[int] = None,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        batch.transactions[log.tx_hash] = {
+            "id": uuid.uuid4(),
+            "tx_hash": log.tx_hash,
+            "transaction_type": transaction_type,
+            "status": TransactionStatus.CONFIRMED,
+            "block_number": log.block_number,
+            "ticket_id": ticket.id if ticket else None,
+            "event_id": ticket.event_id if ticket else None,
+            "user_id": user_id,
+            "amount_wei": amount_wei,
+            "created_at": datetime.utcnow(),
+        }
+
+    # ---- EventManager ----
+
+    def _on_event_created(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        event_id = log.args.eventId
+        if event_id in batch.events_by_onchain:
+            return
+        # 온체인 생성 직후 eventId 기록에 실패한 이벤트는 IPFS 해시로 연결
+        event = (
+            db.query(Event)
+            .filter(Event.event_id_onchain.is_(None))
+            .filter(Event.ipfs_hash == log.args.ipfsHash)
+            .order_by(Event.created_at)
+            .first()
+        )
+        if event is not None:
+            event.event_id_onchain = event_id
+            batch.events_by_onchain[event_id] = event
+            logger.info(f"Linked event {event.id} to onchain eventId {event_id}")
+
+    def _on_event_approved(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        event = batch.events_by_onchain.get(log.args.eventId)
+        if event is not None and event.status == EventStatus.PENDING:
+            event.status = EventStatus.APPROVED
+
+    def _on_event_cancelled(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        event = batch.events_by_onchain.get(log.args.eventId)
+        if event is not None:
+            event.status = EventStatus.CANCELLED
+
+    def _on_ticket_sold(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        ticket = self._upsert_ticket(
+            db, batch, log,
+            token_id=log.args.tokenId,
+            event_id_onchain=log.args.eventId,
+            owner=log.args.buyer,
+            price=log.args.price,
+        )
+        self._record_transaction(batch, log, TransactionType.PURCHASE, ticket, log.args.price)
+
+    # ---- TicketNFT ----
+
+    def _on_ticket_minted(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        token_uri = log.args.tokenURI or ""
+        self._upsert_ticket(
+            db, batch, log,
+            token_id=log.args.tokenId,
+            event_id_onchain=log.args.eventId,
+            owner=log.args.to,
+            ipfs_hash=token_uri.replace("ipfs://", "") or None,
+        )
+
+    def _on_ticket_burned(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        ticket = batch.tickets_by_token.get(log.args.tokenId)
+        if ticket is not None and ticket.status != TicketStatus.CANCELLED:
+            ticket.status = TicketStatus.REFUNDED
+
+    def _on_transfer(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        # mint/burn은 TicketMinted/TicketBurned에서 처리
+        if log.args["from"] == ZERO_ADDRESS or log.args.to == ZERO_ADDRESS:
+            return
+        ticket = batch.tickets_by_token.get(log.args.tokenId)
+        if ticket is not None:
+            ticket.owner_address = log.args.to
+
+    # ---- TicketMarketplace ----
+
+    def _on_ticket_listed(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        token_id = log.args.tokenId
+        resale = batch.listed_resales.get(token_id)
+        if resale is not None:
+            resale.seller_address = log.args.seller
+            resale.price_wei = log.args.price
+            return
+        ticket = batch.tickets_by_token.get(token_id)
+        if ticket is None:
+            logger.warning(f"TicketListed for unknown token {token_id} (tx {log.tx_hash})")
+            return
+        resale = Resale(
+            ticket_id=ticket.id,
+            token_id=token_id,
+            seller_address=log.args.seller,
+            price_wei=log.args.price,
+            status=ResaleStatus.LISTED,
+        )
+        db.add(resale)
+        batch.listed_resales[token_id] = resale
+
+    def _on_resale_sold(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        token_id = log.args.tokenId
+        resale = batch.listed_resales.pop(token_id, None)
+        if resale is not None:
+            resale.status = ResaleStatus.SOLD
+            resale.sold_at = datetime.utcnow()
+            resale.sale_tx_hash = log.tx_hash
+        ticket = batch.tickets_by_token.get(token_id)
+        if ticket is not None:
+            ticket.owner_address = log.args.buyer
+        self._record_transaction(batch, log, TransactionType.RESALE, ticket, log.args.price)
+
+    def _on_listing_cancelled(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        resale = batch.listed_resales.pop(log.args.tokenId, None)
+        if resale is not None:
+            resale.status = ResaleStatus.CANCELLED
+
+    # ---- RefundManager ----
+
+    def _on_refund_requested(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        ticket = batch.tickets_by_token.get(log.args.tokenId)
+        if ticket is None:
+            logger.warning(f"RefundRequested for unknown token {log.args.tokenId} (tx {log.tx_hash})")
+            return
+        refund = batch.open_refunds.get(ticket.id)
+        if refund is not None:
+            refund.refund_amount_wei = log.args.refundAmount
+            return
+        user = batch.users_by_address.get(log.args.requester.lower())
+        if user is None:
+            logger.warning(f"RefundRequested by unknown address {log.args.requester} (tx {log.tx_hash})")
+            return
+        refund = RefundRequest(
+            ticket_id=ticket.id,
+            user_id=user.id,
+            status=RefundStatus.PENDING,
+            refund_amount_wei=log.args.refundAmount,
+        )
+        db.add(refund)
+        batch.open_refunds[ticket.id] = refund
+
+    def _on_refund_processed(self, db: Session, batch: _Batch, log: DecodedLog) -> None:
+        ticket = batch.tickets_by_token.get(log.args.tokenId)
+        if ticket is None:
+            return
+        refund = batch.open_refunds.pop(ticket.id, None)
+        if refund is not None:
+            refund.status = RefundStatus.PROCESSED
+            refund.refund_amount_wei = log.args.refundAmount
+            refund.refund_tx_hash = log.tx_hash
+            refund.processed_at = datetime.utcnow()
+        ticket.status = TicketStatus.REFUNDED
+        self._record_transaction(
+            batch, log, TransactionType.REFUND, ticket, log.args.refundAmount,
+            user_id=refund.user_id if refund is not None else None,
+        )
+
+    def _upsert_ticket(
+        self,
+        db: Session,
+        batch: _Batch,
+        log: DecodedLog,
+        token_id: int,
+        event_id_onchain: int,
+        owner: str,
+        price: Optional[int] = None,
+        ipfs_hash: Optional[str] = None,
+    ) -> Optional[Ticket]:
+        """
+        token_id 기준 티켓 upsert
+
+        1. 같은 token_id 티켓이 있으면 갱신
+        2. 아직 token_id가 없는 티켓 중 같은 트랜잭션(또는 같은 이벤트/소유자)으로 구매한 티켓에 token_id 기록
+        3. 둘 다 없으면 (다른 클라이언트가 직접 구매한 경우 등) 새 티켓 생성
+        """
+        ticket = batch.tickets_by_token.get(token_id)
+        event = batch.events_by_onchain.get(event_id_onchain)
+
+        if ticket is None and event is not None:
+            ticket = self._match_unresolved(batch, log.tx_hash, event.id, owner)
+            if ticket is not None:
+                ticket.token_id = token_id
+                logger.info(f"Ticket token resolved by indexer: ticket={ticket.id}, tokenId={token_id}")
+
+        if ticket is None:
+            if event is None:
+                logger.warning(f"Ticket {token_id} for unknown onchain event {event_id_onchain} (tx {log.tx_hash})")
+                return None
+            ticket = Ticket(
+                id=uuid.uuid4(),
+                token_id=token_id,
+                event_id=event.id,
+                owner_address=owner,
+                ipfs_hash=ipfs_hash,
+                purchase_price_wei=price,
+                purchase_tx_hash=log.tx_hash,
+            )
+            db.add(ticket)
+        else:
+            ticket.owner_address = owner
+            if ipfs_hash and not ticket.ipfs_hash:
+                ticket.ipfs_hash = ipfs_hash
+            if price is not None and ticket.purchase_price_wei is None:
+                ticket.purchase_price_wei = price
+
+        batch.tickets_by_token[token_id] = ticket
+        return ticket
+
+    @staticmethod
+    def _match_unresolved(batch: _Batch, tx_hash: str, event_uuid, owner: str) -> Optional[Ticket]:
+        owner = owner.lower()
+        fallback = None
+        for ticket in batch.unresolved_tickets:
+            if ticket.token_id is not None or ticket.event_id != event_uuid:
+                continue
+            if ticket.purchase_tx_hash == tx_hash:
+                return ticket
+            # Bundler 경유 구매는 purchase_tx_hash가 UserOperation 해시라 소유자로 매칭
+            if fallback is None and ticket.owner_address.lower() == owner:
+                fallback = ticket
+        return fallback
+
+
+chain_indexer = ChainIndexer(
+    web3_service,
+    start_block=settings.INDEXER_START_BLOCK,
+    batch_blocks=settings.INDEXER_BATCH_BLOCKS,
+    confirmations=settings.INDEXER_CONFIRMATIONS,
+    poll_interval=settings.INDEXER_POLL_INTERVAL,
+)
@@ -0,0 +1,269 @@
+"""
+IPFS CID 파싱/계산
+게이트웨이 응답이나 업로드한 내용이 CID와 일치하는지 검증 (sha2-256만 지원)
+
+UnixFS 파일 DAG는 kubo/Pinata 기본값과 같게 계산
+- 청크 256KiB, balanced 레이아웃, 노드당 최대 174 링크
+- CIDv0: dag-pb 리프, CIDv1: raw 리프 (--cid-version=1 기본값)
+"""
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import hashlib
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE32_ALPHABET = "abcdefghijklmnopqrstuvwxyz234567"
+
+DAG_PB = 0x70
+RAW = 0x55
+SHA2_256 = 0x12
+
+CHUNK_SIZE = 262144
+MAX_LINKS = 174
+
+# UnixFS Data.Type
+UNIXFS_FILE = 2
+
+
+class CID(NamedTuple):
+    version: int
+    codec: int
+    multihash: bytes
+
+    @property
+    def bytes(self) -> bytes:
+        if self.version == 0:
+            return self.multihash
+        return varint(1) + varint(self.codec) + self.multihash
+
+    def __str__(self) -> str:
+        if self.version == 0:
+            return b58encode(self.multihash)
+        return "b" + b32encode(self.bytes)
+
+
+def varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def b58encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    out = ""
+    while number:
+        number, rem = divmod(number, 58)
+        out = BASE58_ALPHABET[rem] + out
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + out
+
+
+def b58decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        index = BASE58_ALPHABET.find(char)
+        if index < 0:
+            raise ValueError(f"invalid base58 character: {char!r}")
+        number = number * 58 + index
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return b"\0" * (len(text) - len(text.lstrip("1"))) + body
+
+
+def b32encode(data: bytes) -> str:
+    bits = int.from_bytes(data, "big") if data else 0
+    length = len(data) * 8
+    pad = -length % 5
+    bits <<= pad
+    return "".join(
+        BASE32_ALPHABET[(bits >> shift) & 31] for shift in range(length + pad - 5, -1, -5)
+    )
+
+
+def b32decode(text: str) -> bytes:
+    bits = 0
+    for char in text:
+        index = BASE32_ALPHABET.find(char)
+        if index < 0:
+            raise ValueError(f"invalid base32 character: {char!r}")
+        bits = (bits << 5) | index
+    length = len(text) * 5 // 8
+    return (bits >> (len(text) * 5 - length * 8)).to_bytes(length, "big")
+
+
+def sha256_multihash(data: bytes) -> bytes:
+    return bytes([SHA2_256, 32]) + hashlib.sha256(data).digest()
+
+
+def parse(value: str) -> CID:
+    """
+    CID 문자열 파싱 (CIDv0 base58btc, CIDv1 base32 소문자)
+
+    Raises:
+        ValueError: CID가 아니거나 지원하지 않는 인코딩
+    """
+    text = value.replace("ipfs://", "").strip().split("/", 1)[0]
+    if len(text) == 46 and text.startswith("Qm"):
+        multihash = b58decode(text)
+        if multihash[:2] != bytes([SHA2_256, 32]) or len(multihash) != 34:
+            raise ValueError(f"invalid CIDv0: {text}")
+        return CID(0, DAG_PB, multihash)
+    if text.startswith("b"):
+        data = b32decode(text[1:])
+    elif text.startswith("z"):
+        data = b58decode(text[1:])
+    else:
+        raise ValueError(f"unsupported CID encoding: {text}")
+    version, offset = read_varint(data, 0)
+    if version != 1:
+        raise ValueError(f"unsupported CID version: {version}")
+    codec, offset = read_varint(data, offset)
+    hash_code, digest_offset = read_varint(data, offset)
+    length, digest_offset = read_varint(data, digest_offset)
+    if len(data) - digest_offset != length:
+        raise ValueError(f"invalid multihash length: {text}")
+    return CID(1, codec, data[offset:])
+
+
+def try_parse(value: str) -> Optional[CID]:
+    try:
+        return parse(value)
+    except ValueError:
+        return None
+
+
+# --- dag-pb / UnixFS 인코딩 ---
+
+def _field(number: int, payload: bytes) -> bytes:
+    """length-delimited protobuf 필드"""
+    return varint(number << 3 | 2) + varint(len(payload)) + payload
+
+
+def _uint_field(number: int, value: int) -> bytes:
+    return varint(number << 3) + varint(value)
+
+
+def unixfs_data(data: bytes = b"", filesize: int = 0, blocksizes: Iterable[int] = ()) -> bytes:
+    out = _uint_field(1, UNIXFS_FILE)
+    if data:
+        out += _field(2, data)
+    out += _uint_field(3, filesize)
+    for size in blocksizes:
+        out += _uint_field(4, size)
+    return out
+
+
+def pb_node(data: bytes, links: Iterable[Tuple[bytes, str, int]] = ()) -> bytes:
+    """dag-pb 노드 (링크가 Data보다 먼저 직렬화됨, 링크 = (CID bytes, 이름, 누적 크기))"""
+    out = b""
+    for cid_bytes, name, tsize in links:
+        out += _field(2, _field(1, cid_bytes) + _field(2, name.encode()) + _uint_field(3, tsize))
+    return out + _field(1, data)
+
+
+class _Node(NamedTuple):
+    cid: CID
+    tsize: int  # 하위 블록 전체 크기 (링크의 Tsize)
+    filesize: int  # 파일 내용 크기 (blocksizes)
+
+
+def _leaf(chunk: bytes, version: int) -> _Node:
+    if version == 1:
+        return _Node(CID(1, RAW, sha256_multihash(chunk)), len(chunk), len(chunk))
+    block = pb_node(unixfs_data(chunk, len(chunk)))
+    return _Node(CID(0, DAG_PB, sha256_multihash(block)), len(block), len(chunk))
+
+
+def _parent(children: List[_Node], version: int) -> _Node:
+    filesize = sum(child.filesize for child in children)
+    block = pb_node(
+        unixfs_data(filesize=filesize, blocksizes=[child.filesize for child in children]),
+        [(child.cid.bytes, "", child.tsize) for child in children],
+    )
+    cid = CID(version, DAG_PB, sha256_multihash(block))
+    return _Node(cid, len(block) + sum(child.tsize for child in children), filesize)
+
+
+def _chunks(content: Union[bytes, Iterable[bytes]]) -> Iterator[bytes]:
+    """CHUNK_SIZE 청크 (빈 내용이면 빈 청크 하나)"""
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        view = memoryview(content)
+        for start in range(0, max(len(view), 1), CHUNK_SIZE):
+            yield bytes(view[start:start + CHUNK_SIZE])
+        return
+    buffer = bytearray()
+    for piece in content:
+        buffer += piece
+        if len(buffer) >= CHUNK_SIZE:
+            for start in range(0, len(buffer) - CHUNK_SIZE + 1, CHUNK_SIZE):
+                yield bytes(buffer[start:start + CHUNK_SIZE])
+            del buffer[:len(buffer) - len(buffer) % CHUNK_SIZE]
+    yield bytes(buffer)
+
+
+def _push(levels: List[List[_Node]], depth: int, node: _Node, version: int) -> None:
+    """레벨에 노드 추가, 가득 찬 레벨(MAX_LINKS)에 더 들어오면 앞의 MAX_LINKS개를 부모 하나로 접음"""
+    if depth == len(levels):
+        levels.append([])
+    if len(levels[depth]) == MAX_LINKS:
+        _push(levels, depth + 1, _parent(levels[depth], version), version)
+        levels[depth] = []
+    levels[depth].append(node)
+
+
+def file_node(content: Union[bytes, Iterable[bytes]], version: int = 0) -> _Node:
+    """
+    파일 UnixFS DAG의 루트
+    내용은 청크 단위로만 메모리에 두고 레벨별로 아직 부모가 없는 노드만 유지 (balanced 레이아웃과 같은 모양)
+    """
+    levels: List[List[_Node]] = [[]]
+    for chunk in _chunks(content):
+        if levels[0] and not chunk:
+            break  # 청크 크기의 배수인 내용의 마지막 빈 청크
+        _push(levels, 0, _leaf(chunk, version), version)
+
+    # 남은 노드를 아래 레벨부터 부모로 접어 올림 (맨 위 레벨에 하나만 남으면 루트)
+    depth = 0
+    while depth < len(levels) - 1 or len(levels[depth]) > 1:
+        if levels[depth]:
+            nodes, levels[depth] = levels[depth], []
+            _push(levels, depth + 1, _parent(nodes, version), version)
+        depth += 1
+    return levels[depth][0]
+
+
+def file_cid(content: Union[bytes, Iterable[bytes]], version: int = 0) -> CID:
+    """UnixFS 파일로 추가했을 때의 CID (ipfs add / Pinata pinFileToIPFS와 동일)"""
+    return file_node(content, version).cid
+
+
+def verify(cid: Union[str, CID], content: bytes) -> bool:
+    """
+    내용이 CID와 일치하는지 확인
+
+    raw 코덱은 해시만, dag-pb는 기본 설정으로 추가한 UnixFS 파일로 간주하고 계산
+    (다른 청크 설정으로 추가한 큰 파일은 일치하지 않을 수 있음 - 이 경우 False)
+    """
+    parsed = cid if isinstance(cid, CID) else try_parse(cid)
+    if parsed is None or parsed.multihash[:1] != bytes([SHA2_256]):
+        return False
+    if parsed.codec == RAW:
+        return parsed.multihash == sha256_multihash(content)
+    if parsed.codec == DAG_PB:
+        return file_cid(content, parsed.version) == parsed
+    return False
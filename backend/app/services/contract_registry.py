@@ -0,0 +1,160 @@
+"""
+컨트랙트 레지스트리
+ABI 아티팩트와 컨트랙트 인스턴스 캐시
+"""
+from web3 import Web3
+from typing import Dict, Optional, Tuple
+import json
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+CONTRACTS_DIR = os.path.join(os.path.dirname(__file__), "..", "contracts")
+
+
+class ContractRegistry:
+    """
+    ABI와 컨트랙트 인스턴스를 한 번만 만들고 재사용하는 레지스트리
+
+    - ABI: 컨트랙트 이름별로 아티팩트 JSON을 한 번만 읽고 "abi" 항목만 보관
+    - 컨트랙트: (체크섬 주소, 컨트랙트 이름)별로 w3.eth.contract 인스턴스 보관
+    """
+
+    def __init__(self, w3=None, parent: Optional["ContractRegistry"] = None):
+        """
+        Args:
+            w3: Web3 또는 AsyncWeb3 인스턴스
+            parent: ABI 캐시를 공유할 레지스트리 (동기/비동기 서비스가 같은 ABI 사용)
+        """
+        self.w3 = w3
+        self.parent = parent
+        self._abis: Dict[str, list] = {}
+        self._contracts: Dict[Tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "abi_hits": 0,
+            "abi_misses": 0,
+            "contract_hits": 0,
+            "contract_misses": 0,
+            "invalidations": 0,
+        }
+
+    def bind(self, w3) -> None:
+        """Web3 인스턴스 교체 (기존 컨트랙트 인스턴스는 모두 폐기)"""
+        with self._lock:
+            self.w3 = w3
+            self._contracts.clear()
+
+    def register_abi(self, contract_name: str, abi: list) -> None:
+        """아티팩트 파일이 없는 컨트랙트(EntryPoint 등)의 ABI 등록"""
+        if self.parent is not None:
+            self.parent.register_abi(contract_name, abi)
+        with self._lock:
+            if self.parent is None:
+                self._abis[contract_name] = abi
+            # 같은 이름의 기존 인스턴스는 새 ABI로 다시 만들어야 함
+            for key in [k for k in self._contracts if k[1] == contract_name]:
+                del self._contracts[key]
+
+    def get_abi(self, contract_name: str) -> list:
+        """ABI 조회 (최초 1회만 디스크에서 로드)"""
+        if self.parent is not None:
+            return self.parent.get_abi(contract_name)
+
+        abi = self._abis.get(contract_name)
+        if abi is not None:
+            self._stats["abi_hits"] += 1
+            return abi
+
+        with self._lock:
+            abi = self._abis.get(contract_name)
+            if abi is not None:
+                self._stats["abi_hits"] += 1
+                return abi
+
+            self._stats["abi_misses"] += 1
+            abi = self._load_artifact_abi(contract_name)
+            # 로드 실패(빈 ABI)는 캐시하지 않음 - 배포 후 파일이 추가될 수 있음
+            if abi:
+                self._abis[contract_name] = abi
+            return abi
+
+    def get_contract(self, contract_address: str, contract_name: str):
+        """(주소, 이름)별 컨트랙트 인스턴스 조회"""
+        if not self.w3:
+            raise Exception("Web3 not connected")
+
+        address = Web3.to_checksum_address(contract_address)
+        key = (address, contract_name)
+        contract = self._contracts.get(key)
+        if contract is not None:
+            self._stats["contract_hits"] += 1
+            return contract
+
+        abi = self.get_abi(contract_name)
+        if not abi:
+            raise Exception(f"Failed to load ABI for {contract_name}")
+
+        with self._lock:
+            contract = self._contracts.get(key)
+            if contract is None:
+                self._stats["contract_misses"] += 1
+                contract = self.w3.eth.contract(address=address, abi=abi)
+                self._contracts[key] = contract
+            else:
+                self._stats["contract_hits"] += 1
+            return contract
+
+    def invalidate(self, contract_address: Optional[str] = None, contract_name: Optional[str] = None) -> int:
+        """
+        캐시된 컨트랙트 인스턴스 제거
+
+        Args:
+            contract_address: 해당 주소의 인스턴스만 제거 (None이면 전체)
+            contract_name: 해당 이름의 인스턴스만 제거 (None이면 전체)
+
+        Returns:
+            제거된 인스턴스 수
+        """
+        address = Web3.to_checksum_address(contract_address) if contract_address else None
+        with self._lock:
+            keys = [
+                key for key in self._contracts
+                if (address is None or key[0] == address)
+                and (contract_name is None or key[1] == contract_name)
+            ]
+            for key in keys:
+                del self._contracts[key]
+            self._stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def preload(self, contract_names) -> int:
+        """ABI 미리 로드 (로드된 ABI 수 반환)"""
+        return sum(1 for name in contract_names if self.get_abi(name))
+
+    def stats(self) -> dict:
+        """캐시 히트/미스 통계"""
+        return {
+            **self._stats,
+            "cached_abis": len(self._abis),
+            "cached_contracts": len(self._contracts),
+        }
+
+    @staticmethod
+    def _load_artifact_abi(contract_name: str) -> list:
+        """Hardhat 아티팩트에서 ABI만 추출"""
+        abi_path = os.path.join(CONTRACTS_DIR, f"{contract_name}.json")
+        try:
+            with open(abi_path, 'r') as f:
+                artifact = json.load(f)
+            logger.info(f"ABI loaded: {contract_name}")
+            # bytecode 등 나머지 필드는 보관하지 않음
+            return artifact.get("abi", [])
+        except FileNotFoundError:
+            logger.error(f"ABI file not found: {abi_path}")
+            return []
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse ABI: {e}")
+            return []
@@ -0,0 +1,136 @@
+"""
+이벤트 검색
+이름/설명/IPFS 메타데이터 전문 검색(tsvector GIN) + 결과가 없을 때 이름 trigram 유사도 검색(오타 대비)
+가격/일시/잔여 수량/주최자 조건과 조건별 집계(facet)
+"""
+from sqlalchemy import Select, and_, func, literal_column, select
+from typing import Any, List, Optional, Tuple
+from datetime import datetime
+import uuid
+
+from app.models.event import Event, EventStatus, SEARCH_CONFIG
+
+# 응답(EventResponse)에 필요한 컬럼만 조회 (search_vector 등 제외)
+RESULT_COLUMNS = [
+    Event.id, Event.event_id_onchain, Event.organizer_id, Event.name, Event.description,
+    Event.ipfs_hash, Event.price_wei, Event.max_tickets, Event.sold_tickets,
+    Event.start_time, Event.end_time, Event.event_date, Event.status,
+    Event.created_at, Event.updated_at,
+]
+
+# (점수, id) 커서 파서
+SCORE_ID = (float, uuid.UUID)
+
+# 메타데이터에서 이미 컬럼으로 색인하는 항목
+_INDEXED_COLUMNS = {"name", "description"}
+
+
+def metadata_search_text(metadata: Any) -> str:
+    """IPFS 메타데이터(JSON)의 문자열 값을 검색용 텍스트로 (name/description은 컬럼으로 따로 색인)"""
+    values: List[str] = []
+
+    def collect(value: Any, key: Optional[str] = None) -> None:
+        if key in _INDEXED_COLUMNS:
+            return
+        if isinstance(value, dict):
+            for child_key, child in value.items():
+                collect(child, child_key)
+        elif isinstance(value, (list, tuple)):
+            for child in value:
+                collect(child)
+        elif isinstance(value, str) and value and not value.startswith(("ipfs://", "http://", "https://")):
+            values.append(value)
+
+    collect(metadata)
+    return " ".join(values)
+
+
+def search_conditions(
+    status_filter: Optional[EventStatus] = None,
+    price_min: Optional[int] = None,
+    price_max: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    min_available: Optional[int] = None,
+    organizer_id: Optional[uuid.UUID] = None,
+    now: Optional[datetime] = None,
+) -> list:
+    """facet 조건 (검색어 조건과 AND)"""
+    conditions = []
+    if status_filter == EventStatus.ACTIVE:
+        # 스케줄러가 ACTIVE로 전환하기 직전의 APPROVED 포함
+        now = now or datetime.utcnow()
+        conditions += [
+            Event.status.in_([EventStatus.APPROVED, EventStatus.ACTIVE]),
+            Event.start_time <= now,
+            Event.end_time >= now,
+        ]
+    elif status_filter:
+        conditions.append(Event.status == status_filter)
+    if price_min is not None:
+        conditions.append(Event.price_wei >= price_min)
+    if price_max is not None:
+        conditions.append(Event.price_wei <= price_max)
+    if date_from is not None:
+        conditions.append(Event.event_date >= date_from)
+    if date_to is not None:
+        conditions.append(Event.event_date <= date_to)
+    if min_available is not None:
+        conditions.append(Event.max_tickets - Event.sold_tickets >= min_available)
+    if organizer_id is not None:
+        conditions.append(Event.organizer_id == organizer_id)
+    return conditions
+
+
+def ts_query(q: str):
+    """검색어 → tsquery (따옴표 구문, OR, -제외 지원)"""
+    # 설정 이름은 바인드 파라미터가 아닌 regconfig 상수로 (asyncpg 타입 추론)
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+
+
+def fulltext_match(q: str):
+    return Event.search_vector.op("@@")(ts_query(q))
+
+
+def trigram_match(q: str):
+    # pg_trgm.similarity_threshold (기본 0.3) 이상
+    return Event.name.op("%")(q)
+
+
+def fulltext_statement(q: str, conditions: list) -> Tuple[Select, Any]:
+    """전문 검색 (ts_rank_cd 점수 = rank 컬럼)"""
+    rank = func.ts_rank_cd(Event.search_vector, ts_query(q)).label("rank")
+    return select(*RESULT_COLUMNS, rank).where(fulltext_match(q), *conditions), rank
+
+
+def trigram_statement(q: str, conditions: list) -> Tuple[Select, Any]:
+    """이름 trigram 유사도 검색 (similarity = rank 컬럼)"""
+    rank = func.similarity(Event.name, q).label("rank")
+    return select(*RESULT_COLUMNS, rank).where(trigram_match(q), *conditions), rank
+
+
+def facet_statements(match, conditions: list, organizers: int = 10) -> Tuple[Select, Select]:
+    """
+    facet 집계 쿼리 (매칭 조건은 같게, 집계는 한 번씩)
+
+    Returns:
+        (요약 집계 select, 주최자별 상위 N select)
+    """
+    where = and_(match, *conditions)
+    remaining = Event.max_tickets - Event.sold_tickets
+    summary = select(
+        func.count().label("total"),
+        func.count().filter(remaining > 0).label("available"),
+        func.min(Event.price_wei).label("price_min"),
+        func.max(Event.price_wei).label("price_max"),
+        func.min(Event.event_date).label("date_min"),
+        func.max(Event.event_date).label("date_max"),
+    ).where(where)
+    by_organizer = (
+        select(Event.organizer_id, func.count().label("count"))
+        .where(where)
+        .group_by(Event.organizer_id)
+        .order_by(func.count().desc())
+        .limit(organizers)
+    )
+    return summary, by_organizer
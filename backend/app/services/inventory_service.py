@@ -0,0 +1,372 @@
+"""
+재고 예약 서비스
+조건부 UPDATE로 재고를 원자적으로 잡고(hold), 구매 확정 시 sold로 옮기거나 실패/만료 시 반환
+인기 이벤트는 카운터를 여러 샤드 행으로 나눠 구매자끼리 같은 행 잠금을 기다리지 않게 함
+
+만료 예약 반환/판매 수량 동기화(sweep)는 리더 워커 하나만 실행하고,
+동기화는 직전 실행 이후 샤드가 바뀐(updated_at) 이벤트만 다시 합산
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import threading
+import logging
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.event import Event
+from app.models.inventory import InventoryHold, InventoryHoldStatus, InventoryShard
+from app.services.catalog_cache import catalog_cache
+from app.services.leader_lock import LeaderLock
+
+logger = logging.getLogger(__name__)
+
+
+def split_capacity(total: int, shards: int) -> List[int]:
+    """total을 shards개로 최대한 고르게 분배"""
+    base, extra = divmod(total, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+class InventoryService:
+    """
+    재고 예약/확정/반환 (모든 메서드는 커밋하지 않음 - 호출자가 커밋)
+
+    hold를 잡은 뒤에는 바로 커밋해야 샤드 행 잠금이 풀림
+    (온체인 처리 같은 긴 작업을 잠금을 쥔 채로 하지 않도록)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        shards: int = 8,
+        shard_min_tickets: int = 200,
+        hold_seconds: int = 900,
+        sweep_interval: float = 5.0,
+        sync_lag: float = 30.0,
+        leader: Optional[LeaderLock] = None,
+    ):
+        self.session_factory = session_factory
+        self.shards = max(shards, 1)
+        self.shard_min_tickets = shard_min_tickets
+        self.hold_seconds = hold_seconds
+        self.sweep_interval = sweep_interval
+        self.sync_lag = sync_lag
+        self.leader = leader or LeaderLock("inventory-sweeper", check_interval=sweep_interval)
+        self._synced_at: Optional[datetime] = None  # 직전 동기화 조회 시각 (None이면 전체 합산)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "reserved": 0, "sold_out": 0, "contended": 0, "confirmed": 0, "released": 0, "expired": 0,
+            "serials_reused": 0, "serial_conflicts": 0,
+        }
+
+    def shard_count(self, max_tickets: int) -> int:
+        if max_tickets < self.shard_min_tickets:
+            return 1
+        return min(self.shards, max_tickets)
+
+    def ensure_shards(self, db: Session, event: Event) -> None:
+        """이벤트 샤드 행 생성 (이미 판매된 수량은 앞 샤드부터 sold로 채움)"""
+        capacities = split_capacity(event.max_tickets, self.shard_count(event.max_tickets))
+        already_sold = event.sold_tickets or 0
+        rows = []
+        for shard, capacity in enumerate(capacities):
+            sold = min(capacity, already_sold)
+            already_sold -= sold
+            rows.append({
+                "event_id": event.id, "shard": shard, "capacity": capacity, "held": 0, "sold": sold, "issued": sold
+            })
+        db.execute(pg_insert(InventoryShard).values(rows).on_conflict_do_nothing())
+
+    def _take_slot(self, db: Session, event_id, skip_locked: bool) -> Optional[Tuple[int, int]]:
+        """
+        남은 재고가 있는 샤드 하나에서 held += 1, issued += 1
+
+        UPDATE ... WHERE (event_id, shard) = (SELECT ... FOR UPDATE [SKIP LOCKED]) RETURNING shard, 일련번호
+        (일련번호는 샤드끼리 겹치지 않게 샤드 수 간격으로 배정 - 같은 행 UPDATE라 추가 잠금 없음)
+        같은 샤드에 반환된 예약의 번호가 있으면 그 번호를 재사용 (실패한 구매가 번호를 써 버려
+        마지막 티켓들의 번호가 max_tickets를 넘지 않도록)
+        """
+        available = InventoryShard.held + InventoryShard.sold < InventoryShard.capacity
+        target = (
+            select(InventoryShard.shard)
+            .where(InventoryShard.event_id == event_id, available)
+            .order_by(func.random())
+            .limit(1)
+            .with_for_update(skip_locked=skip_locked)
+            .scalar_subquery()
+        )
+        shard_count = (
+            select(func.count())
+            .select_from(InventoryShard)
+            .where(InventoryShard.event_id == event_id)
+            .scalar_subquery()
+        )
+        row = db.execute(
+            update(InventoryShard)
+            .where(InventoryShard.event_id == event_id, InventoryShard.shard == target, available)
+            .values(held=InventoryShard.held + 1, issued=InventoryShard.issued + 1)
+            .returning(
+                InventoryShard.shard,
+                InventoryShard.shard + 1 + (InventoryShard.issued - 1) * shard_count,
+            )
+        ).first()
+        if row is None:
+            return None
+        shard, serial = row
+        recycled = self._reuse_serial(db, event_id, shard)
+        if recycled is not None:
+            # 방금 배정한 새 번호는 되돌림 (샤드 행 잠금을 쥐고 있어 그 사이 다른 배정 없음)
+            db.execute(
+                update(InventoryShard)
+                .where(InventoryShard.event_id == event_id, InventoryShard.shard == shard)
+                .values(issued=InventoryShard.issued - 1)
+            )
+            serial = recycled
+        return shard, serial
+
+    def _reuse_serial(self, db: Session, event_id, shard: int) -> Optional[int]:
+        """샤드의 반환된 예약 번호 하나를 가져옴 (없으면 None)"""
+        target = (
+            select(InventoryHold.id)
+            .where(
+                InventoryHold.event_id == event_id,
+                InventoryHold.shard == shard,
+                InventoryHold.serial_free.is_(True),
+            )
+            .order_by(InventoryHold.serial)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        serial = db.execute(
+            update(InventoryHold)
+            .where(InventoryHold.id == target)
+            .values(serial_free=False)
+            .returning(InventoryHold.serial)
+        ).scalar()
+        if serial is not None:
+            self._stats["serials_reused"] += 1
+        return serial
+
+    def reserve(
+        self,
+        db: Session,
+        event: Event,
+        user_id=None,
+        hold_seconds: Optional[int] = None
+    ) -> Optional[InventoryHold]:
+        """
+        재고 1장 예약
+
+        Returns:
+            InventoryHold (남은 재고가 없으면 None)
+        """
+        slot = self._take_slot(db, event.id, skip_locked=True)
+        if slot is None:
+            # 남은 샤드가 모두 다른 구매자에게 잠겨 있거나, 샤드가 없거나, 만료된 예약이 재고를 잡고 있는 경우
+            self._stats["contended"] += 1
+            if db.query(InventoryShard.shard).filter(InventoryShard.event_id == event.id).first() is None:
+                self.ensure_shards(db, event)
+            else:
+                self.release_expired(db, event_id=event.id)
+            slot = self._take_slot(db, event.id, skip_locked=False)
+        if slot is None:
+            self._stats["sold_out"] += 1
+            return None
+
+        shard, serial = slot
+        hold = InventoryHold(
+            event_id=event.id,
+            shard=shard,
+            serial=serial,
+            user_id=user_id,
+            expires_at=datetime.utcnow() + timedelta(seconds=hold_seconds or self.hold_seconds)
+        )
+        db.add(hold)
+        db.flush()
+        self._stats["reserved"] += 1
+        return hold
+
+    def _lock_hold(self, db: Session, hold_id) -> Optional[InventoryHold]:
+        return (
+            db.query(InventoryHold)
+            .filter(InventoryHold.id == hold_id)
+            .with_for_update()
+            .first()
+        )
+
+    def _adjust(self, db: Session, event_id, shard: int, held: int = 0, sold: int = 0) -> None:
+        db.execute(
+            update(InventoryShard)
+            .where(InventoryShard.event_id == event_id, InventoryShard.shard == shard)
+            .values(held=InventoryShard.held + held, sold=InventoryShard.sold + sold)
+        )
+
+    def confirm(self, db: Session, hold_id) -> None:
+        """
+        구매 확정 (held → sold)
+
+        이미 만료되어 반환된 예약이라도 온체인 구매는 끝났으므로 sold는 올림
+        (반환된 번호가 아직 재사용되지 않았으면 다시 이 예약의 번호로 가져옴)
+        """
+        hold = self._lock_hold(db, hold_id)
+        if hold is None or hold.status == InventoryHoldStatus.CONFIRMED:
+            return
+        held = -1 if hold.status == InventoryHoldStatus.HELD else 0
+        if hold.status == InventoryHoldStatus.RELEASED and hold.serial is not None:
+            if hold.serial_free:
+                hold.serial_free = False
+            else:
+                self._stats["serial_conflicts"] += 1
+                logger.warning(f"Serial {hold.serial} of released hold {hold.id} was reused before confirmation")
+        self._adjust(db, hold.event_id, hold.shard, held=held, sold=1)
+        hold.status = InventoryHoldStatus.CONFIRMED
+        self._stats["confirmed"] += 1
+
+    def release(self, db: Session, hold_id) -> bool:
+        """예약 반환 (이미 확정/반환된 예약이면 False)"""
+        hold = self._lock_hold(db, hold_id)
+        if hold is None or hold.status != InventoryHoldStatus.HELD:
+            return False
+        self._adjust(db, hold.event_id, hold.shard, held=-1)
+        hold.status = InventoryHoldStatus.RELEASED
+        hold.serial_free = hold.serial is not None
+        self._stats["released"] += 1
+        return True
+
+    def extend(self, db: Session, hold_id, hold_seconds: Optional[int] = None) -> bool:
+        """예약 만료 시간 연장 (이미 반환된 예약이면 False)"""
+        result = db.execute(
+            update(InventoryHold)
+            .where(InventoryHold.id == hold_id, InventoryHold.status == InventoryHoldStatus.HELD)
+            .values(expires_at=datetime.utcnow() + timedelta(seconds=hold_seconds or self.hold_seconds))
+        )
+        return result.rowcount == 1
+
+    def release_expired(self, db: Session, event_id=None, limit: int = 1000) -> int:
+        """만료된 예약을 샤드로 반환 (다른 프로세스가 처리 중인 행은 건너뜀)"""
+        query = (
+            db.query(InventoryHold)
+            .filter(InventoryHold.status == InventoryHoldStatus.HELD)
+            .filter(InventoryHold.expires_at < datetime.utcnow())
+        )
+        if event_id is not None:
+            query = query.filter(InventoryHold.event_id == event_id)
+        expired = query.limit(limit).with_for_update(skip_locked=True).all()
+        if not expired:
+            return 0
+
+        counts: Dict[Tuple, int] = {}
+        for hold in expired:
+            hold.status = InventoryHoldStatus.RELEASED
+            hold.serial_free = hold.serial is not None
+            key = (hold.event_id, hold.shard)
+            counts[key] = counts.get(key, 0) + 1
+        for (hold_event_id, shard), count in counts.items():
+            self._adjust(db, hold_event_id, shard, held=-count)
+
+        self._stats["expired"] += len(expired)
+        logger.info(f"Released {len(expired)} expired inventory holds")
+        return len(expired)
+
+    def resize(self, db: Session, event: Event) -> None:
+        """max_tickets 변경 반영 (판매/예약된 수량은 유지하고 남은 수량만 다시 분배)"""
+        shards = (
+            db.query(InventoryShard)
+            .filter(InventoryShard.event_id == event.id)
+            .order_by(InventoryShard.shard)
+            .with_for_update()
+            .all()
+        )
+        if not shards:
+            return
+        used = [shard.held + shard.sold for shard in shards]
+        remaining = max(event.max_tickets - sum(used), 0)
+        for shard, in_use, extra in zip(shards, used, split_capacity(remaining, len(shards))):
+            shard.capacity = in_use + extra
+
+    def sync_sold_counts(self, db: Session, since: Optional[datetime] = None) -> List:
+        """
+        샤드 합계를 events.sold_tickets에 반영 (표시/빠른 매진 확인용, 달라진 이벤트만 갱신)
+
+        Args:
+            since: 이 시각 이후 샤드가 바뀐 이벤트만 합산 (None이면 전체)
+
+        Returns:
+            sold_tickets가 바뀐 이벤트 ID 목록
+        """
+        totals = select(InventoryShard.event_id, func.sum(InventoryShard.sold).label("sold"))
+        if since is not None:
+            changed_events = select(InventoryShard.event_id).where(InventoryShard.updated_at >= since)
+            totals = totals.where(InventoryShard.event_id.in_(changed_events))
+        totals = totals.group_by(InventoryShard.event_id).subquery()
+        result = db.execute(
+            update(Event)
+            .where(Event.id == totals.c.event_id, Event.sold_tickets != totals.c.sold)
+            .values(sold_tickets=totals.c.sold)
+            .returning(Event.id)
+        )
+        return list(result.scalars())
+
+    def sweep(self) -> None:
+        if not self.leader.held():
+            # 다음에 리더가 되면 그동안의 변경을 놓치지 않도록 전체 합산부터
+            self._synced_at = None
+            return
+        started = datetime.utcnow()
+        since = self._synced_at - timedelta(seconds=self.sync_lag) if self._synced_at else None
+        db = self.session_factory()
+        try:
+            self.release_expired(db)
+            changed = self.sync_sold_counts(db, since=since)
+            db.commit()
+            self._synced_at = started
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        # 판매 수량이 바뀐 이벤트의 카탈로그 캐시 무효화 (커밋 후)
+        if changed:
+            catalog_cache.invalidate_events_sync(changed)
+
+    def start(self) -> None:
+        """만료 예약 반환/판매 수량 동기화 스레드 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="inventory-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.leader.release()
+        self._synced_at = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Inventory sweep failed: {e}")
+            self._stop.wait(self.sweep_interval)
+
+    def stats(self) -> dict:
+        return {**self._stats, "leader": self.leader.stats()["leader"]}
+
+
+inventory_service = InventoryService(
+    shards=settings.INVENTORY_SHARDS,
+    shard_min_tickets=settings.INVENTORY_SHARD_MIN_TICKETS,
+    hold_seconds=settings.INVENTORY_HOLD_SECONDS,
+    sweep_interval=settings.INVENTORY_SWEEP_INTERVAL,
+    sync_lag=settings.INVENTORY_SYNC_LAG_SECONDS,
+)
@@ -0,0 +1,265 @@
+"""
+IPFS 콘텐츠 캐시 (CID 또는 CID/경로 기준)
+IPFS 내용은 CID로 불변이므로(디렉터리 CID 아래 경로도 마찬가지) 만료 없이 크기 기준으로만 제거
+
+- 메모리: 파싱한 JSON LRU (원본 크기 합계 기준 제한)
+- 디스크: 원본 바이트, 키별 파일 (크기 합계 기준 LRU 제거, 재시작 후에도 유지)
+CID 키는 저장 전에 내용이 CID와 일치하는지 검증하고, 일치하지 않거나 CID로 시작하지 않는 키는 저장하지 않음
+(CID/경로 키는 디렉터리 DAG 없이 검증할 수 없어 게이트웨이 응답을 그대로 저장)
+
+워커 프로세스마다 디스크 인덱스를 따로 관리하므로 같은 디렉터리를 공유하면 합계가 제한을 넘을 수 있음
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+from urllib.parse import quote
+import json
+import os
+import tempfile
+import threading
+import logging
+
+from app.core.config import settings
+from app.services import cid as cids
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(ipfs_hash: str) -> Optional[str]:
+    """
+    정규화한 캐시 키 (캐시할 수 없으면 None)
+
+    "<CID>" → 정규화한 CID, "<디렉터리 CID>/<경로>" → 정규화한 CID + "/" + 경로
+    (빈 경로 구간과 "."/".." 구간이 있는 경로는 캐시하지 않음)
+    """
+    text = ipfs_hash.replace("ipfs://", "").strip()
+    root, _, path = text.partition("/")
+    parsed = cids.try_parse(root)
+    if parsed is None:
+        return None
+    if not path:
+        return str(parsed)
+    segments = path.split("/")
+    if any(segment in ("", ".", "..") for segment in segments):
+        return None
+    return f"{parsed}/{path}"
+
+
+class MemoryTier:
+    """파싱한 JSON LRU (항목 크기 = 원본 바이트 수)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        # 한 항목이 캐시의 1/8을 넘으면 저장하지 않음 (다른 항목을 모두 밀어내지 않도록)
+        if size > self.max_bytes // 8:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[0]
+            self._entries[key] = (size, value)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskTier:
+    """
+    키별 파일 저장소 (첫 사용 시 디렉터리를 훑어 수정 시각 순으로 LRU 인덱스 구성)
+    파일 이름은 키를 퍼센트 인코딩한 값 (CID/경로 키의 "/" → "%2F") - 인덱스도 파일 이름 기준
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return quote(key, safe="")
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name[-2:] / name
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.name, stat.st_size))
+        for _, key, size in sorted(files):
+            self._index[key] = size
+            self.bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self.bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self.bytes -= size
+
+    def get(self, key: str) -> Optional[bytes]:
+        name = self._name(key)
+        with self._lock:
+            self._load()
+            if name not in self._index:
+                return None
+            self._index.move_to_end(name)
+        path = self._path(name)
+        try:
+            raw = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            # 다른 워커가 제거함
+            with self._lock:
+                self._forget(name)
+            return None
+        return raw
+
+    def put(self, key: str, raw: bytes) -> None:
+        if len(raw) > self.max_bytes // 8:
+            return
+        name = self._name(key)
+        with self._lock:
+            self._load()
+            if name in self._index:
+                self._index.move_to_end(name)
+                return
+        path = self._path(name)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".")
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"IPFS disk cache write failed for {key}: {e}")
+            return
+        with self._lock:
+            self._forget(name)
+            self._index[name] = len(raw)
+            self.bytes += len(raw)
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class IPFSCache:
+    def __init__(self, memory_bytes: int, directory: str = "", disk_bytes: int = 0):
+        self.memory = MemoryTier(memory_bytes)
+        self.disk = DiskTier(directory, disk_bytes) if disk_bytes > 0 else None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stored": 0, "rejected": 0}
+
+    def get_memory(self, ipfs_hash: str) -> Optional[Any]:
+        """메모리에서만 조회 (이벤트 루프에서 바로 호출 가능)"""
+        key = cache_key(ipfs_hash)
+        if key is None:
+            return None
+        value = self.memory.get(key)
+        if value is not None:
+            self._stats["memory_hits"] += 1
+        return value
+
+    def get(self, ipfs_hash: str) -> Optional[Any]:
+        """
+        캐시된 JSON 조회 (메모리 → 디스크, 디스크에서 찾으면 메모리로 올림)
+        반환값은 캐시와 공유하므로 수정하지 말 것
+        """
+        key = cache_key(ipfs_hash)
+        if key is None:
+            return None
+        value = self.memory.get(key)
+        if value is not None:
+            self._stats["memory_hits"] += 1
+            return value
+        raw = self.disk.get(key) if self.disk is not None else None
+        if raw is not None:
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                value = None
+            if value is not None:
+                self._stats["disk_hits"] += 1
+                self.memory.put(key, value, len(raw))
+                return value
+        self._stats["misses"] += 1
+        return None
+
+    def put(self, ipfs_hash: str, raw: bytes, value: Any = None) -> bool:
+        """
+        CID 검증 후 저장 (value가 없으면 JSON이면 파싱해서 메모리에도 저장)
+
+        Returns:
+            저장 여부 (CID로 시작하지 않거나 내용이 CID와 일치하지 않으면 False)
+        """
+        key = cache_key(ipfs_hash)
+        if key is None:
+            return False
+        if "/" not in key and not cids.verify(key, raw):
+            self._stats["rejected"] += 1
+            logger.debug(f"IPFS content does not match CID, not cached: {key}")
+            return False
+        if value is None:
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                value = None
+        if value is not None:
+            self.memory.put(key, value, len(raw))
+        if self.disk is not None:
+            self.disk.put(key, raw)
+        self._stats["stored"] += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.bytes,
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+            "disk_bytes": self.disk.bytes if self.disk is not None else 0,
+        }
+
+
+ipfs_cache = IPFSCache(
+    memory_bytes=settings.IPFS_CACHE_MEMORY_BYTES,
+    directory=settings.IPFS_CACHE_DIR or os.path.join(tempfile.gettempdir(), "ticketing-ipfs-cache"),
+    disk_bytes=settings.IPFS_CACHE_DISK_BYTES,
+)
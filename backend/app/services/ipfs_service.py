@@ -1,7 +1,10 @@
 import requests
 from app.core.config import settings
+from app.services.ipfs_cache import ipfs_cache
 from typing import Optional, Dict, Any
 import json
+import os
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +17,8 @@ class IPFSService:
         self.base_url = "https://api.pinata.cloud"
         self.gateway_url = "https://gateway.pinata.cloud/ipfs"
         self.is_configured = bool(self.api_key and self.secret_key)
+        # keep-alive 세션 (Pinata API/게이트웨이 TLS 연결 재사용)
+        self.http = requests.Session()
     
     def upload_json(self, data: dict, pinata_metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
@@ -45,7 +50,7 @@ class IPFSService:
             payload["pinataMetadata"] = pinata_metadata
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self.http.post(url, json=payload, headers=headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -53,6 +58,9 @@ class IPFSService:
             
             if ipfs_hash:
                 logger.info(f"Successfully uploaded JSON to IPFS: {ipfs_hash}")
+                # Pinata는 JSON.stringify 결과를 저장 (직렬화가 다르면 CID 검증에서 걸러짐)
+                raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+                ipfs_cache.put(ipfs_hash, raw, data)
                 return ipfs_hash
             else:
                 logger.error(f"IPFS upload succeeded but no hash returned: {result}")
@@ -96,7 +104,7 @@ class IPFSService:
                 if pinata_metadata:
                     data['pinataMetadata'] = json.dumps(pinata_metadata)
                 
-                response = requests.post(url, files=files, headers=headers, data=data, timeout=60)
+                response = self.http.post(url, files=files, headers=headers, data=data, timeout=60)
                 response.raise_for_status()
                 
                 result = response.json()
@@ -104,6 +112,8 @@ class IPFSService:
                 
                 if ipfs_hash:
                     logger.info(f"Successfully uploaded file to IPFS: {ipfs_hash}")
+                    f.seek(0)
+                    ipfs_cache.put(ipfs_hash, f.read())
                     return ipfs_hash
                 else:
                     logger.error(f"IPFS upload succeeded but no hash returned: {result}")
@@ -120,10 +130,123 @@ class IPFSService:
         except Exception as e:
             logger.error(f"Unexpected error during IPFS file upload: {e}")
             return None
-    
+
+    def pin_bytes(
+        self,
+        content: bytes,
+        name: str,
+        keyvalues: Optional[Dict[str, Any]] = None,
+        cid_version: int = 0
+    ) -> str:
+        """
+        바이트 내용을 파일로 고정 (pinFileToIPFS, 로컬에서 계산한 CID와 같은 설정으로)
+
+        Args:
+            content: 올릴 내용
+            name: 파일/pinataMetadata 이름
+            keyvalues: pinataMetadata.keyvalues
+            cid_version: 0 또는 1
+
+        Returns:
+            Pinata가 반환한 IPFS 해시
+
+        Raises:
+            requests.exceptions.RequestException: 요청 실패
+            ValueError: 응답에 해시가 없음
+        """
+        url = f"{self.base_url}/pinning/pinFileToIPFS"
+        headers = {
+            "pinata_api_key": self.api_key,
+            "pinata_secret_api_key": self.secret_key
+        }
+        pinata_metadata: Dict[str, Any] = {"name": name}
+        if keyvalues:
+            pinata_metadata["keyvalues"] = keyvalues
+        data = {
+            "pinataMetadata": json.dumps(pinata_metadata),
+            "pinataOptions": json.dumps({"cidVersion": cid_version}),
+        }
+
+        response = self.http.post(url, files={"file": (name, content)}, headers=headers, data=data, timeout=60)
+        response.raise_for_status()
+        ipfs_hash = response.json().get("IpfsHash")
+        if not ipfs_hash:
+            raise ValueError(f"IPFS upload succeeded but no hash returned: {response.text}")
+        return ipfs_hash
+
+    def pin_directory(
+        self,
+        directory: str,
+        name: str,
+        keyvalues: Optional[Dict[str, Any]] = None,
+        cid_version: int = 0
+    ) -> str:
+        """
+        디렉터리의 파일들을 한 번의 pinFileToIPFS로 디렉터리 고정 (multipart 본문을 파일 단위로 스트리밍)
+
+        Args:
+            directory: 올릴 디렉터리 (하위 디렉터리 없이 파일만)
+            name: 디렉터리/pinataMetadata 이름
+
+        Returns:
+            디렉터리 IPFS 해시 (파일은 ipfs://<해시>/<파일명>)
+
+        Raises:
+            requests.exceptions.RequestException: 요청 실패
+            ValueError: 응답에 해시가 없음
+        """
+        url = f"{self.base_url}/pinning/pinFileToIPFS"
+        boundary = uuid.uuid4().hex
+        pinata_metadata: Dict[str, Any] = {"name": name}
+        if keyvalues:
+            pinata_metadata["keyvalues"] = keyvalues
+        fields = {
+            "pinataMetadata": json.dumps(pinata_metadata),
+            "pinataOptions": json.dumps({"cidVersion": cid_version}),
+        }
+
+        files = sorted((entry for entry in os.scandir(directory) if entry.is_file()), key=lambda entry: entry.name)
+        dirname = os.path.basename(os.path.normpath(directory))
+
+        def file_header(entry: os.DirEntry) -> bytes:
+            return (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="{dirname}/{entry.name}"\r\n'
+                f"Content-Type: application/octet-stream\r\n\r\n"
+            ).encode()
+
+        trailer = "".join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'
+            for key, value in fields.items()
+        ).encode() + f"--{boundary}--\r\n".encode()
+
+        def body():
+            for entry in files:
+                yield file_header(entry)
+                with open(entry.path, "rb") as f:
+                    yield f.read()
+                yield b"\r\n"
+            yield trailer
+
+        length = sum(len(file_header(entry)) + entry.stat().st_size + 2 for entry in files) + len(trailer)
+        headers = {
+            "pinata_api_key": self.api_key,
+            "pinata_secret_api_key": self.secret_key,
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(length),
+        }
+
+        response = self.http.post(url, data=body(), headers=headers, timeout=600)
+        response.raise_for_status()
+        ipfs_hash = response.json().get("IpfsHash")
+        if not ipfs_hash:
+            raise ValueError(f"IPFS upload succeeded but no hash returned: {response.text}")
+        logger.info(f"Pinned directory to IPFS: {ipfs_hash} ({len(files)} files)")
+        return ipfs_hash
+
     def get_json(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
         """
-        IPFS에서 JSON 데이터 조회
+        IPFS에서 JSON 데이터 조회 (게이트웨이 순차 시도, 스크립트용 - API는 async_ipfs_service 사용)
         
         Args:
             ipfs_hash: IPFS 해시 (ipfs:// 접두사 제거됨)
@@ -133,20 +256,20 @@ class IPFSService:
         """
         # ipfs:// 접두사 제거
         hash_clean = ipfs_hash.replace("ipfs://", "").strip()
+        cached = ipfs_cache.get(hash_clean)
+        if cached is not None:
+            return cached
         
         # 여러 IPFS 게이트웨이 시도
-        gateways = [
-            f"{self.gateway_url}/{hash_clean}",
-            f"https://ipfs.io/ipfs/{hash_clean}",
-            f"https://cloudflare-ipfs.com/ipfs/{hash_clean}",
-        ]
+        gateways = [f"{gateway.rstrip('/')}/{hash_clean}" for gateway in settings.IPFS_GATEWAYS]
         
         for gateway_url in gateways:
             try:
-                response = requests.get(gateway_url, timeout=10)
+                response = self.http.get(gateway_url, timeout=settings.IPFS_GATEWAY_TIMEOUT_SECONDS)
                 response.raise_for_status()
                 data = response.json()
                 logger.info(f"Successfully retrieved JSON from IPFS: {hash_clean}")
+                ipfs_cache.put(hash_clean, response.content, data)
                 return data
             except requests.exceptions.RequestException as e:
                 logger.debug(f"Failed to fetch from {gateway_url}: {e}")
@@ -189,7 +312,7 @@ class IPFSService:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.http.get(url, headers=headers, timeout=10)
             response.raise_for_status()
             logger.info("Pinata connection test successful")
             return True
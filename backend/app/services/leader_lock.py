@@ -0,0 +1,99 @@
+"""
+리더 잠금
+여러 워커 프로세스 중 하나만 실행하면 되는 백그라운드 작업(상태 전환, 판매 수량 동기화 등)용
+PostgreSQL 세션 advisory lock을 전용 연결로 쥐고 있는 워커가 리더 (연결이 끊기면 잠금이 풀려 다른 워커가 이어받음)
+
+세션 잠금이므로 트랜잭션 풀링 PgBouncer 뒤에서는 DATABASE_URL을 직접 연결로 지정해야 함
+"""
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+from typing import Optional
+import hashlib
+import threading
+import time
+import logging
+
+from app.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def lock_key(name: str) -> int:
+    """이름 → advisory lock 키 (signed bigint)"""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class LeaderLock:
+    """
+    held()는 check_interval 동안 결과를 재사용 (리더는 연결 생존 확인, 아닌 워커는 잠금 시도)
+    SQLite 등 PostgreSQL이 아니면 항상 리더 (단일 프로세스 개발 환경)
+    """
+
+    def __init__(self, name: str, bind: Engine = engine, check_interval: float = 5.0):
+        self.name = name
+        self.key = lock_key(name)
+        self.bind = bind
+        self.check_interval = check_interval
+        self._conn: Optional[Connection] = None
+        self._checked_at = float("-inf")
+        self._held = False
+        self._lock = threading.Lock()
+
+    def held(self) -> bool:
+        """이 워커가 리더인지"""
+        if self.bind.dialect.name != "postgresql":
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at < self.check_interval:
+                return self._held
+            self._checked_at = now
+            was_held = self._held
+            self._held = self._check() if self._conn is not None else self._acquire()
+            if self._held != was_held:
+                logger.info(f"Leader lock {self.name}: {'acquired' if self._held else 'lost'}")
+            return self._held
+
+    def _check(self) -> bool:
+        try:
+            self._conn.execute(select(1))
+            return True
+        except Exception as e:
+            logger.warning(f"Leader lock {self.name} connection lost: {e}")
+            self._close()
+            return self._acquire()
+
+    def _acquire(self) -> bool:
+        try:
+            conn = self.bind.connect().execution_options(isolation_level="AUTOCOMMIT")
+        except Exception as e:
+            logger.warning(f"Leader lock {self.name} connect failed: {e}")
+            return False
+        try:
+            acquired = bool(conn.execute(select(func.pg_try_advisory_lock(self.key))).scalar())
+        except Exception as e:
+            logger.warning(f"Leader lock {self.name} acquire failed: {e}")
+            acquired = False
+        if acquired:
+            self._conn = conn
+        else:
+            conn.close()
+        return acquired
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.invalidate()
+            except Exception:
+                pass
+            self._conn = None
+
+    def release(self) -> None:
+        """잠금 해제 (연결을 버려 세션 잠금도 함께 풀림)"""
+        with self._lock:
+            self._close()
+            self._held = False
+            self._checked_at = float("-inf")
+
+    def stats(self) -> dict:
+        return {"name": self.name, "leader": self._held or self.bind.dialect.name != "postgresql"}
@@ -0,0 +1,233 @@
+"""
+온체인 읽기 배치
+여러 컨트랙트 call()을 Multicall3 aggregate3 한 번으로 묶고,
+Multicall3가 없는 네트워크에서는 eth_call JSON-RPC 배치로 대체
+"""
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_utils import function_signature_to_4byte_selector
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.method_formatters import log_entry_formatter, receipt_formatter
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.datastructures import AttributeDict
+from typing import Any, Callable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+
+_MISSING = object()
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+
+
+def decode_function_result(contract_function, data: bytes) -> Any:
+    """call() 반환값과 같은 형태로 디코딩 (출력이 하나면 값만, 주소는 체크섬)"""
+    output_types = get_abi_output_types(contract_function.abi)
+    decoded = abi_decode(output_types, data)
+    normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, decoded)
+    if len(normalized) == 1:
+        return normalized[0]
+    return normalized
+
+
+class ReadBatchBase:
+    """
+    읽기 요청 수집기 (실행은 동기/비동기 하위 클래스가 담당)
+
+    - call(): 컨트랙트 view 함수 호출 추가
+    - rpc(): eth_getBalance, eth_feeHistory 등 일반 JSON-RPC 호출 추가
+
+    추가 순서대로 인덱스를 반환하며 execute() 결과도 같은 순서
+    실패한 호출(revert, RPC 에러)은 default 값으로 채움
+    """
+
+    def __init__(self, multicall_address: Optional[str] = None):
+        self.multicall_address = multicall_address
+        # (kind, payload, default)
+        self._requests: List[Tuple[str, Any, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def call(self, contract_function, default: Any = None) -> int:
+        """컨트랙트 읽기 호출 추가 (contract.functions.foo(args) 형태)"""
+        self._requests.append(("call", contract_function, default))
+        return len(self._requests) - 1
+
+    def rpc(
+        self,
+        method: str,
+        params: list,
+        formatter: Optional[Callable[[Any], Any]] = None,
+        default: Any = None
+    ) -> int:
+        """일반 JSON-RPC 읽기 호출 추가"""
+        self._requests.append(("rpc", (method, params, formatter), default))
+        return len(self._requests) - 1
+
+    def _contract_calls(self) -> List[Tuple[int, Any]]:
+        return [(i, payload) for i, (kind, payload, _) in enumerate(self._requests) if kind == "call"]
+
+    def _build(self, use_multicall: bool) -> List[Tuple[str, list]]:
+        """JSON-RPC 배치 요청 목록 생성"""
+        calls: List[Tuple[str, list]] = []
+        contract_calls = self._contract_calls()
+
+        if use_multicall and contract_calls:
+            # 모든 컨트랙트 호출을 aggregate3 한 번으로 (allowFailure=True)
+            encoded = abi_encode(
+                ["(address,bool,bytes)[]"],
+                [[
+                    (function.address, True, _to_bytes(function._encode_transaction_data()))
+                    for _, function in contract_calls
+                ]]
+            )
+            calls.append((
+                "eth_call",
+                [{"to": self.multicall_address, "data": "0x" + (AGGREGATE3_SELECTOR + encoded).hex()}, "latest"]
+            ))
+        else:
+            for _, function in contract_calls:
+                calls.append((
+                    "eth_call",
+                    [{"to": function.address, "data": function._encode_transaction_data()}, "latest"]
+                ))
+
+        for kind, payload, _ in self._requests:
+            if kind == "rpc":
+                method, params, _ = payload
+                calls.append((method, params))
+        return calls
+
+    def _parse(self, raw_results: List[Optional[Any]], use_multicall: bool) -> List[Any]:
+        """배치 응답을 요청 순서대로의 결과 목록으로 변환"""
+        results: List[Any] = [_MISSING] * len(self._requests)
+        contract_calls = self._contract_calls()
+        cursor = 0
+
+        if use_multicall and contract_calls:
+            aggregated = raw_results[0]
+            cursor = 1
+            returns = abi_decode(["(bool,bytes)[]"], _to_bytes(aggregated))[0] if aggregated else []
+            for (index, function), (success, data) in zip(contract_calls, returns):
+                if success:
+                    results[index] = self._decode(function, data)
+        else:
+            for index, function in contract_calls:
+                raw = raw_results[cursor]
+                cursor += 1
+                if raw is not None:
+                    results[index] = self._decode(function, _to_bytes(raw))
+
+        for index, (kind, payload, _) in enumerate(self._requests):
+            if kind != "rpc":
+                continue
+            raw = raw_results[cursor]
+            cursor += 1
+            if raw is not None:
+                formatter = payload[2]
+                results[index] = formatter(raw) if formatter else raw
+
+        return [
+            default if result is _MISSING else result
+            for result, (_, _, default) in zip(results, self._requests)
+        ]
+
+    @staticmethod
+    def _decode(contract_function, data: bytes) -> Any:
+        try:
+            return decode_function_result(contract_function, data)
+        except Exception as e:
+            # 빈 반환값(미배포 주소 등)은 실패로 처리
+            logger.debug(f"Failed to decode {contract_function.fn_name}: {e}")
+            return _MISSING
+
+
+class ReadBatch(ReadBatchBase):
+    """Web3Service용 읽기 배치"""
+
+    def __init__(self, web3_service):
+        super().__init__(web3_service.multicall_address)
+        self.web3_service = web3_service
+
+    def execute(self) -> List[Any]:
+        """한 번의 HTTP 왕복으로 모든 읽기 실행"""
+        if not self._requests:
+            return []
+        use_multicall = bool(self._contract_calls()) and self.web3_service.has_multicall()
+        raw_results = self.web3_service.rpc_batch(self._build(use_multicall))
+        return self._parse(raw_results, use_multicall)
+
+
+class AsyncReadBatch(ReadBatchBase):
+    """AsyncWeb3Service용 읽기 배치"""
+
+    def __init__(self, async_web3_service):
+        super().__init__(async_web3_service.multicall_address)
+        self.web3_service = async_web3_service
+
+    async def execute(self) -> List[Any]:
+        """한 번의 HTTP 왕복으로 모든 읽기 실행"""
+        if not self._requests:
+            return []
+        use_multicall = bool(self._contract_calls()) and await self.web3_service.has_multicall()
+        raw_results = await self.web3_service.rpc_batch(self._build(use_multicall))
+        return self._parse(raw_results, use_multicall)
+
+
+def rpc_batch_payload(calls: List[Tuple[str, list]]) -> List[dict]:
+    """JSON-RPC 배치 요청 본문 (id = 호출 순서)"""
+    return [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+
+
+def rpc_batch_results(calls: List[Tuple[str, list]], body) -> List[Optional[Any]]:
+    """
+    JSON-RPC 배치 응답을 호출 순서대로의 result 목록으로 변환 (에러가 난 호출은 None)
+
+    전송 방식(requests/aiohttp)과 무관한 부분이라 동기/비동기 서비스가 공유
+    """
+    # 배치를 지원하지 않는 노드는 단일 에러 객체를 반환
+    if not isinstance(body, list):
+        raise Exception(f"JSON-RPC batch not supported: {body}")
+
+    results: List[Optional[Any]] = [None] * len(calls)
+    for item in body:
+        index = item.get("id")
+        if not isinstance(index, int) or not 0 <= index < len(calls):
+            continue
+        if "error" in item:
+            logger.debug(f"Batch call {calls[index][0]} failed: {item['error']}")
+            continue
+        results[index] = item.get("result")
+    return results
+
+
+def hex_to_int(value: str) -> int:
+    """eth_getBalance 등 quantity 결과 변환"""
+    return int(value, 16)
+
+
+def format_fee_history(value: dict) -> dict:
+    """eth_feeHistory 결과 변환 (baseFeePerGas만 정수로)"""
+    return {
+        **value,
+        "baseFeePerGas": [int(fee, 16) for fee in value.get("baseFeePerGas", [])],
+    }
+
+
+def format_receipt(value: dict) -> AttributeDict:
+    """eth_getTransactionReceipt 결과 변환 (w3.eth.get_transaction_receipt와 같은 형태)"""
+    return AttributeDict.recursive(receipt_formatter(value))
+
+
+def format_logs(value: list) -> List[AttributeDict]:
+    """eth_getLogs 결과 변환 (w3.eth.get_logs와 같은 형태)"""
+    return [AttributeDict.recursive(log_entry_formatter(log)) for log in value]
@@ -0,0 +1,151 @@
+"""
+서비스 계정 Nonce 관리자
+하나의 서명 계정에서 여러 트랜잭션을 동시에 전송할 수 있도록 nonce를 로컬에서 할당
+"""
+from typing import Callable, Dict, List, Optional
+import heapq
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 노드가 nonce 충돌 시 반환하는 에러 메시지 (geth / hardhat / erigon)
+NONCE_ERROR_MARKERS = (
+    "nonce too low",
+    "nonce has already been used",
+    "replacement transaction underpriced",
+    "nonce too high",
+)
+
+# 같은 서명 트랜잭션이 이미 전송된 경우 (충돌이 아니라 전송 성공)
+ALREADY_KNOWN_MARKERS = (
+    "already known",
+    "known transaction",
+)
+
+
+class NonceManager:
+    """
+    스레드/asyncio 태스크 사이에서 안전한 nonce 할당기
+
+    - allocate(): 다음 nonce를 원자적으로 할당 (반환된 nonce가 있으면 그것부터 재사용)
+    - release(): 전송하지 못한 nonce를 반환해 다음 할당에서 빈자리를 채움
+    - resync(): 체인의 pending nonce와 로컬 카운터를 다시 맞춤
+    - fill_gaps(): 전송 후 사라진(drop) 트랜잭션의 nonce를 다시 할당 대상으로 돌림
+    """
+
+    def __init__(self, fetch_chain_nonce: Callable[[str], int], gap_timeout: float = 120.0):
+        """
+        Args:
+            fetch_chain_nonce: block_identifier("pending"/"latest")를 받아
+                서비스 계정의 트랜잭션 수를 반환하는 함수
+            gap_timeout: 전송 후 이 시간(초)이 지나도 채굴되지 않은 nonce는 drop된 것으로 간주
+        """
+        self._fetch_chain_nonce = fetch_chain_nonce
+        self.gap_timeout = gap_timeout
+        self._lock = threading.Lock()
+        self._next: Optional[int] = None
+        self._released: List[int] = []
+        self._in_flight: Dict[int, float] = {}
+        self._stats = {"allocated": 0, "released": 0, "resyncs": 0, "gaps_filled": 0}
+
+    def allocate(self) -> int:
+        """다음 nonce 할당"""
+        with self._lock:
+            if self._next is None:
+                self._next = self._fetch_chain_nonce("pending")
+                logger.info(f"Nonce manager initialized at {self._next}")
+
+            if self._released:
+                nonce = heapq.heappop(self._released)
+            else:
+                nonce = self._next
+                self._next += 1
+
+            self._in_flight[nonce] = time.monotonic()
+            self._stats["allocated"] += 1
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        """브로드캐스트하지 못한 nonce 반환"""
+        with self._lock:
+            self._in_flight.pop(nonce, None)
+            if self._next is None or nonce >= self._next or nonce in self._released:
+                return
+            heapq.heappush(self._released, nonce)
+            self._stats["released"] += 1
+
+    def resync(self) -> int:
+        """
+        체인의 pending nonce와 동기화
+
+        로컬 카운터보다 체인이 앞서 있으면(다른 프로세스가 같은 계정 사용 등) 체인 값으로 올리고,
+        이미 사용된 반환 nonce는 버림
+        체인이 뒤처져 있고(nonce too high - drop/노드 재시작 등) 전송 중인 nonce가 없으면 체인 값으로 내림
+        """
+        chain_nonce = self._fetch_chain_nonce("pending")
+        with self._lock:
+            for nonce in [n for n in self._in_flight if n < chain_nonce]:
+                del self._in_flight[nonce]
+            if self._next is None or chain_nonce > self._next:
+                self._next = chain_nonce
+            elif chain_nonce < self._next and not self._in_flight:
+                # 체인 값 이후의 nonce는 모두 다시 할당되므로 반환 목록도 비움
+                self._next = chain_nonce
+            self._released = [n for n in self._released if chain_nonce <= n < self._next]
+            heapq.heapify(self._released)
+            self._stats["resyncs"] += 1
+            logger.info(f"Nonce manager resynced: chain={chain_nonce}, next={self._next}")
+            return self._next
+
+    def fill_gaps(self) -> List[int]:
+        """
+        drop된 트랜잭션이 남긴 빈 nonce를 재할당 대상으로 반환
+
+        채굴된 nonce(latest 기준)는 추적에서 제거하고, gap_timeout이 지나도
+        채굴되지 않은 nonce 중 가장 앞의 하나만 다시 할당 가능하게 만듦
+        (뒤의 nonce는 앞 nonce를 기다리는 중일 수 있으므로 빈자리가 채워진 뒤 다시 판단)
+
+        Returns:
+            다시 할당 가능해진 nonce 목록
+        """
+        mined_nonce = self._fetch_chain_nonce("latest")
+        now = time.monotonic()
+        refilled = []
+        with self._lock:
+            for nonce in [n for n in self._in_flight if n < mined_nonce]:
+                del self._in_flight[nonce]
+            if self._in_flight:
+                nonce = min(self._in_flight)
+                if now - self._in_flight[nonce] >= self.gap_timeout:
+                    del self._in_flight[nonce]
+                    if nonce not in self._released:
+                        heapq.heappush(self._released, nonce)
+                        refilled.append(nonce)
+            self._stats["gaps_filled"] += len(refilled)
+        if refilled:
+            logger.warning(f"Refilling dropped nonces: {refilled}")
+        return refilled
+
+    @staticmethod
+    def is_nonce_error(error: Exception) -> bool:
+        """nonce 충돌 에러인지 확인 (재동기화 후 재시도 대상)"""
+        message = str(error).lower()
+        return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+    @staticmethod
+    def is_already_known(error: Exception) -> bool:
+        """같은 트랜잭션이 이미 전송되었다는 에러인지 확인 (전송 성공으로 처리)"""
+        message = str(error).lower()
+        return any(marker in message for marker in ALREADY_KNOWN_MARKERS)
+
+    def stats(self) -> dict:
+        """할당 통계"""
+        with self._lock:
+            return {
+                **self._stats,
+                "next": self._next,
+                "in_flight": len(self._in_flight),
+                "released_pending": len(self._released),
+            }
@@ -0,0 +1,90 @@
+"""
+비밀번호 해싱 풀
+bcrypt(cost 12 기준 수백 ms)를 이벤트 루프에서 직접 실행하면 그동안 다른 요청이 모두 멈추므로
+전용 스레드 풀에서 실행 (bcrypt는 해싱 중 GIL을 놓아 스레드로도 코어 수만큼 병렬)
+
+실행 중 + 대기 중 작업이 max_pending을 넘으면 기다리지 않고 바로 거절 (로그인 폭주 시 429)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.security import get_password_hash, password_needs_rehash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusyError(Exception):
+    """해싱 풀 포화 (잠시 후 재시도)"""
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = 4, max_pending: int = 64, rounds: int = 12):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 이벤트 루프 스레드에서만 바뀌므로 잠금 없음
+        self._pending = 0
+        self._stats = {"hashed": 0, "verified": 0, "rehashed": 0, "rejected": 0}
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self._stats["rejected"] += 1
+            raise PasswordHasherBusyError(f"{self._pending} password hashes pending")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """비밀번호 해싱 (설정한 cost)"""
+        hashed = await self._run(get_password_hash, password, self.rounds)
+        self._stats["hashed"] += 1
+        return hashed
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        비밀번호 검증
+
+        Returns:
+            (일치 여부, 새 해시) - 일치했고 해시의 cost가 설정과 다르면 같은 작업에서 다시 해싱한 값, 아니면 None
+        """
+        ok, new_hash = await self._run(self._verify_and_rehash, password, hashed_password)
+        self._stats["verified"] += 1
+        if new_hash:
+            self._stats["rehashed"] += 1
+        return ok, new_hash
+
+    def _verify_and_rehash(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        if not verify_password(password, hashed_password):
+            return False, None
+        if password_needs_rehash(hashed_password, self.rounds):
+            return True, get_password_hash(password, self.rounds)
+        return True, None
+
+    def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "pending": self._pending,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "rounds": self.rounds,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+)
@@ -0,0 +1,230 @@
+"""
+IPFS 고정 대기열
+메타데이터 CID를 로컬에서 계산해 요청 안에서는 ipfs_pins에 넣기만 하고 (Pinata 왕복 없음),
+백그라운드 스레드가 SKIP LOCKED로 묶어 가져가 Pinata에 올림 (재시도/지수 백오프)
+
+같은 바이트를 pinFileToIPFS로 올리므로 Pinata가 반환하는 CID는 로컬 계산값과 같음
+(다르면 재시도하지 않고 FAILED로 남김)
+넣는 시점에 ipfs_cache에도 저장하므로 고정 전에도 이 서버에서는 바로 조회 가능
+"""
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import and_, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from datetime import datetime, timedelta
+import json
+import os
+import socket
+import threading
+import logging
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.ipfs_pin import IPFSPin, IPFSPinStatus
+from app.services.cid import file_cid
+from app.services.ipfs_cache import ipfs_cache
+from app.services.ipfs_service import ipfs_service
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_json(data: Any) -> bytes:
+    """고정할 JSON 바이트 (키 정렬, 공백 없음, UTF-8 - 같은 내용이면 항상 같은 CID)"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class _Claimed(NamedTuple):
+    cid: str
+    content: bytes
+    name: Optional[str]
+    keyvalues: Optional[Dict[str, Any]]
+    attempts: int
+
+
+class PinQueue:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        cid_version: int = 0,
+        batch_size: int = 20,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        max_attempts: int = 8,
+        retry_base_seconds: float = 5.0,
+        retry_max_seconds: float = 300.0,
+        lease_seconds: int = 120,
+    ):
+        self.session_factory = session_factory
+        self.cid_version = cid_version
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"[:64]
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"queued": 0, "pinned": 0, "retried": 0, "failed": 0}
+
+    def json_cid(self, data: Any) -> str:
+        """add_json이 반환할 CID (DB 접근 없음)"""
+        return str(file_cid(canonical_json(data), self.cid_version))
+
+    def add_json(
+        self,
+        db: Session,
+        data: Any,
+        name: str,
+        keyvalues: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        JSON 고정 예약 (커밋하지 않음 - 호출자의 트랜잭션과 함께 커밋)
+
+        Returns:
+            로컬에서 계산한 CID (바로 ipfs://<CID>로 사용 가능)
+        """
+        content = canonical_json(data)
+        cid = str(file_cid(content, self.cid_version))
+        db.execute(
+            pg_insert(IPFSPin)
+            .values(cid=cid, content=content, name=name[:255], keyvalues=keyvalues)
+            .on_conflict_do_nothing(index_elements=["cid"])
+        )
+        ipfs_cache.put(cid, content, data)
+        self._stats["queued"] += 1
+        return cid
+
+    # ---- 워커 ----
+
+    def claim(self) -> List[_Claimed]:
+        """고정할 행을 batch_size개까지 SKIP LOCKED로 가져와 RUNNING으로 표시"""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            pins = (
+                db.query(IPFSPin)
+                .filter(or_(
+                    and_(IPFSPin.status == IPFSPinStatus.QUEUED, IPFSPin.run_after <= now),
+                    # 임대가 만료된 행 (프로세스 종료 등)
+                    and_(
+                        IPFSPin.status == IPFSPinStatus.RUNNING,
+                        IPFSPin.locked_at < now - timedelta(seconds=self.lease_seconds)
+                    ),
+                ))
+                .order_by(IPFSPin.run_after)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            claimed = []
+            for pin in pins:
+                pin.status = IPFSPinStatus.RUNNING
+                pin.locked_by = self.worker_id
+                pin.locked_at = now
+                pin.attempts += 1
+                claimed.append(_Claimed(pin.cid, pin.content, pin.name, pin.keyvalues, pin.attempts))
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    def _pin(self, pin: _Claimed) -> Tuple[Optional[str], bool]:
+        """Pinata에 올림 → (오류, 재시도 가능 여부), 성공이면 오류 None"""
+        try:
+            pinned = ipfs_service.pin_bytes(pin.content, pin.name or pin.cid, pin.keyvalues, self.cid_version)
+        except Exception as e:
+            return str(e) or type(e).__name__, True
+        if pinned != pin.cid:
+            return f"CID mismatch: pinned {pinned}, expected {pin.cid}", False
+        return None, False
+
+    def _finish(self, results: List[Tuple[_Claimed, Optional[str], bool]]) -> None:
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            for pin, error, retryable in results:
+                values: Dict[str, Any] = {"locked_by": None, "locked_at": None, "last_error": error}
+                if error is None:
+                    values.update(status=IPFSPinStatus.PINNED, content=None, pinned_at=now)
+                    self._stats["pinned"] += 1
+                elif retryable and pin.attempts < self.max_attempts:
+                    delay = min(self.retry_base_seconds * (2 ** (pin.attempts - 1)), self.retry_max_seconds)
+                    values.update(status=IPFSPinStatus.QUEUED, run_after=now + timedelta(seconds=delay))
+                    self._stats["retried"] += 1
+                    logger.warning(f"IPFS pin retry in {delay:.1f}s: cid={pin.cid}, attempt={pin.attempts}, error={error}")
+                else:
+                    values.update(status=IPFSPinStatus.FAILED)
+                    self._stats["failed"] += 1
+                    logger.error(f"IPFS pin failed: cid={pin.cid}, attempts={pin.attempts}, error={error}")
+                db.execute(
+                    update(IPFSPin)
+                    .where(IPFSPin.cid == pin.cid, IPFSPin.locked_by == self.worker_id)
+                    .values(**values)
+                )
+            db.commit()
+        finally:
+            db.close()
+
+    def process_once(self) -> int:
+        """한 묶음 처리 (동시에 concurrency개씩 업로드) → 처리한 행 수"""
+        claimed = self.claim()
+        if not claimed:
+            return 0
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ipfs-pin")
+        outcomes = list(self._executor.map(self._pin, claimed))
+        self._finish([(pin, error, retryable) for pin, (error, retryable) in zip(claimed, outcomes)])
+        return len(claimed)
+
+    def start(self) -> None:
+        """고정 스레드 시작 (Pinata 키가 없으면 대기열에 쌓기만 함)"""
+        if self._thread and self._thread.is_alive():
+            return
+        if not ipfs_service.is_configured:
+            logger.warning("Pinata API keys not configured. IPFS pins stay queued.")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ipfs-pin-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.process_once()
+            except Exception as e:
+                logger.error(f"IPFS pin queue failed: {e}")
+                processed = 0
+            # 가득 찬 묶음이었으면 쉬지 않고 다음 묶음
+            if processed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "running": bool(self._thread and self._thread.is_alive()),
+        }
+
+
+pin_queue = PinQueue(
+    cid_version=settings.IPFS_CID_VERSION,
+    batch_size=settings.IPFS_PIN_BATCH_SIZE,
+    concurrency=settings.IPFS_PIN_CONCURRENCY,
+    poll_interval=settings.IPFS_PIN_POLL_INTERVAL,
+    max_attempts=settings.IPFS_PIN_MAX_ATTEMPTS,
+    retry_base_seconds=settings.IPFS_PIN_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.IPFS_PIN_RETRY_MAX_SECONDS,
+    lease_seconds=settings.IPFS_PIN_LEASE_SECONDS,
+)
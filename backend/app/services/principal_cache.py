@@ -0,0 +1,176 @@
+"""
+인증 사용자(principal) 캐시
+get_current_user가 요청마다 users를 조회하지 않도록 사용자 컬럼 값(역할/지갑 주소 등)을 짧은 TTL로 캐시하고,
+캐시 값으로 만든 User를 SQL 없이 요청 세션에 붙여 반환
+(엔드포인트가 값을 바꾸고 커밋하면 평소처럼 UPDATE - hashed_password는 담지 않음)
+
+무효화는 catalog_cache와 같은 사용자별 세대(무효화 시각) 방식
+역할 변경/지갑 연결/Smart Wallet 생성 후 invalidate() 호출
+
+AUTH_TOKEN_PRINCIPAL_CLAIMS를 켜면 토큰의 사용자 정보 클레임도 같은 값으로 사용
+(발급 후 AUTH_TOKEN_PRINCIPAL_MAX_AGE_SECONDS 이내, 무효화 시각 이전에 발급된 토큰은 제외)
+"""
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from typing import Any, Dict, Optional
+import asyncio
+import time
+import uuid
+import logging
+
+from app.core.config import settings
+from app.models.user import User, UserRole
+from app.services.catalog_cache import LocalCatalogStore, RedisCatalogStore
+
+logger = logging.getLogger(__name__)
+
+# 토큰의 사용자 정보 클레임 이름
+PRINCIPAL_CLAIM = "usr"
+
+
+def user_scope(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def principal_values(user: User) -> Dict[str, Any]:
+    """캐시/토큰에 담을 사용자 값 (JSON 직렬화 가능)"""
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "role": UserRole(user.role).value,
+        "wallet_address": user.wallet_address,
+        "smart_wallet_address": user.smart_wallet_address,
+        "kyc_verified": user.kyc_verified,
+        "created_at": user.created_at.isoformat(),
+        "updated_at": user.updated_at.isoformat(),
+    }
+
+
+def principal_user(values: Dict[str, Any]) -> User:
+    """캐시 값으로 만든 분리(detached) 상태 User (세션에 add하면 조회 없이 영속 상태)"""
+    user = User(
+        id=uuid.UUID(values["id"]),
+        email=values["email"],
+        role=UserRole(values["role"]),
+        wallet_address=values["wallet_address"],
+        smart_wallet_address=values["smart_wallet_address"],
+        kyc_verified=values["kyc_verified"],
+        created_at=datetime.fromisoformat(values["created_at"]),
+        updated_at=datetime.fromisoformat(values["updated_at"]),
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+class PrincipalCache:
+    def __init__(self, store, ttl: float = 30.0, enabled: bool = True, claims_max_age: Optional[float] = None):
+        self.store = store
+        self.ttl = ttl
+        self.enabled = enabled
+        self.claims_max_age = claims_max_age  # None이면 토큰 클레임 사용 안 함
+        self._stats = {"hits": 0, "claims": 0, "misses": 0, "stale": 0, "invalidations": 0, "errors": 0}
+
+    async def _call(self, fn, *args):
+        # 공유 저장소는 네트워크 I/O라 스레드에서 실행 (로컬 저장소는 바로 호출)
+        if self.store.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def load(self, db: AsyncSession, user_id: uuid.UUID, claims: Dict[str, Any]) -> Optional[User]:
+        """
+        토큰의 사용자 (캐시 → 토큰 클레임 → DB 순)
+
+        캐시/클레임 값이면 SQL 없이 db 세션에 붙인 User, 사용자가 없으면 None
+        """
+        scope = user_scope(user_id)
+        generation = None
+        if self.enabled:
+            try:
+                generation = (await self._call(self.store.generations, [scope]))[0]
+                entry = await self._call(self.store.get, scope)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Principal cache lookup failed: {e}")
+                entry = None
+            if entry is not None:
+                if entry["generation"] == generation:
+                    self._stats["hits"] += 1
+                    return self._attach(db, entry["values"])
+                self._stats["stale"] += 1
+
+        values = self._claim_values(user_id, claims, generation)
+        if values is not None:
+            self._stats["claims"] += 1
+            return self._attach(db, values)
+
+        self._stats["misses"] += 1
+        user = await db.scalar(select(User).where(User.id == user_id))
+        if user is not None and self.enabled:
+            try:
+                # 조회 전에 읽은 세대로 저장 (조회 중 무효화되면 다음 조회에서 바로 stale)
+                await self._call(
+                    self.store.set, scope, {"values": principal_values(user), "generation": generation}, self.ttl
+                )
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Principal cache store failed: {e}")
+        return user
+
+    def _claim_values(self, user_id: uuid.UUID, claims: Dict[str, Any], generation: Optional[float]) -> Optional[Dict[str, Any]]:
+        if self.claims_max_age is None:
+            return None
+        values = claims.get(PRINCIPAL_CLAIM)
+        issued_at = claims.get("iat")
+        if not isinstance(values, dict) or values.get("id") != str(user_id) or not isinstance(issued_at, (int, float)):
+            return None
+        if time.time() - issued_at > self.claims_max_age:
+            return None
+        # 발급 후 무효화(역할/지갑 변경)된 사용자
+        if generation is not None and issued_at <= generation:
+            return None
+        return values
+
+    @staticmethod
+    def _attach(db: AsyncSession, values: Dict[str, Any]) -> User:
+        user = principal_user(values)
+        db.add(user)
+        return user
+
+    async def invalidate(self, user_id) -> None:
+        """사용자 정보 변경 후 호출 (커밋 후)"""
+        try:
+            await self._call(self.store.bump, [user_scope(user_id)], time.time())
+            self._stats["invalidations"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Principal cache invalidation failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "entries": self.store.size(),
+            "ttl_seconds": self.ttl,
+            "enabled": self.enabled,
+            "token_claims": self.claims_max_age is not None,
+        }
+
+
+def _create_store():
+    # 무효화 시각은 토큰이 만료될 때까지 기억
+    generation_ttl = max(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60.0, settings.PRINCIPAL_CACHE_TTL_SECONDS * 10, 86400.0)
+    if settings.PRINCIPAL_CACHE_REDIS_URL:
+        try:
+            return RedisCatalogStore(settings.PRINCIPAL_CACHE_REDIS_URL, prefix="principal:", generation_ttl=generation_ttl)
+        except ImportError:
+            logger.warning("redis package not installed, using in-process principal cache")
+    return LocalCatalogStore(settings.PRINCIPAL_CACHE_MAX_ENTRIES, generation_ttl=generation_ttl)
+
+
+principal_cache = PrincipalCache(
+    store=_create_store(),
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+    claims_max_age=settings.AUTH_TOKEN_PRINCIPAL_MAX_AGE_SECONDS if settings.AUTH_TOKEN_PRINCIPAL_CLAIMS else None,
+)
@@ -0,0 +1,412 @@
+"""
+구매 작업 큐
+purchase_jobs 테이블을 큐로 사용 (SELECT ... FOR UPDATE SKIP LOCKED)
+요청은 검증/재고 예약/작업 등록만 하고 202를 반환, 워커가 구매 단계를 실행
+"""
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Callable, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.event import Event
+from app.models.purchase_job import PurchaseJob, PurchaseJobStatus
+from app.models.ticket import Ticket
+from app.models.user import User
+from app.services.inventory_service import InventoryService, inventory_service
+from app.services.purchase_service import (
+    PurchaseError,
+    confirm_purchase,
+    submit_purchase,
+)
+from app.services.ticket_metadata import ticket_metadata
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (PurchaseJobStatus.QUEUED, PurchaseJobStatus.RUNNING)
+
+
+class SoldOutError(Exception):
+    """예약할 재고가 없음"""
+
+
+class DuplicatePurchaseError(Exception):
+    """같은 이벤트에 대한 구매 작업이 이미 진행 중"""
+
+
+class IdempotencyKeyConflictError(Exception):
+    """같은 Idempotency-Key로 다른 요청이 이미 등록됨"""
+
+
+class LeaseLostError(Exception):
+    """작업 임대가 만료되어 다른 워커가 가져감"""
+
+
+class PurchaseQueue:
+    """
+    구매 작업 큐와 워커
+
+    단계별 결과(ipfs_hash, op_hash, tx_hash)를 작업 행에 저장하므로,
+    재시도나 워커 교체 시 이미 끝난 단계(특히 UserOperation 전송)는 다시 실행하지 않음
+    """
+
+    def __init__(
+        self,
+        inventory: InventoryService,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: int = 8,
+        poll_interval: float = 0.5,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 60.0,
+        lease_seconds: int = 300,
+        confirm_timeout: int = 120,
+    ):
+        self.inventory = inventory
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self.confirm_timeout = confirm_timeout
+        self._stats = {"claimed": 0, "succeeded": 0, "retried": 0, "failed": 0}
+
+    # ---- 요청 쪽 ----
+
+    def find_job(self, db: Session, user_id, idempotency_key: str) -> Optional[PurchaseJob]:
+        return (
+            db.query(PurchaseJob)
+            .filter(PurchaseJob.user_id == user_id)
+            .filter(PurchaseJob.idempotency_key == idempotency_key)
+            .first()
+        )
+
+    def enqueue(
+        self,
+        db: Session,
+        user: User,
+        event: Event,
+        token_uri: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        default_token_uri: Optional[str] = None
+    ) -> Tuple[PurchaseJob, bool]:
+        """
+        재고 예약(hold) 후 구매 작업 등록 (한 트랜잭션으로 커밋)
+
+        Args:
+            token_uri: 클라이언트가 지정한 URI (있으면 그대로 사용)
+            default_token_uri: 좌석 번호별 문서가 없을 때 쓸 이벤트 티켓 문서 URI
+                (고정 대기열 등록/캐시 쓰기가 있으므로 호출자가 미리 스레드에서 계산,
+                 없으면 워커가 채움)
+
+        Returns:
+            (작업, 새로 등록했는지 여부) - 같은 Idempotency-Key의 작업이 있으면 그 작업을 반환
+        """
+        if idempotency_key:
+            existing = self.find_job(db, user.id, idempotency_key)
+            if existing is not None:
+                if existing.event_id != event.id:
+                    raise IdempotencyKeyConflictError(idempotency_key)
+                return existing, False
+
+        in_progress = (
+            db.query(PurchaseJob.id)
+            .filter(PurchaseJob.user_id == user.id)
+            .filter(PurchaseJob.event_id == event.id)
+            .filter(PurchaseJob.status.in_(ACTIVE_STATUSES))
+            .first()
+        )
+        if in_progress is not None:
+            raise DuplicatePurchaseError(str(in_progress.id))
+
+        job = PurchaseJob(
+            user_id=user.id,
+            event_id=event.id,
+            idempotency_key=idempotency_key,
+            token_uri=token_uri,
+            ipfs_hash=token_uri.replace("ipfs://", "") if token_uri else None,
+        )
+        db.add(job)
+        try:
+            db.flush()
+        except IntegrityError:
+            # 같은 키로 동시에 들어온 요청이 먼저 등록함
+            db.rollback()
+            if not idempotency_key:
+                raise
+            existing = self.find_job(db, user.id, idempotency_key)
+            if existing is None or existing.event_id != event.id:
+                raise IdempotencyKeyConflictError(idempotency_key)
+            return existing, False
+
+        hold = self.inventory.reserve(db, event, user_id=user.id)
+        if hold is None:
+            db.rollback()
+            raise SoldOutError(str(event.id))
+        job.hold_id = hold.id
+        if not job.token_uri:
+            # 좌석 번호별 디렉터리가 있으면 예약에서 받은 번호의 문서 (문자열 조합만)
+            job.token_uri = ticket_metadata.serial_uri(event, hold.serial) or default_token_uri
+            job.ipfs_hash = job.token_uri.replace("ipfs://", "") if job.token_uri else None
+
+        db.commit()
+        db.refresh(job)
+        logger.info(f"Purchase job queued: job={job.id}, event={event.id}, user={user.id}")
+        return job, True
+
+    # ---- 워커 쪽 (DB 접근은 스레드에서 실행) ----
+
+    def claim(self, worker_id: str) -> Optional[uuid.UUID]:
+        """실행할 작업 하나를 SKIP LOCKED로 가져와 RUNNING으로 표시"""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            job = (
+                db.query(PurchaseJob)
+                .filter(or_(
+                    and_(PurchaseJob.status == PurchaseJobStatus.QUEUED, PurchaseJob.run_after <= now),
+                    # 임대가 만료된 작업 (워커 종료 등)
+                    and_(
+                        PurchaseJob.status == PurchaseJobStatus.RUNNING,
+                        PurchaseJob.locked_at < now - timedelta(seconds=self.lease_seconds)
+                    ),
+                ))
+                .order_by(PurchaseJob.run_after)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if job is None:
+                db.rollback()
+                return None
+
+            job.status = PurchaseJobStatus.RUNNING
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.attempts += 1
+            db.commit()
+            self._stats["claimed"] += 1
+            return job.id
+        finally:
+            db.close()
+
+    def _load(self, job_id) -> Tuple[PurchaseJob, Event, User]:
+        db = self.session_factory()
+        try:
+            job = db.query(PurchaseJob).filter(PurchaseJob.id == job_id).one()
+            event = db.query(Event).filter(Event.id == job.event_id).one()
+            user = db.query(User).filter(User.id == job.user_id).one()
+            db.expunge_all()
+            return job, event, user
+        finally:
+            db.close()
+
+    def _save(self, job_id, worker_id: str, **fields) -> None:
+        """단계 결과 저장 (임대 갱신 포함, 다른 워커가 가져간 작업이면 LeaseLostError)"""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            result = db.execute(
+                update(PurchaseJob)
+                .where(PurchaseJob.id == job_id, PurchaseJob.locked_by == worker_id)
+                .values(locked_at=now, updated_at=now, **fields)
+            )
+            if result.rowcount != 1:
+                db.rollback()
+                raise LeaseLostError(str(job_id))
+            db.commit()
+        finally:
+            db.close()
+
+    def _complete(self, job_id, worker_id: str) -> None:
+        """티켓 저장 + 예약 확정 후 작업 완료"""
+        db = self.session_factory()
+        try:
+            job = (
+                db.query(PurchaseJob)
+                .filter(PurchaseJob.id == job_id, PurchaseJob.locked_by == worker_id)
+                .with_for_update()
+                .first()
+            )
+            if job is None:
+                raise LeaseLostError(str(job_id))
+
+            event = db.query(Event).filter(Event.id == job.event_id).one()
+            user = db.query(User).filter(User.id == job.user_id).one()
+            ticket = Ticket(
+                token_id=job.token_id,  # 찾지 못했으면 NULL (인덱서가 채움)
+                event_id=job.event_id,
+                owner_address=user.smart_wallet_address,
+                ipfs_hash=job.ipfs_hash,
+                purchase_price_wei=event.price_wei,
+                purchase_tx_hash=job.tx_hash
+            )
+            db.add(ticket)
+            db.flush()
+            if job.hold_id:
+                self.inventory.confirm(db, job.hold_id)
+
+            job.ticket_id = ticket.id
+            job.status = PurchaseJobStatus.SUCCEEDED
+            job.last_error = None
+            job.locked_by = None
+            job.locked_at = None
+            db.commit()
+            self._stats["succeeded"] += 1
+            logger.info(f"Purchase job succeeded: job={job_id}, ticket={ticket.id}, tokenId={ticket.token_id}")
+        finally:
+            db.close()
+
+    def _retry_or_fail(self, job_id, worker_id: str, error: str, retryable: bool) -> None:
+        """재시도 예약 또는 최종 실패 처리"""
+        db = self.session_factory()
+        try:
+            job = (
+                db.query(PurchaseJob)
+                .filter(PurchaseJob.id == job_id, PurchaseJob.locked_by == worker_id)
+                .with_for_update()
+                .first()
+            )
+            if job is None:
+                return
+
+            job.last_error = error[:2000]
+            job.locked_by = None
+            job.locked_at = None
+            if retryable and job.attempts < self.max_attempts:
+                delay = min(self.retry_base_seconds * (2 ** (job.attempts - 1)), self.retry_max_seconds)
+                job.status = PurchaseJobStatus.QUEUED
+                job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+                self._stats["retried"] += 1
+                logger.warning(f"Purchase job retry in {delay:.1f}s: job={job_id}, attempt={job.attempts}, error={error}")
+            else:
+                job.status = PurchaseJobStatus.FAILED
+                # 전송 후 확인만 못 한 경우는 온체인 결과를 알 수 없으므로 재고를 반환하지 않음 (인덱서가 정리)
+                if job.hold_id and not (job.op_hash and retryable):
+                    self.inventory.release(db, job.hold_id)
+                self._stats["failed"] += 1
+                logger.error(f"Purchase job failed: job={job_id}, attempts={job.attempts}, error={error}")
+            db.commit()
+        finally:
+            db.close()
+
+    def _ensure_hold(self, job_id, worker_id: str) -> str:
+        """
+        전송 전 재고 예약 연장 (재시도 대기 중 만료되어 반환됐으면 다시 예약)
+
+        Returns:
+            전송할 token URI (다시 예약했고 좌석 번호별 문서를 쓰던 작업이면 새 번호의 문서 -
+            반환된 이전 번호는 다른 예약이 재사용할 수 있음)
+        """
+        db = self.session_factory()
+        try:
+            job = (
+                db.query(PurchaseJob)
+                .filter(PurchaseJob.id == job_id, PurchaseJob.locked_by == worker_id)
+                .first()
+            )
+            if job is None:
+                raise LeaseLostError(str(job_id))
+            if job.hold_id and self.inventory.extend(db, job.hold_id):
+                db.commit()
+                return job.token_uri
+
+            event = db.query(Event).filter(Event.id == job.event_id).one()
+            hold = self.inventory.reserve(db, event, user_id=job.user_id)
+            if hold is None:
+                db.rollback()
+                raise PurchaseError("Tickets sold out", retryable=False)
+            job.hold_id = hold.id
+            if job.token_uri and ticket_metadata.has_directory(event) and job.token_uri.startswith(f"ipfs://{event.metadata_dir_cid}/"):
+                job.token_uri = ticket_metadata.serial_uri(event, hold.serial) or ticket_metadata.token_uri(event)
+                job.ipfs_hash = job.token_uri.replace("ipfs://", "")
+            db.commit()
+            return job.token_uri
+        finally:
+            db.close()
+
+    async def process(self, job_id, worker_id: str) -> None:
+        """작업 실행 (완료된 단계는 건너뜀)"""
+        job, event, user = await asyncio.to_thread(self._load, job_id)
+        try:
+            if not user.smart_wallet_address:
+                raise PurchaseError("Smart wallet not created", retryable=False)
+
+            token_uri = job.token_uri
+            if not token_uri:
+                # 등록 시 token URI를 정하지 못한 작업 (이벤트 티켓 문서 사용)
+                token_uri = await asyncio.to_thread(ticket_metadata.token_uri, event)
+                await asyncio.to_thread(
+                    self._save, job_id, worker_id, ipfs_hash=token_uri.replace("ipfs://", ""), token_uri=token_uri
+                )
+
+            if event.event_id_onchain is not None:
+                op_hash = job.op_hash
+                if not op_hash:
+                    token_uri = await asyncio.to_thread(self._ensure_hold, job_id, worker_id)
+                    op_hash = await submit_purchase(event, user.smart_wallet_address, token_uri, wait=False)
+                    await asyncio.to_thread(self._save, job_id, worker_id, op_hash=op_hash)
+
+                if not job.tx_hash:
+                    tx_hash, token_id = await confirm_purchase(
+                        op_hash,
+                        event.event_id_onchain,
+                        user.smart_wallet_address,
+                        timeout=self.confirm_timeout
+                    )
+                    await asyncio.to_thread(self._save, job_id, worker_id, tx_hash=tx_hash, token_id=token_id)
+
+            await asyncio.to_thread(self._complete, job_id, worker_id)
+        except LeaseLostError:
+            logger.warning(f"Purchase job lease lost: job={job_id}, worker={worker_id}")
+        except PurchaseError as e:
+            await asyncio.to_thread(self._retry_or_fail, job_id, worker_id, str(e), e.retryable)
+        except Exception as e:
+            logger.error(f"Purchase job error: job={job_id}, error={e}")
+            await asyncio.to_thread(self._retry_or_fail, job_id, worker_id, str(e), True)
+
+    async def _worker(self, worker_id: str, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                job_id = await asyncio.to_thread(self.claim, worker_id)
+            except Exception as e:
+                logger.error(f"Failed to claim purchase job: {e}")
+                job_id = None
+
+            if job_id is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.process(job_id, worker_id)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """concurrency 개의 워커로 큐 처리 (stop이 설정되면 진행 중인 작업을 마치고 종료)"""
+        prefix = f"{socket.gethostname()}-{os.getpid()}"
+        logger.info(f"Purchase workers started: {prefix} x{self.concurrency}")
+        await asyncio.gather(*(
+            self._worker(f"{prefix}-{i}", stop) for i in range(self.concurrency)
+        ))
+        logger.info(f"Purchase workers stopped: {self._stats}")
+
+
+purchase_queue = PurchaseQueue(
+    inventory_service,
+    concurrency=settings.PURCHASE_WORKER_CONCURRENCY,
+    poll_interval=settings.PURCHASE_WORKER_POLL_INTERVAL,
+    max_attempts=settings.PURCHASE_JOB_MAX_ATTEMPTS,
+    retry_base_seconds=settings.PURCHASE_JOB_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.PURCHASE_JOB_RETRY_MAX_SECONDS,
+    lease_seconds=settings.PURCHASE_JOB_LEASE_SECONDS,
+    confirm_timeout=settings.PURCHASE_CONFIRM_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,159 @@
+"""
+티켓 구매 단계
+동기 구매 요청(POST /tickets/purchase)과 구매 작업 워커가 같은 단계를 공유
+(티켓 메타데이터 token URI → UserOperation 생성/서명/전송 → 처리 대기 및 tokenId 추출)
+"""
+from web3 import Web3
+from typing import Optional, Tuple
+import aiohttp
+import asyncio
+import os
+import logging
+
+from app.core.config import settings
+from app.models.event import Event
+from app.services.async_aa_service import async_aa_service
+from app.services.async_web3_service import async_web3_service
+from app.services.receipt_decoder import receipt_decoder
+
+logger = logging.getLogger(__name__)
+
+
+class PurchaseError(Exception):
+    """구매 단계 실패 (retryable=False면 다시 시도해도 같은 결과)"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class InsufficientBalanceError(PurchaseError):
+    """Smart Wallet 잔액 부족 (카드 결제 필요)"""
+
+    def __init__(self, required: int, current: int, smart_wallet_address: str):
+        super().__init__("Insufficient balance", retryable=False)
+        self.required = required
+        self.current = current
+        self.smart_wallet_address = smart_wallet_address
+
+    def to_detail(self) -> dict:
+        return {
+            "error": "Insufficient balance",
+            "required": str(self.required),
+            "current": str(self.current),
+            "smart_wallet_address": self.smart_wallet_address,
+            "message": "Smart Wallet에 충분한 자금이 없습니다. 카드 결제를 진행해주세요.",
+            "payment_required": True
+        }
+
+
+def encode_purchase_call(event_id_onchain: int, token_uri: str) -> bytes:
+    """purchaseTicket(eventId, tokenURI) 호출 데이터 인코딩"""
+    contract = async_web3_service._get_contract(settings.EVENT_MANAGER_ADDRESS, "EventManager")
+
+    # (encodeABI는 RPC 호출 없이 로컬에서 인코딩 - build_transaction은 gasPrice/chainId 조회 필요)
+    try:
+        call_data = contract.encodeABI(
+            fn_name="purchaseTicket",
+            args=[event_id_onchain, token_uri]
+        )
+        logger.info(f"Function call data encoded: {call_data[:20]}...")
+    except Exception as e:
+        logger.error(f"Failed to encode function call with encodeABI: {e}")
+        # 대체 방법: 직접 ABI 인코딩
+        from eth_abi import encode as abi_encode
+        from eth_utils import keccak, to_hex
+        # 함수 시그니처 해시 (purchaseTicket(uint256,string))
+        fn_signature = keccak(b"purchaseTicket(uint256,string)")[:4]
+        encoded_args = abi_encode(['uint256', 'string'], [event_id_onchain, token_uri])
+        call_data = to_hex(fn_signature + encoded_args)
+        logger.info(f"Function call data encoded (fallback): {call_data[:20]}...")
+
+    if isinstance(call_data, str):
+        return bytes.fromhex(call_data.replace("0x", ""))
+    return call_data
+
+
+async def submit_purchase(
+    event: Event,
+    smart_wallet_address: str,
+    token_uri: str,
+    wait: bool = True
+) -> str:
+    """
+    UserOperation으로 purchaseTicket 전송
+
+    Args:
+        event: 구매할 이벤트 (event_id_onchain 필요)
+        smart_wallet_address: 구매자 Smart Wallet 주소
+        token_uri: 티켓 tokenURI
+        wait: 직접 전송(Bundler 미사용) 시 영수증까지 대기할지 여부
+
+    Returns:
+        UserOperation 해시 (Bundler 경유) 또는 트랜잭션 해시 (직접 전송)
+    """
+    call_data = encode_purchase_call(event.event_id_onchain, token_uri)
+
+    # Smart Wallet 잔액 확인 (실제 서비스: 사용자가 충전해야 함)
+    smart_wallet_balance = await async_web3_service.w3.eth.get_balance(
+        Web3.to_checksum_address(smart_wallet_address)
+    )
+    logger.info(f"Smart Wallet balance: {smart_wallet_balance} wei ({async_web3_service.w3.from_wei(smart_wallet_balance, 'ether')} ETH)")
+
+    # 잔액 부족 시 에러 (카드 결제 필요)
+    if smart_wallet_balance < event.price_wei:
+        raise InsufficientBalanceError(event.price_wei, smart_wallet_balance, smart_wallet_address)
+
+    user_operation = await async_aa_service.create_user_operation(
+        sender=smart_wallet_address,
+        target=settings.EVENT_MANAGER_ADDRESS,
+        data=call_data,
+        value=event.price_wei
+    )
+
+    # Paymaster 데이터 가져오기 (티켓 구매는 스폰서)
+    paymaster_data = await async_aa_service.get_paymaster_sponsor_data(
+        user_operation,
+        target=settings.EVENT_MANAGER_ADDRESS
+    )
+    user_operation["paymasterAndData"] = paymaster_data
+
+    # UserOperation 서명 (서비스 계정의 private key 사용 - 테스트용)
+    private_key = os.getenv("PRIVATE_KEY", settings.PRIVATE_KEY)
+    if not private_key:
+        raise PurchaseError("Private key not configured", retryable=False)
+
+    signed_user_op = await async_aa_service.sign_user_operation(user_operation, private_key)
+
+    op_hash = await async_aa_service.send_user_operation(signed_user_op, wait=wait)
+    logger.info(f"UserOperation sent, op_hash: {op_hash}")
+    return str(op_hash) if not isinstance(op_hash, str) else op_hash
+
+
+async def confirm_purchase(
+    op_hash: str,
+    event_id_onchain: int,
+    buyer: str,
+    timeout: int = 120
+) -> Tuple[str, Optional[int]]:
+    """
+    UserOperation 처리 대기 후 해당 UserOperation의 로그에서 tokenId 추출
+
+    Returns:
+        (트랜잭션 해시, tokenId) - tokenId를 찾지 못하면 None (tx_tracker/인덱서가 채움)
+    """
+    try:
+        tx_hash, receipt, op_logs = await async_aa_service.wait_for_user_operation(op_hash, timeout=timeout)
+    except (TimeoutError, asyncio.TimeoutError, aiohttp.ClientError) as e:
+        raise PurchaseError(f"UserOperation not confirmed yet: {e}")
+    except Exception as e:
+        # 실패한 트랜잭션/revert된 UserOperation은 다시 기다려도 결과가 같음
+        raise PurchaseError(f"Failed to get transaction receipt: {e}", retryable=False)
+
+    # TicketSold/TicketMinted 디코딩 (topic0로 바로 매칭)
+    token_id = receipt_decoder.find_purchased_token(op_logs, event_id=event_id_onchain, buyer=buyer)
+    if token_id is not None:
+        logger.info(f"Ticket purchased via UserOperation: tokenId={token_id}, tx={tx_hash}")
+    else:
+        logger.error(f"Failed to extract token ID from transaction: {tx_hash}, logs={len(op_logs)}")
+    return tx_hash, token_id
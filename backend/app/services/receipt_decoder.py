@@ -0,0 +1,194 @@
+"""
+영수증/로그 디코더
+컨트랙트별 topic0 → 이벤트 ABI 맵을 한 번만 만들고, 영수증의 로그를 주소/토픽으로 바로 찾아 디코딩
+"""
+from eth_abi.abi import default_codec
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3._utils.events import get_event_data
+from web3.datastructures import AttributeDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from app.services.aa_service import ENTRY_POINT_ABI, aa_service
+from app.services.contract_registry import ContractRegistry
+from app.services.web3_service import web3_service
+
+logger = logging.getLogger(__name__)
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class DecodedLog:
+    """디코딩된 로그 (컨트랙트 이름 + 이벤트 이름 + 인자)"""
+
+    __slots__ = ("contract", "event", "args", "address", "tx_hash", "log_index", "block_number")
+
+    def __init__(self, contract: str, event: str, args, address: str, tx_hash: str, log_index: int, block_number: int):
+        self.contract = contract
+        self.event = event
+        self.args = args
+        self.address = address
+        self.tx_hash = tx_hash
+        self.log_index = log_index
+        self.block_number = block_number
+
+
+class ReceiptDecoder:
+    """
+    (주소, topic0)로 이벤트 ABI를 찾아 로그를 한 번에 디코딩
+
+    등록하지 않은 주소/토픽의 로그는 디코딩을 시도하지 않고 건너뜀
+    """
+
+    def __init__(self, contracts: ContractRegistry, codec=default_codec):
+        self.contracts = contracts
+        self.codec = codec
+        self._events: Dict[Tuple[str, bytes], Tuple[str, dict]] = {}
+        self._addresses: Dict[str, str] = {}  # 소문자 주소 → 컨트랙트 이름
+
+    def register(
+        self,
+        contract_address: Optional[str],
+        contract_name: str,
+        event_names: Optional[Iterable[str]] = None
+    ) -> bool:
+        """
+        컨트랙트 이벤트 등록 (ABI는 레지스트리 캐시 사용)
+
+        Args:
+            contract_address: 컨트랙트 주소 (비어 있으면 등록하지 않음)
+            contract_name: ABI 이름
+            event_names: 등록할 이벤트 (None이면 ABI의 모든 이벤트)
+        """
+        if not contract_address:
+            return False
+        address = contract_address.lower()
+        wanted = set(event_names) if event_names is not None else None
+        for item in self.contracts.get_abi(contract_name):
+            if item.get("type") != "event":
+                continue
+            if wanted is not None and item["name"] not in wanted:
+                continue
+            self._events[(address, event_abi_to_log_topic(item))] = (contract_name, item)
+        self._addresses[address] = contract_name
+        return True
+
+    def unregister(self, contract_address: Optional[str]) -> bool:
+        """컨트랙트 이벤트 등록 해제 (재배포로 주소가 바뀐 경우)"""
+        if not contract_address:
+            return False
+        address = contract_address.lower()
+        self._events = {key: entry for key, entry in self._events.items() if key[0] != address}
+        return self._addresses.pop(address, None) is not None
+
+    @property
+    def addresses(self) -> List[str]:
+        return [Web3.to_checksum_address(address) for address in self._addresses]
+
+    @property
+    def topics(self) -> List[str]:
+        return sorted({Web3.to_hex(topic) for _, topic in self._events})
+
+    def topic_for(self, contract_name: str, event_name: str) -> Optional[str]:
+        """등록된 이벤트의 topic0 (hex)"""
+        for (_, topic), (name, event_abi) in self._events.items():
+            if name == contract_name and event_abi["name"] == event_name:
+                return Web3.to_hex(topic)
+        return None
+
+    def decode_log(self, log) -> Optional[DecodedLog]:
+        """로그 하나 디코딩 (등록되지 않은 로그는 None)"""
+        topics = log["topics"]
+        if not topics:
+            return None
+        address = str(log["address"]).lower()
+        entry = self._events.get((address, bytes(topics[0])))
+        if entry is None:
+            return None
+        contract_name, event_abi = entry
+        try:
+            event = AttributeDict.recursive(get_event_data(self.codec, event_abi, log))
+        except Exception as e:
+            logger.warning(f"Failed to decode {contract_name}.{event_abi['name']} log: {e}")
+            return None
+        return DecodedLog(
+            contract_name,
+            event_abi["name"],
+            event.args,
+            address,
+            event.transactionHash.hex(),
+            event.logIndex,
+            event.blockNumber,
+        )
+
+    def decode(self, logs) -> List[DecodedLog]:
+        """로그 목록(또는 영수증)을 한 번에 디코딩"""
+        if hasattr(logs, "get") and "logs" in logs:
+            logs = logs["logs"]
+        return [decoded for decoded in (self.decode_log(log) for log in logs) if decoded is not None]
+
+    def user_operation_logs(self, receipt, user_op_hash: Optional[str]) -> Tuple[Optional[DecodedLog], list]:
+        """
+        번들 트랜잭션 영수증에서 특정 UserOperation이 남긴 로그만 추출
+
+        EntryPoint는 각 UserOperation 실행 후 UserOperationEvent를 남기므로,
+        직전 UserOperationEvent 다음부터 해당 UserOperationEvent 전까지가 그 UserOperation의 로그
+
+        Args:
+            user_op_hash: UserOperation 해시 (None이면 첫 UserOperation - handleOps 직접 호출처럼 하나만 담은 번들)
+
+        Returns:
+            (UserOperationEvent, 내부 로그 목록) - 영수증에 해당 UserOperation이 없으면 (None, [])
+        """
+        user_op_hash = user_op_hash.lower() if user_op_hash else None
+        start = 0
+        logs = receipt["logs"]
+        for i, log in enumerate(logs):
+            decoded = self.decode_log(log)
+            if decoded is None or decoded.event != "UserOperationEvent":
+                continue
+            if user_op_hash is None or Web3.to_hex(decoded.args.userOpHash).lower() == user_op_hash:
+                return decoded, list(logs[start:i])
+            start = i + 1
+        return None, []
+
+    def find_purchased_token(
+        self,
+        logs,
+        event_id: Optional[int] = None,
+        buyer: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        구매로 발행된 tokenId 찾기
+
+        EventManager.TicketSold → TicketNFT.TicketMinted → TicketNFT.Transfer(mint) 순으로 확인하고,
+        eventId/buyer가 주어지면 일치하는 로그만 사용 (한 번들에 여러 구매가 섞인 경우)
+        """
+        buyer = buyer.lower() if buyer else None
+        minted = transferred = None
+        for log in self.decode(logs):
+            args = log.args
+            if log.contract == "EventManager" and log.event == "TicketSold":
+                if (event_id is None or args.eventId == event_id) and (buyer is None or args.buyer.lower() == buyer):
+                    return args.tokenId
+            elif log.contract == "TicketNFT" and log.event == "TicketMinted":
+                if minted is None and (event_id is None or args.eventId == event_id) and (buyer is None or args.to.lower() == buyer):
+                    minted = args.tokenId
+            elif log.contract == "TicketNFT" and log.event == "Transfer":
+                if transferred is None and args["from"] == ZERO_ADDRESS and (buyer is None or args.to.lower() == buyer):
+                    transferred = args.tokenId
+        return minted if minted is not None else transferred
+
+
+def _build_default_decoder() -> ReceiptDecoder:
+    # 서비스가 실제로 쓰는 주소로 등록 (주소 변경은 Web3Service.set_contract_address가 반영)
+    web3_service.contracts.register_abi("EntryPoint", ENTRY_POINT_ABI)
+    decoder = ReceiptDecoder(web3_service.contracts)
+    for attr, contract_name in web3_service.CONTRACT_NAMES.items():
+        decoder.register(getattr(web3_service, attr, None), contract_name)
+    decoder.register(aa_service.entry_point_address, "EntryPoint", ["UserOperationEvent"])
+    return decoder
+
+
+receipt_decoder = _build_default_decoder()
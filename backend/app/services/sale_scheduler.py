@@ -0,0 +1,374 @@
+"""
+판매 상태 스케줄러
+승인된 이벤트를 판매 기간 경계(start_time / end_time)에 맞춰 APPROVED(판매 전) → ACTIVE(판매 중) → ENDED로 전환하고,
+판매 중 이벤트를 (created_at, id) 순으로 메모리에 정렬해 두어 GET /events?status_filter=active를 DB 없이 응답
+
+DB 상태 전환(UPDATE)은 리더 워커 하나만 실행하고, 다른 워커는 판매 기간으로 인덱스만 갱신
+다른 워커의 변경은 updated_at 워터마크 이후에 바뀐 이벤트만 다시 읽어 반영
+"""
+from bisect import bisect_left, insort
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import threading
+import time
+import uuid
+import logging
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.event import Event, EventStatus
+from app.schemas.event import EventResponse
+from app.services.catalog_cache import catalog_cache
+from app.services.leader_lock import LeaderLock
+
+logger = logging.getLogger(__name__)
+
+# 판매 기간에 따라 상태가 바뀌는 (승인 이후) 상태
+SALE_STATUSES = (EventStatus.APPROVED, EventStatus.ACTIVE, EventStatus.ENDED)
+
+SortKey = Tuple[datetime, uuid.UUID]
+
+
+def sale_status(start_time: datetime, end_time: datetime, now: Optional[datetime] = None) -> EventStatus:
+    """판매 기간 기준 상태 (승인된 이벤트용)"""
+    now = now or datetime.utcnow()
+    if now < start_time:
+        return EventStatus.APPROVED
+    if now > end_time:
+        return EventStatus.ENDED
+    return EventStatus.ACTIVE
+
+
+def _snapshot(event: Event) -> EventResponse:
+    return EventResponse(
+        id=str(event.id),
+        event_id_onchain=event.event_id_onchain,
+        organizer_id=str(event.organizer_id),
+        name=event.name,
+        description=event.description,
+        ipfs_hash=event.ipfs_hash,
+        price_wei=event.price_wei,
+        max_tickets=event.max_tickets,
+        sold_tickets=event.sold_tickets,
+        start_time=event.start_time,
+        end_time=event.end_time,
+        event_date=event.event_date,
+        status=event.status,
+        created_at=event.created_at,
+        updated_at=event.updated_at,
+    )
+
+
+class SaleScheduler:
+    """
+    판매 기간 경계 힙 + 판매 중 이벤트 정렬 인덱스
+
+    - 힙: (경계 시각, 순번, 이벤트 ID) - 꺼낼 때 현재 스냅샷으로 다시 판단하므로 오래된 항목은 무시됨
+    - 인덱스: 판매 중 이벤트의 (created_at, id) 오름차순 목록 + ID별 응답 스냅샷
+    - refresh_interval마다 updated_at이 워터마크 이후인 이벤트만 다시 읽어 반영
+      (다른 워커의 승인/수정/취소, 판매 수량 변경 - 모두 updated_at을 갱신)
+      삭제는 updated_at으로 알 수 없으므로 full_reload_interval마다 전체를 다시 읽음
+    - 상태 전환 UPDATE는 리더만 실행 (조건부 UPDATE라 리더가 바뀌는 순간 겹쳐도 안전)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        refresh_interval: float = 5.0,
+        change_lag: float = 30.0,
+        full_reload_interval: float = 600.0,
+        leader: Optional[LeaderLock] = None,
+    ):
+        self.session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self.change_lag = change_lag
+        self.full_reload_interval = full_reload_interval
+        self.leader = leader or LeaderLock("sale-scheduler", check_interval=refresh_interval)
+        self._leading = False
+        self._watermark: Optional[datetime] = None
+        self._next_full_reload = 0.0
+        self._events: Dict[uuid.UUID, EventResponse] = {}
+        self._on_sale: List[SortKey] = []
+        self._heap: List[Tuple[datetime, int, uuid.UUID]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loaded = False
+        self._stats = {"reloads": 0, "full_reloads": 0, "reloaded_events": 0, "activated": 0, "ended": 0}
+
+    @property
+    def ready(self) -> bool:
+        """인덱스로 응답 가능한지 (스레드가 돌고 있고 한 번 이상 로드됨)"""
+        return self._loaded and self._thread is not None and self._thread.is_alive()
+
+    # ---- 인덱스 ----
+
+    def _remove(self, event_id: uuid.UUID) -> None:
+        snapshot = self._events.pop(event_id, None)
+        if snapshot is not None and snapshot.status == EventStatus.ACTIVE:
+            key = (snapshot.created_at, event_id)
+            position = bisect_left(self._on_sale, key)
+            if position < len(self._on_sale) and self._on_sale[position] == key:
+                del self._on_sale[position]
+
+    def _put(self, event_id: uuid.UUID, snapshot: EventResponse) -> None:
+        self._remove(event_id)
+        if snapshot.status not in (EventStatus.APPROVED, EventStatus.ACTIVE):
+            return
+        self._events[event_id] = snapshot
+        if snapshot.status == EventStatus.ACTIVE:
+            insort(self._on_sale, (snapshot.created_at, event_id))
+            heapq.heappush(self._heap, (snapshot.end_time, next(self._seq), event_id))
+        else:
+            heapq.heappush(self._heap, (snapshot.start_time, next(self._seq), event_id))
+
+    def track(self, event: Event) -> None:
+        """API에서 승인/수정/취소한 이벤트 반영 (커밋 후 호출, 같은 워커에는 바로 반영)"""
+        with self._lock:
+            self._put(event.id, _snapshot(event))
+        self._wake.set()
+
+    def untrack(self, event_id: uuid.UUID) -> None:
+        with self._lock:
+            self._remove(event_id)
+
+    def on_sale_page(
+        self,
+        after: Optional[SortKey],
+        skip: int,
+        limit: int,
+        now: Optional[datetime] = None,
+    ) -> List[EventResponse]:
+        """
+        판매 중 이벤트 한 페이지 (created_at, id 내림차순)
+
+        Args:
+            after: 이전 페이지 마지막 (created_at, id) - 이보다 작은 키부터
+            skip: after가 없을 때 건너뛸 개수
+            limit: 최대 개수 (다음 페이지 확인용으로 limit + 1을 넘기면 됨)
+        """
+        now = now or datetime.utcnow()
+        page: List[EventResponse] = []
+        with self._lock:
+            position = bisect_left(self._on_sale, after) if after else len(self._on_sale)
+            for i in range(position - 1, -1, -1):
+                snapshot = self._events[self._on_sale[i][1]]
+                # 아직 전환 전인 경계 직후의 이벤트 제외
+                if not (snapshot.start_time <= now <= snapshot.end_time):
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                page.append(snapshot)
+                if len(page) >= limit:
+                    break
+        return page
+
+    # ---- 상태 전환 ----
+
+    def reload(self) -> None:
+        """
+        다른 워커의 변경 반영
+
+        처음과 full_reload_interval마다는 APPROVED/ACTIVE 전체, 그 사이에는
+        updated_at >= (직전 조회 시각 - change_lag)인 이벤트만 읽음
+        """
+        full = not self._loaded or time.monotonic() >= self._next_full_reload
+        started = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            query = db.query(Event)
+            if full:
+                query = query.filter(Event.status.in_([EventStatus.APPROVED, EventStatus.ACTIVE]))
+            else:
+                query = query.filter(Event.updated_at >= self._watermark - timedelta(seconds=self.change_lag))
+            snapshots = {event.id: _snapshot(event) for event in query.all()}
+        finally:
+            db.close()
+
+        with self._lock:
+            if full:
+                changed = [
+                    event_id for event_id in self._events.keys() | snapshots.keys()
+                    if self._events.get(event_id) != snapshots.get(event_id)
+                ]
+                self._events, self._on_sale, self._heap = {}, [], []
+            else:
+                # 추적하지 않던 이벤트가 추적 대상 밖 상태로 바뀐 것(종료된 이벤트 수정 등)은 제외
+                changed = [
+                    event_id for event_id, snapshot in snapshots.items()
+                    if self._events.get(event_id) != snapshot
+                    and (event_id in self._events or snapshot.status in (EventStatus.APPROVED, EventStatus.ACTIVE))
+                ]
+            for event_id, snapshot in snapshots.items():
+                self._put(event_id, snapshot)
+            self._watermark = started
+            initial = not self._loaded
+            self._loaded = True
+        if full:
+            self._next_full_reload = time.monotonic() + self.full_reload_interval
+            self._stats["full_reloads"] += 1
+        self._stats["reloads"] += 1
+        self._stats["reloaded_events"] += len(snapshots)
+
+        # 다른 워커에서 바뀐 이벤트(판매 수량 등)의 카탈로그 캐시 무효화
+        if changed and not initial:
+            catalog_cache.invalidate_events_sync(changed)
+
+    def advance(self, now: Optional[datetime] = None) -> int:
+        """
+        판매 기간 경계가 지난 이벤트 상태 전환
+
+        Returns:
+            이 워커가 상태를 바꾼 이벤트 수
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            due = set()
+            while self._heap and self._heap[0][0] <= now:
+                due.add(heapq.heappop(self._heap)[2])
+
+        if not self.leader.held():
+            # DB 전환은 리더가 담당 - 여기서는 판매 기간으로 인덱스만 갱신 (리더의 UPDATE는 reload로 반영)
+            self._leading = False
+            with self._lock:
+                for event_id in due:
+                    snapshot = self._events.get(event_id)
+                    if snapshot is not None:
+                        status = sale_status(snapshot.start_time, snapshot.end_time, now)
+                        self._put(event_id, snapshot.model_copy(update={"status": status}))
+            return 0
+        self._leading = True
+
+        db = self.session_factory()
+        try:
+            # 기간 조건을 UPDATE에 함께 걸어 그 사이 수정된 이벤트는 건드리지 않음
+            activated = db.execute(
+                update(Event)
+                .where(
+                    Event.status == EventStatus.APPROVED,
+                    Event.start_time <= now,
+                    Event.end_time >= now,
+                )
+                .values(status=EventStatus.ACTIVE)
+                .returning(Event.id)
+            ).scalars().all()
+            ended = db.execute(
+                update(Event)
+                .where(
+                    Event.status.in_([EventStatus.APPROVED, EventStatus.ACTIVE]),
+                    Event.end_time < now,
+                )
+                .values(status=EventStatus.ENDED)
+                .returning(Event.id)
+            ).scalars().all()
+            # 판매 기간이 미래로 바뀐 판매 중 이벤트는 판매 전으로
+            pending = db.execute(
+                update(Event)
+                .where(Event.status == EventStatus.ACTIVE, Event.start_time > now)
+                .values(status=EventStatus.APPROVED)
+                .returning(Event.id)
+            ).scalars().all()
+            changed = [*activated, *ended, *pending]
+            # 경계가 지난 이벤트는 다른 워커가 먼저 전환했을 수 있으므로 DB 상태로 스냅샷 갱신
+            refresh = due.union(changed)
+            events = db.query(Event).filter(Event.id.in_(refresh)).all() if refresh else []
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            for event in events:
+                self._put(event.id, _snapshot(event))
+            for event_id in refresh.difference(event.id for event in events):
+                self._remove(event_id)
+
+        if not changed:
+            return 0
+        self._stats["activated"] += len(activated)
+        self._stats["ended"] += len(ended)
+        logger.info(f"Sale status: {len(activated)} on sale, {len(ended)} ended, {len(pending)} back to pending")
+        catalog_cache.invalidate_events_sync(changed)
+        return len(changed)
+
+    def _next_boundary(self) -> Optional[datetime]:
+        """다음 경계 시각 (현재 상태로는 더 이상 의미 없는 힙 항목은 버림)"""
+        with self._lock:
+            while self._heap:
+                when, _, event_id = self._heap[0]
+                snapshot = self._events.get(event_id)
+                if snapshot is not None:
+                    boundary = snapshot.end_time if snapshot.status == EventStatus.ACTIVE else snapshot.start_time
+                    if boundary == when:
+                        return when
+                heapq.heappop(self._heap)
+            return None
+
+    # ---- 백그라운드 스레드 ----
+
+    def start(self) -> None:
+        """스케줄러 스레드 시작 (첫 로드도 스레드에서 - 앱 시작을 막지 않음)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sale-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.leader.release()
+        self._leading = False
+
+    def _run(self) -> None:
+        next_reload = 0.0
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() >= next_reload:
+                    next_reload = time.monotonic() + self.refresh_interval
+                    self.reload()
+                    # 리더가 된 직후에는 리더가 없던 동안 지난 경계를 한 번에 전환
+                    if not self._leading and self.leader.held():
+                        self.advance()
+                else:
+                    boundary = self._next_boundary()
+                    if boundary is not None and boundary <= datetime.utcnow():
+                        self.advance()
+                wait = next_reload - time.monotonic()
+                boundary = self._next_boundary()
+                if boundary is not None:
+                    wait = min(wait, (boundary - datetime.utcnow()).total_seconds())
+            except Exception as e:
+                logger.error(f"Sale scheduler iteration failed: {e}")
+                wait = self.refresh_interval
+            self._wake.wait(max(wait, 0.05))
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "ready": self.ready,
+            "leader": self._leading,
+            "tracked": len(self._events),
+            "on_sale": len(self._on_sale),
+            "pending_boundaries": len(self._heap),
+        }
+
+
+sale_scheduler = SaleScheduler(
+    refresh_interval=settings.SALE_SCHEDULER_REFRESH_SECONDS,
+    change_lag=settings.SALE_SCHEDULER_CHANGE_LAG_SECONDS,
+    full_reload_interval=settings.SALE_SCHEDULER_FULL_RELOAD_SECONDS,
+)
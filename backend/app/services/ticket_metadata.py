@@ -0,0 +1,243 @@
+"""
+티켓 메타데이터
+티켓 메타데이터는 이벤트 단위 내용(이름/일시/가격/이미지)만으로 만들어지므로,
+이벤트별 불변 문서 하나를 고정하고 그 이벤트의 모든 티켓 token URI가 같은 문서를 가리킴
+(티켓별 차이가 없어 티켓마다 올릴 내용이 없음 - IPFS 고정은 이벤트 내용이 바뀔 때마다 1번)
+
+문서 CID는 내용에서 바로 계산되므로 이벤트가 수정되면 새 문서/CID가 되고,
+이미 발행된 티켓은 구매 시점의 문서를 그대로 가리킴
+
+TICKET_METADATA_MODE=directory면 승인 시 좌석 번호(1..max_tickets)별 문서를 디스크에 순서대로 써서
+디렉터리 하나로 한 번에 고정하고, 구매는 예약 때 받은 번호로 ipfs://<디렉터리 CID>/<n>.json을 사용
+(디렉터리가 준비되기 전이나 번호가 범위를 벗어나면 이벤트 문서로 대체)
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Set, Tuple
+import os
+import shutil
+import tempfile
+import threading
+import logging
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.models.event import Event
+from app.services.ipfs_service import ipfs_service
+from app.services.pin_queue import PinQueue, canonical_json, pin_queue
+
+logger = logging.getLogger(__name__)
+
+
+def build_ticket_metadata(event: Event) -> Tuple[dict, dict]:
+    """이벤트 티켓 문서(ERC-721 메타데이터)와 Pinata 메타데이터 생성"""
+    metadata = {
+        "name": f"Ticket for {event.name}",
+        "description": f"Ticket for event: {event.name}",
+        "image": event.ipfs_hash or "",  # 이벤트 이미지가 있다면
+        "attributes": [
+            {"trait_type": "Event", "value": event.name},
+            {"trait_type": "Event Date", "value": event.event_date.isoformat()},
+            {"trait_type": "Price", "value": str(event.price_wei)},
+        ],
+        "event_id": str(event.id),
+        "event_name": event.name,
+    }
+
+    pinata_metadata = {
+        "name": f"Ticket-{event.name}",
+        "keyvalues": {
+            "event_id": str(event.id),
+            "event_name": event.name,
+        }
+    }
+    return metadata, pinata_metadata
+
+
+# 바뀌면 미리 만든 디렉터리를 다시 만들어야 하는 이벤트 필드
+DIRECTORY_FIELDS = frozenset({"name", "event_date", "price_wei", "ipfs_hash", "max_tickets"})
+
+
+def build_serial_metadata(event: Event, serial: int) -> dict:
+    """좌석 번호별 티켓 문서 (이벤트 문서 + 번호)"""
+    metadata, _ = build_ticket_metadata(event)
+    metadata["name"] = f"Ticket #{serial} for {event.name}"
+    metadata["attributes"].append({"trait_type": "Serial", "value": serial})
+    metadata["serial"] = serial
+    return metadata
+
+
+def iter_serial_metadata(event: Event) -> Iterator[Tuple[int, bytes]]:
+    """(번호, 문서 바이트)를 1번부터 차례로 생성 (전체를 메모리에 올리지 않음)"""
+    for serial in range(1, event.max_tickets + 1):
+        yield serial, canonical_json(build_serial_metadata(event, serial))
+
+
+class TicketMetadata:
+    """이벤트 티켓 문서의 token URI (이미 고정 대기열에 넣은 CID는 기억해 DB 왕복 없이 반환)"""
+
+    def __init__(self, pins: PinQueue, max_known: int = 10000, mode: str = "event", work_dir: str = ""):
+        self.pins = pins
+        self.max_known = max_known
+        self.mode = mode
+        self.work_dir = work_dir or os.path.join(tempfile.gettempdir(), "ticketing-metadata")
+        self._known: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[str] = set()
+        self._stats = {"reused": 0, "queued": 0, "serial": 0, "directories": 0, "directory_failures": 0}
+
+    def has_directory(self, event: Event) -> bool:
+        """좌석 번호별 문서 디렉터리가 준비됐는지 (token URI에 예약 번호가 필요한지)"""
+        return self.mode == "directory" and bool(event.metadata_dir_cid)
+
+    def serial_uri(self, event: Event, serial: Optional[int]) -> Optional[str]:
+        """좌석 번호별 문서 URI (디렉터리가 없거나 번호가 범위 밖이면 None, DB/네트워크 접근 없음)"""
+        if self.has_directory(event) and serial is not None and 1 <= serial <= event.max_tickets:
+            self._stats["serial"] += 1
+            return f"ipfs://{event.metadata_dir_cid}/{serial}.json"
+        return None
+
+    def token_uri(self, event: Event, serial: Optional[int] = None) -> str:
+        """
+        구매할 티켓의 token URI
+
+        미리 만든 디렉터리가 있고 번호가 범위 안이면 ipfs://<디렉터리 CID>/<serial>.json,
+        아니면 ipfs://<이벤트 티켓 문서 CID>
+
+        처음 보는 문서면 별도 트랜잭션으로 고정 대기열에 넣고 바로 커밋
+        (구매가 롤백돼도 문서는 남음 - 같은 이벤트의 다음 구매가 재사용)
+        """
+        uri = self.serial_uri(event, serial)
+        if uri:
+            return uri
+
+        metadata, pinata_metadata = build_ticket_metadata(event)
+        cid = self.pins.json_cid(metadata)
+        with self._lock:
+            if cid in self._known:
+                self._known.move_to_end(cid)
+                self._stats["reused"] += 1
+                return f"ipfs://{cid}"
+
+        db = self.pins.session_factory()
+        try:
+            self.pins.add_json(db, metadata, pinata_metadata["name"], pinata_metadata["keyvalues"])
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._known[cid] = None
+            while len(self._known) > self.max_known:
+                self._known.popitem(last=False)
+            self._stats["queued"] += 1
+        logger.info(f"Ticket metadata document queued: event={event.id}, cid={cid}")
+        return f"ipfs://{cid}"
+
+    # ---- 좌석 번호별 디렉터리 (TICKET_METADATA_MODE=directory) ----
+
+    def schedule_directory(self, event_id) -> bool:
+        """디렉터리 생성을 백그라운드 작업으로 예약 (같은 이벤트가 이미 대기 중이면 무시)"""
+        if self.mode != "directory":
+            return False
+        key = str(event_id)
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            if self._executor is None:
+                # 한 번에 하나씩 (디스크/업로드 대역폭을 구매 처리와 나눠 씀)
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ticket-metadata")
+        self._executor.submit(self._build_scheduled, event_id)
+        return True
+
+    def _build_scheduled(self, event_id) -> None:
+        try:
+            self.build_directory(event_id)
+        except Exception as e:
+            self._stats["directory_failures"] += 1
+            logger.error(f"Ticket metadata directory failed: event={event_id}, error={e}")
+        finally:
+            with self._lock:
+                self._pending.discard(str(event_id))
+
+    def build_directory(self, event_id) -> Optional[str]:
+        """
+        좌석 번호별 문서를 디스크에 쓰고 디렉터리 하나로 고정한 뒤 events.metadata_dir_cid에 저장
+
+        디렉터리 CID는 Pinata 응답을 사용 (항목이 많으면 HAMT 샤딩 디렉터리가 되므로 로컬 계산과 맞추지 않음)
+        업로드 중 이벤트가 수정됐으면 저장하지 않음 (수정 시 다시 예약됨)
+
+        Returns:
+            디렉터리 CID 또는 None (이벤트 없음/Pinata 미설정/내용 변경)
+        """
+        if not ipfs_service.is_configured:
+            logger.warning("Pinata API keys not configured. Skipping ticket metadata directory.")
+            return None
+
+        db = self.pins.session_factory()
+        try:
+            event = db.query(Event).filter(Event.id == event_id).first()
+            if event is None or event.max_tickets <= 0:
+                return None
+            db.expunge(event)
+        finally:
+            db.close()
+
+        snapshot = self._directory_snapshot(event)
+        path = os.path.join(self.work_dir, str(event.id))
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        try:
+            for serial, content in iter_serial_metadata(event):
+                with open(os.path.join(path, f"{serial}.json"), "wb") as f:
+                    f.write(content)
+            cid = ipfs_service.pin_directory(
+                path,
+                f"Tickets-{event.name}"[:255],
+                {"event_id": str(event.id), "event_name": event.name},
+                self.pins.cid_version,
+            )
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+        db = self.pins.session_factory()
+        try:
+            current = db.query(Event).filter(Event.id == event.id).with_for_update().first()
+            if current is None or self._directory_snapshot(current) != snapshot:
+                logger.info(f"Event changed while building ticket metadata directory: event={event.id}")
+                return None
+            db.execute(update(Event).where(Event.id == event.id).values(metadata_dir_cid=cid))
+            db.commit()
+        finally:
+            db.close()
+
+        self._stats["directories"] += 1
+        logger.info(f"Ticket metadata directory pinned: event={event.id}, cid={cid}, tickets={event.max_tickets}")
+        return cid
+
+    @staticmethod
+    def _directory_snapshot(event: Event) -> tuple:
+        return tuple(getattr(event, field) for field in sorted(DIRECTORY_FIELDS))
+
+    def stop(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "mode": self.mode,
+            "known_documents": len(self._known),
+            "pending_directories": len(self._pending),
+        }
+
+
+ticket_metadata = TicketMetadata(
+    pin_queue,
+    mode=settings.TICKET_METADATA_MODE,
+    work_dir=settings.TICKET_METADATA_WORK_DIR,
+)
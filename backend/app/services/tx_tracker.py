@@ -0,0 +1,338 @@
+"""
+트랜잭션 확인 추적기
+전송과 영수증 확인을 분리: 요청은 해시만 받고 반환, 확인은 백그라운드에서 블록마다 배치로 처리
+
+Bundler 경유 구매는 해시가 UserOperation 해시라 트랜잭션 영수증이 없으므로,
+같은 배치에서 EntryPoint UserOperationEvent(userOpHash) 로그를 함께 조회해 번들 트랜잭션 영수증으로 확인
+"""
+from sqlalchemy.orm import Session
+from web3 import Web3
+from web3.datastructures import AttributeDict
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+import threading
+import time
+import logging
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.ticket import Ticket
+from app.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.services.multicall import format_logs, format_receipt
+from app.services.receipt_decoder import receipt_decoder
+from app.services.web3_service import Web3Service, web3_service
+
+logger = logging.getLogger(__name__)
+
+# UserOperationEvent 조회 시작 블록 = 처음 폴링한 블록 - 여유 (재시작 후 DB에서 불러온 해시는 더 넓게)
+USER_OPERATION_LOOKBACK_BLOCKS = 10
+RESTORED_LOOKBACK_BLOCKS = 1000
+
+# 확인된 트랜잭션 후처리 (같은 세션 안에서 실행, 커밋은 추적기가 담당)
+ReceiptHandler = Callable[[Session, Transaction, AttributeDict], None]
+
+
+class TransactionTracker:
+    """
+    대기 중인 트랜잭션 해시를 모아 새 블록마다 eth_getTransactionReceipt를
+    한 번의 JSON-RPC 배치로 조회하고, 결과를 Transaction 테이블에 기록
+    """
+
+    def __init__(
+        self,
+        web3_service: Web3Service,
+        session_factory: Callable[[], Session] = SessionLocal,
+        poll_interval: float = 2.0,
+        timeout: float = 600.0,
+    ):
+        self.web3_service = web3_service
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._pending: Dict[str, float] = {}
+        self._lookback: Dict[str, int] = {}
+        self._from_block: Dict[str, int] = {}  # UserOperationEvent 조회 시작 블록 (첫 폴링 때 정함)
+        self._handlers: Dict[TransactionType, ReceiptHandler] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_block: Optional[int] = None
+        self._stats = {"tracked": 0, "confirmed": 0, "failed": 0, "timed_out": 0, "batches": 0}
+
+    def register_handler(self, transaction_type: TransactionType, handler: ReceiptHandler) -> None:
+        """트랜잭션 유형별 확인 후처리 등록"""
+        self._handlers[transaction_type] = handler
+
+    def track(self, tx_hash: str, lookback_blocks: int = USER_OPERATION_LOOKBACK_BLOCKS) -> None:
+        """확인 대상 해시 추가 (트랜잭션 해시 또는 UserOperation 해시)"""
+        with self._lock:
+            if tx_hash not in self._pending:
+                self._pending[tx_hash] = time.monotonic()
+                self._lookback[tx_hash] = lookback_blocks
+                self._stats["tracked"] += 1
+
+    def record(
+        self,
+        db: Session,
+        tx_hash: str,
+        transaction_type: TransactionType,
+        **fields
+    ) -> Transaction:
+        """
+        PENDING 상태의 Transaction 행을 추가하고 추적 시작 (커밋은 호출자가 담당)
+
+        Args:
+            db: DB 세션
+            tx_hash: 트랜잭션 해시
+            transaction_type: 트랜잭션 유형
+            **fields: user_id, ticket_id, event_id, amount_wei 등
+        """
+        transaction = Transaction(
+            tx_hash=tx_hash,
+            transaction_type=transaction_type,
+            status=TransactionStatus.PENDING,
+            **fields
+        )
+        db.add(transaction)
+        self.track(tx_hash)
+        return transaction
+
+    def is_pending(self, tx_hash: str) -> bool:
+        return tx_hash in self._pending
+
+    def start(self) -> None:
+        """백그라운드 추적 스레드 시작 (DB의 PENDING 트랜잭션부터 이어서 추적)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        db = self.session_factory()
+        try:
+            rows = (
+                db.query(Transaction.tx_hash)
+                .filter(Transaction.status == TransactionStatus.PENDING)
+                .all()
+            )
+            for (tx_hash,) in rows:
+                self.track(tx_hash, RESTORED_LOOKBACK_BLOCKS)
+        except Exception as e:
+            logger.warning(f"Failed to load pending transactions: {e}")
+        finally:
+            db.close()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tx-tracker", daemon=True)
+        self._thread.start()
+        logger.info(f"Transaction tracker started ({len(self._pending)} pending)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Transaction tracker poll failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def poll_once(self) -> int:
+        """
+        새 블록이 있으면 대기 중인 모든 영수증을 한 번에 조회
+
+        Returns:
+            처리(확인/실패)된 트랜잭션 수
+        """
+        with self._lock:
+            pending = list(self._pending.items())
+        if not pending or not self.web3_service.w3:
+            return 0
+
+        block_number = self.web3_service.w3.eth.block_number
+        if block_number == self._last_block:
+            return 0
+        self._last_block = block_number
+
+        hashes = [tx_hash for tx_hash, _ in pending]
+        calls = [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes]
+        user_op_filter = self._user_operation_filter(hashes, block_number)
+        if user_op_filter:
+            calls.append(("eth_getLogs", [user_op_filter]))
+        results = self.web3_service.rpc_batch(calls)
+        self._stats["batches"] += 1
+
+        receipts = {
+            tx_hash: format_receipt(raw)
+            for tx_hash, raw in zip(hashes, results)
+            if raw
+        }
+        if user_op_filter and results[-1]:
+            receipts.update(self._user_operation_receipts(
+                format_logs(results[-1]),
+                receipts,
+            ))
+
+        now = time.monotonic()
+        expired = [
+            tx_hash for tx_hash, submitted_at in pending
+            if tx_hash not in receipts and now - submitted_at > self.timeout
+        ]
+        if not receipts and not expired:
+            return 0
+
+        db = self.session_factory()
+        try:
+            for tx_hash, receipt in receipts.items():
+                self._apply_receipt(db, tx_hash, receipt)
+            for tx_hash in expired:
+                self._expire(db, tx_hash)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            for tx_hash in list(receipts) + expired:
+                self._pending.pop(tx_hash, None)
+                self._lookback.pop(tx_hash, None)
+                self._from_block.pop(tx_hash, None)
+
+        if expired and self.web3_service.nonces:
+            # 시간 안에 채굴되지 않은 서비스 계정 트랜잭션은 drop된 것으로 보고 nonce 재사용
+            self.web3_service.nonces.fill_gaps()
+
+        return len(receipts) + len(expired)
+
+    def _user_operation_filter(self, hashes: List[str], block_number: int) -> Optional[dict]:
+        """대기 중인 해시들을 userOpHash로 갖는 UserOperationEvent 조회 필터 (EntryPoint 미등록이면 None)"""
+        event_topic = receipt_decoder.topic_for("EntryPoint", "UserOperationEvent")
+        if not event_topic or not settings.ENTRY_POINT_ADDRESS:
+            return None
+        with self._lock:
+            for tx_hash in hashes:
+                if tx_hash not in self._from_block:
+                    lookback = self._lookback.get(tx_hash, USER_OPERATION_LOOKBACK_BLOCKS)
+                    self._from_block[tx_hash] = max(block_number - lookback, 0)
+            from_block = min(self._from_block[tx_hash] for tx_hash in hashes)
+        return {
+            "fromBlock": hex(from_block),
+            "toBlock": "latest",
+            "address": settings.ENTRY_POINT_ADDRESS,
+            "topics": [event_topic, [Web3.to_hex(hexstr=tx_hash) for tx_hash in hashes]],
+        }
+
+    def _user_operation_receipts(self, events: list, receipts: Dict[str, AttributeDict]) -> Dict[str, AttributeDict]:
+        """
+        UserOperationEvent → 번들 트랜잭션 영수증을 해당 UserOperation 기준으로 바꾼 영수증
+
+        status는 UserOperation 성공 여부, logs는 그 UserOperation의 로그, 수수료는 actualGasCost
+        (번들에 여러 구매가 섞여도 다른 UserOperation의 로그를 쓰지 않음)
+        """
+        confirmed = {tx_hash.lower() for tx_hash in receipts}
+        by_op_hash = {}
+        for event in events:
+            op_hash = Web3.to_hex(event.topics[1]).lower()
+            if op_hash not in confirmed:
+                by_op_hash[op_hash] = Web3.to_hex(event.transactionHash)
+        if not by_op_hash:
+            return {}
+
+        bundle_hashes = sorted(set(by_op_hash.values()))
+        raw_receipts = self.web3_service.rpc_batch(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in bundle_hashes]
+        )
+        bundles = {
+            tx_hash: format_receipt(raw)
+            for tx_hash, raw in zip(bundle_hashes, raw_receipts)
+            if raw
+        }
+
+        with self._lock:
+            pending = {tx_hash.lower(): tx_hash for tx_hash in self._pending}
+        resolved = {}
+        for op_hash, bundle_hash in by_op_hash.items():
+            bundle = bundles.get(bundle_hash)
+            if bundle is None or op_hash not in pending:
+                continue
+            user_op_event, logs = receipt_decoder.user_operation_logs(bundle, op_hash)
+            if user_op_event is None:
+                continue
+            resolved[pending[op_hash]] = AttributeDict({
+                **bundle,
+                "status": 1 if user_op_event.args.success else 0,
+                "logs": logs,
+                "actualGasCost": user_op_event.args.actualGasCost,
+            })
+            logger.info(f"UserOperation {op_hash} included in {bundle_hash}")
+        return resolved
+
+    def _apply_receipt(self, db: Session, tx_hash: str, receipt: AttributeDict) -> None:
+        transaction = db.query(Transaction).filter(Transaction.tx_hash == tx_hash).first()
+        succeeded = receipt.status == 1
+        self._stats["confirmed" if succeeded else "failed"] += 1
+        if transaction is None:
+            return
+
+        transaction.status = TransactionStatus.CONFIRMED if succeeded else TransactionStatus.FAILED
+        transaction.block_number = receipt.blockNumber
+        if "actualGasCost" in receipt:
+            # UserOperation: 번들 전체가 아닌 해당 UserOperation이 낸 수수료
+            transaction.gas_fee_wei = receipt.actualGasCost
+        else:
+            gas_price = receipt.get("effectiveGasPrice") or 0
+            transaction.gas_fee_wei = receipt.gasUsed * gas_price
+
+        handler = self._handlers.get(transaction.transaction_type)
+        if handler and succeeded:
+            try:
+                with db.begin_nested():
+                    handler(db, transaction, receipt)
+            except Exception as e:
+                logger.error(f"Receipt handler failed for {tx_hash}: {e}")
+
+        logger.info(f"Transaction {transaction.status.value}: {tx_hash} (block {receipt.blockNumber})")
+
+    def _expire(self, db: Session, tx_hash: str) -> None:
+        self._stats["timed_out"] += 1
+        transaction = db.query(Transaction).filter(Transaction.tx_hash == tx_hash).first()
+        if transaction is not None:
+            transaction.status = TransactionStatus.FAILED
+        logger.warning(f"Transaction not mined within {self.timeout}s: {tx_hash}")
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "last_block": self._last_block,
+            "running": bool(self._thread and self._thread.is_alive()),
+        }
+
+
+def _on_purchase_confirmed(db: Session, transaction: Transaction, receipt: AttributeDict) -> None:
+    """구매 확인 시 영수증 로그(TicketSold/TicketMinted)에서 tokenId를 읽어 티켓에 기록"""
+    if transaction.ticket_id is None:
+        return
+    ticket = db.query(Ticket).filter(Ticket.id == transaction.ticket_id).first()
+    if ticket is None or ticket.token_id is not None:
+        return
+
+    token_id = receipt_decoder.find_purchased_token(receipt, buyer=ticket.owner_address)
+    if token_id is not None:
+        ticket.token_id = token_id
+        ticket.updated_at = datetime.utcnow()
+        logger.info(f"Ticket token resolved: ticket={ticket.id}, tokenId={ticket.token_id}")
+        return
+
+    logger.warning(f"TicketSold not found in confirmed purchase: {transaction.tx_hash}")
+
+
+tx_tracker = TransactionTracker(
+    web3_service,
+    poll_interval=settings.TX_TRACKER_POLL_INTERVAL,
+    timeout=settings.TX_TRACKER_TIMEOUT_SECONDS,
+)
+tx_tracker.register_handler(TransactionType.PURCHASE, _on_purchase_confirmed)
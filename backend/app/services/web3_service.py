@@ -1,29 +1,72 @@
 from web3 import Web3
 from eth_account import Account
 from app.core.config import settings
-from typing import Optional, Tuple
-import json
+from app.services.contract_registry import ContractRegistry
+from app.services.multicall import ReadBatch, rpc_batch_payload, rpc_batch_results
+from app.services.nonce_manager import NonceManager
+from web3.exceptions import TimeExhausted
+from typing import Any, Callable, List, Optional, Tuple
+import requests
+import threading
+import time
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def event_tuple_to_dict(event) -> dict:
+    """EventManager.getEvent 반환 튜플을 딕셔너리로 변환"""
+    return {
+        "eventId": event[0],
+        "organizer": event[1],
+        "ipfsHash": event[2],
+        "price": event[3],
+        "maxTickets": event[4],
+        "soldTickets": event[5],
+        "startTime": event[6],
+        "endTime": event[7],
+        "eventDate": event[8],
+        "approved": event[9],
+        "cancelled": event[10],
+    }
+
+
 class Web3Service:
+    # 주소 속성 → ABI 이름
+    CONTRACT_NAMES = {
+        "event_manager_address": "EventManager",
+        "ticket_nft_address": "TicketNFT",
+        "marketplace_address": "TicketMarketplace",
+        "refund_manager_address": "RefundManager",
+    }
+
+    # nonce 충돌 시 재동기화 후 재시도 횟수
+    NONCE_RETRIES = 3
+
     def __init__(self):
+        # ABI/컨트랙트 인스턴스 캐시 (연결 실패 시에도 ABI 캐시는 사용 가능)
+        self.contracts = ContractRegistry()
+        self.account = None
+        self.address = None
+        self.nonces = None
+        self._chain_id = None
+        self.multicall_address = settings.MULTICALL3_ADDRESS or None
+        self._multicall_available = None
+
         # RPC 연결 (로컬 네트워크 우선)
         rpc_url = os.getenv("POLYGON_MUMBAI_RPC_URL", settings.POLYGON_MUMBAI_RPC_URL)
         if not rpc_url or rpc_url == "":
             rpc_url = "http://localhost:8545"  # 기본값: 로컬 Hardhat 노드
         
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
-        if not self.w3.is_connected():
-            logger.warning(f"Web3 connection failed to {rpc_url}")
-            self.w3 = None
-            return
-        
-        logger.info(f"Web3 connected to {rpc_url}")
+        self.rpc_url = rpc_url
+        # keep-alive 세션 (web3 프로바이더와 JSON-RPC 배치 요청이 공유)
+        self.http = requests.Session()
+        # 연결 확인은 첫 사용 시점(또는 앱 시작 warm-up)으로 미룸 - import 시 RPC 왕복 없음
+        self._provider_w3 = Web3(Web3.HTTPProvider(rpc_url, session=self.http))
+        self._w3 = None
+        self._connect_lock = threading.Lock()
+        self._next_connect_at = 0.0
         
         # 서비스 계정 설정
         private_key = os.getenv("PRIVATE_KEY", settings.PRIVATE_KEY)
@@ -32,11 +75,13 @@ class Web3Service:
                 private_key = "0x" + private_key
             self.account = Account.from_key(private_key)
             self.address = self.account.address
+            self.nonces = NonceManager(
+                lambda block_identifier: self.w3.eth.get_transaction_count(self.address, block_identifier),
+                gap_timeout=settings.NONCE_GAP_TIMEOUT_SECONDS
+            )
             logger.info(f"Service account: {self.address}")
         else:
             logger.warning("PRIVATE_KEY not set, some functions may not work")
-            self.account = None
-            self.address = None
         
         # 컨트랙트 주소
         self.event_manager_address = os.getenv("EVENT_MANAGER_ADDRESS", settings.EVENT_MANAGER_ADDRESS)
@@ -44,68 +89,238 @@ class Web3Service:
         self.marketplace_address = os.getenv("MARKETPLACE_ADDRESS", settings.MARKETPLACE_ADDRESS)
         self.refund_manager_address = os.getenv("REFUND_MANAGER_ADDRESS", settings.REFUND_MANAGER_ADDRESS)
     
-    def _load_abi(self, contract_name: str) -> list:
-        """ABI 파일 로드"""
-        abi_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "contracts",
-            f"{contract_name}.json"
-        )
+    @property
+    def w3(self) -> Optional[Web3]:
+        """연결된 Web3 인스턴스 (최초 접근 시 연결 확인, 연결 실패 시 None)"""
+        if self._w3 is None:
+            self.connect()
+        return self._w3
+    
+    @property
+    def connected(self) -> bool:
+        """연결 확인 완료 여부 (RPC 호출 없음)"""
+        return self._w3 is not None
+    
+    def connect(self, force: bool = False) -> bool:
+        """
+        RPC 연결 확인 (성공하면 이후 호출은 바로 반환)
         
-        try:
-            with open(abi_path, 'r') as f:
-                artifact = json.load(f)
-                return artifact.get("abi", [])
-        except FileNotFoundError:
-            logger.error(f"ABI file not found: {abi_path}")
-            return []
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse ABI: {e}")
-            return []
+        실패하면 WEB3_RECONNECT_INTERVAL_SECONDS 동안은 다시 확인하지 않음
+        (RPC 장애 중 요청마다 타임아웃을 기다리지 않도록)
+        
+        Args:
+            force: 재시도 대기 시간을 무시하고 바로 확인
+        """
+        if self._w3 is not None:
+            return True
+        with self._connect_lock:
+            if self._w3 is not None:
+                return True
+            if not force and time.monotonic() < self._next_connect_at:
+                return False
+            
+            if not self._provider_w3.is_connected():
+                logger.warning(f"Web3 connection failed to {self.rpc_url}")
+                self._next_connect_at = time.monotonic() + settings.WEB3_RECONNECT_INTERVAL_SECONDS
+                return False
+            
+            logger.info(f"Web3 connected to {self.rpc_url}")
+            self.contracts.bind(self._provider_w3)
+            self._w3 = self._provider_w3
+            return True
+    
+    def _load_abi(self, contract_name: str) -> list:
+        """ABI 로드 (레지스트리 캐시 사용)"""
+        return self.contracts.get_abi(contract_name)
     
     def _get_contract(self, contract_address: str, contract_name: str):
-        """컨트랙트 인스턴스 가져오기"""
+        """컨트랙트 인스턴스 가져오기 (주소/이름별 캐시)"""
         if not self.w3:
             raise Exception("Web3 not connected")
         
-        abi = self._load_abi(contract_name)
-        if not abi:
-            raise Exception(f"Failed to load ABI for {contract_name}")
+        return self.contracts.get_contract(contract_address, contract_name)
+    
+    def set_contract_address(self, attr: str, address: str) -> None:
+        """
+        컨트랙트 주소 변경 (재배포 등)
         
-        return self.w3.eth.contract(address=Web3.to_checksum_address(contract_address), abi=abi)
+        Args:
+            attr: 주소 속성 이름 (예: "event_manager_address")
+            address: 새 컨트랙트 주소
+        """
+        if attr not in self.CONTRACT_NAMES:
+            raise ValueError(f"Unknown contract address attribute: {attr}")
+        
+        old_address = getattr(self, attr, None)
+        setattr(self, attr, address)
+        if (old_address or "").lower() == (address or "").lower():
+            return
+        removed = self.contracts.invalidate(old_address) if old_address else 0
+        logger.info(f"{attr} changed: {old_address} -> {address} ({removed} cached contracts dropped)")
+        
+        # 영수증 디코더도 새 주소의 로그를 디코딩하도록 다시 등록
+        from app.services.receipt_decoder import receipt_decoder
+        if receipt_decoder.contracts is self.contracts:
+            receipt_decoder.unregister(old_address)
+            receipt_decoder.register(address, self.CONTRACT_NAMES[attr])
     
-    def _send_transaction(self, contract_function, value: int = 0) -> str:
-        """트랜잭션 전송"""
+    @property
+    def chain_id(self) -> int:
+        """체인 ID (최초 1회만 조회)"""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+    
+    def _sign_and_send(self, build_transaction: Callable[[int], dict]) -> str:
+        """
+        nonce 할당 → 서명 → 전송
+        
+        Args:
+            build_transaction: 할당된 nonce를 받아 트랜잭션 딕셔너리를 만드는 함수
+        
+        Returns:
+            트랜잭션 해시 (hex)
+        """
         if not self.account:
             raise Exception("Service account not configured")
         
         if not self.w3:
             raise Exception("Web3 not connected")
         
-        # 트랜잭션 빌드
-        transaction = contract_function.build_transaction({
+        for attempt in range(self.NONCE_RETRIES):
+            nonce = self.nonces.allocate()
+            signed_txn = None
+            try:
+                transaction = build_transaction(nonce)
+                
+                # 서명
+                signed_txn = self.account.sign_transaction(transaction)
+                
+                # 전송 (eth_account의 SignedTransaction 객체는 raw_transaction 속성을 가짐)
+                tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                return tx_hash.hex()
+            except Exception as e:
+                if signed_txn is not None and self.nonces.is_already_known(e):
+                    # 같은 트랜잭션이 이미 노드에 있음 (전송 재시도 등) - 전송된 것으로 처리
+                    logger.info(f"Transaction with nonce {nonce} already known")
+                    return signed_txn.hash.hex()
+                if self.nonces.is_nonce_error(e) and attempt < self.NONCE_RETRIES - 1:
+                    # 다른 프로세스/재시작 등으로 로컬 카운터가 어긋난 경우
+                    # 이 nonce로는 전송되지 않았으므로 반환 후 재동기화 (이미 사용된 nonce면 resync가 버림)
+                    logger.warning(f"Nonce conflict on {nonce}, resyncing: {e}")
+                    self.nonces.release(nonce)
+                    self.nonces.resync()
+                    continue
+                # 브로드캐스트되지 않았으므로 nonce를 반환해 빈자리가 생기지 않도록 함
+                self.nonces.release(nonce)
+                raise
+        
+        raise Exception("Failed to send transaction: nonce retries exhausted")
+    
+    def _wait_for_receipt(self, tx_hash: str, timeout: int = 120):
+        """트랜잭션 영수증 대기"""
+        try:
+            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        except TimeExhausted:
+            # 트랜잭션이 drop되었을 수 있음 - 빈 nonce를 다시 채울 수 있게 함
+            self.nonces.fill_gaps()
+            raise
+        
+        if receipt.status != 1:
+            raise Exception(f"Transaction failed: {tx_hash}")
+        
+        logger.info(f"Transaction successful: {tx_hash}")
+        return receipt
+    
+    def submit_transaction(self, contract_function, value: int = 0) -> str:
+        """트랜잭션 전송 후 영수증을 기다리지 않고 해시 반환"""
+        gas_price = self.w3.eth.gas_price if self.w3 else None
+        
+        return self._sign_and_send(lambda nonce: contract_function.build_transaction({
             'from': self.address,
-            'nonce': self.w3.eth.get_transaction_count(self.address),
+            'nonce': nonce,
             'gas': 500000,  # 가스 한도
-            'gasPrice': self.w3.eth.gas_price,
+            'gasPrice': gas_price,
+            'value': value,
+        }))
+    
+    def _send_transaction(self, contract_function, value: int = 0, wait: bool = True) -> str:
+        """
+        트랜잭션 전송
+        
+        Args:
+            contract_function: 호출할 컨트랙트 함수
+            value: 전송할 이더 값 (wei)
+            wait: False면 영수증을 기다리지 않음 (확인은 tx_tracker가 처리)
+        """
+        tx_hash = self.submit_transaction(contract_function, value)
+        
+        # 트랜잭션 영수증 대기
+        if wait:
+            self._wait_for_receipt(tx_hash)
+        return tx_hash
+    
+    def transfer(self, to_address: str, value: int, wait: bool = True) -> str:
+        """서비스 계정에서 이더 전송"""
+        gas_price = self.w3.eth.gas_price if self.w3 else None
+        
+        tx_hash = self._sign_and_send(lambda nonce: {
+            'from': self.address,
+            'to': Web3.to_checksum_address(to_address),
+            'nonce': nonce,
             'value': value,
+            'gas': 21000,
+            'gasPrice': gas_price,
+            'chainId': self.chain_id,
         })
         
-        # 서명
-        signed_txn = self.account.sign_transaction(transaction)
+        if wait:
+            self._wait_for_receipt(tx_hash, timeout=60)
+        return tx_hash
+    
+    def has_multicall(self) -> bool:
+        """Multicall3 배포 여부 (최초 1회만 확인)"""
+        if self._multicall_available is None:
+            available = False
+            if self.multicall_address and self.w3:
+                try:
+                    available = len(self.w3.eth.get_code(Web3.to_checksum_address(self.multicall_address))) > 0
+                except Exception as e:
+                    logger.warning(f"Failed to check Multicall3 deployment: {e}")
+            self._multicall_available = available
+            logger.info(f"Multicall3 {'available' if available else 'not deployed'}, read batches use "
+                        f"{'aggregate3' if available else 'JSON-RPC batch'}")
+        return self._multicall_available
+    
+    def read_batch(self) -> ReadBatch:
+        """
+        읽기 배치 생성
         
-        # 전송 (eth_account의 SignedTransaction 객체는 raw_transaction 속성을 가짐)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        사용 예:
+            batch = web3_service.read_batch()
+            owner = batch.call(ticket_nft.functions.ownerOf(token_id))
+            balance = batch.rpc("eth_getBalance", [address, "latest"], hex_to_int)
+            results = batch.execute()  # results[owner], results[balance]
+        """
+        return ReadBatch(self)
+    
+    def rpc_batch(self, calls: List[Tuple[str, list]], timeout: int = 30) -> List[Optional[Any]]:
+        """
+        JSON-RPC 배치 요청 (한 번의 HTTP 왕복으로 여러 호출)
         
-        # 트랜잭션 영수증 대기
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        Args:
+            calls: (method, params) 목록
+            timeout: 요청 타임아웃 (초)
         
-        if receipt.status != 1:
-            raise Exception(f"Transaction failed: {tx_hash.hex()}")
+        Returns:
+            호출 순서대로의 result 목록 (에러가 난 호출은 None)
+        """
+        if not calls:
+            return []
         
-        logger.info(f"Transaction successful: {tx_hash.hex()}")
-        return tx_hash.hex()
+        response = self.http.post(self.rpc_url, json=rpc_batch_payload(calls), timeout=timeout)
+        response.raise_for_status()
+        return rpc_batch_results(calls, response.json())
     
     def create_event_onchain(
         self,
@@ -300,22 +515,21 @@ class Web3Service:
             contract = self._get_contract(event_manager_address, "EventManager")
             event = contract.functions.getEvent(event_id).call()
             
-            return {
-                "eventId": event[0],
-                "organizer": event[1],
-                "ipfsHash": event[2],
-                "price": event[3],
-                "maxTickets": event[4],
-                "soldTickets": event[5],
-                "startTime": event[6],
-                "endTime": event[7],
-                "eventDate": event[8],
-                "approved": event[9],
-                "cancelled": event[10],
-            }
+            return event_tuple_to_dict(event)
         except Exception as e:
             logger.error(f"Failed to get event onchain: {e}")
             return None
+    
+    def get_events_onchain(self, event_manager_address: str, event_ids: List[int]) -> List[Optional[dict]]:
+        """여러 이벤트 정보를 한 번의 배치로 조회 (조회 실패한 이벤트는 None)"""
+        contract = self._get_contract(event_manager_address, "EventManager")
+        batch = self.read_batch()
+        for event_id in event_ids:
+            batch.call(contract.functions.getEvent(event_id))
+        return [
+            event_tuple_to_dict(event) if event is not None else None
+            for event in batch.execute()
+        ]
 
 
 web3_service = Web3Service()
@@ -42,6 +42,12 @@ echo ""
 echo "Docker 이미지 빌드 중..."
 docker-compose -f docker-compose.prod.yml build
 
+# DB 마이그레이션 (앱은 시작 시 테이블을 만들지 않음)
+echo ""
+echo "DB 마이그레이션 중..."
+# (create_all로 만든 기존 DB는 0001로 stamp 후 upgrade)
+docker-compose -f docker-compose.prod.yml run --rm backend python scripts/migrate.py
+
 # 컨테이너 시작
 echo ""
 echo "컨테이너 시작 중..."
@@ -53,7 +59,7 @@ echo "헬스 체크 중..."
 sleep 5
 
 for i in {1..30}; do
-    if curl -f http://localhost:8000/health > /dev/null 2>&1; then
+    if curl -f http://localhost:8000/ready > /dev/null 2>&1; then
         echo "✅ 백엔드 서버가 정상적으로 실행 중입니다!"
         echo ""
         echo "=========================================="
@@ -62,6 +68,7 @@ for i in {1..30}; do
         echo "백엔드 URL: http://localhost:8000"
         echo "API 문서: http://localhost:8000/docs"
         echo "헬스 체크: http://localhost:8000/health"
+        echo "준비 상태: http://localhost:8000/ready"
         echo ""
         echo "로그 확인: docker-compose -f docker-compose.prod.yml logs -f"
         echo "=========================================="
@@ -1,17 +1,53 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.readiness import readiness
 from app.api.v1 import api_router
-from app.db.database import engine
-from app.models import Base
+from app.services.tx_tracker import tx_tracker
+from app.services.inventory_service import inventory_service
+from app.services.sale_scheduler import sale_scheduler
+from app.services.pin_queue import pin_queue
+from app.services.ticket_metadata import ticket_metadata
+from app.services.password_hasher import password_hasher
+from app.services.async_aa_service import async_aa_service
+from app.services.async_web3_service import async_web3_service
+from app.services.async_ipfs_service import async_ipfs_service
+
+# 스키마는 Alembic으로 관리 (alembic upgrade head) - 시작 시 create_all 하지 않음
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 트랜잭션 확인 추적기 (submit-and-track 모드)
+    if settings.TX_CONFIRMATION_MODE == "track":
+        tx_tracker.start()
+    # 만료된 재고 예약 반환 + events.sold_tickets 동기화
+    inventory_service.start()
+    # 판매 기간 경계에 맞춘 이벤트 상태 전환 + 판매 중 목록 인덱스
+    sale_scheduler.start()
+    # 로컬에서 CID를 계산한 메타데이터를 Pinata에 고정
+    pin_queue.start()
+    # DB 풀/RPC/ABI/IPFS warm-up은 기다리지 않고 동시에 진행 (완료 여부는 GET /ready)
+    readiness.start()
+    yield
+    await readiness.stop()
+    tx_tracker.stop()
+    inventory_service.stop()
+    sale_scheduler.stop()
+    pin_queue.stop()
+    ticket_metadata.stop()
+    password_hasher.close()
+    await async_aa_service.close()
+    await async_web3_service.close()
+    await async_ipfs_service.close()
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Blockchain Ticketing API",
     description="Polygon 기반 NFT 티켓팅 시스템 API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -21,6 +57,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],  # 커서 페이지네이션, 조건부 요청
 )
 
 # API 라우터 등록
@@ -36,3 +73,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """준비 상태 (필수 구성요소가 준비되지 않았으면 503)"""
+    report = await readiness.check()
+    if not report["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
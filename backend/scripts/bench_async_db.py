@@ -0,0 +1,206 @@
+"""
+API 동시 부하 벤치마크 (동기 세션 vs 비동기 세션)
+같은 이벤트 목록 쿼리를 두 방식으로 서빙하고, 동시 클라이언트 N개로 요청을 보내 지연 시간 분포를 비교합니다.
+
+    python scripts/bench_async_db.py                       # 클라이언트 500개, 경로별 20초
+    python scripts/bench_async_db.py --clients 200 --duration 10 --seed 500
+
+- legacy: 변경 전 방식 (async 핸들러 안에서 동기 Session 쿼리 → 쿼리마다 이벤트 루프가 멈춤)
+- async: 현재 GET /api/v1/events (AsyncSession + asyncpg)
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import multiprocessing
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import aiohttp
+import uvicorn
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy.orm import Session
+from typing import List
+from app.api.v1 import api_router
+from app.db.database import SessionLocal, get_db
+from app.models.event import Event, EventStatus
+from app.models.user import User, UserRole
+from app.schemas.event import EventResponse
+from datetime import datetime, timedelta
+import uuid
+
+PATHS = {
+    "legacy": "/legacy/events",
+    "async": "/api/v1/events",
+}
+
+app = FastAPI()
+app.include_router(api_router, prefix="/api/v1")
+
+
+@app.get("/legacy/events", response_model=List[EventResponse])
+async def legacy_events(
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """변경 전 구현 (동기 세션)"""
+    events = db.query(Event).order_by(Event.created_at.desc(), Event.id.desc()).limit(limit).all()
+    return [
+        EventResponse(
+            id=str(event.id),
+            event_id_onchain=event.event_id_onchain,
+            organizer_id=str(event.organizer_id),
+            name=event.name,
+            description=event.description,
+            ipfs_hash=event.ipfs_hash,
+            price_wei=event.price_wei,
+            max_tickets=event.max_tickets,
+            sold_tickets=event.sold_tickets,
+            start_time=event.start_time,
+            end_time=event.end_time,
+            event_date=event.event_date,
+            status=event.status,
+            created_at=event.created_at,
+            updated_at=event.updated_at,
+        ) for event in events
+    ]
+
+
+def seed(count: int):
+    """벤치마크용 이벤트 생성"""
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        organizer = User(email=f"bench-{tag}@example.com", role=UserRole.ORGANIZER)
+        db.add(organizer)
+        db.flush()
+        now = datetime.utcnow()
+        db.bulk_insert_mappings(Event, [
+            {
+                "id": uuid.uuid4(),
+                "organizer_id": organizer.id,
+                "name": f"Bench Event {tag}-{i}",
+                "price_wei": 10 ** 16,
+                "max_tickets": 100,
+                "sold_tickets": 0,
+                "start_time": now - timedelta(days=1),
+                "end_time": now + timedelta(days=30),
+                "event_date": now + timedelta(days=31),
+                "status": EventStatus.APPROVED,
+                "created_at": now - timedelta(seconds=i),
+                "updated_at": now,
+            }
+            for i in range(count)
+        ])
+        db.commit()
+        return organizer.id
+    finally:
+        db.close()
+
+
+def cleanup(organizer_id):
+    db = SessionLocal()
+    try:
+        db.query(Event).filter(Event.organizer_id == organizer_id).delete(synchronize_session=False)
+        db.query(User).filter(User.id == organizer_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def serve(port: int):
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{base_url}/docs") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit("❌ Benchmark server did not start")
+
+
+async def load(url: str, clients: int, duration: float, limit: int) -> dict:
+    """클라이언트 N개가 duration 동안 요청을 반복"""
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    connector = aiohttp.TCPConnector(limit=clients)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def client():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    async with session.get(url, params={"limit": limit}) as response:
+                        await response.read()
+                        if response.status != 200:
+                            errors += 1
+                            continue
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        started = time.monotonic()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.monotonic() - started
+
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def report(name: str, result: dict):
+    ms = sorted(t * 1000 for t in result["latencies"])
+    if not ms:
+        print(f"{name:<8} no successful requests (errors={result['errors']})")
+        return
+    print(f"{name:<8} requests={len(ms):<7} rps={len(ms) / result['elapsed']:8.1f} errors={result['errors']:<5} "
+          f"p50={percentile(ms, 0.50):8.1f}ms p95={percentile(ms, 0.95):8.1f}ms "
+          f"p99={percentile(ms, 0.99):8.1f}ms max={ms[-1]:8.1f}ms avg={statistics.mean(ms):8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs async DB session load benchmark")
+    parser.add_argument("--clients", type=int, default=500, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="경로별 측정 시간(초)")
+    parser.add_argument("--limit", type=int, default=20, help="요청당 이벤트 수")
+    parser.add_argument("--seed", type=int, default=0, help="생성할 벤치마크 이벤트 수 (0이면 현재 데이터 사용)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    organizer_id = seed(args.seed) if args.seed else None
+    server = multiprocessing.Process(target=serve, args=(args.port,), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_up(base_url))
+        print(f"🚀 {args.clients} clients x {args.duration:.0f}s per path")
+        for name, path in PATHS.items():
+            # 연결 풀/캐시 예열
+            asyncio.run(load(f"{base_url}{path}", min(args.clients, 20), 2.0, args.limit))
+            report(name, asyncio.run(load(f"{base_url}{path}", args.clients, args.duration, args.limit)))
+    finally:
+        server.terminate()
+        server.join()
+        if organizer_id:
+            cleanup(organizer_id)
+            print("🧹 Bench data removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+워커 콜드 스타트 측정
+새 프로세스에서 main 모듈 import → lifespan 시작(요청 수신 가능) → warm-up 완료(/ready)까지 걸린 시간을 측정합니다.
+
+    python scripts/bench_cold_start.py             # 5회
+    python scripts/bench_cold_start.py --runs 10
+
+import/시작 단계는 DB/RPC 상태와 무관해야 하고, warm-up 시간만 외부 의존성 지연을 따라갑니다.
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# 자식 프로세스에서 실행할 측정 코드
+CHILD = """
+import asyncio, json, logging, time
+logging.disable(logging.CRITICAL)
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter()
+
+async def run():
+    async with main.app.router.lifespan_context(main.app):
+        t_started = time.perf_counter()
+        await main.readiness._task
+        t_warm = time.perf_counter()
+        report = main.readiness.report()
+    return t_started, t_warm, report
+
+t_started, t_warm, report = asyncio.run(run())
+print(json.dumps({
+    "import": t_import - t0,
+    "startup": t_started - t0,
+    "warmup": t_warm - t_started,
+    "ready": report["ready"],
+    "components": {name: c["ready"] for name, c in report["components"].items()},
+}))
+"""
+
+
+def run_once() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수")
+    args = parser.parse_args()
+
+    results = []
+    for i in range(args.runs):
+        result = run_once()
+        results.append(result)
+        print(f"  run {i + 1}: import={result['import'] * 1000:7.1f}ms startup={result['startup'] * 1000:7.1f}ms "
+              f"warmup={result['warmup'] * 1000:7.1f}ms ready={result['ready']} {result['components']}")
+
+    for key in ("import", "startup", "warmup"):
+        values = [r[key] * 1000 for r in results]
+        print(f"📊 {key:<8} median={statistics.median(values):7.1f}ms min={min(values):7.1f}ms max={max(values):7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
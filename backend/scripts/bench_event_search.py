@@ -0,0 +1,233 @@
+"""
+이벤트 검색 벤치마크
+합성 이벤트를 대량으로 넣고 (기본 100만 개) GET /events/search 핸들러를 여러 검색 유형으로 반복 실행해 지연 시간 분포를 측정합니다.
+(먼저 alembic upgrade head 필요)
+
+    python scripts/bench_event_search.py                      # 100만 개 시드, 유형별 50회
+    python scripts/bench_event_search.py --events 200000 --runs 100 --keep
+    python scripts/bench_event_search.py --no-seed            # 이전에 --keep으로 남긴 데이터 사용
+
+전체 p95가 --target-ms(기본 50ms)를 넘으면 종료 코드 1
+"""
+import sys
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import Response
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.types import Text
+from app.api.v1.events import search_events, _search_filters
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.database import AsyncSessionLocal, SessionLocal
+from app.models.event import Event, EventStatus
+from app.models.user import User, UserRole
+from datetime import datetime, timedelta
+import uuid
+
+BENCH_EMAIL_PREFIX = "search-bench-"
+
+# 검색어로 쓸 실제 단어 + 빈도 분포를 만들 합성 단어
+WORDS = [
+    "콘서트", "뮤지컬", "페스티벌", "재즈", "클래식", "오케스트라", "록", "힙합", "인디", "발라드",
+    "서울", "부산", "인천", "대구", "광주", "대전", "제주", "올림픽홀", "예술의전당", "블루스퀘어",
+    "concert", "festival", "live", "tour", "jazz", "classic", "orchestra", "rock", "indie", "opera",
+    "musical", "theater", "comedy", "dance", "edm", "hiphop", "acoustic", "symphony", "quartet", "ballet",
+    "summer", "winter", "spring", "autumn", "night", "weekend", "special", "premiere", "finale", "encore",
+] + [f"tag{i}" for i in range(5000)]
+
+SEED_SQL = text("""
+INSERT INTO events (
+    id, organizer_id, name, description, metadata_text, price_wei, max_tickets, sold_tickets,
+    start_time, end_time, event_date, status, created_at, updated_at
+)
+SELECT
+    gen_random_uuid(),
+    o[1 + floor(random() * cardinality(o))::int],
+    w[1 + floor(cardinality(w) * random() ^ 3)::int] || ' ' ||
+        w[1 + floor(cardinality(w) * random() ^ 3)::int] || ' ' ||
+        w[1 + floor(cardinality(w) * random() ^ 2)::int],
+    w[1 + floor(cardinality(w) * random() ^ 2)::int] || ' ' ||
+        w[1 + floor(cardinality(w) * random() ^ 2)::int] || ' ' ||
+        w[1 + floor(cardinality(w) * random())::int] || ' ' ||
+        w[1 + floor(cardinality(w) * random())::int],
+    w[1 + floor(20 * random())::int] || ' ' || w[1 + floor(cardinality(w) * random())::int],
+    (1 + floor(random() * 200))::bigint * 1000000000000000,
+    m.max_tickets,
+    floor(m.max_tickets * random())::int,
+    now() - interval '30 days' + (g % 365) * interval '1 day',
+    now() + (g % 365) * interval '1 day',
+    now() + (g % 365) * interval '1 day' + interval '1 day',
+    (ARRAY['ACTIVE', 'ACTIVE', 'APPROVED', 'ENDED', 'ENDED', 'PENDING'])[1 + floor(random() * 6)::int]::eventstatus,
+    now() - g * interval '1 second',
+    now()
+FROM generate_series(:start, :stop) AS g
+CROSS JOIN LATERAL (SELECT (50 + floor(random() * 950))::int AS max_tickets) m
+CROSS JOIN (SELECT :words AS w, :organizers AS o) v
+""").bindparams(
+    bindparam("words", type_=ARRAY(Text)),
+    bindparam("organizers", type_=ARRAY(UUID(as_uuid=True))),
+)
+
+
+def seed(count: int, organizers: int, batch: int = 100000):
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        users = [
+            User(id=uuid.uuid4(), email=f"{BENCH_EMAIL_PREFIX}{tag}-{i}@example.com", role=UserRole.ORGANIZER)
+            for i in range(organizers)
+        ]
+        db.add_all(users)
+        db.commit()
+        organizer_ids = [user.id for user in users]
+
+        for start in range(1, count + 1, batch):
+            stop = min(start + batch - 1, count)
+            db.execute(SEED_SQL, {"start": start, "stop": stop, "words": WORDS, "organizers": organizer_ids})
+            db.commit()
+            print(f"  seeded {stop}/{count}")
+        db.execute(text("ANALYZE events"))
+        db.commit()
+        return organizer_ids
+    finally:
+        db.close()
+
+
+def cleanup():
+    db = SessionLocal()
+    try:
+        organizer_ids = [row[0] for row in db.query(User.id).filter(User.email.like(f"{BENCH_EMAIL_PREFIX}%"))]
+        if organizer_ids:
+            db.query(Event).filter(Event.organizer_id.in_(organizer_ids)).delete(synchronize_session=False)
+            db.query(User).filter(User.id.in_(organizer_ids)).delete(synchronize_session=False)
+            db.commit()
+    finally:
+        db.close()
+
+
+def bench_organizers() -> list:
+    db = SessionLocal()
+    try:
+        return [row[0] for row in db.query(User.id).filter(User.email.like(f"{BENCH_EMAIL_PREFIX}%"))]
+    finally:
+        db.close()
+
+
+def query_shapes(organizer_ids: list, rng: random.Random) -> dict:
+    """검색 유형별 파라미터 생성기"""
+    now = datetime.utcnow()
+    common = WORDS[:50]
+    rare = WORDS[50:]
+
+    def filters(q, **kwargs):
+        params = dict(
+            q=q, status_filter=None, price_min=None, price_max=None,
+            date_from=None, date_to=None, min_available=None, organizer_id=None,
+        )
+        params.update(kwargs)
+        return params
+
+    return {
+        "common word": lambda: filters(rng.choice(common)),
+        "rare word": lambda: filters(rng.choice(rare)),
+        "two words": lambda: filters(f"{rng.choice(common)} {rng.choice(common)}"),
+        "phrase": lambda: filters(f'"{rng.choice(common)} {rng.choice(common)}"'),
+        "typo (trigram)": lambda: filters(rng.choice(common)[:-1] + "x"),
+        "facets": lambda: filters(
+            rng.choice(common),
+            status_filter=EventStatus.ACTIVE,
+            price_max=50 * 10 ** 15,
+            min_available=10,
+            date_from=now,
+            date_to=now + timedelta(days=90),
+        ),
+        "organizer": lambda: filters(rng.choice(common), organizer_id=str(rng.choice(organizer_ids))),
+        "page 2 (cursor)": lambda: filters(rng.choice(common)),
+    }
+
+
+async def run_search(params: dict, limit: int, follow_cursor: bool) -> float:
+    async with AsyncSessionLocal() as db:
+        filters = _search_filters(**params)
+        response = Response()
+        started = time.perf_counter()
+        await search_events(response=response, skip=0, limit=limit, cursor=None, filters=filters, db=db)
+        if follow_cursor and NEXT_CURSOR_HEADER in response.headers:
+            cursor = response.headers[NEXT_CURSOR_HEADER]
+            started = time.perf_counter()
+            await search_events(response=Response(), skip=0, limit=limit, cursor=cursor, filters=filters, db=db)
+        return time.perf_counter() - started
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+async def bench(runs: int, limit: int, target_ms: float) -> bool:
+    organizer_ids = bench_organizers()
+    if not organizer_ids:
+        raise SystemExit("❌ No bench data. Run without --no-seed.")
+    rng = random.Random(42)
+    shapes = query_shapes(organizer_ids, rng)
+
+    # 연결/플랜 캐시 예열
+    for make_params in shapes.values():
+        await run_search(make_params(), limit, False)
+
+    all_ms = []
+    for name, make_params in shapes.items():
+        ms = sorted([
+            await run_search(make_params(), limit, name.startswith("page 2")) * 1000
+            for _ in range(runs)
+        ])
+        all_ms.extend(ms)
+        print(f"  {name:<18} p50={percentile(ms, 0.50):7.1f}ms p95={percentile(ms, 0.95):7.1f}ms "
+              f"max={ms[-1]:7.1f}ms avg={statistics.mean(ms):7.1f}ms")
+
+    all_ms.sort()
+    p95 = percentile(all_ms, 0.95)
+    print(f"📊 overall p50={percentile(all_ms, 0.50):.1f}ms p95={p95:.1f}ms (target {target_ms:.0f}ms)")
+    return p95 <= target_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event search benchmark")
+    parser.add_argument("--events", type=int, default=1000000, help="시드 이벤트 수")
+    parser.add_argument("--organizers", type=int, default=200, help="시드 주최자 수")
+    parser.add_argument("--runs", type=int, default=50, help="검색 유형별 반복 횟수")
+    parser.add_argument("--limit", type=int, default=20, help="페이지 크기")
+    parser.add_argument("--target-ms", type=float, default=50.0, help="전체 p95 목표")
+    parser.add_argument("--no-seed", action="store_true", help="시드 없이 기존 벤치마크 데이터 사용")
+    parser.add_argument("--keep", action="store_true", help="생성한 데이터를 지우지 않음")
+    args = parser.parse_args()
+
+    if not args.no_seed:
+        print(f"🔧 Seeding {args.events} events ({args.organizers} organizers)...")
+        started = time.perf_counter()
+        seed(args.events, args.organizers)
+        print(f"  done in {time.perf_counter() - started:.1f}s")
+
+    try:
+        ok = asyncio.run(bench(args.runs, args.limit, args.target_ms))
+    finally:
+        if not args.no_seed and not args.keep:
+            cleanup()
+            print("🧹 Bench data removed")
+
+    if not ok:
+        print("❌ p95 above target")
+        sys.exit(1)
+    print("✅ p95 within target")
+
+
+if __name__ == "__main__":
+    main()
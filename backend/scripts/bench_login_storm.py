@@ -0,0 +1,104 @@
+"""
+로그인 폭주 시 다른 요청 지연 측정
+동시 로그인(bcrypt 검증)을 계속 보내면서, 같은 이벤트 루프에서 가벼운 요청(probe)이
+얼마나 늦게 실행되는지 측정합니다. DB 없이 bcrypt 부분만 재현합니다.
+
+    python scripts/bench_login_storm.py                    # inline(이벤트 루프에서 bcrypt) vs pool 비교
+    python scripts/bench_login_storm.py --logins 200 --concurrency 64 --rounds 12
+
+inline은 probe 지연이 bcrypt 한 번(수백 ms) 단위로 늘어나고, pool은 거의 그대로여야 합니다.
+풀이 가득 차면 로그인은 429(거절)로 집계됩니다.
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusyError
+
+PASSWORD = "correct horse battery staple"
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def probe(stop: asyncio.Event, interval: float, delays: list):
+    """interval마다 깨어나 예정보다 늦은 시간 기록 (= 다른 요청이 기다린 시간)"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        delays.append(max(0.0, time.perf_counter() - expected))
+
+
+async def storm(mode: str, hashed: str, logins: int, concurrency: int, hasher: PasswordHasher) -> dict:
+    delays = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop, 0.01, delays))
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"ok": 0, "rejected": 0}
+
+    async def login():
+        async with semaphore:
+            if mode == "inline":
+                verify_password(PASSWORD, hashed)
+                await asyncio.sleep(0)
+            else:
+                try:
+                    await hasher.verify(PASSWORD, hashed)
+                except PasswordHasherBusyError:
+                    counts["rejected"] += 1
+                    return
+            counts["ok"] += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await probe_task
+
+    delays_ms = [d * 1000 for d in delays] or [0.0]
+    return {
+        "elapsed": elapsed,
+        "ok": counts["ok"],
+        "rejected": counts["rejected"],
+        "p50": statistics.median(delays_ms),
+        "p99": percentile(delays_ms, 0.99),
+        "max": max(delays_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--logins", type=int, default=100, help="로그인 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 로그인 수")
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS, help="해싱 스레드 수")
+    parser.add_argument("--max-pending", type=int, default=settings.PASSWORD_HASH_MAX_PENDING, help="대기 한도")
+    args = parser.parse_args()
+
+    hashed = get_password_hash(PASSWORD, args.rounds)
+    print(f"🔐 bcrypt cost={args.rounds}, logins={args.logins}, concurrency={args.concurrency}, "
+          f"workers={args.workers}, max_pending={args.max_pending}")
+
+    for mode in ("inline", "pool"):
+        hasher = PasswordHasher(workers=args.workers, max_pending=args.max_pending, rounds=args.rounds)
+        try:
+            result = asyncio.run(storm(mode, hashed, args.logins, args.concurrency, hasher))
+        finally:
+            hasher.close()
+        print(f"📊 {mode:<6} elapsed={result['elapsed']:6.2f}s ok={result['ok']:4d} 429={result['rejected']:4d} "
+              f"probe delay p50={result['p50']:7.1f}ms p99={result['p99']:7.1f}ms max={result['max']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+내 티켓 목록(GET /tickets) 벤치마크
+지갑 하나에 티켓 N장을 만들고, 전체 페이지를 넘기면서 요청당 쿼리 수와 지연 시간을 측정합니다.
+
+    python scripts/bench_ticket_list.py                  # 티켓 1000장, 페이지 100
+    python scripts/bench_ticket_list.py --tickets 5000 --keep
+
+기존 방식(OFFSET + 티켓마다 이벤트 재조회)과 현재 핸들러(조인 프로젝션 + 커서)를 비교합니다.
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import Response
+from sqlalchemy import event as sa_event
+from app.db.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from app.models.event import Event, EventStatus
+from app.models.ticket import Ticket
+from app.models.user import User, UserRole
+from app.api.v1.tickets import get_tickets
+from app.core.pagination import NEXT_CURSOR_HEADER
+from datetime import datetime, timedelta
+import uuid
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+def seed(db, tickets: int, events: int):
+    """벤치마크용 사용자/이벤트/티켓 생성"""
+    tag = uuid.uuid4().hex[:8]
+    owner_address = "0x" + uuid.uuid4().hex + uuid.uuid4().hex[:8]
+    organizer = User(email=f"bench-{tag}@example.com", role=UserRole.ORGANIZER, smart_wallet_address=owner_address)
+    db.add(organizer)
+    db.flush()
+
+    now = datetime.utcnow()
+    event_rows = [
+        Event(
+            organizer_id=organizer.id,
+            name=f"Bench Event {tag}-{i}",
+            price_wei=10 ** 18,
+            max_tickets=tickets,
+            start_time=now - timedelta(days=1),
+            end_time=now + timedelta(days=30),
+            event_date=now + timedelta(days=31),
+            status=EventStatus.APPROVED,
+        )
+        for i in range(events)
+    ]
+    db.add_all(event_rows)
+    db.flush()
+
+    db.bulk_insert_mappings(Ticket, [
+        {
+            "id": uuid.uuid4(),
+            "event_id": event_rows[i % events].id,
+            "owner_address": owner_address,
+            "purchase_price_wei": 10 ** 18,
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        }
+        for i in range(tickets)
+    ])
+    db.commit()
+    return organizer, event_rows
+
+
+def cleanup(db, organizer, event_rows):
+    event_ids = [e.id for e in event_rows]
+    db.query(Ticket).filter(Ticket.event_id.in_(event_ids)).delete(synchronize_session=False)
+    db.query(Event).filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
+    db.query(User).filter(User.id == organizer.id).delete(synchronize_session=False)
+    db.commit()
+
+
+def legacy_page(db, owner_address: str, skip: int, limit: int) -> list:
+    """변경 전 구현 (OFFSET + 티켓마다 Event 재조회)"""
+    tickets = (
+        db.query(Ticket)
+        .join(Event, Ticket.event_id == Event.id)
+        .filter(Ticket.owner_address == owner_address)
+        .order_by(Ticket.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    result = []
+    for ticket in tickets:
+        event = db.query(Event).filter(Event.id == ticket.event_id).first()
+        result.append({"id": str(ticket.id), "event_name": event.name if event else None})
+    return result
+
+
+def run_legacy(db, owner_address: str, limit: int, counter: QueryCounter):
+    timings, queries = [], []
+    skip = 0
+    while True:
+        db.expunge_all()
+        before = counter.count
+        start = time.perf_counter()
+        page = legacy_page(db, owner_address, skip, limit)
+        timings.append(time.perf_counter() - start)
+        queries.append(counter.count - before)
+        if len(page) < limit:
+            break
+        skip += limit
+    return timings, queries
+
+
+async def run_current(user, limit: int, counter: QueryCounter):
+    timings, queries = [], []
+    cursor = None
+    async with AsyncSessionLocal() as db:
+        while True:
+            db.expunge_all()
+            response = Response()
+            before = counter.count
+            start = time.perf_counter()
+            page = await get_tickets(response, skip=0, cursor=cursor, limit=limit, current_user=user, db=db)
+            timings.append(time.perf_counter() - start)
+            queries.append(counter.count - before)
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor or not page:
+                break
+    await async_engine.dispose()
+    return timings, queries
+
+
+def report(name: str, timings: list, queries: list):
+    ms = sorted(t * 1000 for t in timings)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(f"{name:<28} pages={len(ms):<4} queries/req avg={statistics.mean(queries):6.1f} max={max(queries):<4} "
+          f"latency avg={statistics.mean(ms):7.2f}ms p95={p95:7.2f}ms total={sum(ms):8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GET /tickets benchmark")
+    parser.add_argument("--tickets", type=int, default=1000, help="지갑 하나의 티켓 수")
+    parser.add_argument("--events", type=int, default=20, help="티켓을 나눠 담을 이벤트 수")
+    parser.add_argument("--limit", type=int, default=100, help="페이지 크기")
+    parser.add_argument("--keep", action="store_true", help="생성한 데이터를 지우지 않음")
+    args = parser.parse_args()
+
+    counter = QueryCounter()
+    sa_event.listen(engine, "before_cursor_execute", counter)
+    sa_event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    db = SessionLocal()
+    try:
+        print(f"🔧 Seeding {args.tickets} tickets across {args.events} events...")
+        organizer, event_rows = seed(db, args.tickets, args.events)
+        user = SimpleNamespace(
+            id=organizer.id,
+            smart_wallet_address=organizer.smart_wallet_address,
+            wallet_address=None,
+        )
+
+        report("legacy (offset + N+1)", *run_legacy(db, user.smart_wallet_address, args.limit, counter))
+        report("current (join + keyset)", *asyncio.run(run_current(user, args.limit, counter)))
+
+        if not args.keep:
+            cleanup(db, organizer, event_rows)
+            print("🧹 Bench data removed")
+    finally:
+        db.close()
+        sa_event.remove(engine, "before_cursor_execute", counter)
+        sa_event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+핫 쿼리 실행 계획 확인
+시드 데이터를 넣고 ANALYZE 후, 각 API의 자주 실행되는 쿼리를 EXPLAIN ANALYZE로 실행해
+의도한 인덱스를 타는지 확인합니다. (먼저 alembic upgrade head 필요)
+
+    python scripts/explain_hot_queries.py                 # 기본 시드 데이터
+    python scripts/explain_hot_queries.py --tickets 100000 --keep
+    python scripts/explain_hot_queries.py --no-seed       # 현재 DB 데이터 그대로
+
+의도한 인덱스를 타지 않는 쿼리가 있으면 종료 코드 1
+"""
+import sys
+import random
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from app.db.database import SessionLocal
+from app.models.event import Event, EventStatus
+from app.models.ticket import Ticket, TicketStatus
+from app.models.resale import Resale, ResaleStatus
+from app.models.refund import RefundRequest, RefundStatus
+from app.models.user import User, UserRole
+from datetime import datetime, timedelta
+import uuid
+
+PAGE = 101  # 목록 API limit + 1 (다음 커서 확인용)
+
+
+def seed(db, events: int, users: int, tickets: int):
+    """시드 데이터 생성 (이벤트/사용자/티켓/재판매/환불 요청)"""
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.utcnow()
+    rng = random.Random(tag)
+
+    user_rows = [
+        {
+            "id": uuid.uuid4(),
+            "email": f"explain-{tag}-{i}@example.com",
+            "smart_wallet_address": "0x" + uuid.uuid4().hex + uuid.uuid4().hex[:8],
+            "role": UserRole.ORGANIZER if i == 0 else UserRole.BUYER,
+            "kyc_verified": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(users)
+    ]
+    db.bulk_insert_mappings(User, user_rows)
+
+    # 대부분 지난 이벤트, 일부만 판매 중/승인 대기
+    statuses = [EventStatus.ENDED] * 6 + [EventStatus.APPROVED, EventStatus.ACTIVE] * 2 + [EventStatus.PENDING, EventStatus.CANCELLED]
+    event_rows = []
+    for i in range(events):
+        event_status = rng.choice(statuses)
+        offset = timedelta(days=rng.randint(-365, 60))
+        event_rows.append({
+            "id": uuid.uuid4(),
+            "organizer_id": user_rows[0]["id"],
+            "name": f"Explain Event {tag}-{i}",
+            "price_wei": 10 ** 16,
+            "max_tickets": 1000,
+            "sold_tickets": 0,
+            "start_time": now + offset - timedelta(days=30),
+            "end_time": now + offset,
+            "event_date": now + offset + timedelta(days=1),
+            "status": event_status,
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        })
+    db.bulk_insert_mappings(Event, event_rows)
+
+    ticket_rows = [
+        {
+            "id": uuid.uuid4(),
+            "event_id": rng.choice(event_rows)["id"],
+            "owner_address": rng.choice(user_rows)["smart_wallet_address"],
+            "status": TicketStatus.ACTIVE if rng.random() < 0.9 else TicketStatus.REFUNDED,
+            "purchase_price_wei": 10 ** 16,
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        }
+        for i in range(tickets)
+    ]
+    db.bulk_insert_mappings(Ticket, ticket_rows)
+
+    resale_rows = [
+        {
+            "id": uuid.uuid4(),
+            "ticket_id": ticket["id"],
+            "token_id": i,
+            "seller_address": ticket["owner_address"],
+            "price_wei": 10 ** 16,
+            "status": ResaleStatus.LISTED if rng.random() < 0.2 else ResaleStatus.SOLD,
+            "created_at": now - timedelta(seconds=i),
+        }
+        for i, ticket in enumerate(rng.sample(ticket_rows, tickets // 4))
+    ]
+    db.bulk_insert_mappings(Resale, resale_rows)
+
+    owner_to_user = {user["smart_wallet_address"]: user["id"] for user in user_rows}
+    refund_rows = [
+        {
+            "id": uuid.uuid4(),
+            "ticket_id": ticket["id"],
+            "user_id": owner_to_user[ticket["owner_address"]],
+            "status": rng.choice(list(RefundStatus)),
+            "created_at": now - timedelta(seconds=i),
+        }
+        for i, ticket in enumerate(rng.sample(ticket_rows, tickets // 10))
+    ]
+    db.bulk_insert_mappings(RefundRequest, refund_rows)
+    db.commit()
+
+    for table in ("users", "events", "tickets", "resales", "refund_requests"):
+        db.execute(text(f"ANALYZE {table}"))
+    db.commit()
+    return {
+        "users": [row["id"] for row in user_rows],
+        "events": [row["id"] for row in event_rows],
+        "tickets": [row["id"] for row in ticket_rows],
+    }
+
+
+def cleanup(db, seeded: dict):
+    event_ids, user_ids = seeded["events"], seeded["users"]
+    ticket_ids = db.query(Ticket.id).filter(Ticket.event_id.in_(event_ids))
+    db.query(RefundRequest).filter(RefundRequest.ticket_id.in_(ticket_ids)).delete(synchronize_session=False)
+    db.query(Resale).filter(Resale.ticket_id.in_(ticket_ids)).delete(synchronize_session=False)
+    db.query(Ticket).filter(Ticket.event_id.in_(event_ids)).delete(synchronize_session=False)
+    db.query(Event).filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
+    db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    db.commit()
+
+
+def sample(db):
+    """쿼리 파라미터로 쓸 실제 값 (가장 많이 쓰이는 소유자/사용자 기준)"""
+    ticket = db.query(Ticket).filter(Ticket.status == TicketStatus.ACTIVE).order_by(Ticket.created_at.desc()).first()
+    resale = db.query(Resale).filter(Resale.status == ResaleStatus.LISTED).first()
+    refund = db.query(RefundRequest).order_by(RefundRequest.created_at.desc()).first()
+    if not ticket or not resale or not refund:
+        raise SystemExit("❌ Not enough data (tickets/listed resales/refund requests). Run without --no-seed.")
+    return ticket, resale, refund
+
+
+def hot_queries(db):
+    """(이름, 쿼리, 기대 인덱스) - 각 API 핸들러와 같은 조건/정렬"""
+    ticket, resale, refund = sample(db)
+    now = datetime.utcnow()
+    return [
+        (
+            "tickets: duplicate purchase check",
+            db.query(Ticket)
+            .filter(Ticket.event_id == ticket.event_id)
+            .filter(Ticket.owner_address == ticket.owner_address)
+            .filter(Ticket.status == TicketStatus.ACTIVE)
+            .limit(1),
+            ("ix_tickets_event_owner_active",),
+        ),
+        (
+            "tickets: my tickets page",
+            db.query(Ticket.id, Ticket.created_at, Event.name)
+            .join(Event, Ticket.event_id == Event.id)
+            .filter(Ticket.owner_address == ticket.owner_address)
+            .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+            .limit(PAGE),
+            ("ix_tickets_owner_created_id",),
+        ),
+        (
+            "resales: listed page",
+            db.query(Resale)
+            .filter(Resale.status == ResaleStatus.LISTED)
+            .order_by(Resale.created_at.desc(), Resale.id.desc())
+            .limit(PAGE),
+            ("ix_resales_listed_created_id",),
+        ),
+        (
+            "resales: duplicate listing check",
+            db.query(Resale)
+            .filter(Resale.ticket_id == resale.ticket_id)
+            .filter(Resale.status == ResaleStatus.LISTED)
+            .limit(1),
+            ("ix_resales_ticket_listed",),
+        ),
+        (
+            "refunds: open request for ticket",
+            db.query(RefundRequest)
+            .filter(RefundRequest.ticket_id == refund.ticket_id)
+            .filter(RefundRequest.status != RefundStatus.REJECTED)
+            .limit(1),
+            ("ix_refund_requests_ticket_status",),
+        ),
+        (
+            "refunds: my requests page",
+            db.query(RefundRequest)
+            .filter(RefundRequest.user_id == refund.user_id)
+            .order_by(RefundRequest.created_at.desc(), RefundRequest.id.desc())
+            .limit(PAGE),
+            ("ix_refund_requests_user_created_id",),
+        ),
+        (
+            "events: on sale (ACTIVE filter, scheduler not running)",
+            db.query(Event)
+            .filter(
+                Event.status.in_([EventStatus.APPROVED, EventStatus.ACTIVE]),
+                Event.start_time <= now,
+                Event.end_time >= now,
+            )
+            .order_by(Event.created_at.desc(), Event.id.desc())
+            .limit(PAGE),
+            # 판매 기간 범위 스캔 또는 status 정렬 인덱스 역순 스캔 (데이터 분포에 따라 플래너가 선택)
+            ("ix_events_status_window", "ix_events_status_created_id"),
+        ),
+        (
+            "admin: pending events page",
+            db.query(Event)
+            .filter(Event.status == EventStatus.PENDING)
+            .order_by(Event.created_at.desc(), Event.id.desc())
+            .limit(PAGE),
+            ("ix_events_status_created_id",),
+        ),
+    ]
+
+
+def explain(db, query) -> list:
+    sql = query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).all()
+    return [row[0] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE hot queries")
+    parser.add_argument("--events", type=int, default=5000, help="시드 이벤트 수")
+    parser.add_argument("--users", type=int, default=500, help="시드 사용자 수")
+    parser.add_argument("--tickets", type=int, default=50000, help="시드 티켓 수")
+    parser.add_argument("--no-seed", action="store_true", help="시드 데이터 없이 현재 DB로 실행")
+    parser.add_argument("--keep", action="store_true", help="생성한 데이터를 지우지 않음")
+    parser.add_argument("--quiet", action="store_true", help="실행 계획 전체를 출력하지 않음")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    seeded = None
+    failed = []
+    try:
+        if not args.no_seed:
+            print(f"🔧 Seeding {args.events} events, {args.users} users, {args.tickets} tickets...")
+            seeded = seed(db, args.events, args.users, args.tickets)
+
+        for name, query, expected in hot_queries(db):
+            plan = explain(db, query)
+            used = next((index for index in expected if any(index in line for line in plan)), None)
+            timing = next((line.strip() for line in plan if line.startswith("Execution Time")), "")
+            if used:
+                print(f"✅ {name:<36} {used}  {timing}")
+            else:
+                print(f"❌ {name:<36} expected {' or '.join(expected)}  {timing}")
+                failed.append(name)
+            if not args.quiet or not used:
+                for line in plan:
+                    print(f"     {line}")
+        db.rollback()
+
+        if seeded and not args.keep:
+            cleanup(db, seeded)
+            print("🧹 Seed data removed")
+    finally:
+        db.close()
+
+    if failed:
+        print(f"\n❌ {len(failed)} queries did not use the expected index")
+        sys.exit(1)
+    print("\n✅ All hot queries use their indexes")
+
+
+if __name__ == "__main__":
+    main()
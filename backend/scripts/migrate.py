@@ -0,0 +1,56 @@
+"""
+DB 마이그레이션 스크립트 (배포 시 앱 시작 전에 실행)
+이전 버전이 Base.metadata.create_all로 테이블을 만들어 alembic 버전 기록이 없는 DB는
+먼저 0001(초기 테이블)로 stamp한 뒤 upgrade합니다. (0002 이후는 이미 있는 테이블/컬럼을 건너뜀)
+
+    python scripts/migrate.py                # stamp(필요 시) + upgrade head
+    python scripts/migrate.py --revision 0010
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+
+from app.db.database import engine
+
+# create_all 시절 DB의 기준 리비전 / 그 DB에 항상 있던 테이블
+BASELINE_REVISION = "0001"
+BASELINE_TABLE = "users"
+
+
+def alembic_config() -> Config:
+    config = Config(str(project_root / "alembic.ini"))
+    config.set_main_option("script_location", str(project_root / "alembic"))
+    return config
+
+
+def needs_baseline_stamp() -> bool:
+    """테이블은 있는데 alembic 버전 기록이 없는 DB인지"""
+    with engine.connect() as conn:
+        current = MigrationContext.configure(conn).get_current_revision()
+        return current is None and inspect(conn).has_table(BASELINE_TABLE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run database migrations")
+    parser.add_argument("--revision", default="head", help="upgrade 대상 리비전")
+    args = parser.parse_args()
+
+    config = alembic_config()
+    if needs_baseline_stamp():
+        print(f"📌 Existing tables without alembic version, stamping {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, args.revision)
+    print(f"✅ Database migrated to {args.revision}")
+
+
+if __name__ == "__main__":
+    main()
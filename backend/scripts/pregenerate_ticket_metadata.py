@@ -0,0 +1,69 @@
+"""
+좌석 번호별 티켓 메타데이터 디렉터리 생성/고정 스크립트 (TICKET_METADATA_MODE=directory)
+승인 시 자동으로 만들어지지만, 모드를 켜기 전에 승인된 이벤트나 실패한 이벤트에 직접 실행합니다.
+
+    python scripts/pregenerate_ticket_metadata.py --event-id <UUID>
+    python scripts/pregenerate_ticket_metadata.py --missing      # 판매 중/승인된 이벤트 중 디렉터리가 없는 것 전부
+"""
+import sys
+import uuid
+import logging
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.database import SessionLocal
+from app.models.event import Event, EventStatus
+from app.services.ticket_metadata import ticket_metadata
+
+
+def missing_event_ids():
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Event.id)
+            .filter(Event.status.in_((EventStatus.APPROVED, EventStatus.ACTIVE)))
+            .filter(Event.metadata_dir_cid.is_(None))
+            .all()
+        )
+        return [row.id for row in rows]
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate per-serial ticket metadata directories")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--event-id", type=uuid.UUID, help="대상 이벤트 ID")
+    group.add_argument("--missing", action="store_true", help="디렉터리가 없는 승인/판매 중 이벤트 전부")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    event_ids = [args.event_id] if args.event_id else missing_event_ids()
+    print(f"📦 {len(event_ids)} event(s) to process")
+    failed = 0
+    for event_id in event_ids:
+        try:
+            cid = ticket_metadata.build_directory(event_id)
+        except Exception as e:
+            failed += 1
+            print(f"❌ {event_id}: {e}")
+            continue
+        if cid:
+            print(f"✅ {event_id}: ipfs://{cid}/<serial>.json")
+        else:
+            print(f"⚠️  {event_id}: skipped")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+체인 이벤트 인덱서 실행 스크립트
+API 서버와 별도 프로세스로 실행합니다.
+
+    python scripts/run_indexer.py          # 계속 따라가기
+    python scripts/run_indexer.py --once   # 밀린 블록만 처리하고 종료
+"""
+import sys
+import signal
+import logging
+import argparse
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.chain_indexer import chain_indexer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chain event indexer")
+    parser.add_argument("--once", action="store_true", help="현재 확정 블록까지 처리하고 종료")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    if args.once:
+        total = 0
+        while True:
+            processed = chain_indexer.run_once()
+            if processed == 0:
+                break
+            total += processed
+        print(f"✅ Indexed {total} blocks")
+        return
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    chain_indexer.run_forever(stop)
+
+
+if __name__ == "__main__":
+    main()
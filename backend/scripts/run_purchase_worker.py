@@ -0,0 +1,53 @@
+"""
+구매 작업 워커 실행 스크립트 (PURCHASE_MODE=queue)
+API 서버와 별도 프로세스로 실행하며, 여러 프로세스를 띄워도 SKIP LOCKED로 작업이 겹치지 않습니다.
+
+    python scripts/run_purchase_worker.py                  # PURCHASE_WORKER_CONCURRENCY 개 동시 처리
+    python scripts/run_purchase_worker.py --concurrency 16
+"""
+import sys
+import signal
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.services.purchase_queue import purchase_queue
+from app.services.async_aa_service import async_aa_service
+from app.services.async_web3_service import async_web3_service
+
+
+async def run(concurrency: int):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+
+    purchase_queue.concurrency = concurrency
+    try:
+        await purchase_queue.run(stop)
+    finally:
+        await async_aa_service.close()
+        await async_web3_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Purchase job worker")
+    parser.add_argument("--concurrency", type=int, default=purchase_queue.concurrency, help="동시 처리 작업 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    asyncio.run(run(args.concurrency))
+    print("✅ Purchase worker stopped")
+
+
+if __name__ == "__main__":
+    main()
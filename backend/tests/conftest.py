@@ -0,0 +1,13 @@
+"""
+단위 테스트 공통 설정 (DB/노드/게이트웨이 없이 실행)
+
+    cd backend && python -m pytest -q
+
+backend/ 바로 아래의 test_*.py는 실행 중인 노드/API가 필요한 통합 스크립트라 수집하지 않음 (pytest.ini)
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
@@ -0,0 +1,76 @@
+"""CID 계산/검증 (kubo `ipfs add` 결과와 비교)"""
+import pytest
+
+from app.services import cid as cids
+from app.services.ipfs_cache import IPFSCache, cache_key
+
+# (내용, --cid-version=0, --cid-version=1 (raw leaves))
+KUBO_VECTORS = [
+    (b"", "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH",
+     "bafkreihdwdcefgh4dqkjv67uzcmw7ojee6xedzdetojuzjevtenxquvyku"),
+    (b"hello world\n", "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o",
+     "bafkreifjjcie6lypi6ny7amxnfftagclbuxndqonfipmb64f2km2devei4"),
+]
+
+
+@pytest.mark.parametrize("content,v0,v1", KUBO_VECTORS)
+def test_file_cid_matches_kubo(content, v0, v1):
+    assert str(cids.file_cid(content, 0)) == v0
+    assert str(cids.file_cid(content, 1)) == v1
+
+
+@pytest.mark.parametrize("content,v0,v1", KUBO_VECTORS)
+def test_verify(content, v0, v1):
+    assert cids.verify(v0, content)
+    assert cids.verify(v1, content)
+    assert not cids.verify(v0, content + b"x")
+    assert not cids.verify(v1, content + b"x")
+
+
+@pytest.mark.parametrize("text", [vector[1] for vector in KUBO_VECTORS] + [vector[2] for vector in KUBO_VECTORS])
+def test_parse_round_trip(text):
+    parsed = cids.parse(text)
+    assert str(parsed) == text
+    assert cids.try_parse(text) == parsed
+
+
+def test_try_parse_rejects_garbage():
+    assert cids.try_parse("not-a-cid") is None
+    assert cids.try_parse("") is None
+
+
+@pytest.mark.parametrize("version", [0, 1])
+@pytest.mark.parametrize("size", [cids.CHUNK_SIZE, cids.CHUNK_SIZE + 1, cids.CHUNK_SIZE * 3 - 7])
+def test_streamed_content_matches_bytes(version, size):
+    content = bytes(i % 251 for i in range(size))
+    pieces = (content[i:i + 10000] for i in range(0, len(content), 10000))
+    root = cids.file_cid(content, version)
+    assert cids.file_cid(pieces, version) == root
+    # 청크가 여러 개면 루트는 dag-pb, 하나면 v1은 raw 리프 그대로
+    assert root.codec == (cids.DAG_PB if size > cids.CHUNK_SIZE or version == 0 else cids.RAW)
+    assert cids.verify(root, content)
+
+
+def test_cache_key_normalizes_cid_and_keeps_path():
+    v0 = KUBO_VECTORS[0][1]
+    assert cache_key(f"ipfs://{v0}") == v0
+    assert cache_key(f"ipfs://{v0}/12.json") == f"{v0}/12.json"
+    assert cache_key(f"{v0}/a/../b.json") is None
+    assert cache_key("not-a-cid/12.json") is None
+
+
+def test_cache_rejects_mismatched_content(tmp_path):
+    cache = IPFSCache(memory_bytes=1 << 20, directory=str(tmp_path), disk_bytes=1 << 20)
+    v0 = KUBO_VECTORS[1][1]
+    assert not cache.put(v0, b"something else\n")
+    assert cache.put(v0, b"hello world\n")
+    assert cache.disk.get(v0) == b"hello world\n"
+
+
+def test_cache_stores_directory_paths_on_disk(tmp_path):
+    v0 = KUBO_VECTORS[0][1]
+    IPFSCache(memory_bytes=1 << 20, directory=str(tmp_path), disk_bytes=1 << 20).put(f"{v0}/3.json", b'{"serial":3}')
+    # 새 프로세스처럼 디스크 인덱스부터 다시 읽음
+    cache = IPFSCache(memory_bytes=1 << 20, directory=str(tmp_path), disk_bytes=1 << 20)
+    assert cache.get(f"ipfs://{v0}/3.json") == {"serial": 3}
+    assert cache.get(f"{v0}/4.json") is None
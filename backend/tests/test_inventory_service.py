@@ -0,0 +1,83 @@
+"""재고 예약 일련번호 배정/재사용 (SQLite - FOR UPDATE SKIP LOCKED는 생략됨)"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.models.inventory import InventoryHold, InventoryHoldStatus, InventoryShard
+from app.services.inventory_service import InventoryService, split_capacity
+
+
+@compiles(UUID, "sqlite")
+def _uuid_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    InventoryShard.__table__.create(engine)
+    InventoryHold.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def make_event(db, max_tickets: int, shards: int):
+    event = SimpleNamespace(id=uuid.uuid4(), max_tickets=max_tickets, sold_tickets=0)
+    for shard, capacity in enumerate(split_capacity(max_tickets, shards)):
+        db.add(InventoryShard(event_id=event.id, shard=shard, capacity=capacity, held=0, sold=0, issued=0))
+    db.commit()
+    return event
+
+
+def test_serials_cover_exactly_max_tickets(db):
+    inventory = InventoryService(session_factory=None)
+    event = make_event(db, max_tickets=10, shards=3)
+    serials = [inventory.reserve(db, event).serial for _ in range(10)]
+    assert sorted(serials) == list(range(1, 11))
+    assert inventory.reserve(db, event) is None
+
+
+def test_released_serial_is_reused(db):
+    inventory = InventoryService(session_factory=None)
+    event = make_event(db, max_tickets=3, shards=1)
+    first = inventory.reserve(db, event)
+    assert inventory.release(db, first.id)
+    db.commit()
+    again = inventory.reserve(db, event)
+    assert again.serial == first.serial
+    # 남은 재고도 max_tickets 범위 안의 번호
+    serials = {again.serial} | {inventory.reserve(db, event).serial for _ in range(2)}
+    assert serials == {1, 2, 3}
+    assert db.get(InventoryShard, (event.id, 0)).issued == 3
+    assert inventory.stats()["serials_reused"] == 1
+
+
+def test_expired_serial_is_reused(db):
+    inventory = InventoryService(session_factory=None)
+    event = make_event(db, max_tickets=2, shards=1)
+    expired = inventory.reserve(db, event, hold_seconds=1)
+    expired.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.flush()
+    assert inventory.release_expired(db) == 1
+    assert {inventory.reserve(db, event).serial for _ in range(2)} == {1, 2}
+
+
+def test_late_confirm_reclaims_unused_serial(db):
+    inventory = InventoryService(session_factory=None)
+    event = make_event(db, max_tickets=2, shards=1)
+    hold = inventory.reserve(db, event)
+    inventory.release(db, hold.id)
+    # 반환 후 온체인 구매가 확인됨 - 번호를 다시 이 예약의 것으로
+    inventory.confirm(db, hold.id)
+    db.flush()
+    assert db.get(InventoryHold, hold.id).status == InventoryHoldStatus.CONFIRMED
+    assert inventory.reserve(db, event).serial != hold.serial
+    assert inventory.stats()["serial_conflicts"] == 0
@@ -0,0 +1,173 @@
+"""서비스 계정 nonce 할당/재동기화/빈자리 채우기"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.nonce_manager import NonceManager
+from app.services.web3_service import Web3Service
+
+
+class FakeChain:
+    """block_identifier별 트랜잭션 수"""
+
+    def __init__(self, pending: int, latest: int = None):
+        self.counts = {"pending": pending, "latest": pending if latest is None else latest}
+
+    def __call__(self, block_identifier: str) -> int:
+        return self.counts[block_identifier]
+
+
+def test_allocate_is_sequential_and_reuses_released():
+    nonces = NonceManager(FakeChain(5))
+    assert [nonces.allocate() for _ in range(3)] == [5, 6, 7]
+    nonces.release(6)
+    assert nonces.allocate() == 6
+    assert nonces.allocate() == 8
+
+
+def test_release_ignores_unallocated_and_duplicate_nonces():
+    nonces = NonceManager(FakeChain(5))
+    nonces.allocate()
+    nonces.release(5)
+    nonces.release(5)
+    nonces.release(9)
+    assert nonces.stats()["released_pending"] == 1
+
+
+def test_resync_raises_counter_and_drops_used_nonces():
+    chain = FakeChain(5)
+    nonces = NonceManager(chain)
+    [nonces.allocate() for _ in range(3)]
+    nonces.release(6)
+    chain.counts["pending"] = 10
+    assert nonces.resync() == 10
+    assert nonces.stats()["in_flight"] == 0
+    assert nonces.allocate() == 10
+
+
+def test_resync_lowers_counter_when_nothing_is_in_flight():
+    # nonce too high: 로컬 카운터가 체인보다 앞섬 (전송한 트랜잭션이 drop됨 등)
+    chain = FakeChain(5)
+    nonces = NonceManager(chain)
+    allocated = [nonces.allocate() for _ in range(3)]
+    for nonce in allocated:
+        nonces.release(nonce)
+    assert nonces.resync() == 5
+    assert nonces.stats()["released_pending"] == 0
+    assert [nonces.allocate() for _ in range(2)] == [5, 6]
+
+
+def test_resync_keeps_counter_while_lower_nonces_are_in_flight():
+    chain = FakeChain(5)
+    nonces = NonceManager(chain)
+    [nonces.allocate() for _ in range(3)]
+    nonces.release(7)
+    # 5, 6은 아직 전송 중 - 체인 pending에 반영되기 전
+    assert nonces.resync() == 8
+    assert nonces.allocate() == 7
+
+
+def test_fill_gaps_releases_only_lowest_stale_nonce():
+    chain = FakeChain(5)
+    nonces = NonceManager(chain, gap_timeout=0)
+    [nonces.allocate() for _ in range(4)]
+    chain.counts["latest"] = 6
+    assert nonces.fill_gaps() == [6]
+    assert nonces.allocate() == 6
+    # 7, 8은 6을 기다리는 중일 수 있으므로 그대로
+    assert nonces.stats()["in_flight"] == 3
+
+
+def test_fill_gaps_waits_for_timeout():
+    nonces = NonceManager(FakeChain(5), gap_timeout=3600)
+    nonces.allocate()
+    assert nonces.fill_gaps() == []
+
+
+@pytest.mark.parametrize("message,conflict,known", [
+    ("nonce too low", True, False),
+    ("Nonce too high", True, False),
+    ("replacement transaction underpriced", True, False),
+    ("already known", False, True),
+    ("known transaction: 0xabc", False, True),
+    ("insufficient funds for gas", False, False),
+])
+def test_error_classification(message, conflict, known):
+    error = ValueError({"code": -32000, "message": message})
+    assert NonceManager.is_nonce_error(error) is conflict
+    assert NonceManager.is_already_known(error) is known
+
+
+class FakeAccount:
+    def sign_transaction(self, transaction):
+        raw = f"signed-{transaction['nonce']}".encode()
+        return SimpleNamespace(raw_transaction=raw, hash=raw)
+
+
+def make_web3_service(chain: FakeChain, send) -> Web3Service:
+    service = Web3Service.__new__(Web3Service)
+    service.account = FakeAccount()
+    service._w3 = SimpleNamespace(eth=SimpleNamespace(send_raw_transaction=send))
+    service.nonces = NonceManager(chain)
+    return service
+
+
+def test_sign_and_send_releases_conflicting_nonce_and_retries():
+    chain = FakeChain(5)
+    sent = []
+
+    def send(raw):
+        sent.append(raw)
+        if len(sent) == 1:
+            # 다른 프로세스가 5를 사용함
+            chain.counts["pending"] = 6
+            raise ValueError("nonce too low")
+        return raw
+
+    service = make_web3_service(chain, send)
+    assert service._sign_and_send(lambda nonce: {"nonce": nonce}) == b"signed-6".hex()
+    assert service.nonces.stats()["in_flight"] == 1
+    assert service.nonces.stats()["released_pending"] == 0
+
+
+def test_sign_and_send_recovers_from_nonce_too_high():
+    chain = FakeChain(9)
+    calls = []
+
+    def send(raw):
+        calls.append(raw)
+        if raw != b"signed-5":
+            raise ValueError("nonce too high")
+        return raw
+
+    service = make_web3_service(chain, send)
+    service.nonces.resync()
+    # 노드 재시작 등으로 체인 pending이 뒤로 감
+    chain.counts["pending"] = 5
+    assert service._sign_and_send(lambda nonce: {"nonce": nonce}) == b"signed-5".hex()
+    assert calls == [b"signed-9", b"signed-5"]
+    assert service.nonces.allocate() == 6
+
+
+def test_sign_and_send_treats_already_known_as_sent():
+    chain = FakeChain(5)
+    calls = []
+
+    def send(raw):
+        calls.append(raw)
+        raise ValueError("already known")
+
+    service = make_web3_service(chain, send)
+    assert service._sign_and_send(lambda nonce: {"nonce": nonce}) == b"signed-5".hex()
+    assert len(calls) == 1
+    # 전송된 nonce이므로 반환하지 않음
+    assert service.nonces.stats()["released_pending"] == 0
+    assert service.nonces.allocate() == 6
+
+
+def test_sign_and_send_releases_nonce_on_other_errors():
+    service = make_web3_service(FakeChain(5), lambda raw: (_ for _ in ()).throw(ValueError("insufficient funds")))
+    with pytest.raises(ValueError):
+        service._sign_and_send(lambda nonce: {"nonce": nonce})
+    assert service.nonces.stats()["in_flight"] == 0
+    assert service.nonces.allocate() == 5
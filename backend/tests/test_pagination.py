@@ -0,0 +1,33 @@
+"""커서 인코딩/디코딩"""
+from datetime import datetime
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import CREATED_AT_ID, decode_cursor, encode_cursor
+
+
+def test_round_trip_created_at_id():
+    values = [datetime(2026, 10, 18, 12, 30, 45, 123456), uuid.uuid4()]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, CREATED_AT_ID) == values
+
+
+def test_round_trip_custom_parsers():
+    cursor = encode_cursor([42, "0xabc"])
+    assert decode_cursor(cursor, (int, str)) == [42, "0xabc"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    encode_cursor([datetime(2026, 1, 1)]),  # 값 개수 불일치
+    encode_cursor(["yesterday", str(uuid.uuid4())]),  # 파싱 실패
+    encode_cursor(["2026-01-01T00:00:00", "not-a-uuid"]),
+    "e30",  # {} (목록 아님)
+])
+def test_invalid_cursor_is_bad_request(cursor):
+    with pytest.raises(HTTPException) as raised:
+        decode_cursor(cursor, CREATED_AT_ID)
+    assert raised.value.status_code == 400
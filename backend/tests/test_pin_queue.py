@@ -0,0 +1,19 @@
+"""로컬 CID 계산 (pin_queue.add_json이 돌려주는 CID = 고정 후 Pinata가 돌려줄 CID)"""
+import pytest
+
+from app.services import cid as cids
+from app.services.pin_queue import PinQueue, canonical_json
+
+
+def test_canonical_json_is_key_order_independent():
+    assert canonical_json({"b": 1, "a": [1, 2]}) == canonical_json({"a": [1, 2], "b": 1})
+    assert canonical_json({"name": "콘서트"}) == '{"name":"콘서트"}'.encode()
+
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_json_cid_matches_pinned_bytes(version):
+    data = {"name": "Ticket #1", "attributes": [{"trait_type": "Seat", "value": 1}]}
+    cid = PinQueue(cid_version=version).json_cid(data)
+    assert cids.parse(cid).version == version
+    assert cids.verify(cid, canonical_json(data))
+    assert PinQueue(cid_version=version).json_cid(dict(reversed(list(data.items())))) == cid
@@ -0,0 +1,164 @@
+"""구매 작업 임대(lease)/재시도 상태 전이 (SQLite - FOR UPDATE SKIP LOCKED는 생략됨)"""
+from datetime import datetime, timedelta
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.models.purchase_job import PurchaseJob, PurchaseJobStatus
+from app.services.purchase_queue import LeaseLostError, PurchaseQueue
+
+
+@compiles(UUID, "sqlite")
+def _uuid_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+class FakeInventory:
+    def __init__(self):
+        self.released = []
+
+    def release(self, db, hold_id):
+        self.released.append(hold_id)
+        return True
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    PurchaseJob.__table__.create(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def inventory():
+    return FakeInventory()
+
+
+@pytest.fixture
+def queue(session_factory, inventory):
+    return PurchaseQueue(
+        inventory,
+        session_factory=session_factory,
+        max_attempts=3,
+        retry_base_seconds=2.0,
+        retry_max_seconds=3.0,
+        lease_seconds=60,
+    )
+
+
+def add_job(session_factory, **fields) -> uuid.UUID:
+    db = session_factory()
+    job = PurchaseJob(user_id=uuid.uuid4(), event_id=uuid.uuid4(), **fields)
+    db.add(job)
+    db.commit()
+    db.close()
+    return job.id
+
+
+def load(session_factory, job_id) -> PurchaseJob:
+    db = session_factory()
+    try:
+        return db.get(PurchaseJob, job_id)
+    finally:
+        db.close()
+
+
+def test_claim_marks_job_running(queue, session_factory):
+    job_id = add_job(session_factory)
+    assert queue.claim("worker-a") == job_id
+    job = load(session_factory, job_id)
+    assert job.status == PurchaseJobStatus.RUNNING
+    assert job.locked_by == "worker-a"
+    assert job.attempts == 1
+    # 임대 중인 작업은 다른 워커가 가져가지 않음
+    assert queue.claim("worker-b") is None
+
+
+def test_claim_skips_jobs_waiting_for_retry(queue, session_factory):
+    add_job(session_factory, run_after=datetime.utcnow() + timedelta(minutes=1))
+    assert queue.claim("worker-a") is None
+
+
+def test_expired_lease_is_reclaimed_and_old_worker_loses_it(queue, session_factory):
+    job_id = add_job(session_factory)
+    queue.claim("worker-a")
+    db = session_factory()
+    db.get(PurchaseJob, job_id).locked_at = datetime.utcnow() - timedelta(seconds=61)
+    db.commit()
+    db.close()
+
+    assert queue.claim("worker-b") == job_id
+    assert load(session_factory, job_id).attempts == 2
+    with pytest.raises(LeaseLostError):
+        queue._save(job_id, "worker-a", op_hash="0x" + "ab" * 32)
+    # 임대를 잃은 워커의 실패 처리는 무시됨
+    queue._retry_or_fail(job_id, "worker-a", "boom", retryable=True)
+    job = load(session_factory, job_id)
+    assert job.status == PurchaseJobStatus.RUNNING
+    assert job.locked_by == "worker-b"
+    assert job.op_hash is None
+
+
+def test_save_renews_lease(queue, session_factory):
+    job_id = add_job(session_factory)
+    queue.claim("worker-a")
+    before = load(session_factory, job_id).locked_at
+    queue._save(job_id, "worker-a", op_hash="0x" + "cd" * 32)
+    job = load(session_factory, job_id)
+    assert job.op_hash == "0x" + "cd" * 32
+    assert job.locked_at >= before
+
+
+def test_retry_backs_off_then_fails_and_releases_hold(queue, session_factory, inventory):
+    hold_id = uuid.uuid4()
+    job_id = add_job(session_factory, hold_id=hold_id)
+
+    delays = []
+    for _ in range(2):
+        db = session_factory()
+        db.get(PurchaseJob, job_id).run_after = datetime.utcnow()
+        db.commit()
+        db.close()
+        assert queue.claim("worker-a") == job_id
+        started = datetime.utcnow()
+        queue._retry_or_fail(job_id, "worker-a", "rpc timeout", retryable=True)
+        job = load(session_factory, job_id)
+        assert job.status == PurchaseJobStatus.QUEUED
+        assert job.locked_by is None and job.last_error == "rpc timeout"
+        delays.append((job.run_after - started).total_seconds())
+    # 2초 → 4초(최대 3초로 제한)
+    assert delays[0] == pytest.approx(2.0, abs=0.5)
+    assert delays[1] == pytest.approx(3.0, abs=0.5)
+    assert inventory.released == []
+
+    db = session_factory()
+    db.get(PurchaseJob, job_id).run_after = datetime.utcnow()
+    db.commit()
+    db.close()
+    queue.claim("worker-a")
+    queue._retry_or_fail(job_id, "worker-a", "rpc timeout", retryable=True)
+    assert load(session_factory, job_id).status == PurchaseJobStatus.FAILED
+    assert inventory.released == [hold_id]
+
+
+def test_non_retryable_error_fails_immediately(queue, session_factory, inventory):
+    hold_id = uuid.uuid4()
+    job_id = add_job(session_factory, hold_id=hold_id)
+    queue.claim("worker-a")
+    queue._retry_or_fail(job_id, "worker-a", "Tickets sold out", retryable=False)
+    assert load(session_factory, job_id).status == PurchaseJobStatus.FAILED
+    assert inventory.released == [hold_id]
+
+
+def test_unconfirmed_submission_keeps_hold_on_final_failure(queue, session_factory, inventory):
+    # 전송은 했지만 확인하지 못한 작업 - 온체인 결과를 모르므로 재고를 반환하지 않음
+    job_id = add_job(session_factory, hold_id=uuid.uuid4(), op_hash="0x" + "ef" * 32, attempts=2)
+    queue.claim("worker-a")
+    queue._retry_or_fail(job_id, "worker-a", "confirmation timeout", retryable=True)
+    assert load(session_factory, job_id).status == PurchaseJobStatus.FAILED
+    assert inventory.released == []